@@ -1,29 +1,37 @@
-import numpy as np
+import os
 
-def fft_signal(s: np.ndarray, t: np.ndarray):
-    # спектр сигнала
-    fft_s = np.fft.fft(s)
+import numpy as np
+import scipy.fft
 
-    # fftshift для симметричного спектра
-    fft_s = np.fft.fftshift(fft_s)
+def fft_signal(s: np.ndarray, t: np.ndarray, nfft=None, resolution=None, precision='double', workers=None):
+    # Односторонний спектр действительного сигнала: БПФ действительного сигнала (rfft) вычисляет только
+    # неотрицательные частоты — вдвое меньше вычислений и памяти, чем fft + fftshift
+    # nfft — минимальная длина БПФ, resolution — требуемое разрешение по частоте (Гц),
+    # precision — 'double' или 'single' (float32/complex64), workers — количество потоков БПФ
 
-    # длина сигнала
-    nsamp = len(t)
-    # вычисление амплитудного спектра
-    amplitude_spectrum = np.abs(fft_s)
     # частота дискретизации
     fs = 1.0 / (t[1] - t[0])
 
+    # длина БПФ: не меньше длины сигнала и fs/resolution, округлённая до быстрой длины (малые простые множители)
+    nsamp = max(len(t), int(nfft or 0))
+    if resolution:
+        nsamp = max(nsamp, int(np.ceil(fs / resolution)))
+    nsamp = scipy.fft.next_fast_len(nsamp, real=True)
+
+    # спектр сигнала (дополнение нулями до nsamp выполняет само БПФ)
+    dtype = np.float32 if precision == 'single' else np.float64
+    fft_s = scipy.fft.rfft(np.asarray(s, dtype=dtype), n=nsamp, workers=workers or os.cpu_count() or 1)
+
     # частотный шаг
     df = fs / nsamp
 
-    # нормировка амплитуды
-    fft_s = fft_s / nsamp
+    # нормировка амплитуды (на месте)
+    fft_s /= nsamp
 
     print(f"Частота дискретизации = {round(fs/1e6)}  МГц")
     print(f"Разрешение по частоте = {round(df)}  Гц")
 
-    # вектор частот
-    freq_vec = np.fft.fftshift(np.fft.fftfreq(nsamp, d=1/fs))
+    # вектор частот 0...fs/2
+    freq_vec = scipy.fft.rfftfreq(nsamp, d=1/fs)
 
     return fft_s, nsamp, fs, df, freq_vec
@@ -1,11 +1,21 @@
 import csv
 import numpy as np
 import pandas as pd
+from scipy.signal import firwin, kaiserord, resample_poly
 
 class MetaInfo:
     def __init__(self, info):
         self.info = info
 
+def decimate(s, downsampling_factor, attenuation_db=80.0, passband=0.8):
+    # Децимация с фильтром защиты от наложения спектров (полифазный КИХ-фильтр с окном Кайзера).
+    # Частота среза — новая частота Найквиста; составляющие, которые после прореживания попали бы в полосу
+    # [0, passband] новой частоты Найквиста, подавляются на attenuation_db. Отсчёт m результата соответствует
+    # s[m*downsampling_factor] (задержка фильтра скомпенсирована), края сигнала продолжаются крайними значениями.
+    numtaps, beta = kaiserord(attenuation_db, 2 * (1 - passband) / downsampling_factor)
+    h = firwin(numtaps | 1, 1 / downsampling_factor, window=('kaiser', beta))
+    return resample_poly(np.asarray(s, dtype=float), 1, downsampling_factor, window=h, padtype='edge')
+
 def load_and_prepare_data(file_name, format_ver, inx_start, inx_stop, downsampling_factor):
     meta = {}
     t = []
@@ -51,18 +61,17 @@ def load_and_prepare_data(file_name, format_ver, inx_start, inx_stop, downsampli
     print(f"Считано {len(t)} отсчётов")
     print(f"Частота дискретизации = {round((1/k_t)/1e6)}  МГц")
 
+    # Дальше — только массивы NumPy: без .tolist() и списков из миллионов объектов float
+    t = np.asarray(t)
+    s = np.asarray(s)
     if downsampling_factor != 1:
-        s = s[inx_start:inx_stop:downsampling_factor]
-        t = np.array(t)[inx_start:inx_stop:downsampling_factor] - t[inx_start]
-        t = t.tolist()
+        # Срез s[::downsampling_factor] переносит шум выше новой частоты Найквиста в полосу анализа
+        s = decimate(s[inx_start:inx_stop], downsampling_factor)
+        t = t[inx_start:inx_stop:downsampling_factor] - t[inx_start]
     else:
         t = t[inx_start:inx_stop]
         s = s[inx_start:inx_stop]
-        t = np.array(t) - t[0]
-        t = t.tolist()
-
-    s = np.array(s) - np.mean(s)
-    s = s.tolist()
+        t = t - t[0]
 
     meta_info = MetaInfo(meta)
     meta_df = pd.DataFrame({'Key': list(meta_info.info.keys()), 'Value': list(meta_info.info.values())})
@@ -73,9 +82,18 @@ def load_and_prepare_data(file_name, format_ver, inx_start, inx_stop, downsampli
     N = len(t)
     N_new = int(np.floor(oversampling_factor * N))
 
-    s = s + [0.0] * (N_new - N)
+    # Удаление постоянной составляющей и дополнение нулями — в одном выделенном массиве
+    # (сигнал длиннее 2^16 отсчётов не усекается)
+    N_new = max(N_new, N)
+    s_new = np.zeros(N_new)
+    np.subtract(s, np.mean(s), out=s_new[:N])
+    s = s_new
+    # Ось времени продолжается с тем же шагом
     dt = t[1] - t[0]
-    t = t + [t[-1] + dt * i for i in range(1, N_new - N + 1)]
+    t_new = np.empty(N_new)
+    t_new[:N] = t
+    t_new[N:] = t[-1] + dt * np.arange(1, N_new - N + 1)
+    t = t_new
 
     print(f"Для анализа берём {len(t)} отсчётов")
     dt = t[1] - t[0]
@@ -3,8 +3,8 @@
 PlotData.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.1
+Дата:         2026-10-17
+Версия:       1.0.3
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -22,6 +22,7 @@ PlotData.py
 Основные методы:
 - plot(x, y, label=None, **kwargs): Построение линии на графике.
 - plot_line(x, y, *, x_zoom=1, y_zoom=1, color=None, linestyle=None, label=None, add_scale_label=True, add_mode=False): Расширенное построение линии с поддержкой масштабирования и интерактивного управления.
+- update_line(line, x, y, *, x_zoom=1, y_zoom=1, autoscale=True): Замена данных существующей линии (прогрессивная загрузка).
 - clear(): Очистка графика.
 - clear_canvas(): Очистка текущей оси и обновление холста.
 - remove_line(inx_line_to_remove=None): Удаление линии по индексу.
@@ -58,6 +59,9 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt  # Для работы с модификаторами клавиш (например, Shift)
 
+# Равномерная временная ось (t0, dt, n): масштабирование и обрезка без копирования массива времени
+from time_base import TimeBase
+
 # Импортируем Figure и инструменты для интеграции matplotlib-графиков в Qt-интерфейс
 from matplotlib.figure import Figure
 import sys
@@ -83,6 +87,7 @@ class PlotData(QWidget):
     Основные методы:
         - plot(x, y, label=None, **kwargs): Построение линии на графике.
         - plot_line(...): Расширенное построение линии с поддержкой масштабирования и интерактивного управления.
+        - update_line(...): Замена данных существующей линии.
         - clear(), clear_canvas(): Очистка графика.
         - remove_line(...), remove_active_line(): Удаление линии по индексу или активной линии.
         - get_active_line(), get_index_active_line(), get_active_line_params(): Получение информации об активной линии.
@@ -507,7 +512,7 @@ class PlotData(QWidget):
         '''
         Строит линию на графике с возможностью задания параметров отображения и масштабирования.
         Параметры:
-            x (array-like): Массив значений по оси X.
+            x (array-like | TimeBase): Массив значений по оси X или равномерная временная ось.
             y (array-like): Массив значений по оси Y.
             x_zoom (float, optional): Коэффициент масштабирования по оси X (по умолчанию 1).
             y_zoom (float, optional): Коэффициент масштабирования по оси Y (по умолчанию 1).
@@ -527,6 +532,8 @@ class PlotData(QWidget):
             - Двойной клик мыши по графику — авто-масштабирование по оси X.
             - Обновляет легенду и визуальное выделение активной линии.
             - Сохраняет имена и коэффициенты масштабирования для каждой линии.
+            - Для равномерной временной оси (TimeBase) масштабируется только ось (O(1)), массив X формируется один раз,
+              а ось сохраняется в атрибуте линии _osc_viewer_time_base (используется при обрезке и построении спектра).
         Использует:
             - Методы и параметры класса PlotData.
             - Внутренние атрибуты canvas для хранения состояния линий.
@@ -535,7 +542,12 @@ class PlotData(QWidget):
         y = np.array(y) * y_zoom
         '''
         # Масштабируем входные данные по X и Y
-        x = np.array(x) * x_zoom
+        time_base = None
+        if isinstance(x, TimeBase):
+            time_base = x * x_zoom
+            x = time_base.to_array()
+        else:
+            x = np.array(x) * x_zoom
         y = np.array(y) * y_zoom
 
         # --- Вспомогательные обработчики событий для plot_line ---
@@ -624,12 +636,16 @@ class PlotData(QWidget):
             if event.key in ["left"]:
                 xdata = xdata - delta_x  # Сдвиг по X влево
                 line.set_xdata(xdata)
+                if getattr(line, "_osc_viewer_time_base", None) is not None:
+                    line._osc_viewer_time_base = line._osc_viewer_time_base - delta_x
                 main_window.ax.relim()
                 main_window.ax.autoscale_view()
                 main_window.canvas.draw_idle()
             elif event.key in ["right"]:
                 xdata = xdata + delta_x  # Сдвиг по X вправо
                 line.set_xdata(xdata)
+                if getattr(line, "_osc_viewer_time_base", None) is not None:
+                    line._osc_viewer_time_base = line._osc_viewer_time_base + delta_x
                 main_window.ax.relim()
                 main_window.ax.autoscale_view()
                 main_window.canvas.draw_idle()
@@ -744,6 +760,8 @@ class PlotData(QWidget):
             linestyle=linestyle,
             label=f"{label} (x{scale:.2f})" if add_scale_label and label else label,
         )
+        # Сохраняем равномерную временную ось линии (None — произвольная ось X)
+        line._osc_viewer_time_base = time_base
 
         # --- Сохраняем имя и scale-фактор для линии ---
         if not hasattr(main_window.canvas, "_osc_viewer_line_names"):
@@ -766,7 +784,7 @@ class PlotData(QWidget):
         main_window.ax.grid(True)
         # Устанавливаем пределы по X, если есть данные
         if len(x) > 0:
-            main_window.ax.set_xlim(min(x), x[-1])
+            main_window.ax.set_xlim(np.min(x), x[-1])
         main_window.canvas.draw_idle()
 
         # Подключаем обработчик клавиш, отключая предыдущий если был
@@ -791,6 +809,32 @@ class PlotData(QWidget):
         # Обновляем легенду графика
         main_window.update_legend()
 
+    def update_line(main_window, line, x, y, *, x_zoom=1, y_zoom=1, autoscale=True):
+        '''
+        Заменяет данные существующей линии, сохраняя её цвет, стиль, имя и обработчики событий.
+        Используется при прогрессивной загрузке: грубый предварительный просмотр линии уточняется по мере чтения файла.
+        Параметры:
+            line (Line2D): Линия на графике.
+            x (array-like | TimeBase): Новые значения по оси X или равномерная временная ось.
+            y (array-like): Новые значения по оси Y.
+            x_zoom (float, optional): Коэффициент масштабирования по оси X (по умолчанию 1).
+            y_zoom (float, optional): Коэффициент масштабирования по оси Y (по умолчанию 1).
+            autoscale (bool, optional): Подогнать пределы осей под данные всех линий (по умолчанию True).
+        '''
+        time_base = None
+        if isinstance(x, TimeBase):
+            time_base = x * x_zoom
+            x = time_base.to_array()
+        else:
+            x = np.array(x) * x_zoom
+        line.set_data(x, np.array(y) * y_zoom)
+        line._osc_viewer_time_base = time_base
+
+        if autoscale and len(x) > 0:
+            main_window.ax.set_xlim(main_window.get_x_min(), main_window.get_x_max())
+            main_window.ax.relim()
+            main_window.ax.autoscale_view(scalex=False)
+        main_window.canvas.draw_idle()
 
     def get_x_min(main_window):
         '''
@@ -867,6 +911,8 @@ class PlotData(QWidget):
         Описание:
             Метод перебирает все линии на текущей оси (main_window.ax) и обрезает их данные по оси X,
             оставляя только те точки, которые попадают в указанный диапазон [x_min, x_max].
+            Для линий с равномерной временной осью (_osc_viewer_time_base) диапазон индексов вычисляется
+            арифметически, а данные обрезаются срезом без маски и копирования.
             После обрезки обновляет отображение графика.
         '''
         # Проверяем наличие линий на графике
@@ -877,6 +923,14 @@ class PlotData(QWidget):
         for line in main_window.ax.lines:
             xdata = line.get_xdata()
             ydata = line.get_ydata()
+            time_base = getattr(line, "_osc_viewer_time_base", None)
+            if time_base is not None and len(time_base) == len(xdata):
+                # Индексы границ диапазона по t0 и dt
+                i0, i1 = time_base.index_range(x_min, x_max)
+                line.set_xdata(xdata[i0:i1])
+                line.set_ydata(ydata[i0:i1])
+                line._osc_viewer_time_base = time_base[i0:i1]
+                continue
             # Создаем маску для точек внутри заданного диапазона по X
             mask = (xdata >= x_min) & (xdata <= x_max)
             # Применяем маску к данным линии
@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+'''
+archive.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует архивный формат записей (.oscz) для долговременного хранения и быстрого произвольного доступа.
+Архив — zip-файл, в котором отсчёты сигнала разбиты на фрагменты фиксированной длины, каждый фрагмент хранится
+отдельным сжатым .npy-файлом (float64 или коды АЦП int8/int16, см. quantized). Для каждого фрагмента заранее вычислены
+минимум, максимум, среднее и RMS (summary.npy), а заголовок (header.json) содержит временную ось (t0, dt, n)
+и метаинформацию (meta_df). Обзор всей записи, статистика и масштабирование используют только сводки фрагментов,
+а распаковываются лишь фрагменты видимого участка.
+
+Список классов и функций:
+-------------------------
+- write_archive(file_name, t, s, meta, chunk_size=ARCHIVE_CHUNK_SIZE)
+    Записывает сигнал (результат load_data) в архив.
+- ArchiveReader(file_name)
+    Чтение архива: заголовок, сводки фрагментов, диапазон отсчётов, статистика и обзор без распаковки всей записи.
+- ArchiveView(plot_data, reader, line, x_zoom=1000)
+    Связывает линию графика с архивом: при изменении пределов оси X выводит обзор или отсчёты видимого участка.
+- open_archive(main_window)
+    Открывает диалог выбора архива и добавляет запись на график.
+- save_csv_to_archive(main_window)
+    Открывает диалог выбора CSV-файла и сохраняет его в архив рядом с исходным файлом.
+'''
+
+import os
+import io
+import json
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from PyQt6.QtWidgets import QFileDialog
+
+from time_base import TimeBase, as_time_base
+from quantized import QuantizedSignal
+from load_and_prepare_data import (
+    load_data_cached,
+    select_csv_file,
+    add_signal_line,
+    is_compressed,
+    print_c,
+    _read_last_dir,
+    _save_last_dir,
+)
+
+# Расширение файлов архива
+ARCHIVE_EXTENSION = '.oscz'
+# Версия формата архива
+ARCHIVE_VERSION = 1
+# Количество отсчётов во фрагменте архива (определяет детальность обзора по сводкам)
+ARCHIVE_CHUNK_SIZE = 1 << 12
+# Максимальное количество отсчётов, выводимых на график без огибающей
+ARCHIVE_DETAIL_POINTS = 1 << 20
+# Максимальное количество точек огибающей при обзоре записи
+ARCHIVE_OVERVIEW_POINTS = 1 << 13
+# Количество распакованных фрагментов, хранимых в памяти читателя
+ARCHIVE_CACHE_CHUNKS = 64
+# Сводка фрагмента: минимум, максимум, среднее и RMS
+SUMMARY_DTYPE = np.dtype([('min', 'f8'), ('max', 'f8'), ('mean', 'f8'), ('rms', 'f8')])
+
+_HEADER_NAME = 'header.json'
+_SUMMARY_NAME = 'summary.npy'
+
+
+def _chunk_name(k):
+    return f'chunks/{k:08d}.npy'
+
+
+def _meta_dict(meta):
+    '''
+    Приводит метаинформацию (словарь или meta_df со столбцами "Key" и "Value") к словарю.
+    '''
+    if isinstance(meta, pd.DataFrame):
+        return dict(zip(meta['Key'], meta['Value']))
+    return dict(meta or {})
+
+
+def write_archive(file_name, t, s, meta, chunk_size=ARCHIVE_CHUNK_SIZE, compresslevel=6):
+    '''
+    Записывает сигнал в архив фрагментами по chunk_size отсчётов с вычислением сводки каждого фрагмента.
+    Запись выполняется во временный файл с последующей атомарной заменой.
+    Аргументы:
+        file_name (str): Путь к файлу архива.
+        t (TimeBase | array-like): Временная ось сигнала.
+        s (np.ndarray | QuantizedSignal): Отсчёты сигнала (квантованный сигнал хранится кодами АЦП).
+        meta (dict | pandas.DataFrame): Метаинформация (словарь или meta_df из load_data).
+        chunk_size (int): Количество отсчётов во фрагменте.
+        compresslevel (int): Степень сжатия zlib (0-9).
+    Возвращает:
+        int: Размер файла архива, байт.
+    '''
+    t = as_time_base(t)
+    quantization = None
+    values = s
+    if isinstance(s, QuantizedSignal):
+        quantization = [s.scale, s.offset]
+        values = s.codes
+    else:
+        values = np.asarray(s, dtype=np.float64)
+    n = len(values)
+    n_chunks = -(-n // chunk_size)
+    summary = np.zeros(n_chunks, dtype=SUMMARY_DTYPE)
+    tmp_name = file_name + '.tmp'
+    with zipfile.ZipFile(tmp_name, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        for k in range(n_chunks):
+            block = np.ascontiguousarray(values[k * chunk_size:(k + 1) * chunk_size])
+            with zf.open(_chunk_name(k), 'w') as f:
+                np.lib.format.write_array(f, block, allow_pickle=False)
+            v = block if quantization is None else block * quantization[0] + quantization[1]
+            summary[k] = (v.min(), v.max(), v.mean(), np.sqrt(np.dot(v, v) / len(v)))
+        buf = io.BytesIO()
+        np.lib.format.write_array(buf, summary, allow_pickle=False)
+        zf.writestr(_SUMMARY_NAME, buf.getvalue())
+        header = {
+            'version': ARCHIVE_VERSION,
+            'time_base': [t.t0, t.dt, n],
+            'chunk_size': chunk_size,
+            'dtype': values.dtype.str,
+            'quantization': quantization,
+            'meta': _meta_dict(meta),
+        }
+        zf.writestr(_HEADER_NAME, json.dumps(header, ensure_ascii=False, default=str))
+    os.replace(tmp_name, file_name)
+    return os.path.getsize(file_name)
+
+
+class ArchiveReader:
+    '''
+    Чтение архива записи (.oscz) с произвольным доступом.
+    Атрибуты:
+        time_base (TimeBase): Временная ось всей записи.
+        meta (dict): Метаинформация.
+        chunk_size (int): Количество отсчётов во фрагменте.
+        summary (np.ndarray): Сводки фрагментов (поля min, max, mean, rms).
+    Особенности:
+        - При открытии читаются только заголовок и сводки; фрагменты распаковываются по требованию
+          и сохраняются в кэше последних ARCHIVE_CACHE_CHUNKS фрагментов.
+        - Поддерживает контекстный менеджер (with ArchiveReader(...) as reader).
+    '''
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._zf = zipfile.ZipFile(file_name, 'r')
+        try:
+            header = json.loads(self._zf.read(_HEADER_NAME).decode('utf-8'))
+            if header.get('version') != ARCHIVE_VERSION:
+                raise ValueError(f'Неподдерживаемая версия архива: {header.get("version")}')
+            t0, dt, n = header['time_base']
+            self.time_base = TimeBase(t0, dt, n)
+            self.chunk_size = int(header['chunk_size'])
+            self.quantization = header['quantization']
+            self.meta = header['meta']
+            self.summary = np.load(io.BytesIO(self._zf.read(_SUMMARY_NAME)), allow_pickle=False)
+        except (KeyError, ValueError):
+            self._zf.close()
+            raise
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self.time_base)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        '''Закрывает файл архива.'''
+        self._zf.close()
+
+    @property
+    def n_chunks(self):
+        return len(self.summary)
+
+    @property
+    def meta_df(self):
+        '''Метаинформация в виде DataFrame со столбцами "Key" и "Value" (как meta_df из load_data).'''
+        return pd.DataFrame({'Key': list(self.meta.keys()), 'Value': list(self.meta.values())})
+
+    def read_chunk(self, k):
+        '''
+        Распаковывает фрагмент k архива.
+        Возвращает:
+            np.ndarray: Значения фрагмента, В (только для чтения, массив может быть общим с кэшем).
+        '''
+        v = self._cache.get(k)
+        if v is not None:
+            self._cache.move_to_end(k)
+            return v
+        with self._zf.open(_chunk_name(k)) as f:
+            v = np.lib.format.read_array(f, allow_pickle=False)
+        if self.quantization is not None:
+            scale, offset = self.quantization
+            v = v * scale + offset
+        v.setflags(write=False)
+        self._cache[k] = v
+        if len(self._cache) > ARCHIVE_CACHE_CHUNKS:
+            self._cache.popitem(last=False)
+        return v
+
+    def read(self, start=0, stop=None, step=1):
+        '''
+        Читает отсчёты s[start:stop:step], распаковывая только фрагменты, содержащие этот диапазон.
+        Аргументы:
+            start (int): Индекс первого отсчёта.
+            stop (int | None): Индекс отсчёта, следующего за последним (None — до конца записи).
+            step (int): Шаг прореживания.
+        Возвращает:
+            np.ndarray: Значения сигнала, В.
+        '''
+        start, stop, step = slice(start, stop, step).indices(len(self))
+        if stop <= start:
+            return np.empty(0)
+        out = np.empty(stop - start)
+        for k in range(start // self.chunk_size, (stop - 1) // self.chunk_size + 1):
+            a = k * self.chunk_size
+            v = self.read_chunk(k)
+            lo, hi = max(start, a), min(stop, a + len(v))
+            out[lo - start:hi - start] = v[lo - a:hi - a]
+        return out[::step] if step > 1 else out
+
+    def _chunk_range(self, start, stop):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        return start, stop, start // self.chunk_size, -(-stop // self.chunk_size)
+
+    def statistics(self, start=0, stop=None):
+        '''
+        Вычисляет статистику участка записи по сводкам фрагментов; распаковываются только неполные крайние фрагменты.
+        Аргументы:
+            start, stop (int | None): Границы участка (как в read).
+        Возвращает:
+            dict: Количество отсчётов "n", "min", "max", "mean", "rms" и "std" (как stream_statistics).
+        '''
+        start, stop, k0, k1 = self._chunk_range(start, stop)
+        n = 0
+        total = 0.0
+        total_sq = 0.0
+        s_min = np.inf
+        s_max = -np.inf
+        for k in range(k0, k1):
+            a = k * self.chunk_size
+            b = min(a + self.chunk_size, len(self))
+            if start <= a and b <= stop:
+                m = b - a
+                row = self.summary[k]
+                chunk_min, chunk_max = row['min'], row['max']
+                chunk_sum, chunk_sq = row['mean'] * m, row['rms'] ** 2 * m
+            else:
+                # Неполный фрагмент на краю участка
+                v = self.read_chunk(k)[max(start, a) - a:min(stop, b) - a]
+                m = len(v)
+                chunk_min, chunk_max = v.min(), v.max()
+                chunk_sum, chunk_sq = v.sum(), np.dot(v, v)
+            n += m
+            total += chunk_sum
+            total_sq += chunk_sq
+            s_min = min(s_min, chunk_min)
+            s_max = max(s_max, chunk_max)
+        if n == 0:
+            return {'n': 0, 'min': np.nan, 'max': np.nan, 'mean': np.nan, 'rms': np.nan, 'std': np.nan}
+        mean = total / n
+        rms = np.sqrt(total_sq / n)
+        return {
+            'n': n,
+            'min': float(s_min),
+            'max': float(s_max),
+            'mean': float(mean),
+            'rms': float(rms),
+            'std': float(np.sqrt(max(rms ** 2 - mean ** 2, 0.0))),
+        }
+
+    def overview(self, start=0, stop=None, max_points=ARCHIVE_OVERVIEW_POINTS):
+        '''
+        Формирует огибающую участка записи по сводкам фрагментов (без распаковки отсчётов).
+        Фрагменты объединяются в группы так, чтобы количество точек не превышало max_points;
+        для каждой группы выводятся минимум и максимум.
+        Аргументы:
+            start, stop (int | None): Границы участка (как в read).
+            max_points (int): Максимальное количество точек огибающей.
+        Возвращает:
+            x (np.ndarray): Моменты времени точек огибающей.
+            y (np.ndarray): Чередующиеся минимумы и максимумы групп фрагментов.
+        '''
+        start, stop, k0, k1 = self._chunk_range(start, stop)
+        if k1 <= k0:
+            return np.empty(0), np.empty(0)
+        group = max(1, -(-(k1 - k0) * 2 // max_points))
+        edges = np.arange(k0, k1, group)
+        y_min = np.minimum.reduceat(self.summary['min'][k0:k1], edges - k0)
+        y_max = np.maximum.reduceat(self.summary['max'][k0:k1], edges - k0)
+        # Минимум группы — в её начале, максимум — в середине
+        i_first = edges * self.chunk_size
+        i_mid = np.minimum(i_first + group * self.chunk_size // 2, len(self) - 1)
+        tb = self.time_base
+        x = np.empty(2 * len(edges))
+        x[0::2] = tb.t0 + i_first * tb.dt
+        x[1::2] = tb.t0 + i_mid * tb.dt
+        y = np.empty(2 * len(edges))
+        y[0::2] = y_min
+        y[1::2] = y_max
+        return x, y
+
+
+class ArchiveView:
+    '''
+    Связывает линию графика с архивом. При изменении пределов оси X (масштабирование, сдвиг) на линию выводятся
+    отсчёты видимого участка, если их не больше detail_points, иначе — огибающая по сводкам фрагментов.
+    Аргументы:
+        plot_data (PlotData): График, на котором расположена линия.
+        reader (ArchiveReader): Открытый архив.
+        line (Line2D): Линия графика.
+        x_zoom (float): Масштаб оси X (1000 — время в мс).
+        detail_points (int): Максимальное количество отсчётов, выводимых без огибающей.
+    '''
+
+    def __init__(self, plot_data, reader, line, x_zoom=1000, detail_points=ARCHIVE_DETAIL_POINTS):
+        self.plot_data = plot_data
+        self.reader = reader
+        self.line = line
+        self.x_zoom = x_zoom
+        self.detail_points = detail_points
+        self._range = None
+        self._updating = False
+        self._cid = plot_data.ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def disconnect(self):
+        '''Отключает обновление линии при изменении пределов оси X.'''
+        self.plot_data.ax.callbacks.disconnect(self._cid)
+
+    def on_xlim_changed(self, ax):
+        if self._updating:
+            return
+        if self.line not in ax.lines:
+            self.disconnect()
+            return
+        self.refresh()
+
+    def refresh(self):
+        '''
+        Выводит на линию отсчёты или огибающую участка записи, видимого в текущих пределах оси X.
+        '''
+        x_min, x_max = self.plot_data.ax.get_xlim()
+        tb = self.reader.time_base
+        i0, i1 = tb.index_range(x_min / self.x_zoom, x_max / self.x_zoom)
+        # Одна точка за пределами с каждой стороны, чтобы линия доходила до краёв графика
+        i0, i1 = max(0, i0 - 1), min(len(tb), i1 + 1)
+        detail = i1 - i0 <= self.detail_points
+        if self._range == (i0, i1, detail):
+            return
+        self._range = (i0, i1, detail)
+        if detail:
+            x, y = tb[i0:i1], self.reader.read(i0, i1)
+        else:
+            x, y = self.reader.overview(i0, i1)
+        self._updating = True
+        try:
+            self.plot_data.update_line(self.line, x, y, x_zoom=self.x_zoom, autoscale=False)
+        finally:
+            self._updating = False
+
+
+def open_archive(main_window):
+    '''
+    Открывает диалог выбора архива (.oscz) и добавляет запись на график main_window.plot_data_signal.
+    Сначала выводится огибающая всей записи по сводкам фрагментов; при увеличении масштаба
+    распаковываются только фрагменты видимого участка (ArchiveView).
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        ArchiveView | None: Представление архива на графике или None, если файл не выбран или не открыт.
+    '''
+    file_name, _ = QFileDialog.getOpenFileName(
+        main_window, "Выберите архив записи", _read_last_dir(), f"Архивы записей (*{ARCHIVE_EXTENSION});;All Files (*)"
+    )
+    if not file_name:
+        print_c('Файл не выбран.')
+        return None
+    _save_last_dir(os.path.dirname(file_name))
+    try:
+        reader = ArchiveReader(file_name)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print_c(f'Ошибка: {e}', color='red')
+        return None
+    stats = reader.statistics()
+    print_c(f'Архив {file_name}: {len(reader)} отсчётов, {reader.n_chunks} фрагментов, '
+            f'fs = {reader.time_base.fs / 1e6:.2f} МГц, RMS = {stats["rms"]:.4g} В')
+    x, y = reader.overview()
+    add_signal_line(main_window, file_name, x, y)
+    plot_data = main_window.plot_data_signal
+    view = ArchiveView(plot_data, reader, plot_data.get_all_lines()[-1])
+    # Пределы оси X — вся запись (огибающая заканчивается на середине последней группы фрагментов)
+    tb = reader.time_base
+    plot_data.ax.set_xlim(tb[0] * view.x_zoom, tb[-1] * view.x_zoom)
+    view.refresh()
+    # Храним ссылку на представление вместе с линией
+    view.line._osc_viewer_archive_view = view
+    return view
+
+
+def save_csv_to_archive(main_window):
+    '''
+    Открывает диалог выбора CSV-файла (select_csv_file), загружает его (load_data_cached, с хранением кодами АЦП,
+    если это возможно без потери точности) и сохраняет в архив с тем же именем и расширением ARCHIVE_EXTENSION.
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        str | None: Путь к файлу архива или None, если файл не выбран или не сохранён.
+    '''
+    file_name = select_csv_file(main_window)
+    if not file_name:
+        return None
+    try:
+        t, s, meta_df = load_data_cached(file_name, main_window.format_ver, quantized=True)
+        base = os.path.splitext(file_name)[0] if is_compressed(file_name) else file_name
+        archive_name = os.path.splitext(base)[0] + ARCHIVE_EXTENSION
+        size = write_archive(archive_name, t, s, meta_df)
+    except (OSError, ValueError) as e:
+        print_c(f'Ошибка: {e}', color='red')
+        return None
+    print_c(f'Архив сохранён: {archive_name} ({size} байт, исходный файл {os.path.getsize(file_name)} байт)',
+            color='green')
+    return archive_name
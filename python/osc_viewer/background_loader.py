@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+'''
+background_loader.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.5
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует фоновую загрузку CSV-файлов с сигналами в отдельном потоке (QThread), чтобы окно приложения не "зависало"
+на время разбора файла. Ход загрузки отображается в окне QProgressDialog с кнопкой "Отмена".
+Пока файл читается блоками (iter_data_blocks), на график выводится грубый предварительный просмотр по уже прочитанным
+отсчётам, который уточняется по мере загрузки и заменяется полным сигналом после её завершения.
+Большой несжатый файл (не меньше PARALLEL_MIN_BYTES) разбирается фрагментами в пуле процессов на всех ядрах
+(read_capture_parallel) — без предварительного просмотра, но во много раз быстрее разбора в одном потоке.
+
+Список классов и функций:
+-------------------------
+- estimate_row_count(file_name, sample_bytes=1 << 16)
+    Оценивает количество строк файла по размеру файла и средней длине строки в его начале (с учётом степени сжатия).
+- CsvLoadWorker(file_name, format_ver, inx_start=0, inx_stop=None, downsampling_factor=1, ..., max_workers=None)
+    Объект-исполнитель загрузки (выполняется в отдельном потоке), сообщает о ходе загрузки сигналами Qt.
+- CsvLoadController(main_window, file_name, format_ver, inx_start, inx_stop, downsampling_factor)
+    Управляет потоком загрузки, окном хода загрузки и линией сигнала на графике (в потоке GUI).
+- start_background_load(main_window, file_name, format_ver=1, inx_start=0, inx_stop=None, downsampling_factor=1)
+    Запускает фоновую загрузку файла и возвращает её контроллер.
+- open_csv_file_background(main_window)
+    Открывает диалог выбора CSV-файла и загружает выбранный файл в фоновом режиме.
+'''
+
+import os
+import time
+import contextlib
+
+import numpy as np
+
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from PyQt6.QtWidgets import QProgressDialog
+
+from time_base import TimeBase
+from data_cache import load_cache, save_cache
+from pcm_data import is_pcm_file, read_pcm
+from quick_preview import select_region
+from load_and_prepare_data import (
+    iter_data_blocks,
+    read_capture_parallel,
+    is_compressed,
+    PARALLEL_MIN_BYTES,
+    COMPRESSED_OPENERS,
+    meta_to_dataframe,
+    select_csv_file,
+    add_signal_line,
+    print_c,
+)
+
+# Количество строк файла в одном блоке фоновой загрузки (определяет частоту обновления хода загрузки)
+LOAD_BLOCK_ROWS = 1 << 16
+# Количество точек грубого предварительного просмотра
+PREVIEW_POINTS = 20_000
+# Минимальный интервал между обновлениями предварительного просмотра, с
+PREVIEW_INTERVAL_S = 0.25
+
+
+def estimate_row_count(file_name, sample_bytes=1 << 16):
+    '''
+    Оценивает количество строк файла по его размеру и средней длине строки в первых sample_bytes байтах.
+    Для сжатого файла (.gz, .bz2, .xz) размер распакованных данных оценивается по степени сжатия начального фрагмента.
+    Аргументы:
+        file_name (str): Путь к файлу.
+        sample_bytes (int): Размер начального фрагмента (распакованных данных) для оценки средней длины строки.
+    Возвращает:
+        int: Оценка количества строк (не меньше 1).
+    '''
+    size = os.path.getsize(file_name)
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(file_name)[1].lower())
+    with open(file_name, "rb") as f:
+        if opener is None:
+            head = f.read(sample_bytes)
+        else:
+            with opener(f, "rb") as z:
+                head = z.read(sample_bytes)
+                # Степень сжатия: распакованные байты на прочитанный сжатый байт
+                packed = f.tell()
+                if packed and len(head) == sample_bytes:
+                    size = size * len(head) / packed
+                else:
+                    size = len(head)  # Файл распакован целиком
+    n_lines = head.count(b"\n")
+    if n_lines == 0:
+        return 1
+    return max(1, int(size * n_lines / len(head)))
+
+
+class CsvLoadWorker(QObject):
+    '''
+    Объект-исполнитель загрузки CSV-файла. Метод run() выполняется в отдельном потоке (QThread)
+    и не обращается к виджетам: результаты передаются в поток GUI сигналами Qt.
+    Сигналы:
+        progress(int): Ход загрузки, %.
+        preview(object, object): Грубый предварительный просмотр (TimeBase, отсчёты) по уже прочитанной части файла.
+        loaded(object, object, object): Результат загрузки (TimeBase, отсчёты, словарь метаинформации).
+        failed(str): Текст ошибки загрузки.
+        canceled(): Загрузка отменена.
+        finished(): Работа исполнителя завершена (в любом случае).
+    Особенности:
+        - При наличии кэша (data_cache) данные отображаются в память без разбора текста.
+        - Файл WAV/PCM отображается в память сразу (read_pcm), без кэша и разбора.
+        - Большой несжатый файл разбирается параллельно (read_capture_parallel, max_workers процессов),
+          остальные файлы читаются блоками (iter_data_blocks); после загрузки отсчёты сохраняются в кэш.
+        - Если задан диапазон отсчётов или прореживание, файл всё равно разбирается и кэшируется целиком
+          (без предварительного просмотра), а результатом загрузки становится срез без копирования.
+    '''
+
+    progress = pyqtSignal(int)
+    preview = pyqtSignal(object, object)
+    loaded = pyqtSignal(object, object, object)
+    failed = pyqtSignal(str)
+    canceled = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(
+        self,
+        file_name,
+        format_ver,
+        inx_start=0,
+        inx_stop=None,
+        downsampling_factor=1,
+        block_size=LOAD_BLOCK_ROWS,
+        preview_points=PREVIEW_POINTS,
+        preview_interval=PREVIEW_INTERVAL_S,
+        max_workers=None,
+    ):
+        super().__init__()
+        self.file_name = file_name
+        self.format_ver = format_ver
+        self.inx_start = inx_start
+        self.inx_stop = inx_stop
+        self.downsampling_factor = max(1, int(downsampling_factor or 1))
+        self.block_size = block_size
+        self.preview_points = preview_points
+        self.preview_interval = preview_interval
+        self.max_workers = max_workers
+        self._cancel_requested = False
+
+    def cancel(self):
+        '''Запрашивает отмену загрузки (проверяется между блоками).'''
+        self._cancel_requested = True
+
+    def run(self):
+        '''Выполняет загрузку и сообщает о результате сигналами loaded, failed или canceled.'''
+        try:
+            result = self._load()
+            if result is None:
+                self.canceled.emit()
+            else:
+                self.loaded.emit(*result)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    def _load(self):
+        ds = self.downsampling_factor
+        full_range = not self.inx_start and self.inx_stop is None and ds == 1
+        if self._cancel_requested:
+            return None
+
+        # Файл WAV/PCM отображается в память без разбора — загрузка в потоке не требуется
+        cached = read_pcm(self.file_name) if is_pcm_file(self.file_name) else load_cache(self.file_name, self.format_ver)
+        if cached is not None:
+            t, s, meta = cached
+            if not full_range:
+                t = t[self.inx_start:self.inx_stop:ds]
+                s = s[self.inx_start:self.inx_stop:ds]
+            self.progress.emit(100)
+            return t, s, meta
+
+        if self.max_workers != 1 and not is_compressed(self.file_name) \
+                and os.path.getsize(self.file_name) >= PARALLEL_MIN_BYTES:
+            result = self._load_parallel()
+        else:
+            result = self._load_blocks(preview=full_range)
+        if result is None or full_range:
+            return result
+        # Кэш записан для всего файла, на график выводится только диапазон — срез без копирования
+        t, s, meta = result
+        return t[self.inx_start:self.inx_stop:ds], s[self.inx_start:self.inx_stop:ds], meta
+
+    def _load_parallel(self):
+        '''Разбирает большой файл фрагментами в пуле процессов (отмена проверяется после разбора).'''
+        t, s, meta = read_capture_parallel(self.file_name, self.format_ver, self.max_workers)
+        if self._cancel_requested:
+            return None
+        save_cache(self.file_name, self.format_ver, t, s, meta)
+        self.progress.emit(100)
+        return t, s, meta
+
+    def _load_blocks(self, preview=True):
+        '''
+        Читает файл блоками, периодически отправляя прогресс и прореженный предварительный просмотр
+        (preview=False — только прогресс: просмотр всего файла не нужен, если загружается диапазон).
+        '''
+        est_rows = estimate_row_count(self.file_name)
+        # Шаг прореживания предварительного просмотра по оценке полного количества отсчётов
+        stride = max(1, est_rows // self.preview_points)
+        s_blocks = []
+        preview_blocks = []
+        n = 0
+        t0 = 0.0
+        dt = 0.0
+        meta = {'fs': 0.0}
+        last_preview = None
+        for t_block, s_block, meta in iter_data_blocks(self.file_name, self.format_ver, self.block_size):
+            if self._cancel_requested:
+                return None
+            if n == 0:
+                t0 = t_block.t0
+            dt = t_block.dt
+            # Отсчёты с глобальными номерами, кратными stride
+            preview_blocks.append(s_block[(-n) % stride::stride])
+            s_blocks.append(s_block)
+            n += len(s_block)
+            self.progress.emit(min(99, int(100 * n / est_rows)))
+            now = time.monotonic()
+            if preview and (last_preview is None or now - last_preview >= self.preview_interval):
+                s_preview = np.concatenate(preview_blocks)
+                self.preview.emit(TimeBase(t0, dt * stride, len(s_preview)), s_preview)
+                last_preview = now
+
+        if self._cancel_requested:
+            return None
+        s = np.concatenate(s_blocks) if s_blocks else np.empty(0)
+        t = TimeBase(t0, dt, len(s))
+        save_cache(self.file_name, self.format_ver, t, s, meta)
+        self.progress.emit(100)
+        return t, s, meta
+
+
+class CsvLoadController(QObject):
+    '''
+    Управляет фоновой загрузкой одного файла в потоке GUI: запускает CsvLoadWorker в отдельном потоке,
+    показывает окно хода загрузки с кнопкой "Отмена", добавляет линию сигнала на график по первому
+    предварительному просмотру и обновляет её по мере загрузки (PlotData.update_line).
+    Атрибуты:
+        main_window: Главное окно приложения.
+        file_name (str): Путь к загружаемому файлу.
+        line (Line2D | None): Линия сигнала на графике (None, пока ничего не отображено).
+        thread (QThread): Поток загрузки.
+        worker (CsvLoadWorker): Объект-исполнитель загрузки.
+        dialog (QProgressDialog | None): Окно хода загрузки.
+    '''
+
+    def __init__(self, main_window, file_name, format_ver=1, inx_start=0, inx_stop=None, downsampling_factor=1,
+                 show_progress=True, **worker_kwargs):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.file_name = file_name
+        self.line = None
+
+        self.thread = QThread(self)
+        self.worker = CsvLoadWorker(file_name, format_ver, inx_start, inx_stop, downsampling_factor, **worker_kwargs)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.preview.connect(self.on_preview)
+        self.worker.loaded.connect(self.on_loaded)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.canceled.connect(self.on_canceled)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self.on_thread_finished)
+
+        self.dialog = None
+        if show_progress:
+            self.dialog = QProgressDialog(
+                f"Загрузка файла: {os.path.basename(file_name)}", "Отмена", 0, 100, main_window
+            )
+            self.dialog.setWindowTitle("Загрузка")
+            self.dialog.setMinimumDuration(500)  # Окно появляется, только если загрузка заметно долгая
+            self.dialog.setAutoClose(False)
+            self.dialog.setAutoReset(False)
+            self.dialog.canceled.connect(self.cancel)
+            self.worker.progress.connect(self.dialog.setValue)
+
+    def start(self):
+        '''Запускает поток загрузки.'''
+        self.thread.start()
+
+    def cancel(self):
+        '''Запрашивает отмену загрузки.'''
+        self.worker.cancel()
+
+    def wait(self, msecs=None):
+        '''Ожидает завершения потока загрузки (например, при закрытии окна).'''
+        if msecs is None:
+            return self.thread.wait()
+        return self.thread.wait(msecs)
+
+    def _messages(self):
+        # Сообщения выводятся во вкладку "Сообщения", если окно это поддерживает
+        if hasattr(self.main_window, 'redirect_stdout_to_textedit'):
+            return self.main_window.redirect_stdout_to_textedit()
+        return contextlib.nullcontext()
+
+    def _show(self, t, s):
+        plot_data = self.main_window.plot_data_signal
+        if self.line is None:
+            add_signal_line(self.main_window, self.file_name, t, s)
+            self.line = plot_data.get_active_line()
+        else:
+            plot_data.update_line(self.line, t, s, x_zoom=1000)
+
+    def _remove_line(self):
+        plot_data = self.main_window.plot_data_signal
+        if self.line is not None and self.line in plot_data.get_all_lines():
+            plot_data.remove_line(plot_data.get_all_lines().index(self.line))
+        self.line = None
+
+    def on_preview(self, t, s):
+        '''Отображает (или уточняет) грубый предварительный просмотр сигнала.'''
+        self._show(t, s)
+
+    def on_loaded(self, t, s, meta):
+        '''Заменяет предварительный просмотр полным сигналом.'''
+        with self._messages():
+            print_c(f'Загрузка файла: {self.file_name}', color='blue')
+            meta_to_dataframe(meta)
+            print_c(f'Сигнал загружен. Количество точек: {len(s)}\n')
+            self._show(t, s)
+            print_c('График построен', color='green')
+
+    def on_failed(self, message):
+        '''Удаляет предварительный просмотр и сообщает об ошибке.'''
+        self._remove_line()
+        with self._messages():
+            print_c(f"Ошибка: {message}", color='red')
+
+    def on_canceled(self):
+        '''Удаляет предварительный просмотр после отмены загрузки.'''
+        self._remove_line()
+        with self._messages():
+            print_c(f'Загрузка отменена: {self.file_name}', color='orange')
+
+    def on_thread_finished(self):
+        '''Закрывает окно хода загрузки и освобождает контроллер.'''
+        if self.dialog is not None:
+            self.dialog.close()
+        loaders = getattr(self.main_window, '_osc_viewer_loaders', None)
+        if loaders is not None and self in loaders:
+            loaders.remove(self)
+        self.deleteLater()
+
+
+def start_background_load(main_window, file_name, format_ver=1, inx_start=0, inx_stop=None, downsampling_factor=1,
+                          **kwargs):
+    '''
+    Запускает фоновую загрузку файла. Контроллер сохраняется в main_window._osc_viewer_loaders до завершения загрузки.
+    Аргументы:
+        main_window: Главное окно приложения.
+        file_name (str): Путь к CSV-файлу.
+        format_ver, inx_start, inx_stop, downsampling_factor: Параметры загрузки (см. load_data_cached).
+        **kwargs: Дополнительные параметры CsvLoadController (show_progress) и CsvLoadWorker (block_size, ...).
+    Возвращает:
+        CsvLoadController: Контроллер загрузки.
+    '''
+    controller = CsvLoadController(main_window, file_name, format_ver, inx_start, inx_stop, downsampling_factor, **kwargs)
+    if not hasattr(main_window, '_osc_viewer_loaders'):
+        main_window._osc_viewer_loaders = []
+    main_window._osc_viewer_loaders.append(controller)
+    controller.start()
+    return controller
+
+
+def open_csv_file_background(main_window):
+    '''
+    Открывает диалог выбора CSV-файла (select_csv_file) и загружает выбранный файл в фоновом режиме
+    с учётом параметров отображения главного окна. Для большого файла сначала показывается предварительный
+    просмотр с выбором участка (select_region).
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        CsvLoadController | None: Контроллер загрузки или None, если файл не выбран.
+    '''
+    file_name = select_csv_file(main_window)
+    if not file_name or not select_region(main_window, file_name):
+        return None
+    return start_background_load(
+        main_window,
+        file_name,
+        main_window.format_ver,
+        main_window.inx_start,
+        main_window.inx_stop,
+        main_window.downsampling_factor,
+    )
@@ -0,0 +1,395 @@
+# -*- coding: utf-8 -*-
+'''
+catalog.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует каталог библиотеки записей осциллографа в базе SQLite.
+Сканер обходит папку со всеми вложенными папками и для каждого CSV-файла читает только метаинформацию
+(read_header_meta): частоту дискретизации, количество отсчётов, длительность, источник и модель осциллографа.
+Вместе с ними сохраняется ключ файла (размер и время изменения), поэтому при повторном сканировании
+перечитываются только новые и изменённые файлы. Поиск записей (например, с заданными "Sample Interval",
+"Record Length" или "Model Number") выполняется запросом к каталогу без обращения к отсчётам сигналов.
+
+Запуск из командной строки:
+    python catalog.py scan ПАПКА [--db КАТАЛОГ]
+    python catalog.py query ПАПКА [--db КАТАЛОГ] [--model МОДЕЛЬ] [--source КАНАЛ] [--fs ГЦ] [--sample-interval С]
+                                  [--samples N] [--min-duration С] [--max-duration С]
+
+Список классов и функций:
+-------------------------
+- default_catalog_path(folder)
+    Возвращает путь к файлу каталога в корне папки с записями.
+- connect_catalog(db_path)
+    Открывает (создаёт) базу каталога.
+- scan_folder(db_path, folder, prune=True)
+    Добавляет в каталог новые и изменённые записи папки, удаляет записи отсутствующих файлов.
+- query_catalog(db_path, model=None, source=None, fs=None, n_samples=None, min_duration=None, max_duration=None)
+    Возвращает записи каталога, удовлетворяющие условиям.
+- main(argv=None)
+    Точка входа командной строки (сканирование и поиск).
+- CatalogDialog(main_window, folder, db_path=None)
+    Окно поиска записей по каталогу и открытия выбранных файлов.
+- open_catalog_dialog(main_window)
+    Открывает диалог выбора папки, обновляет её каталог и показывает окно поиска.
+'''
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLineEdit, QPushButton, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QLabel, QFileDialog,
+)
+
+from load_and_prepare_data import read_header_meta, find_csv_files, print_c, _read_last_dir, _save_last_dir
+from background_loader import start_background_load
+
+# Имя файла каталога, создаваемого в корне папки с записями
+CATALOG_FILE_NAME = 'osc_catalog.sqlite'
+# Относительная погрешность сравнения частоты дискретизации при поиске
+FS_RELATIVE_TOLERANCE = 1e-6
+# Столбцы каталога, выводимые в результатах поиска (имя, заголовок)
+CATALOG_COLUMNS = (
+    ('path', 'Файл'),
+    ('fs', 'fs, Гц'),
+    ('n_samples', 'Отсчётов'),
+    ('duration', 'Длительность, с'),
+    ('source', 'Источник'),
+    ('model', 'Модель'),
+)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS captures (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    format_ver INTEGER NOT NULL,
+    fs REAL,
+    n_samples INTEGER,
+    duration REAL,
+    t0 REAL,
+    source TEXT,
+    model TEXT,
+    meta TEXT
+);
+CREATE INDEX IF NOT EXISTS captures_model ON captures (model);
+CREATE INDEX IF NOT EXISTS captures_fs ON captures (fs);
+'''
+
+
+def default_catalog_path(folder):
+    '''
+    Возвращает путь к файлу каталога в корне папки с записями.
+    Аргументы:
+        folder (str): Путь к папке с записями.
+    Возвращает:
+        str: Путь к файлу каталога (CATALOG_FILE_NAME).
+    '''
+    return os.path.join(folder, CATALOG_FILE_NAME)
+
+
+def connect_catalog(db_path):
+    '''
+    Открывает базу каталога и создаёт таблицу записей, если её ещё нет.
+    Аргументы:
+        db_path (str): Путь к файлу базы SQLite.
+    Возвращает:
+        sqlite3.Connection: Соединение с базой (строки возвращаются как sqlite3.Row).
+    '''
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def scan_folder(db_path, folder, prune=True):
+    '''
+    Сканирует папку со всеми вложенными папками и обновляет каталог.
+    Для каждого CSV-файла читается только метаинформация (read_header_meta); файлы, размер и время изменения
+    которых совпадают с сохранёнными в каталоге, не открываются.
+    Аргументы:
+        db_path (str): Путь к файлу базы каталога.
+        folder (str): Путь к папке с записями.
+        prune (bool): Удалять из каталога записи файлов этой папки, которых больше нет на диске.
+    Возвращает:
+        dict: Количество добавленных ("added"), обновлённых ("updated"), неизменных ("unchanged"),
+        удалённых ("removed") записей и файлов, которые не удалось прочитать ("failed").
+    '''
+    counts = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+    root = os.path.abspath(folder)
+    file_names = [os.path.abspath(f) for f in find_csv_files(root)]
+    with connect_catalog(db_path) as conn:
+        known = {row['path']: (row['size'], row['mtime_ns'])
+                 for row in conn.execute('SELECT path, size, mtime_ns FROM captures')}
+        for file_name in file_names:
+            st = os.stat(file_name)
+            key = known.get(file_name)
+            if key == (st.st_size, st.st_mtime_ns):
+                counts['unchanged'] += 1
+                continue
+            try:
+                info = read_header_meta(file_name)
+            except (OSError, ValueError, EOFError, UnicodeDecodeError) as e:
+                print_c(f'Не удалось прочитать метаинформацию {file_name}: {e}', color='red')
+                counts['failed'] += 1
+                continue
+            conn.execute(
+                'INSERT OR REPLACE INTO captures VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (file_name, st.st_size, st.st_mtime_ns, info['format_ver'], info['fs'], info['n_samples'],
+                 info['duration'], info['t0'], info['source'], info['model'],
+                 json.dumps(info['meta'], ensure_ascii=False)),
+            )
+            counts['updated' if key is not None else 'added'] += 1
+        if prune:
+            present = set(file_names)
+            prefix = os.path.join(root, '')
+            for path in known:
+                if path.startswith(prefix) and path not in present:
+                    conn.execute('DELETE FROM captures WHERE path = ?', (path,))
+                    counts['removed'] += 1
+    conn.close()
+    return counts
+
+
+def query_catalog(db_path, model=None, source=None, fs=None, n_samples=None, min_duration=None, max_duration=None):
+    '''
+    Возвращает записи каталога, удовлетворяющие всем заданным условиям (условия со значением None не учитываются).
+    Аргументы:
+        db_path (str): Путь к файлу базы каталога.
+        model (str | None): Модель осциллографа ("Model Number"), без учёта регистра.
+        source (str | None): Фрагмент имени источника (канала), без учёта регистра.
+        fs (float | None): Частота дискретизации, Гц (с относительной погрешностью FS_RELATIVE_TOLERANCE).
+        n_samples (int | None): Количество отсчётов ("Record Length").
+        min_duration, max_duration (float | None): Границы длительности записи, с.
+    Возвращает:
+        list of dict: Записи каталога (path, format_ver, fs, n_samples, duration, t0, source, model, meta),
+        упорядоченные по пути к файлу.
+    '''
+    where = []
+    params = []
+    if model:
+        where.append('model = ? COLLATE NOCASE')
+        params.append(model)
+    if source:
+        where.append("source LIKE ? ESCAPE '\\'")
+        params.append('%' + source.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%')
+    if fs is not None:
+        where.append('fs BETWEEN ? AND ?')
+        params += [fs * (1 - FS_RELATIVE_TOLERANCE), fs * (1 + FS_RELATIVE_TOLERANCE)]
+    if n_samples is not None:
+        where.append('n_samples = ?')
+        params.append(int(n_samples))
+    if min_duration is not None:
+        where.append('duration >= ?')
+        params.append(min_duration)
+    if max_duration is not None:
+        where.append('duration <= ?')
+        params.append(max_duration)
+    sql = 'SELECT * FROM captures'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(where)
+    sql += ' ORDER BY path'
+    conn = connect_catalog(db_path)
+    try:
+        rows = [dict(row) for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+    for row in rows:
+        row['meta'] = json.loads(row['meta']) if row['meta'] else {}
+    return rows
+
+
+def _format_value(name, value):
+    if value is None:
+        return ''
+    if name in ('fs', 'duration'):
+        return f'{value:.6g}'
+    return str(value)
+
+
+def main(argv=None):
+    '''
+    Точка входа командной строки: сканирование папки (scan) и поиск записей в каталоге (query).
+    Аргументы:
+        argv (list | None): Аргументы командной строки (None — sys.argv[1:]).
+    Возвращает:
+        int: Код завершения (0 — успешно).
+    '''
+    parser = argparse.ArgumentParser(description='Каталог записей осциллографа (SQLite)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    scan_parser = commands.add_parser('scan', help='добавить в каталог новые и изменённые записи папки')
+    query_parser = commands.add_parser('query', help='найти записи в каталоге')
+    for p in (scan_parser, query_parser):
+        p.add_argument('folder', help='папка с записями')
+        p.add_argument('--db', help=f'файл каталога (по умолчанию ПАПКА/{CATALOG_FILE_NAME})')
+    query_parser.add_argument('--model', help='модель осциллографа (Model Number)')
+    query_parser.add_argument('--source', help='источник (канал)')
+    query_parser.add_argument('--fs', type=float, help='частота дискретизации, Гц')
+    query_parser.add_argument('--sample-interval', type=float, help='период дискретизации (Sample Interval), с')
+    query_parser.add_argument('--samples', type=int, help='количество отсчётов (Record Length)')
+    query_parser.add_argument('--min-duration', type=float, help='минимальная длительность записи, с')
+    query_parser.add_argument('--max-duration', type=float, help='максимальная длительность записи, с')
+    args = parser.parse_args(argv)
+
+    db_path = args.db or default_catalog_path(args.folder)
+    if args.command == 'scan':
+        counts = scan_folder(db_path, args.folder)
+        print(f"Каталог {db_path}: добавлено {counts['added']}, обновлено {counts['updated']}, "
+              f"без изменений {counts['unchanged']}, удалено {counts['removed']}, ошибок {counts['failed']}")
+        return 0
+
+    fs = args.fs
+    if args.sample_interval:
+        fs = 1 / args.sample_interval
+    rows = query_catalog(db_path, model=args.model, source=args.source, fs=fs, n_samples=args.samples,
+                         min_duration=args.min_duration, max_duration=args.max_duration)
+    for row in rows:
+        print('\t'.join(_format_value(name, row[name]) for name, _ in CATALOG_COLUMNS))
+    print(f'Найдено записей: {len(rows)}')
+    return 0
+
+
+class CatalogDialog(QDialog):
+    '''
+    Окно поиска записей по каталогу папки: условия отбора (модель, источник, частота дискретизации,
+    количество отсчётов), таблица найденных записей и кнопка открытия выбранных файлов.
+    Поиск выполняется запросом к каталогу, файлы записей открываются только при загрузке выбранных.
+    Аргументы:
+        main_window: Главное окно приложения.
+        folder (str): Папка с записями.
+        db_path (str | None): Файл каталога (None — в корне папки).
+    '''
+
+    def __init__(self, main_window, folder, db_path=None):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.folder = folder
+        self.db_path = db_path or default_catalog_path(folder)
+        self.rows = []
+        self.setWindowTitle(f'Каталог записей: {folder}')
+        self.resize(900, 500)
+
+        self.model_edit = QLineEdit()
+        self.source_edit = QLineEdit()
+        self.fs_edit = QLineEdit()
+        self.samples_edit = QLineEdit()
+        form = QFormLayout()
+        form.addRow('Модель:', self.model_edit)
+        form.addRow('Источник:', self.source_edit)
+        form.addRow('fs, Гц:', self.fs_edit)
+        form.addRow('Отсчётов:', self.samples_edit)
+        for edit in (self.model_edit, self.source_edit, self.fs_edit, self.samples_edit):
+            edit.returnPressed.connect(self.refresh)
+
+        self.table = QTableWidget(0, len(CATALOG_COLUMNS))
+        self.table.setHorizontalHeaderLabels([title for _, title in CATALOG_COLUMNS])
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.itemDoubleClicked.connect(lambda _: self.open_selected())
+        self.status_label = QLabel()
+
+        search_button = QPushButton('Найти')
+        search_button.clicked.connect(self.refresh)
+        rescan_button = QPushButton('Обновить каталог')
+        rescan_button.clicked.connect(self.rescan)
+        open_button = QPushButton('Открыть')
+        open_button.clicked.connect(self.open_selected)
+        buttons = QHBoxLayout()
+        buttons.addWidget(search_button)
+        buttons.addWidget(rescan_button)
+        buttons.addStretch()
+        buttons.addWidget(open_button)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(form)
+        layout.addWidget(self.table)
+        layout.addWidget(self.status_label)
+        layout.addLayout(buttons)
+        self.refresh()
+
+    def _number(self, edit, cast):
+        text = edit.text().strip().replace(',', '.')
+        try:
+            return cast(float(text)) if text else None
+        except ValueError:
+            return None
+
+    def refresh(self):
+        '''
+        Выполняет поиск по условиям отбора и заполняет таблицу найденными записями.
+        '''
+        self.rows = query_catalog(
+            self.db_path,
+            model=self.model_edit.text().strip() or None,
+            source=self.source_edit.text().strip() or None,
+            fs=self._number(self.fs_edit, float),
+            n_samples=self._number(self.samples_edit, int),
+        )
+        self.table.setRowCount(len(self.rows))
+        for i, row in enumerate(self.rows):
+            for j, (name, _) in enumerate(CATALOG_COLUMNS):
+                value = os.path.relpath(row[name], self.folder) if name == 'path' else row[name]
+                self.table.setItem(i, j, QTableWidgetItem(_format_value(name, value)))
+        self.table.resizeColumnsToContents()
+        self.status_label.setText(f'Найдено записей: {len(self.rows)}')
+
+    def rescan(self):
+        '''
+        Обновляет каталог папки (перечитываются только новые и изменённые файлы) и повторяет поиск.
+        '''
+        counts = scan_folder(self.db_path, self.folder)
+        print_c(f"Каталог обновлён: добавлено {counts['added']}, обновлено {counts['updated']}, "
+                f"удалено {counts['removed']}")
+        self.refresh()
+
+    def selected_rows(self):
+        '''
+        Возвращает записи каталога, выбранные в таблице.
+        '''
+        indexes = sorted({index.row() for index in self.table.selectedIndexes()})
+        return [self.rows[i] for i in indexes]
+
+    def open_selected(self):
+        '''
+        Загружает выбранные записи в фоновом режиме и добавляет их на график главного окна.
+        '''
+        for row in self.selected_rows():
+            start_background_load(self.main_window, row['path'], row['format_ver'])
+
+
+def open_catalog_dialog(main_window):
+    '''
+    Открывает диалог выбора папки с записями, обновляет её каталог (scan_folder) и показывает окно поиска.
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        CatalogDialog | None: Окно поиска или None, если папка не выбрана.
+    '''
+    folder = QFileDialog.getExistingDirectory(main_window, "Выберите папку с записями", _read_last_dir())
+    if not folder:
+        print_c('Папка не выбрана.')
+        return None
+    _save_last_dir(folder)
+    counts = scan_folder(default_catalog_path(folder), folder)
+    print_c(f"Каталог {default_catalog_path(folder)}: добавлено {counts['added']}, обновлено {counts['updated']}, "
+            f"без изменений {counts['unchanged']}, удалено {counts['removed']}, ошибок {counts['failed']}")
+    dialog = CatalogDialog(main_window, folder)
+    # Храним ссылку на окно, чтобы оно не было удалено сборщиком мусора
+    main_window._osc_viewer_catalog_dialog = dialog
+    dialog.show()
+    return dialog
+
+
+if __name__ == '__main__':
+    sys.exit(main())
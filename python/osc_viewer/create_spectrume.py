@@ -3,8 +3,8 @@
 create_spectrume.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-25
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.8
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -16,13 +16,25 @@ create_spectrume.py
 
 Список функций:
 ---------------
-- fft_signal(s: np.ndarray, t: np.ndarray)
+- fft_signal(s: np.ndarray, t, nfft=None, resolution=None, precision='double')
+    Вычисляет односторонний спектр сигнала по отсчётам и временной оси (TimeBase или массиву временных отсчётов).
 - create_spectrume(main_window, line=None)
     Проверяет, был ли уже построен спектр для данной линии, и если нет — вычисляет спектр и возвращает массивы частот и амплитуд.
 - set_spectrum_db_mode(main_window, db_mode: bool)
     Устанавливает режим отображения спектра: в децибелах (дБ) или в вольтах (В), и перерисовывает активный спектр.
-- add_spectrume(main_window, line, params)
-    Создает и отображает спектр выбранной линии на отдельной вкладке, с учетом выбранного режима отображения (дБ/В).
+- create_welch_spectrum(main_window, line, welch)
+    Вычисляет спектр линии методом Уэлча (усреднение периодограмм сегментов) с ограниченным расходом памяти.
+- add_spectrume(main_window, line, params, welch=None)
+    Создает и отображает спектр выбранной линии на отдельной вкладке, с учетом выбранного режима отображения (дБ/В);
+    при заданных параметрах welch — спектр Уэлча вместо спектра одного БПФ.
+- batch_spectra(signals, downsampling_factor=10, nfft=2**20, precision='double')
+    Вычисляет спектры нескольких сигналов одним пакетным БПФ (сигналы с одинаковой частотой дискретизации
+    собираются в один двумерный массив общей длины).
+- add_spectra(main_window, lines=None)
+    Строит спектры всех (или указанных) линий графика сигнала одним пакетным БПФ и добавляет их на вкладку спектра.
+Построенные спектры (амплитуды в режиме отображения) сохраняются в дисковый кэш (spectrum_cache) по ключу из хэша
+отсчётов сигнала и параметров обработки; повторное построение спектра той же линии читает его из кэша.
+В линии спектра сохраняется модель спектра (spectrum_model.SpectrumModel) с кэшированными представлениями В/дБ.
 '''
 
 '''
@@ -42,47 +54,56 @@ import numpy as np
 
 # Импорт функции для подготовки данных (например, интерполяция, фильтрация)
 from load_and_prepare_data import prepare_data  # Функция для подготовки данных
-
-def fft_signal(s: np.ndarray, t: np.ndarray):
+# Равномерная временная ось (t0, dt, n) без массива отсчётов времени
+from time_base import as_time_base
+# БПФ действительного сигнала: односторонний спектр, быстрые длины, одинарная точность, многопоточность
+from spectrum_engine import PRECISIONS, rfft_spectrum
+# Этапы предобработки, записывающие результат в заданный буфер (строку двумерного массива)
+from preprocess import Decimate, Detrend, Pipeline, PadTruncate
+# Дисковый кэш спектров по хэшу отсчётов и параметрам обработки
+from spectrum_cache import spectrum_key, load_spectrum, save_spectrum
+# Модель спектра с кэшированными представлениями (В, дБ, нормированные)
+from spectrum_model import SpectrumModel, attach_spectrum_model, spectrum_model
+# Потоковая децимация и спектр Уэлча (память пропорциональна длине сегмента)
+from decimation import DECIM_BLOCK_SIZE, decimate_blocks
+from welch import welch_blocks
+
+# Параметры предобработки перед построением спектра (как в prepare_data); входят в ключ кэша спектров
+SPECTRUM_DOWNSAMPLING_FACTOR = 10
+SPECTRUM_PAD_LENGTH = 2**20
+
+def fft_signal(s: np.ndarray, t, nfft=None, resolution=None, precision='double'):
     '''
-    Вычисляет спектр сигнала с помощью БПФ и возвращает спектр, параметры и вектор частот.
+    Вычисляет односторонний спектр действительного сигнала с помощью БПФ (см. spectrum_engine.rfft_spectrum)
+    и возвращает спектр, параметры и вектор частот.
 
     Аргументы:
         s (np.ndarray): Массив значений сигнала.
-        t (np.ndarray): Массив временных отсчетов.
+        t (TimeBase | np.ndarray): Временная ось или массив временных отсчетов (считается равномерным).
+        nfft (int | None): Минимальная длина БПФ (по умолчанию — длина временной оси).
+        resolution (float | None): Требуемое разрешение по частоте, Гц (длина БПФ увеличивается до fs/resolution).
+        precision (str): 'double' или 'single' (вычисление в float32/complex64).
 
     Возвращает:
-        fft_s (np.ndarray): Спектр сигнала после fftshift и нормировки.
-        nsamp (int): Количество отсчетов (длина сигнала).
+        fft_s (np.ndarray): Спектр сигнала на частотах 0...fs/2, нормированный на длину БПФ.
+        nsamp (int): Длина БПФ (быстрая длина не меньше длины сигнала).
         fs (float): Частота дискретизации.
         df (float): Частотное разрешение.
-        freq_vec (np.ndarray): Вектор частот (ось X для спектра).
+        freq_vec (np.ndarray): Вектор частот (ось X для спектра), 0...fs/2.
     '''
-    # Вычисляем БПФ сигнала
-    fft_s = np.fft.fft(s)
-
-    # Сдвигаем спектр так, чтобы нулевая частота была по центру
-    fft_s = np.fft.fftshift(fft_s)
+    # Вычисляем частоту дискретизации по шагу временной оси
+    fs = as_time_base(t).fs
 
-    # Определяем длину сигнала
-    nsamp = len(t)
-
-    # Вычисляем частоту дискретизации
-    fs = 1.0 / (t[1] - t[0])
+    # БПФ действительного сигнала: только неотрицательные частоты, без fftshift и отбрасывания половины спектра
+    freq_vec, fft_s, nsamp = rfft_spectrum(s, fs, nfft=nfft or len(t), resolution=resolution, precision=precision)
 
     # Вычисляем частотный шаг (разрешение по частоте)
     df = fs / nsamp
 
-    # Нормируем амплитуду спектра
-    fft_s = fft_s / nsamp
-
     # Выводим параметры спектра для отладки
     print(f"Частота дискретизации = {round(fs/1e6)}  МГц")
     print(f"Разрешение по частоте = {round(df)}  Гц")
 
-    # Формируем вектор частот для оси X
-    freq_vec = np.linspace(-fs/2, fs/2, nsamp)
-
     return fft_s, nsamp, fs, df, freq_vec
 
 def create_spectrume(main_window, line=None):
@@ -111,28 +132,22 @@ def create_spectrume(main_window, line=None):
 
     # Проверяем, установлен ли атрибут has_spectrum и не построен ли уже спектр
     if not (hasattr(line, 'has_spectrum')) or (line.has_spectrum == False):
-        # Получаем данные сигнала (время и значения)
-        t = line.get_xdata()
-        s = line.get_ydata()
-        # Предобрабатываем данные (например, интерполяция, фильтрация)
-        t, s, _ = prepare_data(t/1000, s)  # oversampling_factor не используется
+        # Получаем данные сигнала: временную ось линии в секундах и значения
+        t, s = _line_signal(line)
+        # Предобрабатываем данные конвейером preprocess (децимация, удаление постоянной составляющей, дополнение
+        # нулями в одном выходном массиве)
+        t, s, _ = prepare_data(t, s)  # oversampling_factor не используется
         # Выводим параметры сигнала в текстовый редактор
         with main_window.redirect_stdout_to_textedit():
             print(f"Длина сигнала = {len(s)}")
             print(f"Длительность сигнала = {(t[-1]-t[0])*1000:.2f} мс")
             print(f"Частота дискретизации = {1/(t[1]-t[0])/1e6:.2f} МГц")
         # Вычисляем спектр сигнала с помощью БПФ
-        spectrum_y, _, _, _, spectrum_x = fft_signal(np.array(s), np.array(t))  # nsamp, fs, df не используются
+        # (односторонний: только неотрицательные частоты, отрицательные не вычисляются)
+        spectrum_y, _, _, _, spectrum_x = fft_signal(s, t)  # nsamp, fs, df не используются
         # Повторно выводим частоту дискретизации
         with main_window.redirect_stdout_to_textedit():
             print(f"Частота дискретизации = {(1/(t[1]-t[0]))/1e6:.2f} МГц")
-        # Определяем минимальную длину массивов спектра
-        min_len = min(len(spectrum_x), len(spectrum_y))
-        # Находим индекс первого значения spectrum_x >= 0 (только положительные частоты)
-        idx0 = np.argmax(spectrum_x >= 0)
-        # Обрезаем массивы спектра до положительных частот
-        spectrum_x = spectrum_x[idx0:min_len]
-        spectrum_y = spectrum_y[idx0:min_len]
     else:
         # Если у линии нет атрибута has_spectrum или спектр уже построен — выводим сообщение
         if not hasattr(line, 'has_spectrum'):
@@ -157,6 +172,8 @@ def set_spectrum_db_mode(main_window, db_mode: bool):
             False — отображать спектр в вольтах (В).
     Примечания:
         - Если нет активной линии спектра или её параметров, функция ничего не делает.
+        - Значения берутся из модели спектра линии (кэшированные представления); если линия построена без модели,
+          модель восстанавливается по её значениям (они считаются построенными в противоположном режиме).
         - Для предотвращения ошибок при логарифмировании к амплитуде добавляется малое значение (1e-12).
     '''
     main_window._spectrum_db_mode = db_mode  # Сохраняем выбранный режим
@@ -168,19 +185,17 @@ def set_spectrum_db_mode(main_window, db_mode: bool):
         # Если нет активной линии или параметров — ничего не делаем
         return
 
-    # Получаем данные спектра (частоты и амплитуды)
+    # Получаем данные спектра: частоты и модель спектра линии
     freq = line.get_xdata()
-    spectrum = line.get_ydata()
+    model = spectrum_model(line, db=not db_mode)
 
     # Очищаем холст перед перерисовкой
     main_window.spectrum_data.clear_canvas()
 
     if main_window._spectrum_db_mode:
-        # Переводим амплитуду в дБ
-        spectrum_db = 20 * np.log10(np.abs(spectrum) + 1e-12)
-        # Строим спектр в дБ
+        # Строим спектр в дБ (представление вычисляется один раз и хранится в модели)
         main_window.spectrum_data.plot_line(
-            freq, spectrum_db,
+            freq, model.db,
             add_mode=True,
             color=params['color'],
             linestyle=params['linestyle'],
@@ -194,11 +209,9 @@ def set_spectrum_db_mode(main_window, db_mode: bool):
             xlabel='Частота, МГц'
         )
     else:
-        # Переводим амплитуду из дБ обратно в Вольты (если исходный спектр был в дБ)
-        spectrum_v = np.power(10, spectrum / 20)
         # Строим спектр в Вольтах
         main_window.spectrum_data.plot_line(
-            freq, spectrum_v,
+            freq, model.magnitude,
             add_mode=True,
             color=params['color'],
             linestyle=params['linestyle'],
@@ -211,49 +224,59 @@ def set_spectrum_db_mode(main_window, db_mode: bool):
             ylabel='Амплитуда, В',
             xlabel='Частота, МГц'
         )
+    # Новая линия спектра использует ту же модель
+    attach_spectrum_model(main_window.spectrum_data.get_active_line(), model)
+
+def _line_signal(line):
+    '''Возвращает временную ось линии в секундах и её отсчёты.'''
+    # Временная ось линии (если она равномерная, см. PlotData.plot_line), перевод из мс в с — O(1)
+    t = getattr(line, '_osc_viewer_time_base', None)
+    if t is None:
+        t = as_time_base(line.get_xdata())
+    return t/1000, line.get_ydata()
+
+def _db_mode(main_window):
+    '''Возвращает True, если спектр отображается в дБ.'''
+    return bool(hasattr(main_window, '_spectrum_db_mode') and main_window._spectrum_db_mode)
+
+def _cache_key(main_window, line, welch=None):
+    '''Ключ кэша спектра линии: отсчёты, шаг временной оси, параметры обработки и режим отображения.'''
+    t, s = _line_signal(line)
+    if welch:
+        # Спектр Уэлча: длина сегмента, перекрытие и окно вместо длины дополнения
+        return spectrum_key(
+            s, t,
+            method='welch',
+            downsampling_factor=SPECTRUM_DOWNSAMPLING_FACTOR,
+            welch=dict(welch),
+            db_mode=_db_mode(main_window),
+        )
+    return spectrum_key(
+        s, t,
+        downsampling_factor=SPECTRUM_DOWNSAMPLING_FACTOR,
+        pad_length=SPECTRUM_PAD_LENGTH,
+        window=None,
+        precision='double',
+        db_mode=_db_mode(main_window),
+    )
 
-def add_spectrume(main_window, line, params):
-    '''
-    Создает и отображает спектр выбранной линии на основном графике.
-    Если линия не указана, используется активная линия. Спектр строится на отдельной вкладке
-    и отображается в выбранном режиме (амплитуда в дБ или в В). После построения спектра
-    блокируется возможность перемещения линий на графике спектра, а также происходит
-    автоматическое переключение на вкладку со спектром и выводится сообщение об успешном построении.
-    Аргументы:
-        line: Объект линии, для которой строится спектр. Если None, используется активная линия.
-        params (dict): Словарь параметров отображения спектра (цвет, стиль линии, подпись и др.).
-    Возвращает:
-        None
-    '''
-    def get_amplitude_and_ylabel(main_window, spectrum):
-        # Определяем режим отображения спектра: дБ или В
-        if hasattr(main_window, '_spectrum_db_mode') and main_window._spectrum_db_mode:
-            # Если выбран режим дБ, переводим амплитуду в децибелы
-            spectrum_db = 20 * np.log10(np.abs(spectrum) + 1e-12)
-            return spectrum_db, 'Амплитуда, дБ'
-        else:
-            # В противном случае отображаем амплитуду в вольтах
-            return abs(spectrum), 'Амплитуда, В'
-                
-    # Строим спектр по активной линии
-    freq, spectrum = create_spectrume(main_window, line)
-    
-    if freq is None or spectrum is None:
-        # Если не удалось построить спектр — выходим
-        return
-
-    # Получаем амплитуду и подпись оси Y в зависимости от режима отображения
-    spectrum, ylabel = get_amplitude_and_ylabel(main_window, spectrum)
+def _ylabel(main_window):
+    '''Возвращает подпись оси Y спектра в выбранном режиме отображения (дБ или В).'''
+    return 'Амплитуда, дБ' if _db_mode(main_window) else 'Амплитуда, В'
 
-    # Строим спектр на отдельном холсте (в МГц)
+def _plot_spectrum(main_window, model, params):
+    '''Добавляет на вкладку спектра линию с представлением модели в выбранном режиме и сохраняет в ней модель.'''
     main_window.spectrum_data.plot_line(
-        freq/1e6, spectrum,
+        model.freq, model.view(_db_mode(main_window)),
         add_mode=True,
         color=params['color'],
         linestyle=params['linestyle'],
         label=params['label']
     )
+    attach_spectrum_model(main_window.spectrum_data.get_active_line(), model)
 
+def _show_spectrum_tab(main_window, ylabel):
+    '''Устанавливает параметры осей спектра, блокирует перемещение линий и переключается на вкладку спектра.'''
     # Устанавливаем параметры осей для спектра
     main_window.spectrum_data.set_axes_params(
         xlim=(0, 4),
@@ -272,6 +295,192 @@ def add_spectrume(main_window, line, params):
     # Переключаемся на вкладку со спектром
     main_window.tabs.setCurrentWidget(main_window.spectrum_widget)
 
+def create_welch_spectrum(main_window, line, welch):
+    '''
+    Вычисляет спектр линии методом Уэлча.
+    Сигнал линии проходит потоковую децимацию (как при построении спектра одного БПФ) и блоками подаётся
+    в welch.WelchAccumulator, поэтому память пропорциональна длине сегмента, а не длине записи.
+    Аргументы:
+        line: Линия графика сигнала (методы get_xdata(), get_ydata(), флаг has_spectrum).
+        welch (dict): Параметры: segment_length (отсчётов после децимации), overlap (доля), window (имя окна).
+    Возвращает:
+        tuple: (freq, amplitude) — частоты, Гц, и амплитудный спектр, В.
+        None: Если линия не выбрана, спектр уже построен или сигнал короче одного сегмента.
+    '''
+    if line is None:
+        main_window.show_message("Нет выбранной линии для построения спектра")
+        return None
+    if getattr(line, 'has_spectrum', False):
+        main_window.show_message("Для выбранной линии спектр уже построен.")
+        return None
+
+    t, s = _line_signal(line)
+    decimation = Decimate(SPECTRUM_DOWNSAMPLING_FACTOR)
+    fs = decimation.time_base(as_time_base(t)).fs
+    # Блоки исходного сигнала -> блоки прореженного сигнала -> усреднение периодограмм сегментов
+    blocks = decimate_blocks((s[i:i + DECIM_BLOCK_SIZE] for i in range(0, len(s), DECIM_BLOCK_SIZE)),
+                             decimation.factor)
+    try:
+        freq, amplitude, n_segments = welch_blocks(blocks, fs, **welch)
+    except ValueError as e:
+        main_window.show_message(f"Спектр Уэлча не построен: {e}")
+        return None
+
+    with main_window.redirect_stdout_to_textedit():
+        print(f"Спектр Уэлча: сегмент {welch.get('segment_length')} отсчётов, "
+              f"перекрытие {100*welch.get('overlap', 0):.0f} %, окно {welch.get('window')}, "
+              f"усреднено сегментов: {n_segments}")
+        print(f"Частота дискретизации = {fs/1e6:.2f} МГц")
+        print(f"Разрешение по частоте = {freq[1]:.0f} Гц")
+    return freq, amplitude
+
+def add_spectrume(main_window, line, params, welch=None):
+    '''
+    Создает и отображает спектр выбранной линии на основном графике.
+    Если линия не указана, используется активная линия. Спектр строится на отдельной вкладке
+    и отображается в выбранном режиме (амплитуда в дБ или в В). Если спектр линии с теми же отсчётами
+    и параметрами уже строился, он читается из дискового кэша (spectrum_cache). После построения спектра
+    блокируется возможность перемещения линий на графике спектра, а также происходит
+    автоматическое переключение на вкладку со спектром и выводится сообщение об успешном построении.
+    Аргументы:
+        line: Объект линии, для которой строится спектр. Если None, используется активная линия.
+        params (dict): Словарь параметров отображения спектра (цвет, стиль линии, подпись и др.).
+        welch (dict | None): Параметры спектра Уэлча (см. create_welch_spectrum); None — спектр одного БПФ.
+    Возвращает:
+        None
+    '''
+    # Ищем спектр в дисковом кэше (только для линии, спектр которой ещё не построен)
+    key = None
+    cached = None
+    if line is not None and not getattr(line, 'has_spectrum', False):
+        key = _cache_key(main_window, line, welch)
+        cached = load_spectrum(key)
+
+    if cached is not None:
+        freq, spectrum = cached
+        # Кэш хранит значения в режиме отображения: модель восстанавливается по ним
+        model = SpectrumModel.from_view(freq/1e6, spectrum, db=_db_mode(main_window))
+        with main_window.redirect_stdout_to_textedit():
+            print("Спектр загружен из кэша")
+    else:
+        # Строим спектр по активной линии (одним БПФ или методом Уэлча)
+        if welch:
+            result = create_welch_spectrum(main_window, line, welch)
+        else:
+            result = create_spectrume(main_window, line)
+        if result is None or result[0] is None or result[1] is None:
+            # Если не удалось построить спектр — выходим
+            return
+        freq, spectrum = result
+
+        # Модель хранит комплексный спектр; амплитуда в режиме отображения (дБ или В) кэшируется в ней
+        model = SpectrumModel(freq/1e6, spectrum)
+        if key is not None:
+            save_spectrum(key, freq, model.view(_db_mode(main_window)))
+
+    # Строим спектр на отдельном холсте (в МГц)
+    if welch:
+        params = dict(params, label=f"{params['label']} (Уэлч)")
+    _plot_spectrum(main_window, model, params)
+
+    # Параметры осей, блокировка перемещения линий и переключение на вкладку спектра
+    _show_spectrum_tab(main_window, _ylabel(main_window))
+
     # Показываем сообщение об успешном построении графика
     main_window.show_message("График построен")
+
+def batch_spectra(signals, downsampling_factor=SPECTRUM_DOWNSAMPLING_FACTOR, nfft=SPECTRUM_PAD_LENGTH,
+                  precision='double'):
+    '''
+    Вычисляет спектры нескольких сигналов пакетным БПФ.
+    Сигналы с одинаковой частотой дискретизации и длиной БПФ предобрабатываются (децимация, удаление постоянной
+    составляющей, как в prepare_data) прямо в строки одного двумерного массива (строки дополняются нулями)
+    и преобразуются одним вызовом rfft_spectrum по последней оси — вместо отдельного БПФ и отдельного
+    вектора частот для каждой линии.
+    Аргументы:
+        signals (list): Пары (t, s): временная ось в секундах (TimeBase или массив) и отсчёты сигнала.
+        downsampling_factor (int): Коэффициент децимации (см. prepare_data).
+        nfft (int): Длина сигнала после дополнения нулями (как в prepare_data: 2^20). Сигнал, который после
+            децимации длиннее nfft, не усекается: его длина БПФ равна его длине, как в prepare_data.
+        precision (str): 'double' или 'single' (см. spectrum_engine.rfft_spectrum).
+    Возвращает:
+        list: Пары (freq, spectrum) в порядке signals; спектры сигналов одной группы — строки одного массива,
+              вектор частот у группы общий.
+    '''
+    if precision not in PRECISIONS:
+        raise ValueError(f'Неизвестная точность вычисления спектра: {precision}')
+    decimation = Decimate(downsampling_factor)
+
+    # Группы сигналов с одинаковой частотой дискретизации (после децимации) и длиной БПФ:
+    # (частота, длина) -> номера сигналов. Длина БПФ — как в prepare_data: не меньше nfft и не меньше длины
+    # сигнала после децимации, поэтому спектр совпадает со спектром create_spectrume (и записью в кэше)
+    groups = {}
+    time_bases = []
+    for i, (t, s) in enumerate(signals):
+        t = decimation.time_base(as_time_base(t))
+        time_bases.append(t)
+        width = max(nfft, decimation.output_length(len(s)))
+        groups.setdefault((float(f'{t.fs:.9g}'), width), []).append(i)
+
+    results = [None] * len(signals)
+    for (_, width), indices in groups.items():
+        fs = time_bases[indices[0]].fs
+        # width не меньше длины сигнала, поэтому PadTruncate только дополняет нулями
+        pipeline = Pipeline(decimation, Detrend('constant'), PadTruncate(width))
+        batch = np.zeros((len(indices), width), dtype=PRECISIONS[precision][0])
+        for row, i in enumerate(indices):
+            pipeline.run(signals[i][1], out=batch[row])
+        # Один вызов БПФ для всей группы (строки — сигналы)
+        freq, spectra, _ = rfft_spectrum(batch, fs, nfft=width, precision=precision)
+        for row, i in enumerate(indices):
+            results[i] = (freq, spectra[row])
+    return results
+
+def add_spectra(main_window, lines=None):
+    '''
+    Строит спектры всех (или указанных) линий графика сигнала одним пакетным БПФ (см. batch_spectra)
+    и добавляет их на вкладку спектра с параметрами отображения исходных линий.
+    Линии, для которых спектр уже построен (флаг has_spectrum), и линии не с этого графика пропускаются.
+    Спектры, найденные в дисковом кэше, не вычисляются; вычисленные сохраняются в кэш.
+    Холст перерисовывается один раз: plot_line только запрашивает перерисовку (draw_idle), и запросы объединяются.
+    Аргументы:
+        lines (list | None): Линии графика сигнала. Если None, используются все линии.
+    Возвращает:
+        int: Количество построенных спектров.
+    '''
+    plot_data = main_window.plot_data_signal
+    if lines is None:
+        lines = plot_data.get_all_lines()
+    lines = [line for line in lines
+             if not getattr(line, 'has_spectrum', False) and len(line.get_xdata()) > 1]
+    # Параметры отображения исходных линий (цвет, стиль, подпись)
+    params = [plot_data.get_line_params(line) for line in lines]
+    lines, params = [line for line, p in zip(lines, params) if p], [p for p in params if p]
+    if not lines:
+        main_window.show_message("Нет линий для построения спектров")
+        return 0
+
+    # Спектры из кэша; остальные линии вычисляются одним пакетным БПФ и сохраняются в кэш
+    keys = [_cache_key(main_window, line) for line in lines]
+    spectra = [load_spectrum(key) for key in keys]
+    missing = [i for i, cached in enumerate(spectra) if cached is None]
+    models = [None if cached is None else SpectrumModel.from_view(cached[0]/1e6, cached[1], db=_db_mode(main_window))
+              for cached in spectra]
+    for i, (freq, spectrum) in zip(missing, batch_spectra([_line_signal(lines[i]) for i in missing])):
+        models[i] = SpectrumModel(freq/1e6, spectrum)
+        save_spectrum(keys[i], freq, models[i].view(_db_mode(main_window)))
+        spectra[i] = (freq, spectrum)
+
+    with main_window.redirect_stdout_to_textedit():
+        print(f"Построено спектров одним пакетным БПФ: {len(missing)}, загружено из кэша: {len(spectra) - len(missing)}")
+        for line_params, (freq, _) in zip(params, spectra):
+            print(f"{line_params['label']}: частота дискретизации = {2*freq[-1]/1e6:.2f} МГц, "
+                  f"разрешение по частоте = {freq[1]:.0f} Гц")
+
+    for line_params, model in zip(params, models):
+        _plot_spectrum(main_window, model, line_params)
+
+    _show_spectrum_tab(main_window, _ylabel(main_window))
+    main_window.show_message(f"Построено спектров: {len(spectra)}")
+    return len(spectra)
     
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+'''
+data_cache.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-16
+Версия:       1.0.3
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует бинарный кэш отсчётов и индекс смещений строк рядом с исходным CSV-файлом.
+После первой загрузки отсчёты сигнала сохраняются в .npy-файл, а временная ось (t0, dt), метаинформация и ключ кэша
+(путь, размер и время изменения CSV-файла) — в .json-файл.
+Квантованный сигнал (QuantizedSignal) сохраняется кодами АЦП int8/int16 с шагом и смещением, что в 4-8 раз
+уменьшает файл кэша и занимаемые им страницы памяти.
+При повторном открытии массивы отображаются в память через np.load(mmap_mode='r') без разбора текста,
+поэтому страницы файла в кэше ОС разделяются между всеми запущенными экземплярами приложения.
+Индекс смещений строк (.npz-файл) хранит байтовые смещения каждой ROW_INDEX_STEP-й строки данных
+и позволяет читать из CSV-файла только нужный диапазон отсчётов.
+
+Список функций:
+---------------
+- cache_paths(file_name)
+    Возвращает пути к файлам кэша (.npy и .json) для CSV-файла.
+- file_fingerprint(file_name, format_ver)
+    Формирует ключ кэша: абсолютный путь, размер и время изменения файла, версия формата.
+- load_cache(file_name, format_ver)
+    Возвращает (t, s, meta) из кэша (s отображается в память) или None, если кэш отсутствует или устарел.
+- save_cache(file_name, format_ver, t, s, meta)
+    Сохраняет отсчёты сигнала, временную ось и метаинформацию в кэш.
+- load_row_index(file_name, format_ver)
+    Возвращает сохранённый индекс смещений строк данных (offsets, n_rows, meta) или None.
+- save_row_index(file_name, format_ver, offsets, n_rows, meta)
+    Сохраняет индекс смещений строк данных рядом с CSV-файлом.
+'''
+
+import os
+import json
+
+import numpy as np
+
+from time_base import TimeBase, as_time_base
+from quantized import QuantizedSignal
+
+# Версия формата файлов кэша (увеличивается при несовместимых изменениях)
+CACHE_VERSION = 3
+# Суффиксы файлов кэша, добавляемые к имени исходного файла
+CACHE_DATA_SUFFIX = '.osc_cache.npy'
+CACHE_META_SUFFIX = '.osc_cache.json'
+CACHE_INDEX_SUFFIX = '.osc_index.npz'
+
+
+def cache_paths(file_name):
+    '''
+    Возвращает пути к файлам кэша для указанного CSV-файла.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+    Возвращает:
+        tuple: (путь к .npy-файлу с отсчётами, путь к .json-файлу с метаинформацией).
+    '''
+    return file_name + CACHE_DATA_SUFFIX, file_name + CACHE_META_SUFFIX
+
+
+def file_fingerprint(file_name, format_ver):
+    '''
+    Формирует ключ кэша для CSV-файла.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+        format_ver (int): Версия формата файла.
+    Возвращает:
+        dict: Абсолютный путь, размер, время изменения (нс) файла, версия формата и версия кэша.
+    '''
+    st = os.stat(file_name)
+    return {
+        'path': os.path.abspath(file_name),
+        'size': st.st_size,
+        'mtime_ns': st.st_mtime_ns,
+        'format_ver': format_ver,
+        'cache_version': CACHE_VERSION,
+    }
+
+
+def load_cache(file_name, format_ver):
+    '''
+    Загружает отсчёты и метаинформацию из кэша, если он соответствует текущему состоянию CSV-файла.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+        format_ver (int): Версия формата файла.
+    Возвращает:
+        tuple | None: (t, s, meta), где t — равномерная временная ось (TimeBase), s — массив только для чтения,
+        отображённый в память (для квантованного сигнала — QuantizedSignal с отображёнными в память кодами),
+        meta — словарь метаинформации; None, если кэша нет, он устарел или повреждён.
+    '''
+    data_path, meta_path = cache_paths(file_name)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            cache_info = json.load(f)
+        if cache_info.get('key') != file_fingerprint(file_name, format_ver):
+            return None
+        t0, dt = cache_info['time_base']
+        s = np.load(data_path, mmap_mode='r')
+        if s.ndim != 1:
+            return None
+        if cache_info.get('quantization'):
+            scale, offset = cache_info['quantization']
+            s = QuantizedSignal(s, scale, offset)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return TimeBase(t0, dt, len(s)), s, cache_info['meta']
+
+
+def save_cache(file_name, format_ver, t, s, meta):
+    '''
+    Сохраняет отсчёты и метаинформацию в кэш рядом с CSV-файлом.
+    Запись выполняется во временные файлы с последующей атомарной заменой,
+    чтобы другой экземпляр приложения не прочитал кэш частично.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+        format_ver (int): Версия формата файла.
+        t (TimeBase | np.ndarray): Равномерная временная ось (сохраняются только t0 и dt).
+        s (np.ndarray | QuantizedSignal): Массив значений сигнала или коды АЦП с шагом и смещением.
+        meta (dict): Метаинформация (значения должны сериализоваться в JSON).
+    Возвращает:
+        bool: True, если кэш записан, False — если запись невозможна (например, каталог только для чтения).
+    '''
+    data_path, meta_path = cache_paths(file_name)
+    tmp_data_path = data_path + '.tmp'
+    tmp_meta_path = meta_path + '.tmp'
+    try:
+        t = as_time_base(t)
+        quantization = None
+        if isinstance(s, QuantizedSignal):
+            quantization = [s.scale, s.offset]
+            s = s.codes
+        # Пишем отсчёты напрямую в отображённый в память .npy-файл, без промежуточной копии
+        dtype = s.dtype if quantization else np.float64
+        data = np.lib.format.open_memmap(tmp_data_path, mode='w+', dtype=dtype, shape=(len(s),))
+        data[:] = s
+        data.flush()
+        del data
+        cache_info = {
+            'key': file_fingerprint(file_name, format_ver),
+            'time_base': [t.t0, t.dt],
+            'quantization': quantization,
+            'meta': meta,
+        }
+        with open(tmp_meta_path, 'w', encoding='utf-8') as f:
+            json.dump(cache_info, f, ensure_ascii=False)
+        os.replace(tmp_data_path, data_path)
+        os.replace(tmp_meta_path, meta_path)
+    except OSError:
+        for path in (tmp_data_path, tmp_meta_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        return False
+    return True
+
+
+def load_row_index(file_name, format_ver):
+    '''
+    Загружает индекс смещений строк данных CSV-файла, если он соответствует текущему состоянию файла.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+        format_ver (int): Версия формата файла.
+    Возвращает:
+        tuple | None: (offsets, n_rows, meta), где offsets — байтовые смещения строк данных с шагом индекса,
+        n_rows — общее количество строк данных, meta — метаинформация заголовка; None, если индекса нет или он устарел.
+    '''
+    try:
+        with np.load(file_name + CACHE_INDEX_SUFFIX, allow_pickle=False) as data:
+            if json.loads(str(data['key'])) != file_fingerprint(file_name, format_ver):
+                return None
+            return data['offsets'], int(data['n_rows']), json.loads(str(data['meta']))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def save_row_index(file_name, format_ver, offsets, n_rows, meta):
+    '''
+    Сохраняет индекс смещений строк данных рядом с CSV-файлом.
+    Аргументы:
+        file_name (str): Путь к исходному CSV-файлу.
+        format_ver (int): Версия формата файла.
+        offsets (np.ndarray): Байтовые смещения строк данных с шагом индекса.
+        n_rows (int): Общее количество строк данных.
+        meta (dict): Метаинформация заголовка файла.
+    Возвращает:
+        bool: True, если индекс записан, False — если запись невозможна.
+    '''
+    index_path = file_name + CACHE_INDEX_SUFFIX
+    tmp_path = index_path + '.tmp.npz'
+    try:
+        np.savez(
+            tmp_path,
+            offsets=np.asarray(offsets, dtype=np.int64),
+            n_rows=np.int64(n_rows),
+            key=json.dumps(file_fingerprint(file_name, format_ver)),
+            meta=json.dumps(meta, ensure_ascii=False),
+        )
+        os.replace(tmp_path, index_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
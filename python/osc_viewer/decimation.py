@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+'''
+decimation.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует децимацию сигнала с фильтром защиты от наложения спектров (anti-aliasing).
+Прореживание срезом s[::q] переносит шум из полосы выше новой частоты Найквиста в полосу анализа;
+здесь перед прореживанием сигнал проходит ФНЧ (КИХ-фильтр с окном Кайзера), который вычисляется
+в полифазной форме: выходные отсчёты считаются только для оставляемых позиций (в q раз меньше операций,
+чем фильтрация с последующим прореживанием).
+Децимация потоковая: сигнал подаётся блоками произвольной длины, между блоками сохраняются только последние
+отсчёты длиной в фильтр. Задержка фильтра скомпенсирована: выходной отсчёт m соответствует входному отсчёту m*q,
+поэтому временная ось прореживается срезом t[::q] (см. TimeBase). На краях сигнал продолжается крайними значениями.
+
+Список классов и функций:
+-------------------------
+- design_decimation_filter(factor, attenuation_db=DECIM_ATTENUATION_DB, passband=DECIM_PASSBAND)
+    Рассчитывает коэффициенты ФНЧ для децимации в factor раз.
+- Decimator(factor, taps=None)
+    Потоковый полифазный дециматор: process(block) для очередного блока, flush() в конце сигнала.
+- decimate(s, factor, block_size=DECIM_BLOCK_SIZE, out=None)
+    Децимация массива (обрабатывается блоками, длина результата ceil(len(s)/factor)).
+- decimate_blocks(blocks, factor)
+    Децимация потока блоков (например, iter_data_blocks): генератор прореженных блоков.
+'''
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import firwin, kaiserord
+
+from quantized import QuantizedSignal
+
+# Подавление в полосе задерживания, дБ
+DECIM_ATTENUATION_DB = 80.0
+# Граница полосы пропускания в долях новой частоты Найквиста: наложение попадает только в полосу выше неё
+DECIM_PASSBAND = 0.8
+# Размер блока входных отсчётов при децимации массива
+DECIM_BLOCK_SIZE = 1 << 20
+
+
+def design_decimation_filter(factor, attenuation_db=DECIM_ATTENUATION_DB, passband=DECIM_PASSBAND):
+    '''
+    Рассчитывает коэффициенты КИХ-фильтра нижних частот (окно Кайзера) для децимации в factor раз.
+    Частота среза — новая частота Найквиста; переходная полоса симметрична относительно неё, поэтому
+    составляющие, которые после прореживания попали бы в полосу [0, passband] новой частоты Найквиста,
+    подавляются не менее чем на attenuation_db.
+    Аргументы:
+        factor (int): Коэффициент децимации (> 1).
+        attenuation_db (float): Подавление в полосе задерживания, дБ.
+        passband (float): Граница полосы пропускания в долях новой частоты Найквиста (0 < passband < 1).
+    Возвращает:
+        np.ndarray: Коэффициенты фильтра (нечётное количество, линейная ФЧХ, коэффициент передачи 1 на нулевой частоте).
+    '''
+    factor = int(factor)
+    if factor < 2:
+        raise ValueError(f'Коэффициент децимации должен быть больше 1: {factor}')
+    numtaps, beta = kaiserord(attenuation_db, 2 * (1 - passband) / factor)
+    numtaps |= 1  # Нечётная длина — целая задержка (numtaps - 1) / 2 отсчётов
+    return firwin(numtaps, 1 / factor, window=('kaiser', beta))
+
+
+@lru_cache(maxsize=16)
+def _default_filter(factor):
+    taps = design_decimation_filter(factor)
+    taps.flags.writeable = False
+    return taps
+
+
+class Decimator:
+    '''
+    Потоковый полифазный дециматор с фильтром защиты от наложения спектров.
+    Аргументы:
+        factor (int): Коэффициент децимации.
+        taps (np.ndarray | None): Коэффициенты фильтра (None — design_decimation_filter(factor)).
+    Атрибуты:
+        n_in (int): Количество поданных входных отсчётов.
+        n_out (int): Количество выданных выходных отсчётов.
+    Особенности:
+        - Фильтр дополняется нулями до длины K*q и раскладывается на K векторов по q коэффициентов;
+          блок входных отсчётов рассматривается как матрица (строки по q отсчётов, без копирования),
+          и выход считается K умножениями матрицы на вектор — q фаз фильтра обрабатываются одновременно.
+        - Между блоками хранятся только необработанные отсчёты (меньше K*q + q); с началом следующего блока
+          они объединяются в небольшой массив, остальная часть блока обрабатывается без копирования.
+        - Выходной отсчёт m соответствует входному m*q (задержка фильтра скомпенсирована);
+          после flush() выдано ровно ceil(n_in / q) отсчётов.
+    '''
+
+    def __init__(self, factor, taps=None):
+        self.factor = int(factor)
+        taps = _default_filter(self.factor) if taps is None else np.asarray(taps, dtype=np.float64)
+        self.delay = (len(taps) - 1) // 2
+        q = self.factor
+        n_phases = -(-len(taps) // q)
+        # Выход — корреляция с обращённым фильтром: y[m] = sum(h_rev[n] * x[m*q + n])
+        h = np.zeros(n_phases * q)
+        h[:len(taps)] = taps[::-1]
+        self._phases = h.reshape(n_phases, q)
+        self._buf = np.empty(0)
+        self.n_in = 0
+        self.n_out = 0
+
+    def _run(self, buf, n_max=None):
+        q = self.factor
+        n_phases = len(self._phases)
+        m = (len(buf) - n_phases * q) // q + 1 if len(buf) >= n_phases * q else 0
+        if n_max is not None:
+            m = min(m, n_max)
+        if m <= 0:
+            self._buf = buf.copy()  # Отсчётов ещё не хватает на выходной отсчёт — ждём следующего блока
+            return np.empty(0)
+        rows = buf[:(m + n_phases - 1) * q].reshape(-1, q)
+        y = rows[:m] @ self._phases[0]
+        for k in range(1, n_phases):
+            y += rows[k:k + m] @ self._phases[k]
+        self._buf = buf[m * q:].copy()  # Копия: вызывающий может изменить или переиспользовать блок
+        self.n_out += m
+        return y
+
+    def process(self, block):
+        '''
+        Обрабатывает очередной блок входных отсчётов.
+        Аргументы:
+            block (np.ndarray): Входные отсчёты.
+        Возвращает:
+            np.ndarray: Выходные отсчёты, которые можно вычислить по уже поданным данным (может быть пустым).
+        '''
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) == 0:
+            return np.empty(0)
+        self._last = block[-1]
+        if self.n_in == 0:
+            # Начало сигнала продолжается первым отсчётом на половину длины фильтра
+            self._buf = np.full(self.delay, block[0])
+        self.n_in += len(block)
+        n_buf = len(self._buf)
+        n_window = len(self._phases) * self.factor
+        if n_buf == 0:
+            return self._run(block)
+        if len(block) <= n_window + self.factor:
+            return self._run(np.concatenate((self._buf, block)))
+        # Выходные отсчёты, окна которых начинаются в сохранённых отсчётах, — по короткому объединённому массиву;
+        # следующие — прямо по блоку (представление, без копирования)
+        n_head = -(-n_buf // self.factor)
+        head = self._run(np.concatenate((self._buf, block[:n_window + self.factor])), n_max=n_head)
+        tail = self._run(block[n_head * self.factor - n_buf:])
+        return np.concatenate((head, tail)) if len(head) and len(tail) else (tail if len(tail) else head)
+
+    def flush(self):
+        '''
+        Завершает сигнал: продолжает его последним отсчётом и выдаёт оставшиеся выходные отсчёты.
+        Возвращает:
+            np.ndarray: Оставшиеся выходные отсчёты (всего выдано ceil(n_in / factor)).
+        '''
+        q = self.factor
+        n_left = -(-self.n_in // q) - self.n_out
+        if n_left <= 0:
+            return np.empty(0)
+        n_need = (n_left - 1) * q + len(self._phases) * q
+        pad = np.full(max(0, n_need - len(self._buf)), self._last)
+        return self._run(np.concatenate((self._buf, pad)), n_max=n_left)
+
+
+def decimate(s, factor, block_size=DECIM_BLOCK_SIZE, out=None):
+    '''
+    Децимация сигнала в factor раз с фильтром защиты от наложения спектров.
+    Массив обрабатывается блоками по block_size отсчётов, поэтому промежуточные массивы не превышают размер блока
+    (сигнал, хранимый кодами АЦП, переводится в вольты тоже поблочно).
+    Аргументы:
+        s (array-like | QuantizedSignal): Сигнал.
+        factor (int): Коэффициент децимации (1 — без изменений).
+        block_size (int): Размер блока входных отсчётов.
+        out (np.ndarray | None): Массив для результата длиной ceil(len(s) / factor). Может совпадать с началом s:
+            выходной отсчёт записывается после того, как прочитаны все входные отсчёты, от которых он зависит.
+    Возвращает:
+        np.ndarray: Прореженный сигнал длиной ceil(len(s) / factor); отсчёт m соответствует s[m*factor].
+    '''
+    factor = int(factor)
+    if factor <= 1:
+        if out is None:
+            return np.asarray(s, dtype=np.float64)
+        out[:] = s
+        return out
+    if not isinstance(s, QuantizedSignal):
+        s = np.asarray(s)
+    if out is None:
+        out = np.empty(-(-len(s) // factor))
+    decimator = Decimator(factor)
+    n = 0
+    for i in range(0, len(s), block_size):
+        y = decimator.process(s[i:i + block_size])
+        out[n:n + len(y)] = y
+        n += len(y)
+    out[n:] = decimator.flush()
+    return out
+
+
+def decimate_blocks(blocks, factor):
+    '''
+    Децимация потока блоков отсчётов (например, блоков сигнала из iter_data_blocks).
+    Аргументы:
+        blocks (iterable): Блоки входных отсчётов.
+        factor (int): Коэффициент децимации.
+    Возвращает:
+        generator: Непустые блоки прореженного сигнала; вместе они равны decimate(np.concatenate(blocks), factor).
+    '''
+    if int(factor) <= 1:
+        yield from (np.asarray(block, dtype=np.float64) for block in blocks)
+        return
+    decimator = Decimator(factor)
+    for block in blocks:
+        y = decimator.process(block)
+        if len(y):
+            yield y
+    y = decimator.flush()
+    if len(y):
+        yield y
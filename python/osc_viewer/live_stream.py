@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+'''
+live_stream.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует просмотр «живого» потока отсчётов от процесса регистрации по TCP.
+Протокол: поток кадров, каждый кадр — заголовок FRAME_HEADER (сигнатура FRAME_MAGIC, тип отсчёта, количество отсчётов,
+частота дискретизации, шаг квантования) и отсчёты (float32 или int16, little-endian).
+Отсчёты принимаются в отдельном потоке (QThread) в заранее выделенный буфер и записываются в кольцевой буфер
+фиксированного размера, поэтому расход памяти не растёт со временем регистрации.
+График работает в режиме прокрутки (roll mode): последние window_s секунд сигнала выводятся огибающей min/max
+с ограниченной частотой кадров; при обновлении массивы не выделяются.
+Для проверки без оборудования есть генератор тестового сигнала (serve_test_signal, командная строка).
+
+Список классов и функций:
+-------------------------
+- RingBuffer(capacity, dtype=np.float32)
+    Кольцевой буфер отсчётов фиксированного размера.
+- write_frame(sock, samples, fs, scale=1.0)
+    Отправляет кадр отсчётов в сокет.
+- StreamWorker(host, port, ring)
+    Исполнитель приёма кадров из TCP-соединения в кольцевой буфер (выполняется в QThread).
+- RollView(plot_data, ring, fs, window_s=ROLL_WINDOW_S, display_points=ROLL_DISPLAY_POINTS, max_fps=ROLL_MAX_FPS)
+    Отображение последних отсчётов кольцевого буфера в режиме прокрутки.
+- LiveStreamController(main_window, host, port)
+    Связывает приём потока и отображение на графике главного окна.
+- open_live_stream(main_window) / stop_live_streams(main_window)
+    Подключение к источнику потока (адрес вводится в диалоге) и отключение всех потоков.
+- listen_socket(host, port) / serve_test_signal(server, fs, ...)
+    Генератор тестового сигнала: TCP-сервер, передающий синусоиду с шумом в реальном времени.
+- main(argv=None)
+    Командная строка генератора: python live_stream.py --port 50505 --fs 1e6
+'''
+
+import sys
+import time
+import socket
+import struct
+import argparse
+import threading
+import contextlib
+
+import numpy as np
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from load_and_prepare_data import print_c
+
+# Сигнатура кадра
+FRAME_MAGIC = b'OSCF'
+# Заголовок кадра: сигнатура, код типа отсчёта, количество каналов (1), резерв, количество отсчётов,
+# частота дискретизации (Гц), шаг квантования (В на код; для float32 — множитель)
+FRAME_HEADER = struct.Struct('<4sBBHIdd')
+# Коды типов отсчётов кадра
+FRAME_DTYPES = {0: np.dtype('<f4'), 1: np.dtype('<i2')}
+# Порт источника потока по умолчанию
+LIVE_PORT = 50505
+# Ёмкость кольцевого буфера, отсчётов (4 с при 1 МГц)
+RING_CAPACITY = 1 << 22
+# Начальный размер буфера приёма кадра, байт (увеличивается только для кадров большего размера)
+FRAME_BUFFER_BYTES = 1 << 20
+# Длительность интервала, выводимого в режиме прокрутки, с
+ROLL_WINDOW_S = 0.05
+# Количество точек линии в режиме прокрутки (огибающая min/max)
+ROLL_DISPLAY_POINTS = 4096
+# Максимальная частота обновления графика, кадров/с
+ROLL_MAX_FPS = 25
+# Таймаут операций с сокетом, с (между таймаутами проверяется запрос остановки)
+SOCKET_TIMEOUT_S = 0.5
+
+
+class RingBuffer:
+    '''
+    Кольцевой буфер отсчётов фиксированного размера: новые отсчёты записываются поверх самых старых.
+    Аргументы:
+        capacity (int): Ёмкость, отсчётов.
+        dtype: Тип хранимых отсчётов.
+    Атрибуты:
+        data (np.ndarray): Буфер (выделяется один раз).
+        total (int): Общее количество записанных отсчётов (с начала приёма).
+    Особенности:
+        - Запись и чтение защищены блокировкой: запись выполняется потоком приёма, чтение — потоком GUI.
+        - read_latest копирует последние отсчёты в переданный массив, не выделяя память.
+    '''
+
+    def __init__(self, capacity=RING_CAPACITY, dtype=np.float32):
+        self.data = np.zeros(int(capacity), dtype=dtype)
+        self.total = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self):
+        return len(self.data)
+
+    def write(self, values):
+        '''
+        Записывает отсчёты в буфер (если их больше ёмкости — только последние capacity отсчётов).
+        Аргументы:
+            values (np.ndarray): Новые отсчёты.
+        '''
+        m = len(values)
+        cap = self.capacity
+        with self._lock:
+            if m > cap:
+                values = values[-cap:]
+            k = len(values)
+            pos = (self.total + m - k) % cap
+            first = min(k, cap - pos)
+            self.data[pos:pos + first] = values[:first]
+            self.data[:k - first] = values[first:]
+            self.total += m
+
+    def read_latest(self, out):
+        '''
+        Копирует последние len(out) отсчётов в хронологическом порядке в массив out.
+        Если записано меньше отсчётов, начало out заполняется NaN (на графике не отображается).
+        Аргументы:
+            out (np.ndarray): Массив-приёмник (len(out) <= capacity).
+        Возвращает:
+            int: Общее количество записанных отсчётов на момент чтения.
+        '''
+        n = len(out)
+        cap = self.capacity
+        with self._lock:
+            total = self.total
+            valid = min(n, total, cap)
+            out[:n - valid] = np.nan
+            end = total % cap
+            start = (end - valid) % cap
+            if start + valid <= cap:
+                out[n - valid:] = self.data[start:start + valid]
+            else:
+                first = cap - start
+                out[n - valid:n - valid + first] = self.data[start:]
+                out[n - valid + first:] = self.data[:end]
+        return total
+
+
+def write_frame(sock, samples, fs, scale=1.0):
+    '''
+    Отправляет кадр отсчётов в сокет.
+    Аргументы:
+        sock (socket.socket): Сокет соединения.
+        samples (np.ndarray): Отсчёты float32 или коды int16.
+        fs (float): Частота дискретизации, Гц.
+        scale (float): Шаг квантования (значение = код * scale).
+    '''
+    samples = np.ascontiguousarray(samples)
+    code = {dtype: c for c, dtype in FRAME_DTYPES.items()}.get(samples.dtype.newbyteorder('<'))
+    if code is None:
+        raise ValueError(f'Неподдерживаемый тип отсчётов кадра: {samples.dtype}')
+    sock.sendall(FRAME_HEADER.pack(FRAME_MAGIC, code, 1, 0, len(samples), float(fs), float(scale)))
+    sock.sendall(samples.astype(FRAME_DTYPES[code], copy=False).tobytes())
+
+
+def _recv_exact(sock, view, stop_requested):
+    '''
+    Заполняет memoryview view данными из сокета. Возвращает False, если соединение закрыто или запрошена остановка.
+    '''
+    pos = 0
+    while pos < len(view):
+        if stop_requested():
+            return False
+        try:
+            k = sock.recv_into(view[pos:])
+        except socket.timeout:
+            continue
+        if k == 0:
+            return False
+        pos += k
+    return True
+
+
+class StreamWorker(QObject):
+    '''
+    Исполнитель приёма потока: подключается к источнику, принимает кадры в заранее выделенный буфер
+    и записывает отсчёты (переведённые в float32) в кольцевой буфер. Выполняется в отдельном потоке (QThread).
+    Аргументы:
+        host (str), port (int): Адрес источника потока.
+        ring (RingBuffer): Кольцевой буфер отсчётов.
+    Сигналы:
+        rate_changed(float): Получена (или изменилась) частота дискретизации потока, Гц.
+        failed(str): Ошибка подключения или протокола.
+        finished(): Приём завершён (соединение закрыто или остановлено).
+    '''
+
+    rate_changed = pyqtSignal(float)
+    failed = pyqtSignal(str)
+    finished = pyqtSignal()
+
+    def __init__(self, host, port, ring):
+        super().__init__()
+        self.host = host
+        self.port = int(port)
+        self.ring = ring
+        self.fs = 0.0
+        self.n_frames = 0
+        self._stop_requested = False
+        self._header = bytearray(FRAME_HEADER.size)
+        self._payload = bytearray(FRAME_BUFFER_BYTES)
+        self._volts = np.empty(FRAME_BUFFER_BYTES // 2, dtype=np.float32)
+
+    def stop(self):
+        '''Запрашивает остановку приёма (проверяется не реже SOCKET_TIMEOUT_S).'''
+        self._stop_requested = True
+
+    def run(self):
+        '''Принимает кадры до закрытия соединения или запроса остановки.'''
+        try:
+            with socket.create_connection((self.host, self.port), timeout=SOCKET_TIMEOUT_S * 10) as sock:
+                sock.settimeout(SOCKET_TIMEOUT_S)
+                self._receive(sock)
+        except (OSError, ValueError) as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+    def _receive(self, sock):
+        stop_requested = lambda: self._stop_requested
+        header_view = memoryview(self._header)
+        while _recv_exact(sock, header_view, stop_requested):
+            magic, code, channels, _, n, fs, scale = FRAME_HEADER.unpack(self._header)
+            if magic != FRAME_MAGIC or code not in FRAME_DTYPES or channels != 1:
+                raise ValueError('Неверный заголовок кадра потока')
+            dtype = FRAME_DTYPES[code]
+            n_bytes = n * dtype.itemsize
+            # Буферы увеличиваются только для кадра большего размера, чем все предыдущие; размеры проверяются
+            # отдельно: кадр кодов int16 может поместиться в буфер байтов, но не в буфер вольт
+            if n_bytes > len(self._payload):
+                self._payload = bytearray(n_bytes)
+            if n > len(self._volts):
+                self._volts = np.empty(n, dtype=np.float32)
+            if not _recv_exact(sock, memoryview(self._payload)[:n_bytes], stop_requested):
+                break
+            samples = np.frombuffer(self._payload, dtype=dtype, count=n)
+            if code == 0 and scale == 1.0:
+                self.ring.write(samples)
+            else:
+                volts = self._volts[:n]
+                np.multiply(samples, scale, out=volts, casting='unsafe')
+                self.ring.write(volts)
+            self.n_frames += 1
+            if fs != self.fs:
+                self.fs = fs
+                self.rate_changed.emit(fs)
+
+
+class RollView(QObject):
+    '''
+    Отображение последних window_s секунд потока в режиме прокрутки (последний отсчёт — у правого края, время 0).
+    Обновление выполняется по таймеру не чаще max_fps раз в секунду и только при поступлении новых отсчётов.
+    Если в интервале больше display_points отсчётов, выводится огибающая: минимум и максимум каждой группы отсчётов.
+    Все массивы (интервал отсчётов, огибающая, ось времени) выделяются при создании и при смене частоты дискретизации.
+    Аргументы:
+        plot_data (PlotData): График.
+        ring (RingBuffer): Кольцевой буфер отсчётов.
+        fs (float): Частота дискретизации, Гц.
+        window_s (float): Длительность выводимого интервала, с.
+        display_points (int): Количество точек линии.
+        max_fps (float): Максимальная частота обновления, кадров/с.
+        label (str | None): Имя линии.
+    '''
+
+    def __init__(self, plot_data, ring, fs, window_s=ROLL_WINDOW_S, display_points=ROLL_DISPLAY_POINTS,
+                 max_fps=ROLL_MAX_FPS, label=None):
+        super().__init__(plot_data)
+        self.plot_data = plot_data
+        self.ring = ring
+        self.window_s = window_s
+        self.display_points = display_points
+        self._last_total = -1
+        self._scaled = False
+        self.set_rate(fs)
+        plot_data.plot_line(self._x, self._y, add_mode=True, label=label)
+        self.line = plot_data.get_all_lines()[-1]
+        self.line.set_data(self._x, self._y)
+        plot_data.set_axes_params(title='Поток (режим прокрутки)', xlabel='Время, мс', ylabel='Амплитуда, В')
+        plot_data.ax.set_xlim(self._x[0], self._x[-1])
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(1000 / max_fps)))
+        self.timer.timeout.connect(self.refresh)
+
+    def set_rate(self, fs):
+        '''
+        Выделяет массивы для частоты дискретизации fs: интервал отсчётов, огибающую и ось времени (мс).
+        '''
+        self.fs = float(fs)
+        n = max(2, int(round(self.window_s * self.fs)))
+        n = min(n, self.ring.capacity)
+        if n > self.display_points:
+            self._bins = self.display_points // 2
+            n -= n % self._bins  # Интервал делится на группы равной длины — огибающая без копирования
+            self._y = np.full(2 * self._bins, np.nan, dtype=self.ring.data.dtype)
+        else:
+            self._bins = 0
+            self._y = np.full(n, np.nan, dtype=self.ring.data.dtype)
+        self._window = np.empty(n, dtype=self.ring.data.dtype)
+        self._x = np.linspace(-(n - 1) / self.fs * 1000, 0.0, len(self._y))
+        self._last_total = -1
+        if hasattr(self, 'line'):
+            self.line.set_data(self._x, self._y)
+            self.plot_data.ax.set_xlim(self._x[0], self._x[-1])
+
+    def start(self):
+        '''Запускает обновление графика.'''
+        self.timer.start()
+
+    def stop(self):
+        '''Останавливает обновление графика.'''
+        self.timer.stop()
+
+    def refresh(self):
+        '''
+        Копирует последние отсчёты из кольцевого буфера в подготовленные массивы и перерисовывает линию.
+        Возвращает:
+            bool: True, если линия обновлена (были новые отсчёты).
+        '''
+        if self.line not in self.plot_data.ax.lines:
+            self.stop()
+            return False
+        total = self.ring.read_latest(self._window)
+        if total == self._last_total:
+            return False
+        self._last_total = total
+        if self._bins:
+            groups = self._window.reshape(self._bins, -1)
+            np.min(groups, axis=1, out=self._y[0::2])
+            np.max(groups, axis=1, out=self._y[1::2])
+        else:
+            self._y[:] = self._window
+        self.line.set_ydata(self._y)
+        if total:
+            self._extend_ylim()
+        self.plot_data.canvas.draw_idle()
+        return True
+
+    def _extend_ylim(self):
+        '''
+        Расширяет пределы оси Y по огибающей (при первом кадре — устанавливает).
+        Пределы только расширяются, чтобы изображение не «прыгало» от кадра к кадру.
+        '''
+        lo, hi = float(np.nanmin(self._y)), float(np.nanmax(self._y))
+        margin = 0.05 * ((hi - lo) or 1.0)
+        ax = self.plot_data.ax
+        if not self._scaled:
+            ax.set_ylim(lo - margin, hi + margin)
+            self._scaled = True
+            return
+        y_lo, y_hi = ax.get_ylim()
+        if lo < y_lo or hi > y_hi:
+            ax.set_ylim(min(lo - margin, y_lo), max(hi + margin, y_hi))
+
+
+class LiveStreamController(QObject):
+    '''
+    Связывает приём потока (StreamWorker в отдельном QThread) и отображение на графике главного окна (RollView).
+    Линия графика создаётся после первого кадра, когда становится известна частота дискретизации.
+    Аргументы:
+        main_window: Главное окно приложения.
+        host (str), port (int): Адрес источника потока.
+        capacity (int): Ёмкость кольцевого буфера, отсчётов.
+    '''
+
+    def __init__(self, main_window, host, port, capacity=RING_CAPACITY):
+        super().__init__(main_window)
+        self.main_window = main_window
+        self.address = f'{host}:{port}'
+        self.ring = RingBuffer(capacity)
+        self.view = None
+        self.thread = QThread(self)
+        self.worker = StreamWorker(host, port, self.ring)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.rate_changed.connect(self._on_rate_changed)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.finished.connect(self.thread.quit)
+        self.thread.finished.connect(self._on_finished)
+
+    @property
+    def active(self):
+        return self.thread.isRunning()
+
+    def start(self):
+        '''Запускает приём потока.'''
+        self.thread.start()
+
+    def stop(self):
+        '''Останавливает приём потока и обновление графика (линия с последними отсчётами остаётся).'''
+        self.worker.stop()
+        self.thread.quit()
+        self.thread.wait()
+        if self.view is not None:
+            self.view.stop()
+            self.view.refresh()
+
+    def _messages(self):
+        # Сообщения выводятся во вкладку "Сообщения", если окно это поддерживает
+        if hasattr(self.main_window, 'redirect_stdout_to_textedit'):
+            return self.main_window.redirect_stdout_to_textedit()
+        return contextlib.nullcontext()
+
+    def _on_rate_changed(self, fs):
+        with self._messages():
+            if self.view is None:
+                self.view = RollView(self.main_window.plot_data_signal, self.ring, fs, label=f'Поток {self.address}')
+                self.view.start()
+                print_c(f'Поток {self.address}: частота дискретизации {fs:g} Гц', color='green')
+            else:
+                self.view.set_rate(fs)
+                print_c(f'Поток {self.address}: частота дискретизации изменилась на {fs:g} Гц', color='orange')
+
+    def _on_failed(self, message):
+        with self._messages():
+            print_c(f'Ошибка потока {self.address}: {message}', color='red')
+
+    def _on_finished(self):
+        if self.view is not None:
+            self.view.stop()
+            self.view.refresh()
+        with self._messages():
+            print_c(f'Поток {self.address} завершён: принято отсчётов {self.ring.total}')
+
+
+def open_live_stream(main_window, host=None, port=None):
+    '''
+    Подключается к источнику потока отсчётов и выводит поток на график в режиме прокрутки.
+    Если адрес не задан, он запрашивается в диалоге (формат host:port).
+    Аргументы:
+        main_window: Главное окно приложения.
+        host (str | None), port (int | None): Адрес источника потока.
+    Возвращает:
+        LiveStreamController | None: Контроллер потока или None, если ввод отменён или адрес неверен.
+    '''
+    if host is None or port is None:
+        from PyQt6.QtWidgets import QInputDialog
+        text, ok = QInputDialog.getText(main_window, 'Живой поток', 'Адрес источника (host:port):',
+                                        text=f'127.0.0.1:{LIVE_PORT}')
+        if not ok or not text.strip():
+            return None
+        host, _, port_text = text.strip().rpartition(':')
+        try:
+            port = int(port_text)
+        except ValueError:
+            print_c(f'Неверный адрес источника: {text}', color='red')
+            return None
+        host = host or '127.0.0.1'
+    controller = LiveStreamController(main_window, host, port)
+    if not hasattr(main_window, '_osc_viewer_streams'):
+        main_window._osc_viewer_streams = []
+    main_window._osc_viewer_streams.append(controller)
+    controller.start()
+    print_c(f'Подключение к потоку {controller.address}...')
+    return controller
+
+
+def stop_live_streams(main_window):
+    '''
+    Останавливает все потоки главного окна.
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        int: Количество остановленных потоков.
+    '''
+    streams = getattr(main_window, '_osc_viewer_streams', [])
+    n_active = sum(stream.active for stream in streams)
+    for stream in streams:
+        stream.stop()
+    streams.clear()
+    print_c(f'Потоки остановлены: {n_active}')
+    return n_active
+
+
+def listen_socket(host='127.0.0.1', port=LIVE_PORT):
+    '''
+    Создаёт сокет генератора тестового сигнала, ожидающий подключения (port=0 — свободный порт).
+    Возвращает:
+        socket.socket: Сокет сервера (фактический порт — sock.getsockname()[1]).
+    '''
+    server = socket.create_server((host, port))
+    return server
+
+
+def serve_test_signal(server, fs=1e6, frame_samples=10_000, freq=1e3, amplitude=1.0, noise=0.02,
+                      bits=12, duration=None, realtime=True):
+    '''
+    Генератор тестового сигнала: принимает одно подключение и передаёт синусоиду с шумом кадрами int16
+    (коды АЦП разрядности bits, шаг квантования передаётся в заголовке кадра).
+    Аргументы:
+        server (socket.socket): Сокет сервера (listen_socket).
+        fs (float): Частота дискретизации, Гц.
+        frame_samples (int): Количество отсчётов в кадре.
+        freq (float): Частота синусоиды, Гц.
+        amplitude (float): Амплитуда, В.
+        noise (float): СКО шума, В.
+        bits (int): Разрядность кодов (не более 16).
+        duration (float | None): Длительность передачи, с (None — до отключения клиента).
+        realtime (bool): Передавать кадры в темпе реального времени (False — без пауз).
+    Возвращает:
+        int: Количество переданных отсчётов.
+    '''
+    scale = amplitude * 1.25 / (2 ** (bits - 1) - 1)
+    limit = 2 ** (bits - 1) - 1
+    rng = np.random.default_rng(0)
+    n_total = None if duration is None else int(round(duration * fs))
+    conn, _ = server.accept()
+    sent = 0
+    t_start = time.perf_counter()
+    with conn:
+        try:
+            while n_total is None or sent < n_total:
+                n = frame_samples if n_total is None else min(frame_samples, n_total - sent)
+                t = (sent + np.arange(n)) / fs
+                volts = amplitude * np.sin(2 * np.pi * freq * t) + noise * rng.standard_normal(n)
+                codes = np.clip(np.round(volts / scale), -limit, limit).astype('<i2')
+                write_frame(conn, codes, fs, scale)
+                sent += n
+                if realtime:
+                    delay = sent / fs - (time.perf_counter() - t_start)
+                    if delay > 0:
+                        time.sleep(delay)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    return sent
+
+
+def main(argv=None):
+    '''
+    Командная строка генератора тестового сигнала.
+    Пример: python live_stream.py --port 50505 --fs 1e6 --freq 1e3
+    '''
+    parser = argparse.ArgumentParser(description='Генератор тестового потока отсчётов для osc_viewer.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=LIVE_PORT)
+    parser.add_argument('--fs', type=float, default=1e6, help='Частота дискретизации, Гц')
+    parser.add_argument('--freq', type=float, default=1e3, help='Частота синусоиды, Гц')
+    parser.add_argument('--frame', type=int, default=10_000, help='Отсчётов в кадре')
+    parser.add_argument('--duration', type=float, default=None, help='Длительность передачи, с')
+    args = parser.parse_args(argv)
+    with listen_socket(args.host, args.port) as server:
+        print(f'Генератор ожидает подключения: {args.host}:{server.getsockname()[1]}')
+        sent = serve_test_signal(server, args.fs, args.frame, args.freq, duration=args.duration)
+    print(f'Передано отсчётов: {sent}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
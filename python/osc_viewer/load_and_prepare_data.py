@@ -3,8 +3,8 @@
 load_and_prepare_data.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-25
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.22
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -16,153 +16,1313 @@ load_and_prepare_data.py
 
 Список функций:
 ---------------
-- load_data(file_name: str, format_ver: int)
-    Загружает данные и метаинформацию из CSV-файла в зависимости от версии формата.
+- open_capture(file_name: str, mode='r')
+    Открывает файл записи на чтение; сжатые файлы (.gz, .bz2, .xz) распаковываются потоково.
+- is_compressed(file_name: str)
+    Проверяет, является ли файл сжатым архивом записи.
+- load_data(file_name: str, format_ver: int, max_workers=1, quantized=False)
+    Загружает данные и метаинформацию из CSV-файла в зависимости от версии формата (с возможностью параллельного разбора
+    и хранения отсчётов кодами АЦП int8/int16); файлы WAV/PCM отображаются в память без копирования (см. pcm_data).
+- read_csv_arrays(file_name: str, format_ver: int, block_rows=CSV_BLOCK_ROWS)
+    Блочно читает CSV-файл C-парсером pandas сразу в массивы numpy (время, сигнал) и словарь метаинформации.
+- iter_data_blocks(file_name: str, format_ver: int, block_size=CSV_BLOCK_ROWS)
+    Генератор: потоково читает CSV-файл блоками фиксированного размера (t, s, meta) с ограниченным расходом памяти.
+- stream_statistics(blocks)
+    Вычисляет минимум, максимум, среднее, RMS и СКО сигнала по потоку блоков за один проход.
+- read_capture(file_name: str, format_ver: int)
+    Читает CSV-файл: отсчёты сигнала и равномерная временная ось (TimeBase) с учётом смещения "Start", частота дискретизации.
+- read_capture_parallel(file_name: str, format_ver: int, max_workers=None, chunk_bytes=PARALLEL_CHUNK_BYTES)
+    Читает один большой CSV-файл в пуле процессов: файл делится на фрагменты по границам строк, фрагменты
+    разбираются параллельно и собираются в один непрерывный массив.
+- detect_channels(file_name: str, format_ver: int)
+    Определяет количество и имена каналов CSV-файла по его первым строкам.
+- read_channels(file_name: str, format_ver: int, block_rows=CSV_BLOCK_ROWS)
+    Читает все каналы за один проход: общая временная ось и двумерный массив "канал x отсчёт".
+- load_channels(file_name: str, format_ver: int)
+    Загружает все каналы CSV-файла и выводит информацию о них в консоль.
+- detect_format(file_name: str)
+    Определяет версию формата CSV-файла по его первой строке.
+- read_header_meta(file_name: str, format_ver=None)
+    Читает только метаинформацию записи (частота дискретизации, количество отсчётов, длительность, источник, модель)
+    без разбора отсчётов сигнала.
+- read_sparse_preview(file_name: str, format_ver: int, n_rows=PREVIEW_ROWS)
+    Быстрый предварительный просмотр большого файла: разбираются только строки, начинающиеся после равномерно
+    расположенных байтовых смещений (несколько тысяч строк), номера отсчётов определяются по столбцу времени.
+- meta_to_dataframe(meta: dict)
+    Преобразует метаинформацию в DataFrame и выводит её в консоль.
+- build_row_index(file_name: str, format_ver: int, step=None)
+    Строит индекс байтовых смещений строк данных CSV-файла (векторный поиск начал строк в отображённом в память файле).
+- get_row_index(file_name: str, format_ver: int)
+    Возвращает сохранённый рядом с CSV-файлом индекс смещений строк или строит и сохраняет новый.
+- read_csv_range(file_name: str, format_ver: int, inx_start=0, inx_stop=None, downsampling_factor=1)
+    Читает только диапазон отсчётов с прореживанием, переходя к началу диапазона по индексу смещений строк
+    (сжатые файлы разбираются потоково с начала).
+- load_data_cached(file_name: str, format_ver: int, inx_start=0, inx_stop=None, downsampling_factor=1, max_workers=1,
+                   quantized=False)
+    Загружает данные (или их диапазон) через бинарный кэш, отображаемый в память (см. data_cache).
 - prepare_data(t, s, downsampling_factor=10)
-    Выполняет даунсемплирование, удаление постоянной составляющей и дополнение массивов до нужной длины.
+    Выполняет децимацию (с фильтром защиты от наложения спектров), удаление постоянной составляющей и дополнение
+    массивов до нужной длины.
 - open_csv_file(main_window)
     Открывает диалог выбора файла, загружает параметры отображения и данные, отображает сигнал на графике.
+- select_csv_file(main_window)
+    Открывает диалог выбора CSV-файла и устанавливает параметры отображения главного окна.
+- read_display_params(file_name: str)
+    Читает параметры отображения (format_ver, inx_start, inx_stop, downsampling_factor) из JSON-файла рядом с CSV-файлом.
+- add_signal_line(main_window, file_name, t, s, label_suffix=None)
+    Добавляет сигнал на график с подписью (именем файла) и настраивает оси.
+- add_channel_lines(main_window, file_name, t, S, names) / open_csv_channels(main_window)
+    Добавляют каждый канал многоканального файла на график отдельной линией.
+- load_files_parallel(jobs, max_workers=None, quantized=False)
+    Генератор: загружает несколько файлов в пуле процессов и выдаёт результаты по мере готовности.
+- find_csv_files(folder)
+    Находит CSV-файлы в папке и вложенных папках.
+- import_csv_files(main_window, file_names, max_workers=None, quantized=False)
+    Загружает несколько CSV-файлов параллельно и добавляет каждый сигнал на график, как только он загружен.
+- open_csv_files(main_window) / open_csv_folder(main_window)
+    Открывают диалог выбора нескольких файлов или папки и загружают файлы параллельно.
 - print_c(text, color='white')
     Выводит текст в консоль с заданным цветом.
 '''
 
+import os
+import io
+import json  # Для работы с JSON файлами
+import mmap
+import contextlib
+import gzip
+import bz2
+import lzma
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Бинарный кэш отсчётов и индекс смещений строк рядом с CSV-файлом
+from data_cache import load_cache, save_cache, load_row_index, save_row_index
+# Равномерная временная ось (t0, dt, n) вместо массива отсчётов времени
+from time_base import TimeBase, as_time_base
+# Компактное хранение отсчётов кодами АЦП (int8/int16) с шагом и смещением
+from quantized import QuantizedSignal, quantize
+# Записи WAV и PCM без заголовка: отображение в память без перевода в CSV
+from pcm_data import PCM_EXTENSIONS, is_pcm_file, read_pcm, read_pcm_channels, read_pcm_header_meta
+# Конвейер предобработки на массивах NumPy: децимация, удаление постоянной составляющей, дополнение нулями
+from preprocess import Pipeline, Decimate, Detrend, PadTruncate
 
 class MetaInfo:
     def __init__(self, info):
         self.info = info
 
-def load_data(file_name, format_ver):
+# Количество строк CSV-файла, разбираемых C-парсером pandas за один блок
+CSV_BLOCK_ROWS = 262_144
+# Шаг индекса смещений строк: сохраняется смещение каждой ROW_INDEX_STEP-й строки данных
+ROW_INDEX_STEP = 4096
+# Размер фрагмента файла (в байтах), в котором за один проход ищутся начала строк при построении индекса
+ROW_INDEX_SCAN_BYTES = 1 << 24
+# Количество столбцов на канал в файлах формата 0 (метаинформация, время, сигнал и пустой столбец-разделитель)
+TEK_CHANNEL_COLUMNS = 6
+# Количество первых строк файла формата 0, в которых ищется метаинформация
+HEADER_SCAN_LINES = 64
+# Размер конца файла (в байтах), в котором ищется последняя строка данных
+TAIL_SCAN_BYTES = 4096
+# Размер фрагмента файла (в байтах), разбираемого одним процессом при параллельном чтении
+PARALLEL_CHUNK_BYTES = 1 << 26
+# Файлы меньшего размера читаются в одном процессе: запуск пула процессов дороже их разбора
+PARALLEL_MIN_BYTES = 1 << 25
+# Количество строк, разбираемых для предварительного просмотра файла (read_sparse_preview)
+PREVIEW_ROWS = 4000
+# Функции открытия сжатых файлов записи по расширению: распаковка выполняется потоково, по мере чтения
+COMPRESSED_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+def is_compressed(file_name):
     '''
-    Параметры:
+    Проверяет, является ли файл сжатым архивом записи (.gz, .bz2, .xz).
+    Аргументы:
+        file_name (str): Путь к файлу.
+    Возвращает:
+        bool: True для сжатого файла.
+    '''
+    return os.path.splitext(file_name)[1].lower() in COMPRESSED_OPENERS
+
+def open_capture(file_name, mode='r'):
+    '''
+    Открывает файл записи на чтение. Сжатые файлы (.csv.gz, .csv.bz2, .csv.xz) распаковываются потоково
+    блок за блоком прямо в разборщик, без распаковки во временный файл.
+    Аргументы:
+        file_name (str): Путь к файлу.
+        mode (str): 'r' — текстовый режим (UTF-8), 'rb' — двоичный режим.
+    Возвращает:
+        Открытый файловый объект.
+    '''
+    opener = COMPRESSED_OPENERS.get(os.path.splitext(file_name)[1].lower())
+    if 'b' in mode:
+        return opener(file_name, 'rb') if opener else open(file_name, 'rb')
+    if opener:
+        return opener(file_name, 'rt', encoding='utf-8')
+    return open(file_name, 'r', encoding='utf-8')
+
+def _read_header_format1(io):
+    '''
+    Читает две строки заголовка файла формата 1: имена столбцов и значения метаинформации.
+    Аргументы:
+        io: Открытый текстовый файл, позиционированный на начало.
+    Возвращает:
+        meta (dict): Метаинформация (имя столбца -> значение).
+        k_t (float): Шаг по времени ("Increment"), 1.0 если не задан.
+    '''
+    meta = {}
+    k_t = 1.0
+    names = io.readline().strip().split(',')
+    fields = io.readline().strip().split(',')
+    for i in range(len(names)-1):
+        meta[names[i]] = fields[i]
+        if names[i] == "Increment":
+            k_t = float(fields[i])
+    return meta, k_t
+
+def _iter_csv_rows(io, format_ver, channel_meta, block_rows=CSV_BLOCK_ROWS, n_channels=1):
+    '''
+    Генератор блоков отсчётов CSV-файла для одного или нескольких каналов. Разбор строк выполняет C-парсер pandas,
+    из файла читаются только нужные столбцы.
+    Аргументы:
+        io: Открытый текстовый файл. Для формата 1 заголовок уже должен быть прочитан.
+        format_ver (int): Версия формата файла (0 или 1).
+        channel_meta (list): Словари метаинформации каналов (для формата 0 пополняются строками метаинформации
+            по мере чтения; для формата 1 используется только первый словарь).
+        block_rows (int): Количество строк файла в одном блоке.
+        n_channels (int): Количество каналов (см. detect_channels).
+    Возвращает (yield):
+        t (np.ndarray): Отсчёты времени блока (для формата 1 — номер отсчёта без учёта "Increment").
+        data (np.ndarray): Отсчёты каналов блока, форма (количество строк, n_channels).
+    '''
+    try:
+        if format_ver == 0:
+            # Формат 0: на канал приходится TEK_CHANNEL_COLUMNS столбцов:
+            # 0-2 — метаинформация, 3 — время, 4 — сигнал (время общее, берётся из первого канала)
+            meta_cols = [k * TEK_CHANNEL_COLUMNS + j for k in range(n_channels) for j in (0, 1)]
+            value_cols = [k * TEK_CHANNEL_COLUMNS + 4 for k in range(n_channels)]
+            dtype = {c: str for c in meta_cols + [2]}
+            dtype.update({c: np.float64 for c in [3] + value_cols})
+            reader = pd.read_csv(
+                io, header=None, usecols=sorted(set(meta_cols + [2, 3] + value_cols)), dtype=dtype,
+                keep_default_na=False, na_values=[''], skipinitialspace=True,
+                chunksize=block_rows, engine='c',
+            )
+        elif format_ver == 1:
+            # Формат 1: столбец 0 — номер отсчёта, 1..n_channels — сигналы каналов
+            value_cols = list(range(1, n_channels + 1))
+            reader = pd.read_csv(
+                io, header=None, usecols=[0] + value_cols, dtype=np.float64,
+                skipinitialspace=True, chunksize=block_rows, engine='c',
+            )
+        else:
+            return
+    except pd.errors.EmptyDataError:
+        return  # После заголовка нет ни одной строки данных — блоков нет
+
+    with reader:
+        for chunk in reader:
+            if format_ver == 0:
+                # Строки с непустыми первыми тремя полями содержат метаинформацию
+                is_meta = chunk[0].notna() | chunk[1].notna() | chunk[2].notna()
+                if is_meta.any():
+                    for k in range(n_channels):
+                        c = k * TEK_CHANNEL_COLUMNS
+                        meta_rows = chunk.loc[is_meta, [c, c + 1]].fillna('')
+                        if k > 0:
+                            meta_rows = meta_rows[meta_rows[c] != '']
+                        channel_meta[k].update(zip(meta_rows[c], meta_rows[c + 1]))
+                # Строки метаинформации тоже содержат отсчёты (столбцы 3-4), иначе временная ось была бы неравномерной
+                data = chunk[[3] + value_cols].to_numpy()
+            else:
+                data = chunk.to_numpy()
+            # Пропускаем строки с пустыми значениями времени или сигнала
+            data = data[~np.isnan(data).any(axis=1)]
+            yield data[:, 0], data[:, 1:]
+
+def _iter_csv_blocks(io, format_ver, meta, block_rows=CSV_BLOCK_ROWS):
+    '''
+    Генератор блоков отсчётов одного канала CSV-файла (см. _iter_csv_rows).
+    Аргументы:
+        io: Открытый текстовый файл. Для формата 1 заголовок уже должен быть прочитан.
+        format_ver (int): Версия формата файла (0 или 1).
+        meta (dict): Словарь метаинформации. Для формата 0 пополняется строками метаинформации по мере чтения.
+        block_rows (int): Количество строк файла в одном блоке.
+    Возвращает (yield):
+        t (np.ndarray): Отсчёты времени блока (для формата 1 — номер отсчёта без учёта "Increment").
+        s (np.ndarray): Отсчёты сигнала блока.
+    '''
+    for t, data in _iter_csv_rows(io, format_ver, [meta], block_rows):
+        yield t, data[:, 0]
+
+def read_csv_arrays(file_name, format_ver, block_rows=CSV_BLOCK_ROWS):
+    '''
+    Читает CSV-файл блоками сразу в массивы numpy, без построчного разбора в Python.
+    Аргументы:
         file_name (str): Путь к CSV-файлу с данными.
-        format_ver (int): Версия формата файла. 
-            0 — метаинформация и данные разделены пустыми строками.
-            1 — первая строка содержит имена столбцов, вторая — значения метаинформации.
+        format_ver (int): Версия формата файла (см. load_data).
+        block_rows (int): Количество строк файла в одном блоке.
     Возвращает:
-        t (list of float): Временной массив.
-        s (list of float): Массив значений сигнала.
-        meta_df (pandas.DataFrame): DataFrame с метаинформацией (ключ-значение).
-    Особенности:
-        - Автоматически вычисляет частоту дискретизации (fs), если возможно.
-        - Корректирует временной массив с учетом смещения "Start" из метаинформации, если оно задано.
-        - Выводит статус загрузки и информацию о сигнале в консоль.
+        t (np.ndarray): Временной массив (без учёта смещения "Start").
+        s (np.ndarray): Массив значений сигнала.
+        meta (dict): Метаинформация (ключ -> значение).
     '''
+    meta = {}
+    k_t = 1.0
+    t_blocks = []
+    s_blocks = []
+    with open_capture(file_name) as io:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(io)
+        for t_block, s_block in _iter_csv_blocks(io, format_ver, meta, block_rows):
+            t_blocks.append(t_block)
+            s_blocks.append(s_block)
 
-    # Статус для отображения процесса загрузки
+    t = np.concatenate(t_blocks) if t_blocks else np.empty(0)
+    s = np.concatenate(s_blocks) if s_blocks else np.empty(0)
+    if k_t != 1.0:
+        t *= k_t
+    return t, s, meta
+
+def _sample_interval(format_ver, meta, k_t, t_first, t_last=None, n=0):
+    '''
+    Определяет шаг по времени (период дискретизации) без массива отсчётов времени.
+    Для формата 0 шаг берётся из "Sample Interval", для формата 1 — по номерам первых двух отсчётов с учётом "Increment".
+    Если "Sample Interval" не задан, используется средний шаг между первым и последним отсчётами (или первыми двумя).
+    Аргументы:
+        format_ver (int): Версия формата файла (см. load_data).
+        meta (dict): Метаинформация файла.
+        k_t (float): Шаг по времени ("Increment") для формата 1.
+        t_first (list): Первые (не более двух) отсчёты времени без учёта "Increment" и "Start".
+        t_last (float | None): Последний отсчёт времени без учёта "Increment" и "Start".
+        n (int): Количество отсчётов от t_first[0] до t_last включительно.
+    Возвращает:
+        float: Шаг по времени; 0.0, если данных недостаточно.
+    '''
+    if format_ver == 0 and 'Sample Interval' in meta:
+        try:
+            return float(meta['Sample Interval'])
+        except ValueError:
+            pass
+    if format_ver == 0 and t_last is not None and n > 1:
+        return float((t_last - t_first[0]) / (n - 1))
+    if len(t_first) > 1:
+        return float((t_first[1] - t_first[0]) * k_t)
+    return 0.0
+
+def _make_time_base(format_ver, meta, k_t, t_first, t_last, n):
+    '''
+    Формирует равномерную временную ось сигнала с учётом "Increment" и смещения "Start"
+    и дополняет метаинформацию частотой дискретизации "fs".
+    Аргументы:
+        format_ver, meta, k_t, t_first, t_last, n: См. _sample_interval.
+    Возвращает:
+        TimeBase: Временная ось из n отсчётов.
+    '''
+    dt = _sample_interval(format_ver, meta, k_t, t_first, t_last, n)
+    meta['fs'] = 1/dt if dt else 0.0  # 0.0, если данных недостаточно
+    t0 = t_first[0] * k_t if t_first else 0.0
+    if 'Start' in meta:
+        t0 += float(meta['Start'])
+    return TimeBase(t0, dt, n)
+
+def iter_data_blocks(file_name, format_ver, block_size=CSV_BLOCK_ROWS):
+    '''
+    Потоковое чтение CSV-файла блоками фиксированного размера.
+    В памяти одновременно находится не более одного блока разбора pandas и одного выходного блока,
+    поэтому файл любого размера обрабатывается с ограниченным расходом памяти.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        block_size (int): Количество отсчётов в блоке (последний блок может быть короче).
+    Возвращает (yield):
+        t (TimeBase): Равномерная временная ось блока с учётом "Increment" и смещения "Start".
+        s (np.ndarray): Отсчёты сигнала блока.
+        meta (dict): Метаинформация, прочитанная к этому моменту (один и тот же словарь для всех блоков);
+            частота дискретизации "fs" добавляется, как только становится известен шаг по времени.
+    Пример:
+        for t, s, meta in iter_data_blocks(file_name, 1, block_size=1 << 16):
+            ...  # децимация, статистика, спектральное усреднение
+    '''
+    meta = {}
+    k_t = 1.0
+    t_first = []  # Первые два отсчёта времени (для вычисления шага, если он не задан в метаинформации)
+    dt = None
+    with open_capture(file_name) as io:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(io)
+        start_t = float(meta['Start']) if 'Start' in meta else 0.0
+
+        def finish_block(t_block0, s):
+            nonlocal dt
+            if dt is None:
+                dt = _sample_interval(format_ver, meta, k_t, t_first) or None
+                if dt is not None:
+                    meta['fs'] = 1/dt
+            # Время блока задаётся первым отсчётом и шагом, массив времени не формируется
+            return TimeBase(t_block0 * k_t + start_t, dt or 0.0, len(s)), s, meta
+
+        s_buf = np.empty(block_size)
+        n = 0
+        t_block0 = 0.0
+        for t_chunk, s_chunk in _iter_csv_blocks(io, format_ver, meta, block_size):
+            if len(t_first) < 2:
+                t_first.extend(t_chunk[:2 - len(t_first)])
+            pos = 0
+            while pos < len(s_chunk):
+                if n == 0:
+                    t_block0 = t_chunk[pos]
+                k = min(block_size - n, len(s_chunk) - pos)
+                s_buf[n:n+k] = s_chunk[pos:pos+k]
+                n += k
+                pos += k
+                if n == block_size:
+                    yield finish_block(t_block0, s_buf)
+                    # Потребитель может сохранить ссылку на блок, поэтому буфер не переиспользуем
+                    s_buf = np.empty(block_size)
+                    n = 0
+        if n > 0:
+            yield finish_block(t_block0, s_buf[:n])
+
+    if 'fs' not in meta:
+        meta['fs'] = 0.0  # Если данных недостаточно
+
+def stream_statistics(blocks):
+    '''
+    Вычисляет статистику сигнала по потоку блоков за один проход, не храня сигнал целиком.
+    Аргументы:
+        blocks (iterable): Последовательность блоков (t, s, ...) или массивов s, например iter_data_blocks(...).
+    Возвращает:
+        dict: Количество отсчётов "n", минимум "min", максимум "max", среднее "mean",
+        среднеквадратическое значение "rms" и стандартное отклонение "std".
+    '''
+    n = 0
+    mean = 0.0
+    m2 = 0.0         # Сумма квадратов отклонений от среднего (алгоритм Чана)
+    sum_sq = 0.0     # Сумма квадратов отсчётов (для RMS)
+    s_min = np.inf
+    s_max = -np.inf
+    for block in blocks:
+        s = block[1] if isinstance(block, tuple) else block
+        k = len(s)
+        if k == 0:
+            continue
+        block_mean = float(np.mean(s))
+        block_m2 = float(np.sum((s - block_mean) ** 2))
+        delta = block_mean - mean
+        total = n + k
+        mean += delta * k / total
+        m2 += block_m2 + delta ** 2 * n * k / total
+        n = total
+        sum_sq += float(np.dot(s, s))
+        s_min = min(s_min, float(np.min(s)))
+        s_max = max(s_max, float(np.max(s)))
+    if n == 0:
+        return {'n': 0, 'min': np.nan, 'max': np.nan, 'mean': np.nan, 'rms': np.nan, 'std': np.nan}
+    return {
+        'n': n,
+        'min': s_min,
+        'max': s_max,
+        'mean': mean,
+        'rms': float(np.sqrt(sum_sq / n)),
+        'std': float(np.sqrt(m2 / n)),
+    }
+
+def build_row_index(file_name, format_ver, step=None):
+    '''
+    Строит индекс байтовых смещений строк данных CSV-файла без разбора чисел.
+    Файл отображается в память, начала строк ищутся векторно (numpy) фрагментами по ROW_INDEX_SCAN_BYTES байт.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        step (int | None): Шаг индекса (сохраняется смещение каждой step-й строки данных), по умолчанию ROW_INDEX_STEP.
+    Возвращает:
+        offsets (np.ndarray): Байтовые смещения строк данных с номерами 0, step, 2*step, ...
+        n_rows (int): Общее количество строк данных.
+        meta (dict): Метаинформация заголовка (формат 1) или строк метаинформации (формат 0).
+    Исключения:
+        ValueError: Для сжатого файла (смещения строк в сжатом потоке не имеют смысла).
+    '''
+    if is_compressed(file_name):
+        raise ValueError(f'Индекс строк недоступен для сжатого файла: {file_name}')
+    if step is None:
+        step = ROW_INDEX_STEP
+    meta = {}
+    header_lines = 0
+    if format_ver == 1:
+        with open_capture(file_name) as io:
+            meta, _ = _read_header_format1(io)
+        header_lines = 2
+
+    offsets = []
+    n_rows = 0
+    line_no = 0
+    with open(file_name, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return np.empty(0, dtype=np.int64), 0, meta
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            for a in range(0, size, ROW_INDEX_SCAN_BYTES):
+                b = min(a + ROW_INDEX_SCAN_BYTES, size)
+                # Начала строк: позиция 0 и позиции после символа перевода строки
+                starts = np.flatnonzero(buf[a:b] == 10) + (a + 1)
+                if a == 0:
+                    starts = np.concatenate(([0], starts))
+                starts = starts[starts < size]
+                # Пропускаем строки заголовка
+                if line_no < header_lines:
+                    k = min(header_lines - line_no, len(starts))
+                    starts = starts[k:]
+                    line_no += k
+                if format_ver == 0:
+                    # Формат 0: строка данных начинается с трёх пустых полей ",,,"
+                    is_data = np.zeros(len(starts), dtype=bool)
+                    ok = starts + 2 < size
+                    s_ok = starts[ok]
+                    is_data[ok] = (buf[s_ok] == 44) & (buf[s_ok + 1] == 44) & (buf[s_ok + 2] == 44)
+                    # Остальные строки (их немного) разбираем как метаинформацию;
+                    # строка с непустыми полями времени и сигнала также является строкой данных
+                    for i in np.flatnonzero(~is_data):
+                        start = int(starts[i])
+                        end = mm.find(b"\n", start)
+                        fields = mm[start:end if end >= 0 else size].decode("utf-8").strip().split(',')
+                        if len(fields) >= 5 and (fields[0] != "" or fields[1] != "" or fields[2] != ""):
+                            meta[fields[0]] = fields[1]
+                        is_data[i] = len(fields) >= 5 and fields[3].strip() != "" and fields[4].strip() != ""
+                else:
+                    # Формат 1: строка данных не пустая и начинается не с разделителя
+                    first = buf[starts]
+                    is_data = (first != 44) & (first != 13) & (first != 10)
+                data_starts = starts[is_data]
+                # Сохраняем смещения строк с глобальными номерами, кратными step
+                offsets.append(data_starts[(-n_rows) % step::step].astype(np.int64))
+                n_rows += len(data_starts)
+            del buf  # Освобождаем буфер до закрытия mmap
+
+    offsets = np.concatenate(offsets) if offsets else np.empty(0, dtype=np.int64)
+    return offsets, n_rows, meta
+
+def get_row_index(file_name, format_ver):
+    '''
+    Возвращает индекс смещений строк данных CSV-файла: из файла индекса рядом с CSV-файлом,
+    а если его нет или он устарел — строит индекс (build_row_index) и сохраняет его.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+    Возвращает:
+        tuple: (offsets, n_rows, meta) — см. build_row_index.
+    '''
+    index = load_row_index(file_name, format_ver)
+    # Индекс, построенный с другим шагом, перестраиваем
+    if index is not None and len(index[0]) != -(-index[1] // ROW_INDEX_STEP):
+        index = None
+    if index is None:
+        index = build_row_index(file_name, format_ver)
+        if not save_row_index(file_name, format_ver, *index):
+            print_c('Не удалось сохранить индекс строк', color='orange')
+    return index
+
+def read_csv_range(file_name, format_ver, inx_start=0, inx_stop=None, downsampling_factor=1):
+    '''
+    Читает из CSV-файла только диапазон отсчётов s[inx_start:inx_stop:downsampling_factor].
+    По индексу смещений строк (get_row_index) выполняется переход сразу к нужному месту файла,
+    разбираются только строки диапазона (плюс не более ROW_INDEX_STEP строк до его начала),
+    прореживание применяется поблочно во время разбора.
+    Сжатый файл (см. is_compressed) не допускает перехода по смещениям: он распаковывается и разбирается потоково
+    с начала до конца диапазона, в памяти сохраняются только выбранные отсчёты.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        inx_start (int): Индекс первого отсчёта.
+        inx_stop (int | None): Индекс отсчёта, следующего за последним (None — до конца файла).
+        downsampling_factor (int): Шаг прореживания.
+    Возвращает:
+        t (TimeBase): Равномерная временная ось диапазона (шаг с учётом прореживания), "Increment" и "Start" учтены.
+        s (np.ndarray): Массив значений сигнала.
+        meta (dict): Метаинформация, дополненная частотой дискретизации "fs" (исходной, до прореживания).
+    '''
+    ds = max(1, int(downsampling_factor or 1))
+    inx_start = max(0, int(inx_start or 0))
+    if is_compressed(file_name):
+        return _read_compressed_range(file_name, format_ver, inx_start, inx_stop, ds)
+    offsets, n_rows, header_meta = get_row_index(file_name, format_ver)
+    meta = dict(header_meta)
+    k_t = float(meta['Increment']) if format_ver == 1 and 'Increment' in meta else 1.0
+    inx_stop = n_rows if inx_stop is None else min(int(inx_stop), n_rows)
+    n_out = len(range(inx_start, inx_stop, ds))
+
+    s = np.empty(n_out)
+    t_pair = []  # Отсчёты времени строк inx_start и inx_start+1 (для вычисления шага по времени)
+    t_last = None  # Отсчёт времени последней выбранной строки
+    n = 0
+    if n_out > 0:
+        step = ROW_INDEX_STEP
+        row = (inx_start // step) * step  # Номер строки данных, с которой начинается чтение
+        block_rows = min(CSV_BLOCK_ROWS, inx_stop - row)
+        with open(file_name, "rb") as io:
+            io.seek(int(offsets[inx_start // step]))
+            for t_chunk, s_chunk in _iter_csv_blocks(io, format_ver, {}, block_rows):
+                k = len(t_chunk)
+                if len(t_pair) < 2 and row + k > inx_start:
+                    lo = max(inx_start - row, 0)
+                    t_pair.extend(t_chunk[lo:lo + 2 - len(t_pair)])
+                # Первая строка блока, попадающая в сетку inx_start + j*ds
+                first = max(inx_start, inx_start + -(-(row - inx_start) // ds) * ds)
+                stop = min(row + k, inx_stop)
+                if first < stop:
+                    m = len(range(first, stop, ds))
+                    s[n:n+m] = s_chunk[first-row:stop-row:ds]
+                    t_last = t_chunk[first - row + (m - 1) * ds]
+                    n += m
+                row += k
+                if row >= inx_stop and len(t_pair) >= 2:
+                    break
+    s = s[:n]
+
+    # Ось строится по исходному шагу, затем прореживается срезом (без массива времени)
+    t = _make_time_base(format_ver, meta, k_t, t_pair, t_last, (n - 1) * ds + 1 if n else 0)
+    return t[::ds], s, meta
+
+def _read_compressed_range(file_name, format_ver, inx_start, inx_stop, ds):
+    '''
+    Читает диапазон отсчётов s[inx_start:inx_stop:ds] сжатого файла потоковой распаковкой с начала файла
+    (см. read_csv_range). Разбор прекращается, как только прочитан конец диапазона.
+    Аргументы и возвращаемые значения: см. read_csv_range.
+    '''
+    meta = {}
+    k_t = 1.0
+    s_parts = []
+    t_pair = []
+    t_last = None
+    n = 0
+    row = 0
+    with open_capture(file_name) as io:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(io)
+        for t_chunk, s_chunk in _iter_csv_blocks(io, format_ver, meta):
+            k = len(t_chunk)
+            if len(t_pair) < 2 and row + k > inx_start:
+                lo = max(inx_start - row, 0)
+                t_pair.extend(t_chunk[lo:lo + 2 - len(t_pair)])
+            first = max(inx_start, inx_start + -(-(row - inx_start) // ds) * ds)
+            stop = row + k if inx_stop is None else min(row + k, int(inx_stop))
+            if first < stop:
+                # Копия, чтобы не удерживать в памяти весь блок разбора
+                part = s_chunk[first-row:stop-row:ds].copy()
+                s_parts.append(part)
+                t_last = t_chunk[first - row + (len(part) - 1) * ds]
+                n += len(part)
+            row += k
+            if inx_stop is not None and row >= inx_stop and len(t_pair) >= 2:
+                break
+    s = np.concatenate(s_parts) if s_parts else np.empty(0)
+    t = _make_time_base(format_ver, meta, k_t, t_pair, t_last, (n - 1) * ds + 1 if n else 0)
+    return t[::ds], s, meta
+
+def read_capture(file_name, format_ver):
+    '''
+    Читает CSV-файл и возвращает готовые к отображению отсчёты сигнала, временную ось и метаинформацию.
+    Массив отсчётов времени не формируется: сохраняются только первые два и последний отсчёты времени.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+    Возвращает:
+        t (TimeBase): Равномерная временная ось с учётом "Increment" и смещения "Start".
+        s (np.ndarray): Массив значений сигнала.
+        meta (dict): Метаинформация, дополненная частотой дискретизации "fs".
+    '''
+    meta = {}
+    k_t = 1.0
+    t_first = []
+    t_last = None
+    s_blocks = []
+    with open_capture(file_name) as io:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(io)
+        for t_block, s_block in _iter_csv_blocks(io, format_ver, meta):
+            if len(t_block) == 0:
+                continue
+            if len(t_first) < 2:
+                t_first.extend(t_block[:2 - len(t_first)])
+            t_last = t_block[-1]
+            s_blocks.append(s_block)
+
+    s = np.concatenate(s_blocks) if s_blocks else np.empty(0)
+    t = _make_time_base(format_ver, meta, k_t, t_first, t_last, len(s))
+    return t, s, meta
+
+def _parse_byte_range(file_name, format_ver, a, b):
+    '''
+    Разбирает фрагмент [a, b) CSV-файла (границы совпадают с началами строк). Выполняется в процессе пула
+    (см. read_capture_parallel): фрагмент берётся из отображённого в память файла.
+    Возвращает:
+        tuple: (t_first, t_last, s, meta) — первые два и последний отсчёты времени фрагмента без учёта "Increment"
+        и "Start", отсчёты сигнала и метаинформация строк фрагмента (для формата 0).
+    '''
+    meta = {}
+    t_first = []
+    t_last = None
+    s_blocks = []
+    with open(file_name, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        chunk = io.BytesIO(mm[a:b])
+    for t_block, s_block in _iter_csv_blocks(chunk, format_ver, meta):
+        if len(t_block) == 0:
+            continue
+        if len(t_first) < 2:
+            t_first.extend(t_block[:2 - len(t_first)])
+        t_last = t_block[-1]
+        s_blocks.append(s_block)
+    s = np.concatenate(s_blocks) if s_blocks else np.empty(0)
+    return t_first, t_last, s, meta
+
+def read_capture_parallel(file_name, format_ver, max_workers=None, chunk_bytes=PARALLEL_CHUNK_BYTES):
+    '''
+    Читает один большой CSV-файл, разбирая его фрагменты в пуле процессов.
+    Файл отображается в память и делится на фрагменты примерно по chunk_bytes байт, границы фрагментов сдвигаются
+    к началам строк. Заголовок формата 1 читается один раз и в разбор не передаётся; строки метаинформации
+    формата 0 находятся в начале файла, поэтому метаинформация берётся из первого фрагмента.
+    Отсчёты фрагментов собираются по порядку в один непрерывный массив.
+    Сжатые файлы, файлы меньше PARALLEL_MIN_BYTES и max_workers <= 1 читаются в одном процессе (read_capture).
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        max_workers (int | None): Количество процессов (по умолчанию — по числу ядер).
+        chunk_bytes (int): Примерный размер фрагмента файла, байт.
+    Возвращает:
+        t, s, meta: См. read_capture.
+    '''
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers <= 1 or is_compressed(file_name) or os.path.getsize(file_name) < max(PARALLEL_MIN_BYTES, 1):
+        return read_capture(file_name, format_ver)
+
+    meta = {}
+    k_t = 1.0
+    with open_capture(file_name) as header:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(header)
+    with open(file_name, "rb") as f:
+        if format_ver == 1:
+            f.readline()
+            f.readline()
+        data_start = f.tell()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
+            n_chunks = max(max_workers, -(-(size - data_start) // chunk_bytes))
+            bounds = [data_start]
+            for k in range(1, n_chunks):
+                pos = max(bounds[-1], data_start + (size - data_start) * k // n_chunks)
+                end = mm.find(b"\n", pos)
+                if end < 0:
+                    break
+                if end + 1 > bounds[-1]:
+                    bounds.append(end + 1)
+            bounds.append(size)
+    bounds = sorted(set(bounds))
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(bounds) - 1)) as pool:
+        parts = list(pool.map(
+            _parse_byte_range, [file_name] * (len(bounds) - 1), [format_ver] * (len(bounds) - 1), bounds[:-1], bounds[1:]
+        ))
+
+    # Сборка фрагментов в один непрерывный массив
+    n = sum(len(part[2]) for part in parts)
+    s = np.empty(n)
+    t_first = []
+    t_last = None
+    pos = 0
+    for part_t_first, part_t_last, part_s, _ in parts:
+        if len(part_s) == 0:
+            continue
+        if len(t_first) < 2:
+            t_first.extend(part_t_first[:2 - len(t_first)])
+        t_last = part_t_last
+        s[pos:pos + len(part_s)] = part_s
+        pos += len(part_s)
+    if format_ver == 0:
+        meta = parts[0][3]
+    t = _make_time_base(format_ver, meta, k_t, t_first, t_last, n)
+    return t, s, meta
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+def detect_channels(file_name, format_ver):
+    '''
+    Определяет количество и имена каналов CSV-файла по его первым строкам.
+    Формат 0: каналы расположены рядом, по TEK_CHANNEL_COLUMNS столбцов на канал; имя канала берётся из строки "Source".
+    Формат 1: после столбца номера отсчёта идут столбцы каналов, у которых во второй строке заголовка указана
+    единица измерения (например, "X,CH1,CH2,Start,Increment," / "Sequence,Volt,Volt,...").
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+    Возвращает:
+        names (list of str): Имена каналов (не менее одного).
+    '''
+    with open_capture(file_name) as io:
+        first = io.readline().rstrip('\r\n').split(',')
+        second = io.readline().rstrip('\r\n').split(',')
+    if format_ver == 0:
+        n_channels = max(1, (len(first) + 1) // TEK_CHANNEL_COLUMNS)
+        names = [f'CH{k + 1}' for k in range(n_channels)]
+        # Имена каналов из строки "Source" (ищем в начале файла, где расположена метаинформация)
+        with open_capture(file_name) as io:
+            for _, line in zip(range(HEADER_SCAN_LINES), io):
+                fields = line.rstrip('\r\n').split(',')
+                for k in range(n_channels):
+                    c = k * TEK_CHANNEL_COLUMNS
+                    if len(fields) > c + 1 and fields[c].strip() == 'Source' and fields[c + 1].strip():
+                        names[k] = fields[c + 1].strip()
+        return names
+    names = []
+    for i in range(1, len(first)):
+        if not first[i] or i >= len(second) or _is_number(second[i]):
+            break
+        names.append(first[i])
+    return names if names else ['CH1']
+
+def read_channels(file_name, format_ver, block_rows=CSV_BLOCK_ROWS):
+    '''
+    Читает все каналы CSV-файла за один проход в общую временную ось и непрерывный двумерный массив.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        block_rows (int): Количество строк файла в одном блоке разбора.
+    Возвращает:
+        t (TimeBase): Общая для всех каналов равномерная временная ось с учётом "Increment" и смещения "Start".
+        S (np.ndarray): Отсчёты каналов, форма (количество каналов, количество отсчётов); S[k] — непрерывный массив канала k.
+        names (list of str): Имена каналов.
+        meta (dict): Метаинформация (для формата 0 — первого канала), дополненная частотой дискретизации "fs".
+    '''
+    names = detect_channels(file_name, format_ver)
+    n_channels = len(names)
+    meta = {}
+    channel_meta = [meta] + [{} for _ in range(n_channels - 1)]
+    k_t = 1.0
+    t_first = []
+    t_last = None
+    blocks = []
+    with open_capture(file_name) as io:
+        if format_ver == 1:
+            meta, k_t = _read_header_format1(io)
+            channel_meta[0] = meta
+        for t_block, data in _iter_csv_rows(io, format_ver, channel_meta, block_rows, n_channels):
+            if len(t_block) == 0:
+                continue
+            if len(t_first) < 2:
+                t_first.extend(t_block[:2 - len(t_first)])
+            t_last = t_block[-1]
+            blocks.append(data)
+
+    # Собираем блоки сразу в массив "канал x отсчёт", без промежуточной копии
+    n = sum(len(data) for data in blocks)
+    S = np.empty((n_channels, n))
+    pos = 0
+    for data in blocks:
+        S[:, pos:pos + len(data)] = data.T
+        pos += len(data)
+    t = _make_time_base(format_ver, meta, k_t, t_first, t_last, n)
+    return t, S, names, meta
+
+def load_channels(file_name, format_ver):
+    '''
+    Загружает все каналы CSV-файла за один проход (read_channels) и выводит информацию о них в консоль.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+    Возвращает:
+        t (TimeBase): Общая временная ось.
+        S (np.ndarray | list): Отсчёты каналов, форма (количество каналов, количество отсчётов);
+            для файла WAV/PCM — список отображённых в память каналов (см. read_pcm_channels).
+        names (list of str): Имена каналов.
+        meta_df (pandas.DataFrame): DataFrame с метаинформацией (ключ-значение).
+    '''
     print_c(f'Загрузка файла: {file_name}  Формат: {format_ver}', color='blue')
 
-    meta = {}  # Словарь для хранения метаинформации
-    t = []     # Список для времени
-    s = []     # Список для значений сигнала
-    k_t = 1.0  # Коэффициент масштабирования времени
-
-    with open(file_name, "r", encoding="utf-8") as io:
-        cnt_str = 0
-        names = []
-        cnt = 0
-        for line in io:
-            fields = line.strip().split(',')
-            if format_ver == 0:
-                # Формат 0: метаинформация и данные разделены пустыми строками
-                if len(fields) >= 5 and (fields[0] != "" or fields[1] != "" or fields[2] != ""):
+    if is_pcm_file(file_name):
+        t, S, names, meta = read_pcm_channels(file_name)
+    else:
+        t, S, names, meta = read_channels(file_name, format_ver)
+    meta_df = meta_to_dataframe(meta)
+
+    print_c(f'Каналы: {", ".join(names)}. Количество точек: {len(t)}\n')
+
+    return t, S, names, meta_df
+
+def detect_format(file_name):
+    '''
+    Определяет версию формата CSV-файла по его первой строке: в файле формата 0 уже первая строка содержит
+    отсчёт (время и сигнал в столбцах 3 и 4), в файле формата 1 — имена столбцов.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу.
+    Возвращает:
+        int: Версия формата (0 или 1).
+    '''
+    with open_capture(file_name) as io:
+        fields = io.readline().rstrip('\r\n').split(',')
+    return 0 if len(fields) >= 5 and _is_number(fields[3]) and _is_number(fields[4]) else 1
+
+def _last_data_line(file_name):
+    '''
+    Возвращает последнюю непустую строку несжатого файла (читается только конец файла).
+    '''
+    with open(file_name, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - TAIL_SCAN_BYTES))
+        lines = f.read().splitlines()
+    for line in reversed(lines):
+        if line.strip():
+            return line.decode('utf-8', errors='replace')
+    return ''
+
+def _count_data_rows(file_name, header_lines):
+    '''
+    Подсчитывает строки данных по символам перевода строки, без разбора чисел (для сжатых файлов).
+    '''
+    n_lines = 0
+    last = b'\n'
+    with open_capture(file_name, 'rb') as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            n_lines += chunk.count(b'\n')
+            last = chunk[-1:]
+    if last != b'\n':
+        n_lines += 1  # Последняя строка без перевода строки
+    return max(0, n_lines - header_lines)
+
+def read_header_meta(file_name, format_ver=None):
+    '''
+    Читает метаинформацию записи без разбора отсчётов сигнала.
+    Формат 0: читаются только первые HEADER_SCAN_LINES строк ("Record Length", "Sample Interval", "Source", "Model Number").
+    Формат 1: читаются две строки заголовка, две первые строки данных и конец файла (номер последнего отсчёта);
+    для сжатого файла количество отсчётов определяется подсчётом строк без разбора чисел.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу.
+        format_ver (int | None): Версия формата файла (None — определить по файлу, см. detect_format).
+    Возвращает:
+        dict: format_ver, fs (Гц), n_samples, duration (с), t0 (с), source (имена каналов), model (модель осциллографа),
+        meta (метаинформация файла, для формата 0 — первого канала).
+        Для файла WAV/PCM метаинформация берётся из заголовка и JSON-файла (read_pcm_header_meta).
+    '''
+    if is_pcm_file(file_name):
+        return read_pcm_header_meta(file_name)
+    if format_ver is None:
+        format_ver = detect_format(file_name)
+    meta = {}
+    k_t = 1.0
+    t_first = []
+    n = None
+    if format_ver == 0:
+        with open_capture(file_name) as io:
+            for _, line in zip(range(HEADER_SCAN_LINES), io):
+                fields = [f.strip() for f in line.rstrip('\r\n').split(',')]
+                if len(fields) < 5:
+                    continue
+                if fields[0]:
                     meta[fields[0]] = fields[1]
-                elif len(fields) >= 5 and fields[0] == "" and fields[1] == "" and fields[2] == "":
-                    t.append(float(fields[3]))
-                    s.append(float(fields[4]))
-            elif format_ver == 1:
-                # Формат 1: первая строка — имена столбцов, вторая — значения метаинформации
-                if cnt_str == 0:
-                    names = fields
-                    cnt_str += 1
-                elif cnt_str == 1:
-                    for i in range(len(names)-1):
-                        meta[names[i]] = fields[i]
-                        if names[i] == "Increment":
-                            k_t = float(fields[i])
-                    cnt_str += 1
-                elif cnt_str > 1:
-                    if (len(fields) < 2):
-                        break
-                    if fields[0].strip() != '' and fields[1].strip() != '':
-                        t.append(float(fields[0]) * k_t)
-                        s.append(float(fields[1]))
-
-    # Вычисляем частоту дискретизации, если возможно
-    if len(t) > 1:
-        meta['fs'] = 1/(t[1]-t[0])
+                if len(t_first) < 2 and _is_number(fields[3]):
+                    t_first.append(float(fields[3]))
+        if 'Record Length' in meta and _is_number(meta['Record Length']):
+            n = int(float(meta['Record Length']))
+        else:
+            n = _count_data_rows(file_name, 0)
+        source = meta.get('Source', '')
     else:
-        meta['fs'] = 0.0  # Если данных недостаточно
+        with open_capture(file_name) as io:
+            meta, k_t = _read_header_format1(io)
+            for _, line in zip(range(2), io):
+                fields = line.split(',')
+                if _is_number(fields[0]):
+                    t_first.append(float(fields[0]))
+        fields = '' if is_compressed(file_name) else _last_data_line(file_name).split(',')[0]
+        if len(t_first) > 1 and t_first[1] != t_first[0] and _is_number(fields):
+            # Номера отсчётов идут с постоянным шагом: количество — по первому и последнему номеру
+            n = int(round((float(fields) - t_first[0]) / (t_first[1] - t_first[0]))) + 1
+        else:
+            n = _count_data_rows(file_name, 2)
+        source = ', '.join(detect_channels(file_name, 1))
+    t0 = t_first[0] * k_t if t_first else 0.0
+    if 'Start' in meta and _is_number(meta['Start']):
+        t0 += float(meta['Start'])
+    dt = _sample_interval(format_ver, meta, k_t, t_first)
+    meta['fs'] = 1/dt if dt else 0.0
+    return {
+        'format_ver': format_ver,
+        'fs': meta['fs'],
+        'n_samples': n,
+        'duration': n * dt,
+        't0': t0,
+        'source': source,
+        'model': meta.get('Model Number', ''),
+        'meta': meta,
+    }
 
+def read_sparse_preview(file_name, format_ver, n_rows=PREVIEW_ROWS):
+    '''
+    Читает предварительный просмотр файла без разбора всех строк: файл отображается в память, в нём выбираются
+    n_rows равномерно расположенных байтовых смещений и разбирается первая строка данных после каждого смещения.
+    Номер отсчёта каждой строки вычисляется по её отсчёту времени (t0 и dt — из read_header_meta),
+    поэтому выбранный по просмотру участок задаётся точными inx_start/inx_stop.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу (несжатому).
+        format_ver (int): Версия формата файла (см. load_data).
+        n_rows (int): Количество разбираемых строк.
+    Возвращает:
+        idx (np.ndarray): Номера отсчётов выбранных строк (по возрастанию).
+        t (np.ndarray): Отсчёты времени выбранных строк, с.
+        s (np.ndarray): Отсчёты сигнала выбранных строк.
+        info (dict): Метаинформация записи (см. read_header_meta): fs, n_samples, t0, duration и т.д.
+    Исключения:
+        ValueError: Для сжатого файла (переход по байтовому смещению невозможен).
+    '''
+    if is_compressed(file_name):
+        raise ValueError(f'Предварительный просмотр недоступен для сжатого файла: {file_name}')
+    info = read_header_meta(file_name, format_ver)
+    meta = info['meta']
+    k_t = float(meta['Increment']) if format_ver == 1 and _is_number(meta.get('Increment', '')) else 1.0
+    shift = float(meta['Start']) if _is_number(meta.get('Start', '')) else 0.0
+    dt = 1/info['fs'] if info['fs'] else 0.0
+
+    lines = []
+    with open(file_name, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data_start = 0
+                if format_ver == 1:
+                    for _ in range(2):  # Пропускаем строки заголовка
+                        data_start = mm.find(b'\n', data_start) + 1 or size
+                last = -1
+                for pos in np.linspace(data_start, size, n_rows, endpoint=False).astype(np.int64):
+                    # Начало строки, содержащей байт pos или следующей за ним
+                    if pos == data_start:
+                        start = data_start
+                    else:
+                        start = mm.find(b'\n', int(pos) - 1) + 1
+                        if start == 0:
+                            break  # После смещения нет начала строки
+                    if start <= last or start >= size:
+                        continue
+                    end = mm.find(b'\n', start)
+                    lines.append(mm[start:end + 1 if end >= 0 else size])
+                    last = start
+    if lines and not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+
+    t_parts, s_parts = [], []
+    for t_block, s_block in _iter_csv_blocks(io.BytesIO(b''.join(lines)), format_ver, {}):
+        t_parts.append(t_block)
+        s_parts.append(s_block)
+    t_col = np.concatenate(t_parts) if t_parts else np.empty(0)
+    s = np.concatenate(s_parts) if s_parts else np.empty(0)
+    # Время строки (как в _make_time_base) и номер отсчёта по нему
+    t_row = t_col * k_t + shift
+    idx = np.rint((t_row - info['t0']) / dt).astype(np.int64) if dt else np.arange(len(s))
+    return idx, info['t0'] + idx * dt, s, info
+
+def meta_to_dataframe(meta):
+    '''
+    Преобразует словарь метаинформации в DataFrame со столбцами "Key" и "Value" и выводит его в консоль.
+    Аргументы:
+        meta (dict): Метаинформация (ключ -> значение).
+    Возвращает:
+        meta_df (pandas.DataFrame): DataFrame с метаинформацией.
+    '''
     meta_info = MetaInfo(meta)
     # Преобразуем метаинформацию в DataFrame для удобства
     meta_df = pd.DataFrame({'Key': list(meta_info.info.keys()), 'Value': list(meta_info.info.values())})
     print_c(' ', color='white')
     print(meta_df)
     print_c('')
+    return meta_df
+
+def _quantize_samples(s, meta):
+    '''
+    Переводит отсчёты в коды АЦП (quantize), если это возможно без потери точности, и сообщает об экономии памяти.
+    '''
+    if isinstance(s, QuantizedSignal):
+        return s
+    q = quantize(s, meta)
+    if q is None:
+        print_c('Отсчёты не лежат на сетке уровней АЦП, сигнал хранится в float64', color='orange')
+        return s
+    print_c(f'Отсчёты хранятся кодами {q.codes.dtype} (шаг {q.scale:.6g} В): {q.nbytes} байт вместо {len(q) * 8}')
+    return q
+
+def _map_pcm(file_name):
+    '''
+    Отображает файл WAV/PCM в память (read_pcm) и сообщает об этом в консоль.
+    '''
+    t, s, meta = read_pcm(file_name)
+    print_c(f'Файл отображён в память без копирования: {meta["Format"]}, fs = {t.fs:g} Гц')
+    return t, s, meta
 
-    # Корректируем временной массив, если задано смещение "Start"
-    start_t = meta_df.loc[meta_df['Key'] == 'Start', 'Value'].values
-    if len(start_t) > 0:
-        start_t = float(start_t[0])
+def load_data(file_name, format_ver, max_workers=1, quantized=False):
+    '''
+    Параметры:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла. 
+            0 — метаинформация и данные разделены пустыми строками.
+            1 — первая строка содержит имена столбцов, вторая — значения метаинформации.
+        max_workers (int | None): Количество процессов разбора: 1 — в текущем процессе,
+            None или больше 1 — параллельный разбор фрагментов большого файла (read_capture_parallel).
+        quantized (bool): Хранить отсчёты кодами АЦП (QuantizedSignal), если они лежат на сетке уровней
+            (шаг — "Vertical Scale" / 25 или наименьшая разность значений); иначе — массив float64.
+    Возвращает:
+        t (TimeBase): Равномерная временная ось (t0, dt, n), отсчёты времени вычисляются по требованию.
+        s (np.ndarray | QuantizedSignal): Массив значений сигнала (при quantized=True — коды АЦП с шагом и смещением).
+        meta_df (pandas.DataFrame): DataFrame с метаинформацией (ключ-значение).
+    Особенности:
+        - Данные читаются блоками (C-парсер pandas), только нужные столбцы; массив времени не хранится.
+        - Шаг по времени берётся из метаинформации ("Increment", "Sample Interval"), вычисляется частота дискретизации (fs).
+        - Учитывает смещение "Start" из метаинформации, если оно задано.
+        - Файл WAV/PCM (.wav, .pcm, .raw) не разбирается, а отображается в память (read_pcm): s — представление
+          отсчётов канала без копирования (целочисленные отсчёты — QuantizedSignal), format_ver не используется.
+        - Выводит статус загрузки и информацию о сигнале в консоль.
+    '''
+
+    # Статус для отображения процесса загрузки
+    print_c(f'Загрузка файла: {file_name}  Формат: {format_ver}', color='blue')
+
+    if is_pcm_file(file_name):
+        t, s, meta = _map_pcm(file_name)
     else:
-        start_t = 0.0
-    t = np.array(t) + start_t
-    t = t.tolist()
+        t, s, meta = read_capture_parallel(file_name, format_ver, max_workers)
+        if quantized:
+            s = _quantize_samples(s, meta)
+    meta_df = meta_to_dataframe(meta)
 
     print_c(f'Сигнал загружен. Количество точек: {len(s)}\n')
     
     return t, s, meta_df
 
+def load_data_cached(file_name, format_ver, inx_start=0, inx_stop=None, downsampling_factor=1, max_workers=1,
+                     quantized=False):
+    '''
+    Загружает данные CSV-файла через бинарный кэш (см. модуль data_cache).
+    При первом открытии файл разбирается и отсчёты сохраняются в кэш рядом с ним;
+    при повторных открытиях массивы отображаются в память из кэша без разбора текста.
+    Кэш считается устаревшим при изменении пути, размера или времени изменения CSV-файла.
+    Если задан диапазон отсчётов или прореживание, а кэша ещё нет, файл всё равно разбирается целиком
+    и сохраняется в кэш (диапазон обычно задан параметрами отображения и повторяется при каждом открытии),
+    а вызывающему возвращается срез без копирования.
+    Файл WAV/PCM кэш не использует: он сам отображается в память (см. load_data), диапазон — срез без копирования.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу с данными.
+        format_ver (int): Версия формата файла (см. load_data).
+        inx_start (int): Индекс первого отсчёта.
+        inx_stop (int | None): Индекс отсчёта, следующего за последним (None — до конца файла).
+        downsampling_factor (int): Шаг прореживания.
+        max_workers (int | None): Количество процессов разбора всего файла (см. read_capture_parallel).
+        quantized (bool): Хранить отсчёты кодами АЦП (см. load_data); кэш тогда также записывается кодами.
+    Возвращает:
+        t (TimeBase): Равномерная временная ось.
+        s (np.ndarray | QuantizedSignal): Массив значений сигнала (только для чтения при загрузке из кэша).
+        meta_df (pandas.DataFrame): DataFrame с метаинформацией (ключ-значение).
+    '''
+    print_c(f'Загрузка файла: {file_name}  Формат: {format_ver}', color='blue')
+
+    ds = max(1, int(downsampling_factor or 1))
+    full_range = not inx_start and inx_stop is None and ds == 1
+
+    cached = None if is_pcm_file(file_name) else load_cache(file_name, format_ver)
+    if is_pcm_file(file_name):
+        t, s, meta = _map_pcm(file_name)
+        if not full_range:
+            t = t[inx_start:inx_stop:ds]
+            s = s[inx_start:inx_stop:ds]
+    elif cached is not None:
+        t, s, meta = cached
+        if not full_range:
+            # Срез отображённого в память массива — представление, без копирования; срез оси — O(1)
+            t = t[inx_start:inx_stop:ds]
+            s = s[inx_start:inx_stop:ds]
+        print_c('Данные загружены из кэша')
+        if quantized:
+            s = _quantize_samples(s, meta)
+        elif isinstance(s, QuantizedSignal):
+            s = s.to_volts()  # Кэш записан кодами АЦП, а вызывающему нужен массив значений
+    else:
+        t, s, meta = read_capture_parallel(file_name, format_ver, max_workers)
+        if quantized:
+            s = _quantize_samples(s, meta)
+        if not save_cache(file_name, format_ver, t, s, meta):
+            print_c('Не удалось сохранить кэш данных', color='orange')
+        if not full_range:
+            # Кэш записан для всего файла, вызывающему нужен только диапазон — срез без копирования
+            t = t[inx_start:inx_stop:ds]
+            s = s[inx_start:inx_stop:ds]
+            print_c(f'Выбран диапазон отсчётов: {inx_start}...{inx_stop}, шаг {ds}')
+    meta_df = meta_to_dataframe(meta)
+
+    print_c(f'Сигнал загружен. Количество точек: {len(s)}\n')
+
+    return t, s, meta_df
+
 def prepare_data(t, s, downsampling_factor=10):
     '''
-    Подготавливает временные и сигнальные данные для дальнейшей обработки, включая даунсемплирование, удаление постоянной составляющей и дополнение до длины, кратной 2^16.
+    Подготавливает временные и сигнальные данные для дальнейшей обработки, включая децимацию с фильтром защиты от наложения спектров, удаление постоянной составляющей и дополнение до длины, кратной 2^16.
     Аргументы:
-        t (list или np.ndarray): Массив временных отсчётов.
+        t (TimeBase, list или np.ndarray): Временная ось или массив временных отсчётов (считается равномерным).
         s (list или np.ndarray): Массив значений сигнала.
-        downsampling_factor (int, по умолчанию 10): Коэффициент даунсемплирования. Если больше 1, данные будут прорежены.
+        downsampling_factor (int, по умолчанию 10): Коэффициент децимации. Если больше 1, сигнал проходит ФНЧ
+            с частотой среза, равной новой частоте Найквиста, и прореживается (см. decimation.decimate),
+            поэтому шум выше новой частоты Найквиста не переносится в полосу анализа.
     Возвращает:
         tuple:
-            t (list): Обновлённый массив времени, дополненный нулями до нужной длины.
-            s (list): Обновлённый массив сигнала, с удалённой постоянной составляющей и дополненный нулями.
+            t (TimeBase): Временная ось, продолженная с тем же шагом до длины сигнала после дополнения.
+            s (np.ndarray): Обновлённый массив сигнала, с удалённой постоянной составляющей и дополненный нулями.
             oversampling_factor (float): Коэффициент увеличения длины сигнала для дополнения до 2^16 точек.
     Примечания:
         - Функция выводит в консоль информацию о частоте дискретизации до и после обработки, а также о длине сигнала.
-        - После обработки длина массивов t и s становится равной ближайшему меньшему числу, кратному 2^16.
+        - После обработки длина t и s становится равной 2^20 (короткий сигнал дополняется нулями);
+          сигнал длиннее 2^20 отсчётов сохраняется целиком.
     '''
+    t = as_time_base(t)
 
     print_c(f"\nПодготовка данных с даунсемплингом: {downsampling_factor}")
-    print_c(f"Исходная частота дискретизации = {1/(t[1] - t[0])/1e6:.2f} МГц")
-
-    # Даунсемплинг временного и сигнального массивов
-    if downsampling_factor > 1:
-        t = t[::downsampling_factor]
-        s = s[::downsampling_factor]
-
-    # Убираем среднее значение из сигнала (постоянную составляющую)
-    s = np.array(s) - np.mean(s)
-    s = s.tolist()
+    print_c(f"Исходная частота дискретизации = {t.fs/1e6:.2f} МГц")
 
-    N = len(s)
+    decimation = Decimate(downsampling_factor)
+    N = decimation.output_length(len(s))
     oversampling_factor = 2**20 / N  # Коэффициент увеличения длины сигнала
     N_new = int(np.floor(oversampling_factor * N))
+    N_new = max(N_new, N)  # Буфер не короче сигнала: сигнал длиннее 2^20 отсчётов не усекается
 
-    # Дополняем сигнал и время нулями до 2^16 точек
-    s = s + [0.0] * (N_new - N)
-    t = t.tolist() + [0.0] * (N_new - N)
+    # Децимация (с фильтром защиты от наложения спектров, ось прореживается срезом — O(1)), удаление
+    # постоянной составляющей и дополнение нулями выполняются в одном выделенном конвейером массиве;
+    # N_new >= N, поэтому PadTruncate здесь только дополняет нулями и никогда не усекает сигнал
+    t, s_new = Pipeline(decimation, Detrend('constant'), PadTruncate(N_new))(t, s)
 
-    print_c(f"Новая частота дискретизации = {1/(t[1] - t[0])/1e6:.2f} МГц")
-    print_c(f"Подготовка проведена. Длина сигнала после подготовки = {len(s)}\n")
+    print_c(f"Новая частота дискретизации = {t.fs/1e6:.2f} МГц")
+    print_c(f"Подготовка проведена. Длина сигнала после подготовки = {len(s_new)}\n")
 
-    return t, s, oversampling_factor
+    return t, s_new, oversampling_factor
 
 # --------------------------------------------------------------------------------------------
 
 
-from PyQt6.QtWidgets import QFileDialog
-import os
-import json  # Для работы с JSON файлами
+from PyQt6.QtWidgets import QFileDialog, QApplication
+
+# Расширения файлов, которые подбираются при импорте папки
+CSV_EXTENSIONS = ('.csv', '.csv.gz', '.csv.bz2', '.csv.xz')
+# Фильтр диалога выбора файлов
+CSV_FILE_FILTER = (
+    "Записи (*.csv *.csv.gz *.csv.bz2 *.csv.xz *.wav *.pcm *.raw);;"
+    "CSV Files (*.csv *.csv.gz *.csv.bz2 *.csv.xz);;WAV/PCM Files (*.wav *.pcm *.raw);;All Files (*)"
+)
+
+def _ini_file_name():
+    return os.path.join(os.path.dirname(__file__), "osc_viewer.ini")
+
+def _read_last_dir():
+    '''
+    Читает последнюю использованную директорию из ini-файла (osc_viewer.ini, json-формат).
+    Возвращает:
+        str: Путь к директории или пустая строка.
+    '''
+    try:
+        with open(_ini_file_name(), "r", encoding="utf-8") as f:
+            ini_data = json.load(f)
+            return ini_data.get("last_dir", "")
+    except Exception:
+        return ""
+
+def _save_last_dir(selected_dir):
+    '''
+    Сохраняет последнюю использованную директорию в ini-файл.
+    Аргументы:
+        selected_dir (str): Путь к директории.
+    '''
+    try:
+        with open(_ini_file_name(), "w", encoding="utf-8") as f:
+            json.dump({"last_dir": selected_dir}, f)
+    except Exception:
+        pass
+
+def read_display_params(file_name):
+    '''
+    Читает параметры отображения из JSON-файла с тем же именем, что и CSV-файл.
+    Аргументы:
+        file_name (str): Путь к CSV-файлу.
+    Возвращает:
+        tuple: (format_ver, inx_start, inx_stop, downsampling_factor); если JSON-файла нет — параметры по умолчанию (1, 0, None, 1).
+        Для файла WAV/PCM JSON-файл может содержать только параметры записи (см. pcm_data) — отсутствующие
+        параметры отображения тогда также берутся по умолчанию.
+    Исключения:
+        Ошибки чтения и разбора существующего JSON-файла передаются вызывающей функции.
+    '''
+    # Формируем имя JSON-файла с параметрами (для сжатого файла — по имени без расширения архива)
+    if is_compressed(file_name):
+        file_name = os.path.splitext(file_name)[0]
+    json_file_name = file_name[:-3] + 'json'
+    try:
+        with open(json_file_name, 'r', encoding='utf-8') as f:
+            data_dict = json.load(f)
+    except FileNotFoundError:
+        # Если JSON-файл не найден, используем параметры по умолчанию
+        print_c('JSON-файл не найден, используются параметры по умолчанию из окна.')
+        return 1, 0, None, 1
+    if is_pcm_file(file_name):
+        data_dict = {'format_ver': 1, 'inx_start': 0, 'inx_stop': None, 'downsampling_factor': 1, **data_dict}
+    params = (
+        data_dict['format_ver'],
+        data_dict['inx_start'],
+        data_dict['inx_stop'],
+        data_dict['downsampling_factor'],
+    )
+    print_c(f'Параметры: {params[0]}, {params[1]}, {params[2]}, {params[3]}')
+    return params
+
+def add_signal_line(main_window, file_name, t, s, label_suffix=None):
+    '''
+    Добавляет сигнал на график main_window.plot_data_signal с подписью (именем файла) и настраивает оси.
+    Аргументы:
+        main_window: Главное окно приложения.
+        file_name (str): Путь к файлу сигнала (сохраняется для линии в _osc_viewer_file_names).
+        t (TimeBase | array-like): Временная ось сигнала, с.
+        s (array-like): Отсчёты сигнала.
+        label_suffix (str | None): Дополнение к подписи линии (например, имя канала).
+    '''
+    label = file_name.replace("\\", "/").split("/")[-1]
+    if label_suffix:
+        label = f"{label} {label_suffix}"
+    # Получаем количество линий на графике
+    num_lines = len(main_window.plot_data_signal.get_all_lines())
+    # Инициализируем словарь для хранения имен файлов, если его нет
+    if not hasattr(main_window.plot_data_signal, '_osc_viewer_file_names'):
+        main_window.plot_data_signal._osc_viewer_file_names = {}
+    # Сохраняем имя файла для текущей линии
+    main_window.plot_data_signal._osc_viewer_file_names[num_lines] = file_name
+    # Добавляем новую линию на график с подписью (именем файла)
+    main_window.plot_data_signal.plot_line(
+        t, s, x_zoom=1000, add_mode=True, label=label
+    )
+    # Устанавливаем параметры осей графика
+    main_window.plot_data_signal.set_axes_params(
+        title="Осциллограмма сигнала",
+        ylabel='Амплитуда, В',
+        xlabel='Время, мс'
+    )
+
+def add_channel_lines(main_window, file_name, t, S, names):
+    '''
+    Добавляет каждый канал многоканального сигнала на график отдельной линией (см. add_signal_line).
+    Аргументы:
+        main_window: Главное окно приложения.
+        file_name (str): Путь к файлу сигнала.
+        t (TimeBase): Общая временная ось каналов, с.
+        S (np.ndarray): Отсчёты каналов, форма (количество каналов, количество отсчётов).
+        names (list of str): Имена каналов (добавляются к подписи линии).
+    '''
+    for name, s in zip(names, S):
+        add_signal_line(main_window, file_name, t, s, label_suffix=name)
 
 def open_csv_file(main_window):
     '''
@@ -173,9 +1333,13 @@ def open_csv_file(main_window):
     - Открывает диалоговое окно для выбора CSV-файла.
     - Сохраняет выбранную директорию обратно в ini-файл для последующего использования.
     - Устанавливает параметры отображения по умолчанию (версия формата, начальный и конечный индексы, коэффициент даунсемплинга).
-    - Пытается загрузить параметры отображения из JSON-файла с тем же именем, что и выбранный CSV-файл.
-    - Загружает данные из CSV-файла с помощью функции load_data.
-    - Добавляет новую линию на график, используя данные из файла, и подписывает её именем файла.
+    - Пытается загрузить параметры отображения из JSON-файла с тем же именем, что и выбранный CSV-файл
+      (выбор файла и параметров — select_csv_file, чтение JSON-файла — read_display_params).
+    - Для большого файла показывает быстрый предварительный просмотр (quick_preview.select_region), в котором выбираются
+      участок и коэффициент прореживания; при отмене файл не загружается.
+    - Загружает данные из CSV-файла с помощью функции load_data_cached с учётом inx_start, inx_stop и downsampling_factor
+      (при повторном открытии — из кэша, иначе читается только нужный диапазон строк).
+    - Добавляет новую линию на график, используя данные из файла, и подписывает её именем файла (add_signal_line).
     - Устанавливает параметры осей графика.
     - Обрабатывает возможные ошибки при загрузке файлов и построении графика, выводя сообщения пользователю.
     Аргументы:
@@ -184,88 +1348,223 @@ def open_csv_file(main_window):
         В случае ошибок при чтении файлов или построении графика, выводит сообщение об ошибке через main_window.show_message.
     '''
 
-    ini_file = os.path.join(os.path.dirname(__file__), "osc_viewer.ini")
+    # Окно предварительного просмотра импортирует функции чтения из этого модуля, поэтому импортируется здесь
+    from quick_preview import select_region
 
-    # Читаем последнюю директорию из ini-файла (json-формат)
-    last_dir = ""
-    try:
-        with open(ini_file, "r", encoding="utf-8") as f:
-            ini_data = json.load(f)
-            last_dir = ini_data.get("last_dir", "")
-    except Exception:
-        last_dir = ""
+    file_name = select_csv_file(main_window)
+
+    # Для большого файла — предварительный просмотр и выбор участка перед загрузкой
+    if file_name and select_region(main_window, file_name):
+        try:
+            # Загружаем данные из CSV-файла (через бинарный кэш)
+            t, s, meta_info = (
+                load_data_cached(
+                    file_name,
+                    main_window.format_ver,
+                    main_window.inx_start,
+                    main_window.inx_stop,
+                    main_window.downsampling_factor,
+                    max_workers=None,  # Большой файл разбирается параллельно на всех ядрах
+                )
+            )
 
+            add_signal_line(main_window, file_name, t, s)
+            print_c('График построен', color='green')
+
+        except Exception as e:
+            # Обработка ошибок при загрузке и построении графика
+            print_c(f"Ошибка: {e}", color='red')
+
+def select_csv_file(main_window):
+    '''
+    Открывает диалог выбора CSV-файла и устанавливает параметры отображения главного окна
+    (main_window.format_ver, inx_start, inx_stop, downsampling_factor) по умолчанию или из JSON-файла рядом с CSV-файлом.
+    Выбранная директория сохраняется в ini-файл.
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        str | None: Путь к выбранному файлу; None, если файл не выбран или параметры не удалось прочитать.
+    '''
     # Открываем диалог выбора файла, используем последнюю директорию
     file_name, _ = QFileDialog.getOpenFileName(
-        main_window, "Выберите CSV файл", last_dir, "CSV Files (*.csv);;All Files (*)"
+        main_window, "Выберите CSV файл", _read_last_dir(), CSV_FILE_FILTER
     )
+    if not file_name:
+        return None
 
     # Сохраняем выбранную директорию в ini-файл
-    if file_name:
-        selected_dir = os.path.dirname(file_name)
-        try:
-            with open(ini_file, "w", encoding="utf-8") as f:
-                json.dump({"last_dir": selected_dir}, f)
-        except Exception:
-            pass
+    _save_last_dir(os.path.dirname(file_name))
 
-    if file_name:
-        # Устанавливаем параметры по умолчанию
-        main_window.format_ver = 1  # версия формата CSV файла
-        main_window.inx_start = 0  # начальный индекс для отображения
-        main_window.inx_stop = None  # конечный индекс для отображения
-        main_window.downsampling_factor = 1  # коэффициент даунсемплинга
+    # Устанавливаем параметры по умолчанию
+    main_window.format_ver = 1  # версия формата CSV файла
+    main_window.inx_start = 0  # начальный индекс для отображения
+    main_window.inx_stop = None  # конечный индекс для отображения
+    main_window.downsampling_factor = 1  # коэффициент даунсемплинга
 
-        print_c(f'Выбран файл: {file_name}')
+    print_c(f'Выбран файл: {file_name}')
 
-        # Формируем имя JSON-файла с параметрами
-        json_file_name = file_name[:-3] + 'json'
+    try:
+        # Загружаем параметры из JSON-файла (если он есть)
+        (
+            main_window.format_ver,
+            main_window.inx_start,
+            main_window.inx_stop,
+            main_window.downsampling_factor,
+        ) = read_display_params(file_name)
+    except Exception as e:
+        print_c(f"Ошибка: {e}", color='red')
+        return None
+    return file_name
+
+def open_csv_channels(main_window):
+    '''
+    Открывает диалог выбора CSV-файла, загружает все его каналы за один проход (load_channels)
+    и добавляет каждый канал на график отдельной линией.
+    Аргументы:
+        main_window: Главное окно приложения.
+    '''
+    file_name = select_csv_file(main_window)
+    if file_name:
         try:
+            t, S, names, meta_info = load_channels(file_name, main_window.format_ver)
+            add_channel_lines(main_window, file_name, t, S, names)
+            print_c('График построен', color='green')
+        except Exception as e:
+            print_c(f"Ошибка: {e}", color='red')
+
+def _load_file_job(file_name, format_ver, inx_start, inx_stop, downsampling_factor, quantized=False):
+    '''
+    Задача для процесса-исполнителя: загружает один файл (load_data_cached).
+    Вывод в консоль перехватывается и возвращается вместе с результатом,
+    чтобы главный процесс вывел его во вкладку "Сообщения".
+    При quantized=True отсчёты загружаются и передаются кодами АЦП, как в load_data.
+    Возвращает:
+        tuple: (t, s, meta_df, log) — временная ось, отсчёты сигнала, метаинформация и текст вывода.
+    '''
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        t, s, meta_df = load_data_cached(file_name, format_ver, inx_start, inx_stop, downsampling_factor,
+                                         quantized=quantized)
+    # Отображённый в память массив передаём как обычный массив; коды АЦП передаются в 4-8 раз быстрее, чем float64
+    if isinstance(s, QuantizedSignal):
+        return t, QuantizedSignal(np.asarray(s.codes), s.scale, s.offset), meta_df, log.getvalue()
+    return t, np.asarray(s), meta_df, log.getvalue()
+
+def load_files_parallel(jobs, max_workers=None, quantized=False):
+    '''
+    Загружает несколько файлов параллельно в пуле процессов и выдаёт результаты по мере готовности.
+    Аргументы:
+        jobs (list): Список кортежей (file_name, format_ver, inx_start, inx_stop, downsampling_factor).
+        max_workers (int | None): Количество процессов (по умолчанию — по числу ядер, но не больше числа файлов).
+        quantized (bool): Загружать отсчёты кодами АЦП (см. load_data); коды передаются из процессов
+            в 4-8 раз быстрее, чем float64.
+    Возвращает (yield):
+        tuple: (file_name, result, error), где result — (t, s, meta_df, log) из _load_file_job
+        или None, если при загрузке возникло исключение error.
+    '''
+    if not jobs:
+        return
+    if max_workers is None:
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+    if max_workers <= 1:
+        # Один процесс — загружаем последовательно, без накладных расходов на пул
+        for job in jobs:
             try:
-                # Пробуем загрузить параметры из JSON-файла
-                with open(json_file_name, 'r', encoding='utf-8') as f:
-                    data_dict = json.load(f)
-                    main_window.format_ver = data_dict['format_ver']
-                    main_window.inx_start = data_dict['inx_start']
-                    main_window.inx_stop = data_dict['inx_stop']
-                    main_window.downsampling_factor = data_dict['downsampling_factor']
-                print_c(
-                    f'Параметры: {main_window.format_ver}, {main_window.inx_start}, {main_window.inx_stop}, {main_window.downsampling_factor}'
-                )
-            except FileNotFoundError:
-                # Если JSON-файл не найден, используем параметры по умолчанию
-                print_c('JSON-файл не найден, используются параметры по умолчанию из окна.')
+                yield job[0], _load_file_job(*job, quantized), None
+            except Exception as e:
+                yield job[0], None, e
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_load_file_job, *job, quantized): job[0] for job in jobs}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
 
-            # Загружаем данные из CSV-файла
-            t, s, meta_info = (
-                load_data(
-                    file_name,
-                    main_window.format_ver
-                )
-            )
+def find_csv_files(folder):
+    '''
+    Находит CSV-файлы (а также WAV/PCM) в папке и всех вложенных папках (например, папки частотной развёртки data/6кГц ... data/24кГц).
+    Аргументы:
+        folder (str): Путь к папке.
+    Возвращает:
+        list: Отсортированный список путей к файлам.
+    '''
+    file_names = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(CSV_EXTENSIONS + PCM_EXTENSIONS):
+                file_names.append(os.path.join(root, name))
+    return sorted(file_names)
 
-            # Получаем количество линий на графике
-            num_lines = len(main_window.plot_data_signal.get_all_lines())
-            # Инициализируем словарь для хранения имен файлов, если его нет
-            if not hasattr(main_window.plot_data_signal, '_osc_viewer_file_names'):
-                main_window.plot_data_signal._osc_viewer_file_names = {}
-            # Сохраняем имя файла для текущей линии
-            main_window.plot_data_signal._osc_viewer_file_names[num_lines] = file_name
-            # Добавляем новую линию на график с подписью (именем файла)
-            main_window.plot_data_signal.plot_line(
-                t, s, x_zoom=1000, add_mode=True, label=file_name.split("/")[-1]
-            )
-            # Устанавливаем параметры осей графика
-            main_window.plot_data_signal.set_axes_params(
-                title="Осциллограмма сигнала",
-                ylabel='Амплитуда, В',
-                xlabel='Время, мс'
-            )
-            print_c('График построен', color='green')
+def import_csv_files(main_window, file_names, max_workers=None, quantized=False):
+    '''
+    Загружает несколько CSV-файлов в пуле процессов (load_files_parallel) и добавляет каждый сигнал
+    на график main_window.plot_data_signal, как только он загружен.
+    Параметры отображения каждого файла читаются из JSON-файла рядом с ним (read_display_params).
+    Аргументы:
+        main_window: Главное окно приложения.
+        file_names (list): Пути к CSV-файлам.
+        max_workers (int | None): Количество процессов (см. load_files_parallel).
+        quantized (bool): Загружать отсчёты кодами АЦП (см. load_data).
+    Возвращает:
+        int: Количество успешно загруженных файлов.
+    '''
+    jobs = []
+    for file_name in file_names:
+        try:
+            jobs.append((file_name, *read_display_params(file_name)))
+        except Exception as e:
+            print_c(f"Ошибка: {file_name}: {e}", color='red')
 
+    print_c(f'Загрузка файлов: {len(jobs)}', color='blue')
+    n_loaded = 0
+    for file_name, result, error in load_files_parallel(jobs, max_workers, quantized):
+        if error is not None:
+            print_c(f"Ошибка: {file_name}: {error}", color='red')
+            continue
+        t, s, meta_df, log = result
+        for line in log.splitlines():
+            print(line)
+        try:
+            add_signal_line(main_window, file_name, t, s)
         except Exception as e:
-            # Обработка ошибок при загрузке и построении графика
-            print_c(f"Ошибка: {e}", color='red')
+            print_c(f"Ошибка: {file_name}: {e}", color='red')
+            continue
+        n_loaded += 1
+        # Перерисовываем окно, не дожидаясь загрузки остальных файлов
+        QApplication.processEvents()
+
+    print_c(f'Загружено файлов: {n_loaded} из {len(file_names)}', color='green')
+    return n_loaded
+
+def open_csv_files(main_window):
+    '''
+    Открывает диалог выбора нескольких CSV-файлов и загружает их параллельно (import_csv_files).
+    Аргументы:
+        main_window: Главное окно приложения.
+    '''
+    file_names, _ = QFileDialog.getOpenFileNames(
+        main_window, "Выберите CSV файлы", _read_last_dir(), CSV_FILE_FILTER
+    )
+    if file_names:
+        _save_last_dir(os.path.dirname(file_names[0]))
+        import_csv_files(main_window, file_names)
+
+def open_csv_folder(main_window):
+    '''
+    Открывает диалог выбора папки и параллельно загружает все CSV-файлы в ней и во вложенных папках (import_csv_files).
+    Аргументы:
+        main_window: Главное окно приложения.
+    '''
+    folder = QFileDialog.getExistingDirectory(main_window, "Выберите папку с CSV файлами", _read_last_dir())
+    if folder:
+        _save_last_dir(folder)
+        file_names = find_csv_files(folder)
+        if not file_names:
+            print_c(f'В папке нет CSV-файлов: {folder}', color='orange')
+            return
+        import_csv_files(main_window, file_names)
 
 def print_c(text, color='white'):
     print(f'<span style="color: {color};">{text}</span>')
\ No newline at end of file
@@ -3,8 +3,8 @@
 main.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.1
+Дата:         2026-10-17
+Версия:       1.0.10
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -46,7 +46,16 @@ from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 
 # Импортируем пользовательские модули и функции
 from PlotData import PlotData  # Класс для работы с графиками (сигнал/спектр)
-from load_and_prepare_data import open_csv_file  # Функция для открытия CSV-файлов
+from load_and_prepare_data import (
+    open_csv_files,
+    open_csv_folder,
+    open_csv_channels,
+)  # Функции для открытия нескольких CSV-файлов, папки или всех каналов файла
+from background_loader import open_csv_file_background  # Фоновая загрузка CSV-файла с предварительным просмотром
+from catalog import open_catalog_dialog  # Каталог записей (SQLite) и поиск по метаинформации
+from archive import open_archive, save_csv_to_archive  # Архив записей (.oscz) со сводками фрагментов
+from tail_follow import follow_csv_file, stop_following  # Слежение за записываемым CSV-файлом
+from live_stream import open_live_stream, stop_live_streams  # Живой поток отсчётов по TCP
 from osc_context_menu import (
     show_plot_context_menu,
 )  # Контекстное меню для графика сигнала
@@ -93,6 +102,8 @@ class MainWindow(QMainWindow):
     Класс MainWindow реализует главное окно приложения OscViewer для визуализации сигналов и их спектров.
     Основные возможности:
     - Отображение графика сигнала и его спектра на отдельных вкладках.
+    - Отображение спектрограммы (STFT) видимого участка сигнала на вкладке "Спектрограмма"
+      (строится из контекстного меню графика, см. spectrogram.show_spectrogram).
     - Вывод сообщений и логов в отдельной вкладке "Сообщения".
     - Контекстные меню для графика и спектра с возможностью:
         - Сохранять изображение графика (заглушка).
@@ -102,7 +113,7 @@ class MainWindow(QMainWindow):
     - Перенаправление вывода stdout в текстовое поле сообщений.
     - Работа с несколькими линиями графика и спектра, поддержка их параметров (цвет, стиль, подпись).
     - Гибкая настройка интерфейса через QTabWidget и QVBoxLayout.
-    - Меню приложения с возможностью открытия CSV-файлов.
+    - Меню приложения с возможностью открытия CSV-файлов (одного, нескольких или всей папки с параллельной загрузкой).
     Атрибуты:
         status_text (QTextEdit): Текстовое поле для вывода сообщений.
         plot_widget (QWidget): Виджет для отображения графика сигнала.
@@ -110,6 +121,8 @@ class MainWindow(QMainWindow):
         spectrum_widget (QWidget): Виджет для отображения спектра сигнала.
         spectrum_layout (QVBoxLayout): Layout для размещения элементов спектра.
         spectrum_data (PlotData): Объект для работы с данными спектра.
+        spectrogram_widget (QWidget): Виджет для отображения спектрограммы.
+        spectrogram_data (PlotData): Объект для работы с графиком спектрограммы.
         tabs (QTabWidget): Вкладки приложения.
         _spectrum_db_mode (bool): Флаг режима отображения спектра (В или дБ).
     Методы:
@@ -154,6 +167,11 @@ class MainWindow(QMainWindow):
         self.spectrum_layout = QVBoxLayout(self.spectrum_widget)  # Layout для спектра
         self._spectrum_db_mode = False
 
+        # Виджет для спектрограммы (изображение STFT заполняется по мере вычисления в отдельном потоке)
+        self.spectrogram_widget = QWidget()
+        self.spectrogram_data = PlotData(self.spectrogram_widget)
+        self._spectrogram_view = None
+
         # Основной layout окна
         layout = QVBoxLayout()
         layout.addWidget(self.plot_widget, stretch=3)
@@ -166,6 +184,7 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.plot_widget, "График")
         self.tabs.addTab(self.status_text, "Сообщения")
         self.tabs.addTab(self.spectrum_widget, "Спектр")
+        self.tabs.addTab(self.spectrogram_widget, "Спектрограмма")
         self.setCentralWidget(self.tabs)
                 
         # Меню приложения
@@ -180,6 +199,43 @@ class MainWindow(QMainWindow):
         # Добавляем действие в меню "Файл"
         file_menu.addAction(open_action)
 
+        # Действия для параллельной загрузки нескольких файлов и папки (например, частотной развёртки)
+        open_files_action = QAction("Открыть несколько CSV...", self)
+        open_files_action.triggered.connect(self.open_csv_files_with_redirect)
+        file_menu.addAction(open_files_action)
+        open_folder_action = QAction("Открыть папку...", self)
+        open_folder_action.triggered.connect(self.open_csv_folder_with_redirect)
+        file_menu.addAction(open_folder_action)
+        # Действие для загрузки всех каналов файла (CH1, CH2, ...) отдельными линиями
+        open_channels_action = QAction("Открыть многоканальный CSV...", self)
+        open_channels_action.triggered.connect(self.open_csv_channels_with_redirect)
+        file_menu.addAction(open_channels_action)
+        # Действие для поиска записей по каталогу папки (только метаинформация, без чтения отсчётов)
+        catalog_action = QAction("Каталог записей...", self)
+        catalog_action.triggered.connect(self.open_catalog_with_redirect)
+        file_menu.addAction(catalog_action)
+        # Действия для архива записей: сжатые фрагменты со сводками, распаковка только видимого участка
+        open_archive_action = QAction("Открыть архив...", self)
+        open_archive_action.triggered.connect(self.open_archive_with_redirect)
+        file_menu.addAction(open_archive_action)
+        save_archive_action = QAction("Сохранить CSV в архив...", self)
+        save_archive_action.triggered.connect(self.save_csv_to_archive_with_redirect)
+        file_menu.addAction(save_archive_action)
+        # Действия для слежения за CSV-файлом, который ещё записывается
+        follow_action = QAction("Следить за файлом...", self)
+        follow_action.triggered.connect(self.follow_csv_file_with_redirect)
+        file_menu.addAction(follow_action)
+        stop_follow_action = QAction("Остановить слежение", self)
+        stop_follow_action.triggered.connect(self.stop_following_with_redirect)
+        file_menu.addAction(stop_follow_action)
+        # Действия для живого потока отсчётов от процесса регистрации (TCP)
+        live_action = QAction("Живой поток...", self)
+        live_action.triggered.connect(self.open_live_stream_with_redirect)
+        file_menu.addAction(live_action)
+        stop_live_action = QAction("Остановить поток", self)
+        stop_live_action.triggered.connect(self.stop_live_streams_with_redirect)
+        file_menu.addAction(stop_live_action)
+
     def show_message(self, text):
         '''
         Выводит сообщение в текстовое поле "Сообщения" на вкладке приложения.
@@ -208,23 +264,95 @@ class MainWindow(QMainWindow):
     def open_csv_with_redirect(self):
         '''
         Этот метод вызывает диалоговое окно для выбора CSV-файла. 
-        Все сообщения, выводимые через функцию print внутри open_csv_file, 
+        Все сообщения, выводимые через функцию print при выборе файла, 
         будут отображаться во вкладке "Сообщения" приложения, а не в стандартном выводе консоли.
         Использует контекстный менеджер для перенаправления stdout в QTextEdit.
         Примечание:
-            Функция open_csv_file должна реализовывать логику открытия и обработки выбранного CSV-файла.
+            Файл загружается в фоновом потоке (open_csv_file_background): окно не блокируется,
+            ход загрузки отображается в окне с кнопкой "Отмена", а на графике сначала появляется
+            грубый предварительный просмотр, который уточняется по мере загрузки.
         '''
         '''
         Открывает CSV-файл с перенаправлением вывода в QTextEdit.
 
         Этот метод вызывает диалог открытия CSV-файла, а все сообщения,
-        которые выводятся через print внутри open_csv_file, будут отображаться
+        которые выводятся через print при выборе и загрузке файла, будут отображаться
         во вкладке "Сообщения" приложения, а не в стандартном выводе консоли.
         '''
         # Используем контекстный менеджер для перенаправления stdout в QTextEdit
         with self.redirect_stdout_to_textedit():
-            # Открываем CSV-файл (функция open_csv_file реализует логику открытия и обработки)
-            open_csv_file(self)
+            # Выбираем CSV-файл и запускаем его фоновую загрузку
+            open_csv_file_background(self)
+
+    def open_csv_files_with_redirect(self):
+        '''
+        Открывает несколько CSV-файлов (параллельная загрузка) с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_csv_files(self)
+
+    def open_csv_folder_with_redirect(self):
+        '''
+        Открывает все CSV-файлы папки и вложенных папок (параллельная загрузка) с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_csv_folder(self)
+
+    def open_csv_channels_with_redirect(self):
+        '''
+        Открывает CSV-файл и добавляет каждый его канал отдельной линией с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_csv_channels(self)
+
+    def open_catalog_with_redirect(self):
+        '''
+        Обновляет каталог выбранной папки и открывает окно поиска записей с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_catalog_dialog(self)
+
+    def open_archive_with_redirect(self):
+        '''
+        Открывает архив записи (.oscz) с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_archive(self)
+
+    def save_csv_to_archive_with_redirect(self):
+        '''
+        Сохраняет выбранный CSV-файл в архив (.oscz) с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            save_csv_to_archive(self)
+
+    def follow_csv_file_with_redirect(self):
+        '''
+        Включает слежение за записываемым CSV-файлом с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            follow_csv_file(self)
+
+    def stop_following_with_redirect(self):
+        '''
+        Останавливает слежение за CSV-файлами с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            stop_following(self)
+
+    def open_live_stream_with_redirect(self):
+        '''
+        Подключается к живому потоку отсчётов по TCP с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            open_live_stream(self)
+
+    def stop_live_streams_with_redirect(self):
+        '''
+        Останавливает живые потоки отсчётов с перенаправлением вывода в QTextEdit.
+        '''
+        with self.redirect_stdout_to_textedit():
+            stop_live_streams(self)
 
     def show_plot_context_menu_with_redirect(self, pos):
         '''
@@ -262,8 +390,17 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         '''
         Обработчик события закрытия главного окна.
-        Вызывает стандартный обработчик родительского класса.
+        Отменяет незавершённые фоновые загрузки и вычисление спектрограммы, останавливает приём живых потоков,
+        дожидается завершения их потоков и вызывает стандартный обработчик родительского класса.
         '''
+        for loader in list(getattr(self, '_osc_viewer_loaders', [])):
+            loader.cancel()
+            loader.wait()
+        for stream in list(getattr(self, '_osc_viewer_streams', [])):
+            stream.stop()  # Остановка приёма и ожидание завершения потока
+        if getattr(self, '_spectrogram_view', None) is not None:
+            self._spectrogram_view.cancel()
+            self._spectrogram_view.wait()
         super().closeEvent(event)
 
 
@@ -3,8 +3,8 @@
 osc_context_menu.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.1
+Дата:         2026-10-17
+Версия:       1.0.4
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -12,7 +12,8 @@ osc_context_menu.py
 Краткое описание:
 -----------------
 Модуль реализует контекстное меню для графика сигнала в приложении визуализации сигналов. 
-Позволяет сохранять изображение графика, очищать график и строить спектр выбранной линии.
+Позволяет сохранять изображение графика, очищать график и строить спектр выбранной линии (одним БПФ или методом Уэлча),
+спектры всех линий или спектрограмму выбранной линии.
 
 Список функций:
 ---------------
@@ -20,16 +21,26 @@ osc_context_menu.py
     Отображает контекстное меню для графика сигнала с возможностью сохранить изображение, очистить график или построить спектр выбранной линии.
 - create_spectrum(main_window)
     Создает спектр по активной линии графика сигнала.
+- create_spectra_all(main_window)
+    Создает спектры всех линий графика сигнала одним пакетным БПФ.
+- ask_welch_params(main_window)
+    Диалог выбора длины сегмента, перекрытия и окна для спектра Уэлча.
+- create_spectrum_welch(main_window)
+    Создает спектр Уэлча по активной линии графика сигнала.
+- create_spectrogram(main_window)
+    Строит спектрограмму активной линии для видимого участка графика сигнала.
 - clip_data_x_axis(main_window)
     Обрезает данные всех линий графика по видимой области оси X.
 - save_to_png(main_window)
     Сохраняет текущее изображение графика в PNG-файл.
 '''
 
-from PyQt6.QtWidgets import QMenu, QFileDialog
+from PyQt6.QtWidgets import QMenu, QFileDialog, QDialog, QDialogButtonBox, QFormLayout, QComboBox, QSpinBox
 
-from create_spectrume import add_spectrume  # Функция для добавления спектра
+from create_spectrume import add_spectrume, add_spectra  # Функции для добавления спектров
 from load_and_prepare_data import print_c   # Функция для печати сообщений в консоль приложения
+from welch import WELCH_SEGMENT_LENGTH, WELCH_OVERLAP, WELCH_WINDOW, WELCH_WINDOWS  # Параметры спектра Уэлча
+from spectrogram import show_spectrogram  # Спектрограмма (STFT) видимого участка
 
 def show_plot_context_menu(main_window, pos):
     '''
@@ -38,6 +49,9 @@ def show_plot_context_menu(main_window, pos):
         - Сохранить изображение графика (заглушка).
         - Очистить график.
         - Построить спектр по выбранной линии.
+        - Построить спектры всех линий (пакетное БПФ).
+        - Построить спектр Уэлча по выбранной линии.
+        - Построить спектрограмму выбранной линии.
     Аргументы:
         pos (QPoint): Позиция вызова контекстного меню.
     '''
@@ -46,6 +60,9 @@ def show_plot_context_menu(main_window, pos):
     action2 = menu.addAction("Очистить график")
     action3 = menu.addAction("Построить спектр")
     action4 = menu.addAction("Обрезать данные по видемой области")
+    action5 = menu.addAction("Построить спектры всех линий")
+    action6 = menu.addAction("Построить спектр Уэлча...")
+    action7 = menu.addAction("Построить спектрограмму")
     action = menu.exec(main_window.plot_widget.mapToGlobal(pos))
     if action == action1:
         print_c('Сохранение изображения графика\n')
@@ -61,6 +78,15 @@ def show_plot_context_menu(main_window, pos):
     elif action == action4:
         print_c("Обрезать данные по оси х\n")
         clip_data_x_axis(main_window)
+    elif action == action5:
+        print_c("Построить спектры всех линий\n")
+        create_spectra_all(main_window)
+    elif action == action6:
+        print_c("Построить спектр Уэлча\n")
+        create_spectrum_welch(main_window)
+    elif action == action7:
+        print_c("Построить спектрограмму\n")
+        create_spectrogram(main_window)
 
 def create_spectrum(main_window):
     '''
@@ -82,6 +108,81 @@ def create_spectrum(main_window):
     if not hasattr(main_window, '_spectrum_db_mode'):
         main_window._spectrum_db_mode = False
 
+def create_spectra_all(main_window):
+    '''
+    Создает спектры всех линий графика сигнала одним пакетным БПФ.
+    '''
+    # Проверяем наличие флага режима спектра (нужен до построения: выбирает В или дБ)
+    if not hasattr(main_window, '_spectrum_db_mode'):
+        main_window._spectrum_db_mode = False
+    if not add_spectra(main_window):
+        print_c("Нет линий для спектра\n")
+
+def ask_welch_params(main_window):
+    '''
+    Диалог выбора параметров спектра Уэлча. Выбранные параметры запоминаются в main_window._spectrum_welch_params.
+    Возвращает:
+        dict | None: {'segment_length', 'overlap', 'window'} или None, если пользователь отменил выбор.
+    '''
+    last = getattr(main_window, '_spectrum_welch_params', None) or {
+        'segment_length': WELCH_SEGMENT_LENGTH, 'overlap': WELCH_OVERLAP, 'window': WELCH_WINDOW}
+    dialog = QDialog(main_window)
+    dialog.setWindowTitle("Спектр Уэлча")
+    form = QFormLayout(dialog)
+    # Длина сегмента — степени двойки (отсчётов после децимации)
+    segment = QComboBox(dialog)
+    for k in range(8, 21):
+        segment.addItem(str(1 << k), 1 << k)
+    segment.setCurrentText(str(last['segment_length']))
+    form.addRow("Длина сегмента, отсчётов", segment)
+    overlap = QSpinBox(dialog)
+    overlap.setRange(0, 95)
+    overlap.setSuffix(" %")
+    overlap.setValue(round(100 * last['overlap']))
+    form.addRow("Перекрытие", overlap)
+    window = QComboBox(dialog)
+    window.addItems(WELCH_WINDOWS)
+    window.setCurrentText(last['window'])
+    form.addRow("Окно", window)
+    buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel, dialog)
+    buttons.accepted.connect(dialog.accept)
+    buttons.rejected.connect(dialog.reject)
+    form.addRow(buttons)
+    if dialog.exec() != QDialog.DialogCode.Accepted:
+        return None
+    main_window._spectrum_welch_params = {
+        'segment_length': segment.currentData(),
+        'overlap': overlap.value() / 100,
+        'window': window.currentText(),
+    }
+    return main_window._spectrum_welch_params
+
+def create_spectrum_welch(main_window):
+    '''
+    Создает спектр Уэлча по активной линии графика сигнала (параметры выбираются в диалоге).
+    '''
+    params = main_window.plot_data_signal.get_active_line_params()
+    line = main_window.plot_data_signal.get_active_line()
+    if params is None or line is None:
+        print_c("Нет активной линии для спектра\n")
+        return
+    welch = ask_welch_params(main_window)
+    if welch is None:
+        return
+    if not hasattr(main_window, '_spectrum_db_mode'):
+        main_window._spectrum_db_mode = False
+    add_spectrume(main_window, line, params, welch=welch)
+
+def create_spectrogram(main_window):
+    '''
+    Строит спектрограмму активной линии для видимого участка графика сигнала (вкладка "Спектрограмма").
+    '''
+    line = main_window.plot_data_signal.get_active_line()
+    if line is None:
+        print_c("Нет активной линии для спектрограммы\n")
+        return
+    show_spectrogram(main_window, line, main_window.plot_data_signal.ax.get_xlim())
+
 def clip_data_x_axis(main_window):
     '''
     Обрезает данные всех линий графика по видимой области оси X.
@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+'''
+pcm_data.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль читает записи в форматах WAV и «сырой» PCM (отсчёты без заголовка, каналы чередуются) без перевода в CSV.
+Файл отображается в память (np.memmap): отсчёты канала — представление (срез с шагом, равным количеству каналов),
+целочисленные отсчёты — QuantizedSignal с шагом квантования и смещением, поэтому при открытии файла ничего не копируется;
+перевод в вольты выполняется только при построении графика или обработке сигнала.
+Тип отсчётов, количество каналов и частота дискретизации берутся из заголовка WAV-файла или из JSON-файла
+с тем же именем (для файлов .pcm/.raw — обязательно). JSON-файл может также содержать параметры отображения
+(format_ver, inx_start, inx_stop, downsampling_factor, см. read_display_params) и ключи:
+    "sample_rate" — частота дискретизации, Гц;
+    "dtype" — тип отсчёта numpy ("int16", "<i2", "float32" и т.д., по умолчанию "int16");
+    "channels" — количество чередующихся каналов (по умолчанию 1);
+    "channel" — номер канала, выводимого на график (по умолчанию 0);
+    "header_bytes" — размер заголовка перед отсчётами, байт (по умолчанию 0);
+    "scale", "offset" — перевод кода в вольты: s = code * scale + offset (по умолчанию — полная шкала ±1);
+    "t0" — время первого отсчёта, с.
+
+Список функций:
+---------------
+- is_pcm_file(file_name)
+    Проверяет, является ли файл записью WAV или PCM (по расширению).
+- read_wav_header(file_name)
+    Читает заголовок WAV-файла: тип отсчёта, количество каналов, частота дискретизации, положение отсчётов.
+- read_pcm_params(file_name)
+    Параметры отображения файла в память по заголовку WAV и/или JSON-файлу.
+- read_pcm(file_name, channel=None)
+    Отображает файл в память: равномерная временная ось (TimeBase), отсчёты канала и метаинформация.
+- read_pcm_channels(file_name)
+    Отображает файл в память: общая временная ось и отсчёты всех каналов.
+- read_pcm_header_meta(file_name)
+    Метаинформация записи для каталога (см. read_header_meta) без чтения отсчётов.
+'''
+
+import os
+import json
+import struct
+
+import numpy as np
+
+from time_base import TimeBase
+from quantized import QuantizedSignal
+
+# Расширения файлов записей WAV и PCM
+PCM_EXTENSIONS = ('.wav', '.pcm', '.raw')
+
+# Коды формата отсчётов в блоке "fmt " WAV-файла
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def is_pcm_file(file_name):
+    '''
+    Проверяет, является ли файл записью WAV или PCM (.wav, .pcm, .raw).
+    Аргументы:
+        file_name (str): Путь к файлу.
+    Возвращает:
+        bool: True для файла WAV или PCM.
+    '''
+    return file_name.lower().endswith(PCM_EXTENSIONS)
+
+
+def read_wav_header(file_name):
+    '''
+    Читает заголовок WAV-файла (блоки RIFF "fmt " и "data"), не читая отсчёты.
+    Аргументы:
+        file_name (str): Путь к WAV-файлу.
+    Возвращает:
+        dict: dtype (np.dtype), channels, sample_rate, header_bytes (смещение отсчётов), n_frames.
+    Исключения:
+        ValueError: Файл не является WAV-файлом или тип отсчётов не поддерживается (например, 24 бита).
+    '''
+    with open(file_name, 'rb') as f:
+        riff, _, wave = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError(f'Файл не является WAV-файлом: {file_name}')
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f'В WAV-файле нет блока отсчётов: {file_name}')
+            chunk_id, size = struct.unpack('<4sI', chunk)
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                if size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b'data':
+                header_bytes = f.tell()
+                break
+            else:
+                f.seek(size + size % 2, os.SEEK_CUR)  # Блоки выравниваются на чётную границу
+        file_size = f.seek(0, os.SEEK_END)
+    if fmt is None:
+        raise ValueError(f'В WAV-файле нет блока "fmt ": {file_name}')
+    audio_format, channels, sample_rate, _, block_align, bits = struct.unpack('<HHIIHH', fmt[:16])
+    if audio_format == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        audio_format = struct.unpack('<H', fmt[24:26])[0]  # Первые два байта GUID подформата
+    if audio_format == _WAVE_FORMAT_PCM and bits in (8, 16, 32):
+        dtype = np.dtype('u1' if bits == 8 else f'<i{bits // 8}')
+    elif audio_format == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        dtype = np.dtype(f'<f{bits // 8}')
+    else:
+        raise ValueError(f'Неподдерживаемый формат отсчётов WAV: код {audio_format}, {bits} бит')
+    if block_align != dtype.itemsize * channels:
+        raise ValueError(f'Неподдерживаемое выравнивание отсчётов WAV: {block_align} байт')
+    # Размер блока данных в заголовке может быть не заполнен при прерванной записи — ограничиваем размером файла
+    data_bytes = min(size, file_size - header_bytes)
+    return {
+        'dtype': dtype,
+        'channels': channels,
+        'sample_rate': float(sample_rate),
+        'header_bytes': header_bytes,
+        'n_frames': data_bytes // block_align,
+    }
+
+
+def _sidecar_name(file_name):
+    return os.path.splitext(file_name)[0] + '.json'
+
+
+def _full_scale(dtype):
+    '''
+    Шаг и смещение, переводящие коды в диапазон ±1 (полная шкала), если перевод в вольты не задан.
+    '''
+    if dtype.kind == 'f':
+        return 1.0, 0.0
+    bits = dtype.itemsize * 8
+    if dtype.kind == 'u':
+        return 1.0 / (1 << (bits - 1)), -1.0
+    return 1.0 / (1 << (bits - 1)), 0.0
+
+
+def read_pcm_params(file_name):
+    '''
+    Определяет параметры отображения файла в память: для WAV-файла — по заголовку, для .pcm/.raw — по JSON-файлу
+    с тем же именем. Ключи JSON-файла (см. описание модуля) дополняют и заменяют значения из заголовка.
+    Аргументы:
+        file_name (str): Путь к файлу WAV или PCM.
+    Возвращает:
+        dict: dtype, channels, sample_rate, header_bytes, n_frames, channel, scale, offset, t0, format.
+    Исключения:
+        ValueError: Не задана частота дискретизации или параметры не соответствуют размеру файла.
+    '''
+    is_wav = file_name.lower().endswith('.wav')
+    params = read_wav_header(file_name) if is_wav else {'dtype': np.dtype('<i2'), 'channels': 1, 'header_bytes': 0}
+    params['format'] = 'WAV' if is_wav else 'PCM'
+    try:
+        with open(_sidecar_name(file_name), 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+    except FileNotFoundError:
+        sidecar = {}
+    for key in ('sample_rate', 'channels', 'header_bytes', 'channel', 'scale', 'offset', 't0'):
+        if key in sidecar:
+            params[key] = sidecar[key]
+    if 'dtype' in sidecar:
+        params['dtype'] = np.dtype(sidecar['dtype'])
+    if not params.get('sample_rate'):
+        raise ValueError(f'Не задана частота дискретизации ("sample_rate" в {_sidecar_name(file_name)})')
+    dtype = params['dtype']
+    params['channels'] = int(params['channels'])
+    params['header_bytes'] = int(params['header_bytes'])
+    params['channel'] = int(params.get('channel', 0))
+    if not 0 <= params['channel'] < params['channels']:
+        raise ValueError(f'Номер канала {params["channel"]} вне диапазона 0...{params["channels"] - 1}')
+    frame_bytes = dtype.itemsize * params['channels']
+    max_frames = max(0, os.path.getsize(file_name) - params['header_bytes']) // frame_bytes
+    params['n_frames'] = min(params.get('n_frames', max_frames), max_frames)
+    scale, offset = _full_scale(dtype)
+    params['scale'] = float(params.get('scale', scale))
+    params['offset'] = float(params.get('offset', offset))
+    params['t0'] = float(params.get('t0', 0.0))
+    return params
+
+
+def _map_frames(file_name, params):
+    '''
+    Отображает отсчёты файла в память: массив "отсчёт x канал" только для чтения.
+    '''
+    if params['n_frames'] == 0:
+        return np.empty((0, params['channels']), dtype=params['dtype'])
+    return np.memmap(file_name, dtype=params['dtype'], mode='r', offset=params['header_bytes'],
+                     shape=(params['n_frames'], params['channels']))
+
+
+def _channel_signal(frames, c, params):
+    '''
+    Отсчёты канала c: представление массива frames (без копирования) с переводом кода в вольты по требованию.
+    '''
+    codes = frames[:, c]
+    if frames.dtype.kind == 'f' and params['scale'] == 1.0 and params['offset'] == 0.0:
+        return codes
+    return QuantizedSignal(codes, params['scale'], params['offset'])
+
+
+def _pcm_meta(file_name, params, source):
+    dt = 1.0 / params['sample_rate']
+    return {
+        'Format': f'{params["format"]} {params["dtype"].name}, каналов: {params["channels"]}',
+        'Record Length': str(params['n_frames']),
+        'Sample Interval': f'{dt:.6e}',
+        'Sample Rate': f'{params["sample_rate"]:g}',
+        'Source': source,
+        'Scale': f'{params["scale"]:.6e}',
+        'Offset': f'{params["offset"]:g}',
+        'fs': params['sample_rate'],
+    }
+
+
+def read_pcm(file_name, channel=None):
+    '''
+    Отображает файл WAV или PCM в память и возвращает отсчёты одного канала без копирования.
+    Аргументы:
+        file_name (str): Путь к файлу.
+        channel (int | None): Номер канала (None — из JSON-файла, по умолчанию 0).
+    Возвращает:
+        t (TimeBase): Равномерная временная ось.
+        s (QuantizedSignal | np.memmap): Отсчёты канала (целочисленные — коды с шагом и смещением).
+        meta (dict): Метаинформация (тип отсчёта, количество отсчётов, период и частота дискретизации, канал).
+    '''
+    params = read_pcm_params(file_name)
+    if channel is not None:
+        params['channel'] = int(channel)
+    frames = _map_frames(file_name, params)
+    s = _channel_signal(frames, params['channel'], params)
+    t = TimeBase(params['t0'], 1.0 / params['sample_rate'], len(frames))
+    return t, s, _pcm_meta(file_name, params, f'CH{params["channel"] + 1}')
+
+
+def read_pcm_channels(file_name):
+    '''
+    Отображает файл WAV или PCM в память и возвращает отсчёты всех каналов без копирования.
+    Аргументы:
+        file_name (str): Путь к файлу.
+    Возвращает:
+        t (TimeBase): Общая временная ось каналов.
+        S (list): Отсчёты каналов (QuantizedSignal или np.memmap).
+        names (list of str): Имена каналов (CH1, CH2, ...).
+        meta (dict): Метаинформация.
+    '''
+    params = read_pcm_params(file_name)
+    frames = _map_frames(file_name, params)
+    names = [f'CH{c + 1}' for c in range(params['channels'])]
+    S = [_channel_signal(frames, c, params) for c in range(params['channels'])]
+    t = TimeBase(params['t0'], 1.0 / params['sample_rate'], len(frames))
+    return t, S, names, _pcm_meta(file_name, params, ', '.join(names))
+
+
+def read_pcm_header_meta(file_name):
+    '''
+    Возвращает метаинформацию записи WAV или PCM в виде словаря read_header_meta (для каталога записей).
+    Отсчёты не читаются: количество отсчётов определяется по размеру файла.
+    '''
+    params = read_pcm_params(file_name)
+    names = [f'CH{c + 1}' for c in range(params['channels'])]
+    return {
+        'format_ver': 1,  # Версия формата CSV для файла WAV/PCM не используется
+        'fs': params['sample_rate'],
+        'n_samples': params['n_frames'],
+        'duration': params['n_frames'] / params['sample_rate'],
+        't0': params['t0'],
+        'source': ', '.join(names),
+        'model': '',
+        'meta': _pcm_meta(file_name, params, ', '.join(names)),
+    }
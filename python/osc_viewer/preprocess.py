@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+'''
+preprocess.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует конвейер предобработки сигнала перед построением спектра из этапов: децимация, удаление
+постоянной составляющей или линейного тренда, оконная функция, дополнение нулями или усечение до заданной длины.
+Этапы работают с массивами NumPy на месте: до выполнения конвейера вычисляется длина результата и выделяется
+один выходной буфер (или используется переданный), первый этап записывает в него данные из исходного сигнала
+(децимация — сразу прореженные отсчёты), остальные изменяют буфер на месте. Исходный сигнал (в том числе
+отображённый в память или хранимый кодами АЦП) не копируется и не изменяется.
+
+Список классов и функций:
+-------------------------
+- Decimate(factor)
+    Этап децимации с фильтром защиты от наложения спектров (см. decimation.decimate).
+- Detrend(kind='constant')
+    Этап удаления постоянной составляющей ('constant') или линейного тренда ('linear').
+- Window(name='hann', coherent_gain=True)
+    Этап умножения на оконную функцию (окна кэшируются по имени и длине).
+- PadTruncate(length)
+    Этап дополнения нулями или усечения до заданной длины.
+- Pipeline(*stages)
+    Конвейер этапов: output_length(n), run(s, out=None), вызов pipeline(t, s, out=None) -> (TimeBase, np.ndarray).
+'''
+
+from functools import lru_cache
+
+import numpy as np
+from scipy.signal import get_window
+
+from decimation import decimate
+from quantized import QuantizedSignal
+from time_base import TimeBase, as_time_base
+
+# Размер блока при вычислении линейного тренда (массив номеров отсчётов не превышает размер блока)
+DETREND_BLOCK_SIZE = 1 << 16
+
+
+def _copy_into(out, s):
+    '''Записывает отсчёты сигнала s в массив out (коды АЦП переводятся в вольты без промежуточного массива).'''
+    if isinstance(s, QuantizedSignal):
+        np.multiply(s.codes, s.scale, out=out)
+        out += s.offset
+    else:
+        out[:] = s
+
+
+class Decimate:
+    '''
+    Этап децимации в factor раз с фильтром защиты от наложения спектров.
+    Отсчёт m результата соответствует отсчёту m*factor исходного сигнала, ось времени прореживается срезом.
+    Аргументы:
+        factor (int): Коэффициент децимации (1 — этап ничего не делает).
+    '''
+
+    in_place = False
+
+    def __init__(self, factor):
+        self.factor = max(1, int(factor or 1))
+
+    def output_length(self, n):
+        return -(-n // self.factor)
+
+    def time_base(self, t):
+        return t[::self.factor]
+
+    def apply(self, s, out):
+        '''Записывает прореженный сигнал s в out (out может совпадать с началом s).'''
+        decimate(s, self.factor, out=out)
+
+
+class Detrend:
+    '''
+    Этап удаления постоянной составляющей (kind='constant') или линейного тренда (kind='linear') на месте.
+    Аргументы:
+        kind (str): 'constant' или 'linear'.
+    '''
+
+    in_place = True
+
+    def __init__(self, kind='constant'):
+        if kind not in ('constant', 'linear'):
+            raise ValueError(f'Неизвестный тип тренда: {kind}')
+        self.kind = kind
+
+    def output_length(self, n):
+        return n
+
+    def time_base(self, t):
+        return t
+
+    def apply(self, x):
+        n = len(x)
+        if n == 0:
+            return
+        mean = np.mean(x)
+        if self.kind == 'constant' or n < 2:
+            x -= mean
+            return
+        # Наклон прямой по МНК: sum((i - c) * x) / sum((i - c)^2), c = (n - 1) / 2; суммы считаются блоками
+        c = (n - 1) / 2
+        cov = 0.0
+        for a in range(0, n, DETREND_BLOCK_SIZE):
+            block = x[a:a + DETREND_BLOCK_SIZE]
+            cov += np.dot(np.arange(a, a + len(block)) - c, block)
+        slope = cov / (n * (n * n - 1) / 12)
+        for a in range(0, n, DETREND_BLOCK_SIZE):
+            block = x[a:a + DETREND_BLOCK_SIZE]
+            block -= mean + slope * (np.arange(a, a + len(block)) - c)
+
+
+@lru_cache(maxsize=8)
+def _window(name, n, coherent_gain):
+    w = get_window(name, n, fftbins=True)
+    if coherent_gain:
+        w /= np.mean(w)  # Амплитуда гармонической составляющей в спектре сохраняется
+    w.flags.writeable = False
+    return w
+
+
+class Window:
+    '''
+    Этап умножения на оконную функцию на месте.
+    Аргументы:
+        name (str | tuple): Имя окна scipy.signal.get_window ('hann', ('kaiser', 8.0) и т.п.).
+        coherent_gain (bool): Нормировать окно на его среднее значение (амплитуды гармоник в спектре сохраняются).
+    Особенности:
+        - Окно одной длины вычисляется один раз (кэш на несколько последних длин), при повторном вызове
+          конвейера новый массив не выделяется.
+    '''
+
+    in_place = True
+
+    def __init__(self, name='hann', coherent_gain=True):
+        self.name = name
+        self.coherent_gain = coherent_gain
+
+    def output_length(self, n):
+        return n
+
+    def time_base(self, t):
+        return t
+
+    def apply(self, x):
+        if len(x):
+            x *= _window(self.name, len(x), self.coherent_gain)
+
+
+class PadTruncate:
+    '''
+    Этап дополнения нулями или усечения до length отсчётов. Ось времени продолжается (или усекается) с тем же шагом.
+    Аргументы:
+        length (int): Длина результата.
+    '''
+
+    in_place = True
+
+    def __init__(self, length):
+        self.length = int(length)
+
+    def output_length(self, n):
+        return self.length
+
+    def time_base(self, t):
+        return TimeBase(t.t0, t.dt, self.length)
+
+
+class Pipeline:
+    '''
+    Конвейер этапов предобработки, выполняемых по порядку.
+    Аргументы:
+        *stages: Этапы (Decimate, Detrend, Window, PadTruncate).
+    Особенности:
+        - Пока этапы не изменяют отсчёты (усечение), они применяются к представлению исходного сигнала.
+        - Первый изменяющий этап записывает результат в буфер, остальные изменяют буфер на месте;
+          размер буфера — наибольшая длина сигнала после записи в буфер, результат — его начало.
+        - Если передан out достаточной длины, конвейер не выделяет массивов длины сигнала.
+    '''
+
+    def __init__(self, *stages):
+        self.stages = list(stages)
+
+    def _lengths(self, n):
+        '''Возвращает (длина результата, необходимый размер буфера) для сигнала длиной n.'''
+        size = 0
+        owned = False
+        for stage in self.stages:
+            m = stage.output_length(n)
+            if isinstance(stage, PadTruncate) and not owned and m <= n:
+                n = m  # Усечение исходного сигнала — срез без копирования
+                continue
+            owned = True
+            n = m
+            size = max(size, n)
+        return n, max(size, n)
+
+    def output_length(self, n):
+        '''Длина результата конвейера для сигнала длиной n.'''
+        return self._lengths(n)[0]
+
+    def buffer_length(self, n):
+        '''Необходимый размер буфера (аргумент out метода run) для сигнала длиной n.'''
+        return self._lengths(n)[1]
+
+    def time_base(self, t):
+        '''Временная ось результата для временной оси сигнала t (TimeBase или массив).'''
+        t = as_time_base(t)
+        for stage in self.stages:
+            t = stage.time_base(t)
+        return t
+
+    def run(self, s, out=None):
+        '''
+        Выполняет конвейер.
+        Аргументы:
+            s (array-like | QuantizedSignal): Исходный сигнал (не изменяется).
+            out (np.ndarray | None): Буфер float64 длиной не меньше buffer_length(len(s)); None — буфер выделяется.
+        Возвращает:
+            np.ndarray: Результат — начало буфера длиной output_length(len(s)).
+        '''
+        if not isinstance(s, QuantizedSignal):
+            s = np.asarray(s)
+        n_out, size = self._lengths(len(s))
+        if out is None:
+            out = np.empty(size)
+        elif len(out) < size:
+            raise ValueError(f'Буфер конвейера слишком мал: {len(out)} < {size}')
+        src = s  # Данные ещё в исходном сигнале (None — уже в буфере)
+        n = len(s)
+        for stage in self.stages:
+            m = stage.output_length(n)
+            if isinstance(stage, PadTruncate):
+                if src is not None and m <= n:
+                    src = src[:m]
+                elif src is not None:
+                    _copy_into(out[:n], src)
+                    src = None
+                if src is None and m > n:
+                    out[n:m] = 0.0
+            elif stage.in_place:
+                if src is not None:
+                    _copy_into(out[:n], src)
+                    src = None
+                stage.apply(out[:n])
+            else:
+                # Этап с другой длиной результата пишет в буфер из исходного сигнала или из начала буфера
+                stage.apply(out[:n] if src is None else src, out[:m])
+                src = None
+            n = m
+        if src is not None:
+            _copy_into(out[:n], src)
+        return out[:n_out]
+
+    def __call__(self, t, s, out=None):
+        '''
+        Выполняет конвейер для сигнала и его временной оси.
+        Возвращает:
+            tuple: (TimeBase, np.ndarray) — временная ось и отсчёты результата.
+        '''
+        return self.time_base(t), self.run(s, out)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+'''
+quantized.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует компактное хранение отсчётов сигнала в виде целочисленных кодов АЦП (int8/int16)
+с шагом квантования и смещением: s[i] = codes[i] * scale + offset.
+Осциллографы (например, TDS2002B) записывают 8-битные отсчёты с шагом Vertical Scale / 25 В,
+поэтому сигнал хранится в 1 или 2 байтах на отсчёт вместо 8 байт float64 без потери точности.
+Перевод в вольты выполняется по требованию: целиком (np.asarray) или поблочно (iter_blocks).
+
+Список классов и функций:
+-------------------------
+- QuantizedSignal(codes, scale, offset=0.0)
+    Сигнал в виде кодов АЦП с ленивым переводом в вольты.
+- quantization_step(meta)
+    Возвращает шаг квантования по метаинформации осциллографа ("Vertical Scale") или None.
+- quantize(s, meta=None, step=None)
+    Переводит отсчёты сигнала в коды int8/int16, если это возможно без потери точности.
+'''
+
+import operator
+
+import numpy as np
+
+# Количество кодов АЦП на одно деление вертикальной шкалы осциллографов Tektronix серии TDS (8-битный АЦП)
+CODES_PER_DIV = 25
+# Допустимое отклонение восстановленного значения от исходного (в долях шага квантования)
+QUANTIZATION_TOLERANCE = 1e-3
+# Количество отсчётов, по которым оценивается шаг квантования, если он не задан в метаинформации
+STEP_ESTIMATE_SAMPLES = 1 << 20
+# Количество отсчётов в блоке перевода кодов в вольты
+VOLTS_BLOCK_SIZE = 1 << 16
+
+
+class QuantizedSignal:
+    '''
+    Сигнал, хранимый в виде целочисленных кодов АЦП: s[i] = codes[i] * scale + offset.
+    Атрибуты:
+        codes (np.ndarray): Коды АЦП (int8 или int16), в том числе отображённые в память.
+        scale (float): Шаг квантования, В.
+        offset (float): Смещение, В.
+    Особенности:
+        - Поддерживает len(), индексацию (s[i] — значение в вольтах) и срезы (s[a:b:k] — новый QuantizedSignal без копирования).
+        - np.asarray(s) и to_volts() переводят весь сигнал в вольты (одно выделение памяти float64).
+        - iter_blocks() переводит сигнал в вольты поблочно, не создавая массив float64 полной длины.
+        - min(), max() вычисляются по кодам.
+    '''
+
+    __slots__ = ('codes', 'scale', 'offset')
+
+    def __init__(self, codes, scale, offset=0.0):
+        self.codes = codes
+        self.scale = float(scale)
+        self.offset = float(offset)
+
+    @property
+    def nbytes(self):
+        '''Объём памяти, занимаемый кодами, байт.'''
+        return self.codes.nbytes
+
+    @property
+    def shape(self):
+        return self.codes.shape
+
+    @property
+    def ndim(self):
+        return 1
+
+    @property
+    def dtype(self):
+        '''Тип значений после перевода в вольты.'''
+        return np.dtype(np.float64)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return QuantizedSignal(self.codes[key], self.scale, self.offset)
+        if isinstance(key, np.ndarray):
+            return self._volts(self.codes[key])
+        return float(self.codes[operator.index(key)]) * self.scale + self.offset
+
+    def _volts(self, codes, dtype=np.float64):
+        v = codes.astype(dtype)
+        v *= self.scale
+        v += self.offset
+        return v
+
+    def to_volts(self, dtype=np.float64):
+        '''
+        Переводит весь сигнал в вольты.
+        Аргументы:
+            dtype: Тип результата (float64 или float32).
+        Возвращает:
+            np.ndarray: Значения сигнала, В.
+        '''
+        return self._volts(self.codes, dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.to_volts(np.float64 if dtype is None else dtype)
+
+    def __iter__(self):
+        return iter(self.to_volts())
+
+    def iter_blocks(self, block_size=VOLTS_BLOCK_SIZE, dtype=np.float64):
+        '''
+        Генератор: переводит сигнал в вольты блоками фиксированного размера.
+        Аргументы:
+            block_size (int): Количество отсчётов в блоке (последний блок может быть короче).
+            dtype: Тип значений блока.
+        Возвращает (yield):
+            np.ndarray: Значения блока сигнала, В.
+        '''
+        for a in range(0, len(self.codes), block_size):
+            yield self._volts(self.codes[a:a + block_size], dtype)
+
+    def min(self, *args, **kwargs):
+        code = self.codes.min() if self.scale >= 0 else self.codes.max()
+        return float(code) * self.scale + self.offset
+
+    def max(self, *args, **kwargs):
+        code = self.codes.max() if self.scale >= 0 else self.codes.min()
+        return float(code) * self.scale + self.offset
+
+    def __repr__(self):
+        return f'QuantizedSignal(n={len(self.codes)}, dtype={self.codes.dtype}, scale={self.scale!r}, offset={self.offset!r})'
+
+
+def quantization_step(meta):
+    '''
+    Возвращает шаг квантования по метаинформации осциллографа.
+    Аргументы:
+        meta (dict | None): Метаинформация файла.
+    Возвращает:
+        float | None: Vertical Scale / CODES_PER_DIV или None, если шаг не задан.
+    '''
+    try:
+        step = float(meta['Vertical Scale']) / CODES_PER_DIV
+    except (TypeError, KeyError, ValueError):
+        return None
+    return step if step > 0 else None
+
+
+def _estimate_step(s):
+    '''
+    Оценивает шаг квантования как наименьшую разность между различными значениями сигнала.
+    '''
+    values = np.unique(s[:STEP_ESTIMATE_SAMPLES])
+    if len(values) < 2:
+        return None
+    # Округление убирает погрешность перевода десятичных значений из текста (0.00999999999995 -> 0.01)
+    return float(f'{np.min(np.diff(values)):.12g}')
+
+
+def quantize(s, meta=None, step=None):
+    '''
+    Переводит отсчёты сигнала в коды АЦП, если значения лежат на равномерной сетке уровней.
+    Шаг квантования берётся из аргумента step, из метаинформации (quantization_step) или оценивается по данным;
+    смещение выбирается так, чтобы сетка уровней проходила через первый отсчёт.
+    Аргументы:
+        s (array-like): Отсчёты сигнала, В.
+        meta (dict | None): Метаинформация файла.
+        step (float | None): Шаг квантования, В.
+    Возвращает:
+        QuantizedSignal | None: Сигнал в кодах int8 (или int16, если коды не помещаются в int8);
+        None, если отсчёты не лежат на сетке уровней или коды не помещаются в int16.
+    '''
+    if isinstance(s, QuantizedSignal):
+        return s
+    s = np.asarray(s, dtype=np.float64)
+    if len(s) == 0:
+        return QuantizedSignal(np.empty(0, dtype=np.int8), step or 1.0)
+    candidates = [step] if step else [quantization_step(meta), _estimate_step(s)]
+    for step in candidates:
+        if not step:
+            continue
+        offset = float(s[0] - np.round(s[0] / step) * step)
+        if abs(offset) < step * QUANTIZATION_TOLERANCE:
+            offset = 0.0
+        codes = np.round((s - offset) / step)
+        # Проверка без потери точности: восстановленные значения совпадают с исходными
+        if np.max(np.abs(codes * step + offset - s)) > step * QUANTIZATION_TOLERANCE:
+            continue
+        lo, hi = codes.min(), codes.max()
+        for dtype in (np.int8, np.int16):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return QuantizedSignal(codes.astype(dtype), step, offset)
+    return None
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+'''
+quick_preview.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует быстрый предварительный просмотр большого CSV-файла перед загрузкой.
+Из файла разбираются только несколько тысяч строк в равномерно расположенных байтовых смещениях (read_sparse_preview),
+по ним строится график всей записи. На графике мышью выделяется участок, задаётся коэффициент прореживания,
+и затем загружается только выбранный участок (inx_start, inx_stop, downsampling_factor главного окна).
+
+Список классов и функций:
+-------------------------
+- SampleIndexSpinBox(n_samples)
+    Поле ввода номера отсчёта без ограничения QSpinBox в 2^31 (запись может содержать больше строк).
+- RegionSelectDialog(main_window, file_name, format_ver, inx_start=0, inx_stop=None, downsampling_factor=1)
+    Окно предварительного просмотра с выбором участка и коэффициента прореживания.
+- needs_preview(file_name)
+    Проверяет, нужен ли предварительный просмотр файла (большой несжатый CSV-файл).
+- select_region(main_window, file_name)
+    Показывает окно предварительного просмотра и сохраняет выбранный участок в параметрах главного окна.
+'''
+
+import os
+
+import numpy as np
+
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QSpinBox, QDoubleSpinBox, QLabel, QPushButton, QDialogButtonBox
+from matplotlib.figure import Figure
+from matplotlib.widgets import SpanSelector
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+from load_and_prepare_data import read_sparse_preview, is_compressed, print_c
+from pcm_data import is_pcm_file
+
+# Файлы меньшего размера загружаются без предварительного просмотра: их разбор и так занимает доли секунды
+PREVIEW_MIN_BYTES = 1 << 24
+# Максимальный коэффициент прореживания, задаваемый в окне
+MAX_DOWNSAMPLING = 1_000_000
+
+
+class SampleIndexSpinBox(QDoubleSpinBox):
+    '''
+    Поле ввода номера отсчёта 0...n_samples. QSpinBox хранит значение в int32 и не позволяет задать номер
+    отсчёта записи длиннее 2^31 строк, поэтому используется QDoubleSpinBox без дробной части
+    (номера до 2^53 представляются в float64 точно).
+    Аргументы:
+        n_samples (int): Количество отсчётов записи (наибольшее значение поля).
+    '''
+
+    def __init__(self, n_samples):
+        super().__init__()
+        self.setDecimals(0)
+        self.setSingleStep(1)
+        self.setRange(0, max(n_samples, 0))
+        self.setGroupSeparatorShown(True)
+
+    def index(self):
+        '''Возвращает номер отсчёта (int).'''
+        return int(self.value())
+
+
+class RegionSelectDialog(QDialog):
+    '''
+    Окно предварительного просмотра файла: график по прореженным строкам (read_sparse_preview),
+    выделение участка мышью (SpanSelector) или полями ввода, коэффициент прореживания и оценка количества
+    загружаемых отсчётов.
+    Аргументы:
+        main_window: Главное окно приложения.
+        file_name (str): Путь к CSV-файлу.
+        format_ver (int): Версия формата файла.
+        inx_start, inx_stop, downsampling_factor: Начальные значения участка и прореживания (например, из JSON-файла).
+    '''
+
+    def __init__(self, main_window, file_name, format_ver, inx_start=0, inx_stop=None, downsampling_factor=1):
+        super().__init__(main_window)
+        self.idx, self.t, self.s, self.info = read_sparse_preview(file_name, format_ver)
+        self.n_samples = self.info['n_samples']
+        self.setWindowTitle(f'Предварительный просмотр: {os.path.basename(file_name)}')
+        self.resize(900, 520)
+
+        self.figure = Figure(figsize=(8, 3))
+        self.canvas = FigureCanvas(self.figure)
+        self.ax = self.figure.add_subplot(111)
+        self.ax.plot(self.t * 1000, self.s, linewidth=0.7)
+        self.ax.set_xlabel('Время, мс')
+        self.ax.set_ylabel('Амплитуда, В')
+        self.ax.set_title(f'Прочитано строк: {len(self.s)} из {self.n_samples}')
+        self.ax.grid(True)
+        self.figure.tight_layout()
+        self.selector = SpanSelector(
+            self.ax, self.on_select, 'horizontal', useblit=True, interactive=True,
+            props=dict(alpha=0.2, facecolor='tab:orange'),
+        )
+
+        self.start_spin = SampleIndexSpinBox(self.n_samples)
+        self.stop_spin = SampleIndexSpinBox(self.n_samples)
+        # Конец участка не может быть раньше начала: при сдвиге начала вперёд конец сдвигается вместе с ним
+        self.start_spin.valueChanged.connect(self.stop_spin.setMinimum)
+        self.ds_spin = QSpinBox()
+        self.ds_spin.setRange(1, MAX_DOWNSAMPLING)
+        self.start_spin.setValue(int(inx_start or 0))
+        self.stop_spin.setValue(self.n_samples if inx_stop is None else min(int(inx_stop), self.n_samples))
+        self.ds_spin.setValue(max(1, int(downsampling_factor or 1)))
+        for spin in (self.start_spin, self.stop_spin, self.ds_spin):
+            spin.valueChanged.connect(self.update_summary)
+        form = QFormLayout()
+        form.addRow('Первый отсчёт (inx_start):', self.start_spin)
+        form.addRow('Последний отсчёт (inx_stop):', self.stop_spin)
+        form.addRow('Прореживание:', self.ds_spin)
+        self.summary_label = QLabel()
+
+        whole_button = QPushButton('Весь файл')
+        whole_button.clicked.connect(self.select_whole)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        bottom = QHBoxLayout()
+        bottom.addWidget(whole_button)
+        bottom.addStretch()
+        bottom.addWidget(buttons)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self.canvas)
+        layout.addLayout(form)
+        layout.addWidget(self.summary_label)
+        layout.addLayout(bottom)
+        self.update_summary()
+
+    def on_select(self, x_min, x_max):
+        '''
+        Переводит выделенный на графике интервал времени (мс) в номера отсчётов.
+        '''
+        dt = 1/self.info['fs'] if self.info['fs'] else 0.0
+        if not dt or x_max <= x_min:
+            return
+        i0 = int(np.floor((x_min / 1000 - self.info['t0']) / dt))
+        i1 = int(np.ceil((x_max / 1000 - self.info['t0']) / dt)) + 1
+        self.start_spin.setValue(min(max(i0, 0), self.n_samples))
+        self.stop_spin.setValue(min(max(i1, 0), self.n_samples))
+
+    def select_whole(self):
+        '''Выбирает всю запись.'''
+        self.start_spin.setValue(0)
+        self.stop_spin.setValue(self.n_samples)
+        self.selector.set_visible(False)
+        self.canvas.draw_idle()
+
+    def region(self):
+        '''
+        Возвращает:
+            tuple: (inx_start, inx_stop, downsampling_factor); inx_stop = None, если участок доходит до конца файла.
+        '''
+        start, stop = self.start_spin.index(), self.stop_spin.index()
+        return start, (None if stop >= self.n_samples else stop), self.ds_spin.value()
+
+    def update_summary(self):
+        '''Обновляет оценку количества загружаемых отсчётов и частоты дискретизации после прореживания.'''
+        start, stop, ds = self.start_spin.index(), self.stop_spin.index(), self.ds_spin.value()
+        n = len(range(start, stop, ds))
+        fs = self.info['fs'] / ds
+        self.summary_label.setText(
+            f'Будет загружено отсчётов: {n} из {self.n_samples}; частота дискретизации после прореживания: {fs:g} Гц'
+        )
+
+
+def needs_preview(file_name):
+    '''
+    Проверяет, нужен ли предварительный просмотр файла: несжатый CSV-файл размером не меньше PREVIEW_MIN_BYTES.
+    Аргументы:
+        file_name (str): Путь к файлу.
+    Возвращает:
+        bool: True, если перед загрузкой следует показать окно предварительного просмотра.
+    '''
+    if is_compressed(file_name) or is_pcm_file(file_name):
+        return False  # Сжатый файл не допускает перехода по смещениям, файл WAV/PCM открывается мгновенно
+    try:
+        return os.path.getsize(file_name) >= PREVIEW_MIN_BYTES
+    except OSError:
+        return False
+
+
+def select_region(main_window, file_name):
+    '''
+    Для большого файла (needs_preview) показывает окно предварительного просмотра и сохраняет выбранный участок
+    в параметрах главного окна (main_window.inx_start, inx_stop, downsampling_factor).
+    Аргументы:
+        main_window: Главное окно приложения (параметры отображения уже установлены select_csv_file).
+        file_name (str): Путь к CSV-файлу.
+    Возвращает:
+        bool: True — файл следует загрузить; False — загрузка отменена пользователем.
+    '''
+    if not needs_preview(file_name):
+        return True
+    try:
+        dialog = RegionSelectDialog(
+            main_window, file_name, main_window.format_ver,
+            main_window.inx_start, main_window.inx_stop, main_window.downsampling_factor,
+        )
+    except (OSError, ValueError) as e:
+        print_c(f'Предварительный просмотр недоступен: {e}', color='orange')
+        return True
+    if dialog.exec() != QDialog.DialogCode.Accepted:
+        print_c('Загрузка отменена.')
+        return False
+    main_window.inx_start, main_window.inx_stop, main_window.downsampling_factor = dialog.region()
+    print_c(f'Выбран участок: {main_window.inx_start}...{main_window.inx_stop}, шаг {main_window.downsampling_factor}')
+    return True
@@ -3,8 +3,8 @@
 spectr_context_menu.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.1
+Дата:         2026-10-17
+Версия:       1.0.2
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -13,6 +13,8 @@ spectr_context_menu.py
 -----------------
 Модуль реализует контекстное меню для вкладки "Спектр" в приложении визуализации сигналов.
 Позволяет переключать масштаб оси Y между Вольтами и децибелами, сохранять изображение графика и очищать график спектра.
+Переключение масштаба, нормализация и сброс подставляют в линии кэшированные представления модели спектра
+(spectrum_model.SpectrumModel), а не пересчитывают значения линий из текущих.
 
 Список функций:
 ---------------
@@ -20,11 +22,10 @@ spectr_context_menu.py
     Отображает контекстное меню для вкладки "Спектр" с возможностью переключения масштаба Y, сохранения изображения и очистки графика.
 '''
 
-import numpy as np
-
 from PyQt6.QtWidgets import QMenu, QFileDialog
 
 from load_and_prepare_data import print_c    # Функция для печати сообщений в консоль приложения
+from spectrum_model import show_spectrum_view  # Кэшированные представления спектра (В, дБ, нормированные)
 
 
 def show_spectr_context_menu(main_window, pos):
@@ -36,6 +37,18 @@ def show_spectr_context_menu(main_window, pos):
         pos (QPoint): Позиция вызова контекстного меню.
     '''
 
+    def scale_factor(line):
+        '''Масштабный коэффициент линии (нужен для восстановления модели линии, построенной без неё).'''
+        scale_factors = getattr(main_window.spectrum_data.canvas, "_osc_viewer_scale_factors", None)
+        if isinstance(scale_factors, dict):
+            return scale_factors.get(line, 1.0)
+        return 1.0
+
+    def set_scale_factor(line, value):
+        '''Сохраняет масштабный коэффициент линии (используется в подписи и при сбросе).'''
+        if hasattr(main_window.spectrum_data.canvas, "_osc_viewer_scale_factors"):
+            main_window.spectrum_data.canvas._osc_viewer_scale_factors[line] = value
+
     def toggle_db():
         '''
         Переключает масштаб оси Y спектра между Вольтами и децибелами.
@@ -45,6 +58,7 @@ def show_spectr_context_menu(main_window, pos):
         if not hasattr(main_window, "_spectrum_db_mode"):
             main_window._spectrum_db_mode = False
         # Инвертируем режим отображения
+        current_db = main_window._spectrum_db_mode
         main_window._spectrum_db_mode = not main_window._spectrum_db_mode
 
         # Получаем все линии спектра для обновления данных
@@ -55,28 +69,24 @@ def show_spectr_context_menu(main_window, pos):
 
         # Инициализируем пределы по оси Y
         ylim = {"min": 1_000, "max": -1_000}
+        if main_window._spectrum_db_mode:
+            ylabel = "Амплитуда, дБ"
+            title = "Спектр сигнала (дБ)"
+        else:
+            ylabel = "Амплитуда, В"
+            title = "Спектр сигнала"
         for line in lines:
-            spectrum = line.get_ydata()  # Получаем текущие значения Y
             params = main_window.spectrum_data.get_line_params(line)
             if params is None:
                 continue
-            if main_window._spectrum_db_mode:
-                # Переводим значения в дБ (20*log10)
-                ydata = 20 * np.log10(np.abs(spectrum) + 1e-12)
-                ylabel = "Амплитуда, дБ"
-                title = "Спектр сигнала (дБ)"
-            else:
-                # Переводим значения обратно в В (10^(x/20))
-                ydata = np.power(10, spectrum / 20)
-                ylabel = "Амплитуда, В"
-                title = "Спектр сигнала"
+            # Подставляем представление в выбранном масштабе (нормализация линии сохраняется);
+            # пределы представления вычисляются один раз и хранятся в модели
+            normalized = getattr(line, "_osc_viewer_spectrum_normalized", False)
+            ymin, ymax = show_spectrum_view(
+                line, main_window._spectrum_db_mode, normalized, current_db=current_db, scale=scale_factor(line))
             # Обновляем минимальные и максимальные значения для оси Y
-            if ylim["min"] > np.min(ydata):
-                ylim["min"] = min(ylim["min"], np.min(ydata))
-            if ylim["max"] < np.max(ydata):
-                ylim["max"] = max(ylim["max"], np.max(ydata))
-            # Устанавливаем новые значения Y для линии
-            line.set_ydata(ydata)
+            ylim["min"] = min(ylim["min"], ymin)
+            ylim["max"] = max(ylim["max"], ymax)
         # Перерисовываем холст
         main_window.spectrum_data.canvas.draw_idle()
 
@@ -127,22 +137,13 @@ def show_spectr_context_menu(main_window, pos):
             ydata = line.get_ydata()
             if ydata is None or len(ydata) == 0:
                 continue
-            max_val = np.max(ydata)
-            if max_val == 0:
-                continue
-            if main_window._spectrum_db_mode:
-                # В дБ максимальный уровень должен быть 0 дБ (смещение)
-                ydata_norm = ydata - max_val
-                # scale_factor в разах (для обратного преобразования)
-                scale_factor = 10 ** ((0-max_val) / 20) if max_val != 0 else 1.0
-            else:
-                # В В максимальный уровень должен быть 1 (деление)
-                ydata_norm = ydata / max_val
-                scale_factor = 1.0 / max_val if max_val != 0 else 1.0
-            line.set_ydata(ydata_norm)
-            # Сохраняем scale-фактор для линии (для сброса)
-            if hasattr(main_window.spectrum_data.canvas, "_osc_viewer_scale_factors"):
-                main_window.spectrum_data.canvas._osc_viewer_scale_factors[line] = scale_factor
+            # Нормированное представление (максимум 1 В или 0 дБ) вычисляется из исходного спектра один раз
+            show_spectrum_view(
+                line, main_window._spectrum_db_mode, True,
+                current_db=main_window._spectrum_db_mode, scale=scale_factor(line))
+            peak = line._osc_viewer_spectrum_model.peak
+            # Сохраняем scale-фактор для линии (в разах)
+            set_scale_factor(line, 1.0 / peak if peak else 1.0)
         # Перерисовываем холст
         main_window.spectrum_data.canvas.draw_idle()
         # Устанавливаем пределы по оси Y в зависимости от режима
@@ -165,21 +166,12 @@ def show_spectr_context_menu(main_window, pos):
             ydata = line.get_ydata()
             if ydata is None or len(ydata) == 0:
                 continue
-            scale_factor = 1.0
-            # Получаем сохранённый scale-фактор для линии
-            if hasattr(main_window.spectrum_data.canvas, "_osc_viewer_scale_factors"):
-                scale_factors = main_window.spectrum_data.canvas._osc_viewer_scale_factors
-                if line in scale_factors:
-                    scale_factor = scale_factors[line]
-            # Приводим данные к исходному масштабу (scale factor = 1.0)
-            if main_window._spectrum_db_mode:
-                ydata_reset = ydata - 20 * np.log10(scale_factor)
-            else:
-                ydata_reset = np.array(ydata/scale_factor)
-            line.set_ydata(ydata_reset)
+            # Исходное (ненормированное) представление уже хранится в модели — данные не пересчитываются
+            show_spectrum_view(
+                line, main_window._spectrum_db_mode, False,
+                current_db=main_window._spectrum_db_mode, scale=scale_factor(line))
             # Устанавливаем scale factor = 1.0 для линии
-            if hasattr(main_window.spectrum_data.canvas, "_osc_viewer_scale_factors"):
-                main_window.spectrum_data.canvas._osc_viewer_scale_factors[line] = 1.0
+            set_scale_factor(line, 1.0)
         # Перерисовываем холст
         main_window.spectrum_data.canvas.draw_idle()
         # Устанавливаем пределы по оси Y в зависимости от режима
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+'''
+spectrogram.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует спектрограмму (кратковременное преобразование Фурье, STFT) для вкладки "Спектрограмма".
+Спектрограмма показывает частотно-временную структуру сигнала, например ЛЧМ-посылок DDS (StartFreq/EndFreq, девиация),
+которая не видна на спектре одного БПФ.
+Сетка спектрограммы ограничена размером изображения: если сегментов на видимом участке больше SPECTROGRAM_MAX_COLUMNS,
+сегменты берутся с увеличенным шагом (прореженная сетка по времени), а если бинов БПФ больше SPECTROGRAM_MAX_ROWS —
+соседние бины объединяются по максимуму (узкие гармоники не теряются). Поэтому объём вычислений определяется
+размером изображения, а не длиной записи: спектрограмма миллиона отсчётов строится за доли секунды.
+Столбцы вычисляются пачками в отдельном потоке (QThread) и по мере готовности подставляются в изображение (imshow).
+При увеличении масштаба на вкладке спектрограмма пересчитывается для видимого участка с более подробной сеткой.
+
+Список классов и функций:
+-------------------------
+- SpectrogramGrid(n, fs, segment_length=SPECTROGRAM_SEGMENT_LENGTH, overlap=SPECTROGRAM_OVERLAP, ...)
+    Сетка спектрограммы участка из n отсчётов: шаг сегментов, объединение бинов, оси времени и частот; compute(s, c0, c1).
+- spectrogram(s, fs, **kwargs)
+    Вычисляет спектрограмму сигнала целиком: (times, freq, amplitude_db).
+- SpectrogramWorker(grid, s, chunk_columns=SPECTROGRAM_CHUNK_COLUMNS, generation=0)
+    Объект-исполнитель (выполняется в QThread): вычисляет столбцы пачками и передаёт их сигналом chunk.
+- SpectrogramView(main_window, plot_data, line, params=None)
+    Спектрограмма линии на вкладке: изображение, постепенное заполнение, пересчёт видимого участка при масштабировании.
+- show_spectrogram(main_window, line=None, x_range=None, params=None)
+    Строит спектрограмму линии (по умолчанию активной) для видимого участка графика сигнала.
+'''
+
+import numpy as np
+import scipy.fft
+from scipy.signal import get_window
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+from time_base import as_time_base
+from spectrum_engine import PRECISIONS, SPECTRUM_WORKERS
+from spectrum_model import DB_EPSILON
+
+# Длина сегмента БПФ по умолчанию, отсчётов
+SPECTROGRAM_SEGMENT_LENGTH = 512
+# Перекрытие соседних сегментов по умолчанию (доля длины сегмента)
+SPECTROGRAM_OVERLAP = 0.5
+# Окно по умолчанию (имя scipy.signal.get_window)
+SPECTROGRAM_WINDOW = 'hann'
+# Наибольшее количество столбцов (моментов времени) изображения
+SPECTROGRAM_MAX_COLUMNS = 1024
+# Наибольшее количество строк (частот) изображения
+SPECTROGRAM_MAX_ROWS = 512
+# Количество столбцов, вычисляемых и передаваемых в изображение за один раз
+SPECTROGRAM_CHUNK_COLUMNS = 64
+# Динамический диапазон цветовой шкалы, дБ
+SPECTROGRAM_DYNAMIC_RANGE_DB = 80
+# Задержка пересчёта после изменения масштаба, мс (пересчёт выполняется один раз по окончании масштабирования)
+SPECTROGRAM_REFINE_DELAY_MS = 300
+
+
+class SpectrogramGrid:
+    '''
+    Сетка спектрограммы участка сигнала.
+    Аргументы:
+        n (int): Количество отсчётов участка.
+        fs (float): Частота дискретизации, Гц.
+        segment_length (int): Длина сегмента (и БПФ), отсчётов.
+        overlap (float): Перекрытие соседних сегментов, доля длины сегмента (0 <= overlap < 1).
+        window (str | tuple): Окно (имя scipy.signal.get_window).
+        max_columns (int): Наибольшее количество столбцов (сегментов).
+        max_rows (int): Наибольшее количество строк (частот).
+        precision (str): 'double' или 'single' (см. spectrum_engine.rfft_spectrum).
+        t0 (float): Время первого отсчёта участка, с.
+    Атрибуты:
+        step (int): Шаг сегментов без прореживания, отсчётов.
+        hop (int): Фактический шаг сегментов (не меньше step), отсчётов.
+        n_columns (int): Количество столбцов.
+        group (int): Количество бинов БПФ, объединяемых в одну строку.
+        freq (np.ndarray): Частоты строк (нижний бин группы), Гц.
+        times (np.ndarray): Время середины сегментов, с.
+    Исключения:
+        ValueError: Неверные параметры или участок короче одного сегмента.
+    '''
+
+    def __init__(self, n, fs, segment_length=SPECTROGRAM_SEGMENT_LENGTH, overlap=SPECTROGRAM_OVERLAP,
+                 window=SPECTROGRAM_WINDOW, max_columns=SPECTROGRAM_MAX_COLUMNS, max_rows=SPECTROGRAM_MAX_ROWS,
+                 precision='double', t0=0.0):
+        if precision not in PRECISIONS:
+            raise ValueError(f'Неизвестная точность вычисления спектра: {precision}')
+        self.segment_length = int(segment_length)
+        if self.segment_length < 2:
+            raise ValueError(f'Длина сегмента должна быть не меньше 2: {segment_length}')
+        if not 0 <= overlap < 1:
+            raise ValueError(f'Перекрытие сегментов должно быть в диапазоне [0, 1): {overlap}')
+        if n < self.segment_length:
+            raise ValueError(f'Участок короче одного сегмента ({self.segment_length} отсчётов)')
+        self.n = int(n)
+        self.fs = fs
+        self.t0 = t0
+        self.step = max(1, self.segment_length - int(round(overlap * self.segment_length)))
+        # Прореженная сетка: шаг увеличивается так, чтобы столбцов было не больше max_columns
+        span = self.n - self.segment_length
+        max_columns = max(1, int(max_columns))
+        self.hop = max(self.step, -(-span // (max_columns - 1)) if max_columns > 1 else span + 1)
+        self.n_columns = span // self.hop + 1
+        n_bins = self.segment_length // 2 + 1
+        self.group = max(1, -(-n_bins // max(1, int(max_rows))))
+        self._bin_starts = np.arange(0, n_bins, self.group)
+        self._real_dtype = PRECISIONS[precision][0]
+        self._window = get_window(window, self.segment_length, fftbins=True).astype(self._real_dtype)
+        self._window_sum = np.sum(self._window, dtype=np.float64)
+        self.freq = scipy.fft.rfftfreq(self.segment_length, d=1/fs)[self._bin_starts]
+        self.times = t0 + (np.arange(self.n_columns) * self.hop + self.segment_length / 2) / fs
+
+    @property
+    def decimated(self):
+        '''True, если сетка прорежена по времени (шаг сегментов больше шага без прореживания).'''
+        return self.hop > self.step
+
+    @property
+    def n_rows(self):
+        '''Количество строк (частот) изображения.'''
+        return len(self._bin_starts)
+
+    def extent(self):
+        '''
+        Возвращает границы изображения (left, right, bottom, top): время в с, частота в Гц.
+        Каждый столбец занимает hop отсчётов вокруг середины своего сегмента.
+        '''
+        left = self.t0 + (self.segment_length - self.hop) / 2 / self.fs
+        df = self.fs / self.segment_length
+        return (left, left + self.n_columns * self.hop / self.fs,
+                self.freq[0] - df / 2, self.freq[-1] + (self.group - 0.5) * df)
+
+    def compute(self, s, c0, c1):
+        '''
+        Вычисляет столбцы c0...c1-1 спектрограммы.
+        Аргументы:
+            s (array-like | QuantizedSignal): Отсчёты участка (n отсчётов).
+            c0, c1 (int): Диапазон столбцов.
+        Возвращает:
+            np.ndarray: Амплитуды, дБ (float32), форма (n_rows, c1 - c0); нормировка как у спектра Уэлча
+            (гармоника амплитуды A даёт A/2).
+        '''
+        L = self.segment_length
+        block = np.asarray(s[c0 * self.hop:(c1 - 1) * self.hop + L])
+        # Сегменты — представления блока с шагом hop; копируется только пачка перед БПФ
+        batch = np.array(np.lib.stride_tricks.sliding_window_view(block, L)[::self.hop], dtype=self._real_dtype)
+        batch -= batch.mean(axis=1, keepdims=True)  # Удаление постоянной составляющей сегмента
+        batch *= self._window
+        magnitude = np.abs(scipy.fft.rfft(batch, axis=-1, workers=SPECTRUM_WORKERS))
+        if self.group > 1:
+            magnitude = np.maximum.reduceat(magnitude, self._bin_starts, axis=1)
+        return (20 * np.log10(magnitude / self._window_sum + DB_EPSILON)).T.astype(np.float32)
+
+    def chunks(self, s, chunk_columns=SPECTROGRAM_CHUNK_COLUMNS):
+        '''Генератор пачек столбцов: (c0, amplitude_db) для c0 = 0, chunk_columns, ...'''
+        for c0 in range(0, self.n_columns, chunk_columns):
+            yield c0, self.compute(s, c0, min(c0 + chunk_columns, self.n_columns))
+
+
+def spectrogram(s, fs, **kwargs):
+    '''
+    Вычисляет спектрограмму сигнала целиком (без потока и изображения).
+    Аргументы:
+        s (array-like | QuantizedSignal): Отсчёты сигнала.
+        fs (float): Частота дискретизации, Гц.
+        **kwargs: Параметры SpectrogramGrid (segment_length, overlap, window, max_columns, max_rows, precision, t0).
+    Возвращает:
+        tuple: (times, freq, amplitude_db) — время середины сегментов, с, частоты строк, Гц,
+        и амплитуды, дБ, формы (len(freq), len(times)).
+    '''
+    grid = SpectrogramGrid(len(s), fs, **kwargs)
+    return grid.times, grid.freq, grid.compute(s, 0, grid.n_columns)
+
+
+class SpectrogramWorker(QObject):
+    '''
+    Объект-исполнитель вычисления спектрограммы. Метод run() выполняется в отдельном потоке (QThread)
+    и не обращается к виджетам: столбцы передаются в поток GUI сигналами Qt.
+    Аргументы:
+        grid (SpectrogramGrid): Сетка спектрограммы.
+        s (array-like | QuantizedSignal): Отсчёты участка.
+        chunk_columns (int): Количество столбцов в пачке.
+        generation (int): Номер вычисления (передаётся с каждой пачкой, чтобы отличать пачки отменённых вычислений).
+    Сигналы:
+        chunk(int, int, object): Номер вычисления, номер первого столбца пачки и амплитуды пачки, дБ.
+        failed(str): Текст ошибки.
+        canceled(): Вычисление отменено.
+        finished(): Работа исполнителя завершена (в любом случае).
+    '''
+
+    chunk = pyqtSignal(int, int, object)
+    failed = pyqtSignal(str)
+    canceled = pyqtSignal()
+    finished = pyqtSignal()
+
+    def __init__(self, grid, s, chunk_columns=SPECTROGRAM_CHUNK_COLUMNS, generation=0):
+        super().__init__()
+        self.grid = grid
+        self.s = s
+        self.chunk_columns = chunk_columns
+        self.generation = generation
+        self._cancel_requested = False
+
+    def cancel(self):
+        '''Запрашивает отмену вычисления (проверяется между пачками).'''
+        self._cancel_requested = True
+
+    def run(self):
+        '''Вычисляет столбцы пачками и передаёт их сигналом chunk.'''
+        try:
+            for c0, block in self.grid.chunks(self.s, self.chunk_columns):
+                if self._cancel_requested:
+                    self.canceled.emit()
+                    return
+                self.chunk.emit(self.generation, c0, block)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            self.finished.emit()
+
+
+class SpectrogramView(QObject):
+    '''
+    Спектрограмма линии графика сигнала на вкладке "Спектрограмма" (в потоке GUI).
+    Изображение (imshow) создаётся сразу, заполненное NaN, и заполняется пачками столбцов по мере их вычисления
+    в потоке SpectrogramWorker. После изменения пределов оси времени (масштабирование, сдвиг) видимый участок
+    пересчитывается, если он выходит за границы изображения или изображение построено по прореженной сетке.
+    Аргументы:
+        main_window: Главное окно приложения (show_message).
+        plot_data (PlotData): График вкладки спектрограммы (ax, canvas, figure).
+        line: Линия графика сигнала (ось X в мс, см. PlotData.plot_line).
+        params (dict | None): Параметры SpectrogramGrid (segment_length, overlap, window, max_columns, max_rows).
+    Атрибуты:
+        grid (SpectrogramGrid | None): Сетка текущего изображения.
+        image (AxesImage | None): Изображение спектрограммы.
+    '''
+
+    def __init__(self, main_window, plot_data, line, params=None):
+        super().__init__(main_window if isinstance(main_window, QObject) else None)
+        self.main_window = main_window
+        self.plot_data = plot_data
+        self.line = line
+        self.params = dict(params or {})
+        self.grid = None
+        self.image = None
+        self._data = None
+        self._colorbar = None
+        self._generation = 0
+        self._running = []  # (поток, исполнитель) незавершённых вычислений
+        self._setting_limits = False
+        # Временная ось линии (мс) и её отсчёты
+        t = getattr(line, '_osc_viewer_time_base', None)
+        self._t = as_time_base(line.get_xdata() if t is None else t)
+        self._s = line.get_ydata()
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(SPECTROGRAM_REFINE_DELAY_MS)
+        self._refine_timer.timeout.connect(self.refine)
+        self._cid = plot_data.ax.callbacks.connect('xlim_changed', self._on_xlim_changed)
+
+    def compute(self, x_min=None, x_max=None):
+        '''
+        Запускает вычисление спектрограммы участка [x_min, x_max] (мс; None — граница сигнала).
+        Возвращает:
+            bool: True, если вычисление запущено; False, если участок короче одного сегмента.
+        '''
+        i0, i1 = self._t.index_range(self._t.t0 if x_min is None else x_min,
+                                     self._t[len(self._t) - 1] if x_max is None else x_max)
+        try:
+            grid = SpectrogramGrid(i1 - i0, 1000 / self._t.dt, t0=self._t[i0] / 1000 if i1 > i0 else 0.0,
+                                   **self.params)
+        except ValueError as e:
+            self.main_window.show_message(f"Спектрограмма не построена: {e}")
+            return False
+        self.cancel()
+        self.grid = grid
+        self._show_grid()
+        self._generation += 1
+        thread = QThread(self)
+        worker = SpectrogramWorker(grid, self._s[i0:i1], generation=self._generation)
+        worker.moveToThread(thread)
+        thread.started.connect(worker.run)
+        worker.chunk.connect(self.on_chunk)
+        worker.failed.connect(self.on_failed)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(self._on_thread_finished)
+        self._running.append((thread, worker))
+        thread.start()
+        return True
+
+    def _show_grid(self):
+        '''Создаёт (или заменяет) изображение, заполненное NaN, под сетку self.grid.'''
+        grid = self.grid
+        left, right, bottom, top = grid.extent()
+        extent = (left * 1000, right * 1000, bottom / 1e6, top / 1e6)  # мс, МГц
+        self._data = np.full((grid.n_rows, grid.n_columns), np.nan, dtype=np.float32)
+        ax = self.plot_data.ax
+        if self.image is None:
+            self.image = ax.imshow(self._data, origin='lower', aspect='auto', interpolation='nearest',
+                                   extent=extent, cmap='viridis')
+            self._colorbar = self.plot_data.figure.colorbar(self.image, ax=ax, label='Амплитуда, дБ')
+            ax.set_xlabel('Время, мс')
+            ax.set_ylabel('Частота, МГц')
+        else:
+            self.image.set_data(self._data)
+            self.image.set_extent(extent)
+        self._setting_limits = True
+        try:
+            ax.set_xlim(extent[0], extent[1])
+            ax.set_ylim(extent[2], extent[3])
+        finally:
+            self._setting_limits = False
+        self.plot_data.canvas.draw_idle()
+
+    def on_chunk(self, generation, c0, block):
+        '''Подставляет пачку столбцов в изображение (пачки отменённых вычислений пропускаются).'''
+        if generation != self._generation:
+            return
+        self._data[:, c0:c0 + block.shape[1]] = block
+        vmax = float(np.nanmax(self._data))
+        self.image.set_data(self._data)
+        self.image.set_clim(vmax - SPECTROGRAM_DYNAMIC_RANGE_DB, vmax)
+        self.plot_data.canvas.draw_idle()
+
+    def on_failed(self, message):
+        '''Сообщает об ошибке вычисления.'''
+        self.main_window.show_message(f"Ошибка построения спектрограммы: {message}")
+
+    def _on_thread_finished(self):
+        for thread, worker in [item for item in self._running if item[0].isFinished()]:
+            self._running.remove((thread, worker))
+            thread.deleteLater()
+
+    def _on_xlim_changed(self, ax):
+        if not self._setting_limits and self.grid is not None:
+            self._refine_timer.start()
+
+    def refine(self):
+        '''
+        Пересчитывает видимый участок, если он выходит за границы изображения
+        или изображение построено по прореженной сетке.
+        Возвращает:
+            bool: True, если пересчёт запущен.
+        '''
+        if self.grid is None:
+            return False
+        x_min, x_max = sorted(self.plot_data.ax.get_xlim())
+        if x_max - x_min < self.grid.segment_length * self._t.dt:
+            return False  # Видимый участок короче одного сегмента
+        left, right = self.image.get_extent()[:2]
+        if not self.grid.decimated and x_min >= left and x_max <= right:
+            return False  # Изображение уже подробное на всём видимом участке
+        return self.compute(x_min, x_max)
+
+    def cancel(self):
+        '''Отменяет незавершённые вычисления.'''
+        self._refine_timer.stop()
+        for _, worker in self._running:
+            worker.cancel()
+
+    def wait(self):
+        '''Ожидает завершения потоков вычисления (например, при закрытии окна).'''
+        for thread, _ in list(self._running):
+            thread.wait()
+
+    def close(self):
+        '''Отменяет вычисления, отключает обработчик масштабирования и удаляет изображение с графика.'''
+        self.cancel()
+        self.wait()
+        self.plot_data.ax.callbacks.disconnect(self._cid)
+        if self._colorbar is not None:
+            self._colorbar.remove()
+            self._colorbar = None
+        if self.image is not None:
+            self.image.remove()
+            self.image = None
+
+
+def show_spectrogram(main_window, line=None, x_range=None, params=None):
+    '''
+    Строит спектрограмму линии графика сигнала на вкладке "Спектрограмма" и переключается на неё.
+    Предыдущая спектрограмма заменяется.
+    Аргументы:
+        main_window: Главное окно приложения (plot_data_signal, spectrogram_data, spectrogram_widget, tabs).
+        line: Линия графика сигнала (None — активная линия).
+        x_range (tuple | None): Участок (x_min, x_max), мс (None — видимая область графика сигнала).
+        params (dict | None): Параметры SpectrogramGrid.
+    Возвращает:
+        SpectrogramView | None: Спектрограмма или None, если линия не выбрана или участок слишком короткий.
+    '''
+    if line is None:
+        line = main_window.plot_data_signal.get_active_line()
+    if line is None:
+        main_window.show_message("Нет выбранной линии для построения спектрограммы")
+        return None
+    if x_range is None:
+        x_range = main_window.plot_data_signal.ax.get_xlim()
+    previous = getattr(main_window, '_spectrogram_view', None)
+    if previous is not None:
+        previous.close()
+    view = SpectrogramView(main_window, main_window.spectrogram_data, line, params)
+    main_window._spectrogram_view = view
+    if not view.compute(*sorted(x_range)):
+        view.close()
+        main_window._spectrogram_view = None
+        return None
+    main_window.tabs.setCurrentWidget(main_window.spectrogram_widget)
+    return view
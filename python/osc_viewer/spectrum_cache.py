@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+'''
+spectrum_cache.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует дисковый кэш построенных спектров.
+Ключ кэша — хэш отсчётов сигнала (BLAKE2b, отсчёты читаются блоками без копирования всего массива), шага временной
+оси и параметров обработки (коэффициент децимации, длина дополнения нулями, окно, режим отображения дБ/В и т.п.).
+Поэтому спектр той же записи, открытой повторно (в том числе на следующий день) или построенной снова после
+переключения между анализами, читается с диска вместо повторной децимации, дополнения до 2^20 отсчётов и БПФ.
+Запись кэша — .npz-файл с амплитудами спектра в float32 и параметрами равномерной оси частот (f0, df),
+вектор частот не хранится. Размер каталога кэша ограничен: при превышении удаляются записи, которые
+дольше всего не использовались (время изменения файла обновляется при каждом чтении записи).
+
+Список функций:
+---------------
+- spectrum_key(s, t, **params)
+    Формирует ключ кэша по отсчётам сигнала, временной оси и параметрам обработки.
+- load_spectrum(key, cache_dir=None)
+    Возвращает (freq, amplitude) из кэша или None, если записи нет.
+- save_spectrum(key, freq, amplitude, cache_dir=None, max_bytes=None)
+    Сохраняет спектр в кэш и ограничивает размер каталога кэша.
+- prune_cache(cache_dir=None, max_bytes=None)
+    Удаляет записи, которые дольше всего не использовались, пока размер кэша превышает max_bytes.
+'''
+
+import os
+import json
+import hashlib
+
+import numpy as np
+
+from quantized import QuantizedSignal
+from time_base import as_time_base
+
+# Каталог кэша спектров (рядом с osc_viewer.ini)
+SPECTRUM_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'spectrum_cache')
+# Наибольший суммарный размер записей кэша, байт
+SPECTRUM_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Версия формата записей кэша (входит в ключ; увеличивается при несовместимых изменениях)
+SPECTRUM_CACHE_VERSION = 1
+# Суффикс файлов записей кэша
+SPECTRUM_CACHE_SUFFIX = '.npz'
+# Количество отсчётов, хэшируемых за один раз (непрерывный блок не копируется)
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def _hash_samples(h, s):
+    '''Добавляет в хэш h отсчёты сигнала s (коды АЦП — вместе с шагом и смещением).'''
+    if isinstance(s, QuantizedSignal):
+        h.update(json.dumps(['quantized', s.scale, s.offset]).encode())
+        s = s.codes
+    s = np.asarray(s)
+    h.update(json.dumps([s.dtype.str, len(s)]).encode())
+    for i in range(0, len(s), HASH_BLOCK_SIZE):
+        h.update(np.ascontiguousarray(s[i:i + HASH_BLOCK_SIZE]).data)
+
+
+def spectrum_key(s, t, **params):
+    '''
+    Формирует ключ кэша спектра.
+    Аргументы:
+        s (array-like | QuantizedSignal): Отсчёты сигнала.
+        t (TimeBase | np.ndarray): Временная ось (в ключ входит только шаг: спектр не зависит от начала оси).
+        **params: Параметры обработки и отображения (значения должны сериализоваться в JSON),
+                  например downsampling_factor=10, pad_length=2**20, window=None, db_mode=False.
+    Возвращает:
+        str: Шестнадцатеричная строка хэша (имя файла записи кэша).
+    '''
+    h = hashlib.blake2b(digest_size=20)
+    h.update(json.dumps({
+        'cache_version': SPECTRUM_CACHE_VERSION,
+        'dt': float(as_time_base(t).dt),
+        'params': params,
+    }, sort_keys=True).encode())
+    _hash_samples(h, s)
+    return h.hexdigest()
+
+
+def _entry_path(key, cache_dir):
+    return os.path.join(cache_dir or SPECTRUM_CACHE_DIR, key + SPECTRUM_CACHE_SUFFIX)
+
+
+def load_spectrum(key, cache_dir=None):
+    '''
+    Загружает спектр из кэша и отмечает запись как недавно использованную.
+    Аргументы:
+        key (str): Ключ кэша (spectrum_key).
+        cache_dir (str | None): Каталог кэша (None — SPECTRUM_CACHE_DIR).
+    Возвращает:
+        tuple | None: (freq, amplitude) — вектор частот (float64) и амплитуды спектра (float32);
+        None, если записи нет или она повреждена.
+    '''
+    path = _entry_path(key, cache_dir)
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            amplitude = data['amplitude']
+            f0, df = data['freq_grid']
+        os.utime(path)  # Запись использована: удаляется при ограничении размера кэша последней
+    except (OSError, ValueError, KeyError):
+        return None
+    return f0 + df * np.arange(len(amplitude)), amplitude
+
+
+def save_spectrum(key, freq, amplitude, cache_dir=None, max_bytes=None):
+    '''
+    Сохраняет спектр в кэш (амплитуды в float32, ось частот — начало и шаг).
+    Запись выполняется во временный файл с последующей атомарной заменой.
+    Аргументы:
+        key (str): Ключ кэша (spectrum_key).
+        freq (np.ndarray): Равномерный вектор частот.
+        amplitude (np.ndarray): Амплитуды спектра (в единицах отображения: В или дБ).
+        cache_dir (str | None): Каталог кэша (None — SPECTRUM_CACHE_DIR).
+        max_bytes (int | None): Наибольший размер кэша (None — SPECTRUM_CACHE_MAX_BYTES).
+    Возвращает:
+        bool: True, если запись сохранена, False — если запись невозможна (например, каталог только для чтения).
+    '''
+    path = _entry_path(key, cache_dir)
+    tmp_path = path + '.tmp.npz'
+    freq = np.asarray(freq)
+    df = freq[1] - freq[0] if len(freq) > 1 else 0.0
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        np.savez(
+            tmp_path,
+            amplitude=np.asarray(amplitude, dtype=np.float32),
+            freq_grid=np.array([freq[0] if len(freq) else 0.0, df], dtype=np.float64),
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    prune_cache(cache_dir, max_bytes)
+    return True
+
+
+def prune_cache(cache_dir=None, max_bytes=None):
+    '''
+    Ограничивает размер кэша: удаляет записи, которые дольше всего не использовались.
+    Аргументы:
+        cache_dir (str | None): Каталог кэша (None — SPECTRUM_CACHE_DIR).
+        max_bytes (int | None): Наибольший размер кэша (None — SPECTRUM_CACHE_MAX_BYTES).
+    Возвращает:
+        int: Количество удалённых записей.
+    '''
+    cache_dir = cache_dir or SPECTRUM_CACHE_DIR
+    max_bytes = SPECTRUM_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    try:
+        with os.scandir(cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(SPECTRUM_CACHE_SUFFIX) and not entry.name.endswith('.tmp.npz'):
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return 0
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+    return removed
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+'''
+spectrum_engine.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль вычисления спектра действительного сигнала.
+Вместо полного комплексного БПФ (np.fft.fft + fftshift) с последующим отбрасыванием отрицательных частот
+вычисляется БПФ действительного сигнала (scipy.fft.rfft): только односторонний спектр из nfft/2 + 1 отсчётов,
+примерно вдвое меньше вычислений и памяти. Дополнительно:
+    - длина БПФ выбирается по требуемому разрешению по частоте и округляется вверх до «быстрой» длины
+      (произведение малых простых множителей, scipy.fft.next_fast_len); дополнение нулями выполняет само БПФ;
+    - вычисление в одинарной точности (float32/complex64) — ещё вдвое меньше памяти;
+    - БПФ выполняется в нескольких потоках (аргумент workers scipy.fft).
+
+Список функций:
+---------------
+- fft_length(n, fs=None, resolution=None, nfft=None)
+    Выбирает длину БПФ: не меньше длины сигнала и fs/resolution, округлённую до быстрой длины.
+- rfft_spectrum(s, fs, nfft=None, resolution=None, precision='double', workers=SPECTRUM_WORKERS)
+    Односторонний спектр действительного сигнала (нормировка на длину БПФ) и вектор частот.
+'''
+
+import os
+
+import numpy as np
+import scipy.fft
+
+# Количество потоков БПФ (все процессоры)
+SPECTRUM_WORKERS = os.cpu_count() or 1
+# Типы данных вычисления: (тип сигнала, тип спектра)
+PRECISIONS = {
+    'double': (np.float64, np.complex128),
+    'single': (np.float32, np.complex64),
+}
+
+
+def fft_length(n, fs=None, resolution=None, nfft=None):
+    '''
+    Выбирает длину БПФ.
+    Аргументы:
+        n (int): Длина сигнала.
+        fs (float | None): Частота дискретизации, Гц (нужна, если задано разрешение).
+        resolution (float | None): Требуемое разрешение по частоте (шаг сетки частот), Гц.
+        nfft (int | None): Минимальная длина БПФ (например, 2^20 для совместимости с прежними спектрами).
+    Возвращает:
+        int: Быстрая длина БПФ (scipy.fft.next_fast_len) не меньше n, nfft и fs/resolution.
+    '''
+    length = max(int(n), int(nfft or 0), 1)
+    if resolution:
+        if not fs:
+            raise ValueError('Для выбора длины БПФ по разрешению нужна частота дискретизации')
+        length = max(length, int(np.ceil(fs / resolution)))
+    return scipy.fft.next_fast_len(length, real=True)
+
+
+def rfft_spectrum(s, fs, nfft=None, resolution=None, precision='double', workers=SPECTRUM_WORKERS):
+    '''
+    Вычисляет односторонний спектр действительного сигнала.
+    Аргументы:
+        s (array-like): Сигнал (одномерный массив или двумерный «сигнал x отсчёт» — спектр по последней оси).
+        fs (float): Частота дискретизации, Гц.
+        nfft (int | None): Минимальная длина БПФ (см. fft_length); сигнал дополняется нулями внутри БПФ.
+        resolution (float | None): Требуемое разрешение по частоте, Гц (см. fft_length).
+        precision (str): 'double' (float64/complex128) или 'single' (float32/complex64).
+        workers (int): Количество потоков БПФ.
+    Возвращает:
+        tuple:
+            freq (np.ndarray): Частоты 0...fs/2, Гц (nfft//2 + 1 отсчётов, float64).
+            spectrum (np.ndarray): Комплексный спектр, нормированный на длину БПФ (как в прежнем fft_signal).
+            nfft (int): Длина БПФ.
+    '''
+    if precision not in PRECISIONS:
+        raise ValueError(f'Неизвестная точность вычисления спектра: {precision}')
+    real_dtype, complex_dtype = PRECISIONS[precision]
+    s = np.asarray(s, dtype=real_dtype)  # Без копирования, если тип уже совпадает
+    n = fft_length(s.shape[-1], fs, resolution, nfft)
+    spectrum = scipy.fft.rfft(s, n=n, axis=-1, workers=workers)
+    spectrum = spectrum.astype(complex_dtype, copy=False)
+    spectrum /= n  # На месте, без дополнительного массива
+    freq = scipy.fft.rfftfreq(n, d=1/fs)  # Частоты всегда в float64: в float32 шаг в единицы Гц теряется на МГц
+    return freq, spectrum, n
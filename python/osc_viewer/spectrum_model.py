@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+'''
+spectrum_model.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует модель данных спектра для вкладки "Спектр".
+Модель хранит спектр один раз (комплексный спектр или амплитуды) и по запросу вычисляет производные
+представления: амплитуды в вольтах, в децибелах и нормированные (максимум 1 В или 0 дБ). Каждое представление
+вычисляется один раз и кэшируется (массив только для чтения), поэтому переключение В/дБ, нормализация и сброс
+только подставляют в линию готовый массив: без 20*log10 и 10^(x/20) при каждом переключении и без накопления
+погрешности при многократных переключениях (все представления вычисляются из исходного спектра).
+Модель хранится в атрибуте линии спектра _osc_viewer_spectrum_model.
+
+Список классов и функций:
+-------------------------
+- SpectrumModel(freq, spectrum)
+    Модель спектра: magnitude, db, view(db=False, normalized=False), limits(db=False, normalized=False), peak.
+- SpectrumModel.from_view(freq, ydata, db=False, scale=1.0)
+    Восстанавливает модель по отображаемым значениям линии (в В или дБ, с масштабным коэффициентом).
+- attach_spectrum_model(line, model, normalized=False)
+    Сохраняет модель в линии спектра.
+- spectrum_model(line, db=False, scale=1.0)
+    Возвращает модель линии; если её нет — восстанавливает по отображаемым значениям и сохраняет в линии.
+- show_spectrum_view(line, db, normalized, current_db=False, scale=1.0)
+    Подставляет в линию кэшированное представление спектра и возвращает его пределы.
+'''
+
+import numpy as np
+
+# Малое значение, добавляемое к амплитуде перед логарифмированием (как при построении спектра)
+DB_EPSILON = 1e-12
+
+
+class SpectrumModel:
+    '''
+    Модель спектра с кэшированными представлениями.
+    Аргументы:
+        freq (array-like): Вектор частот (ось X линии спектра, МГц).
+        spectrum (array-like): Комплексный спектр или амплитуды спектра, В.
+    Особенности:
+        - Представления (амплитуды, дБ, нормированные) вычисляются при первом обращении и кэшируются.
+        - Возвращаемые массивы доступны только для чтения: изменять их на месте нельзя, они общие для всех обращений.
+    '''
+
+    def __init__(self, freq, spectrum):
+        self.freq = np.asarray(freq)
+        self.spectrum = np.asarray(spectrum)
+        self._views = {}
+        self._limits = {}
+
+    @classmethod
+    def from_view(cls, freq, ydata, db=False, scale=1.0):
+        '''
+        Восстанавливает модель по отображаемым значениям линии.
+        Аргументы:
+            freq (array-like): Вектор частот.
+            ydata (array-like): Отображаемые значения (амплитуды в В или в дБ).
+            db (bool): Значения в дБ.
+            scale (float): Масштабный коэффициент, с которым отображены амплитуды (например, после нормализации).
+        Возвращает:
+            SpectrumModel: Модель с амплитудами в В (без масштабного коэффициента).
+        '''
+        ydata = np.asarray(ydata)
+        if ydata.dtype.kind != 'f':
+            ydata = ydata.astype(np.float64)
+        # Тип значений сохраняется (спектр из кэша остаётся в float32)
+        magnitude = np.power(10, ydata / 20) if db else ydata.copy()
+        if scale not in (0, 1):
+            magnitude /= scale
+        return cls(freq, magnitude)
+
+    def _cached(self, key, compute):
+        view = self._views.get(key)
+        if view is None:
+            view = compute()
+            view.flags.writeable = False
+            self._views[key] = view
+        return view
+
+    @property
+    def magnitude(self):
+        '''Амплитуды спектра, В.'''
+        return self._cached('magnitude', lambda: np.abs(self.spectrum))
+
+    @property
+    def db(self):
+        '''Амплитуды спектра, дБ (20*log10).'''
+        return self._cached('db', lambda: 20 * np.log10(self.magnitude + DB_EPSILON))
+
+    @property
+    def peak(self):
+        '''Наибольшая амплитуда спектра, В.'''
+        return self.limits()[1]
+
+    def view(self, db=False, normalized=False):
+        '''
+        Возвращает представление спектра.
+        Аргументы:
+            db (bool): Амплитуды в дБ (иначе в В).
+            normalized (bool): Нормированные амплитуды: максимум 1 В или 0 дБ.
+        Возвращает:
+            np.ndarray: Кэшированный массив только для чтения.
+        '''
+        if not normalized:
+            return self.db if db else self.magnitude
+        if db:
+            return self._cached('db_normalized', lambda: self.db - self.limits(db=True)[1])
+        peak = self.peak
+        return self._cached('normalized', lambda: self.magnitude / peak if peak else self.magnitude.copy())
+
+    def limits(self, db=False, normalized=False):
+        '''
+        Возвращает (минимум, максимум) представления спектра (вычисляется один раз).
+        '''
+        key = (bool(db), bool(normalized))
+        if key not in self._limits:
+            view = self.view(db, normalized)
+            self._limits[key] = (float(np.min(view)), float(np.max(view))) if len(view) else (0.0, 0.0)
+        return self._limits[key]
+
+
+def attach_spectrum_model(line, model, normalized=False):
+    '''
+    Сохраняет модель в линии спектра (линия должна отображать представление model.view(..., normalized)).
+    Аргументы:
+        line: Линия спектра (matplotlib Line2D) или None (ничего не делается).
+        model (SpectrumModel): Модель спектра.
+        normalized (bool): Линия отображает нормированное представление.
+    '''
+    if line is None:
+        return
+    line._osc_viewer_spectrum_model = model
+    line._osc_viewer_spectrum_normalized = normalized
+
+
+def spectrum_model(line, db=False, scale=1.0):
+    '''
+    Возвращает модель спектра линии.
+    Если модели нет (линия построена без неё), модель восстанавливается по отображаемым значениям линии
+    один раз и сохраняется в линии.
+    Аргументы:
+        line: Линия спектра.
+        db (bool): Текущие значения линии в дБ.
+        scale (float): Масштабный коэффициент, с которым отображены амплитуды.
+    Возвращает:
+        SpectrumModel: Модель спектра линии.
+    '''
+    model = getattr(line, '_osc_viewer_spectrum_model', None)
+    if model is None:
+        xdata = line.get_xdata() if hasattr(line, 'get_xdata') else None
+        model = SpectrumModel.from_view(xdata, line.get_ydata(), db=db, scale=scale)
+        attach_spectrum_model(line, model)
+    return model
+
+
+def show_spectrum_view(line, db, normalized, current_db=False, scale=1.0):
+    '''
+    Подставляет в линию представление спектра из модели (без вычислений, если представление уже строилось).
+    Аргументы:
+        line: Линия спектра.
+        db (bool): Показать амплитуды в дБ.
+        normalized (bool): Показать нормированные амплитуды.
+        current_db (bool): Текущие значения линии в дБ (нужно, только если у линии ещё нет модели).
+        scale (float): Масштабный коэффициент текущих значений (нужно, только если у линии ещё нет модели).
+    Возвращает:
+        tuple: (минимум, максимум) показанного представления.
+    '''
+    model = spectrum_model(line, db=current_db, scale=scale)
+    line.set_ydata(model.view(db, normalized))
+    line._osc_viewer_spectrum_normalized = normalized
+    return model.limits(db, normalized)
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+'''
+tail_follow.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует режим слежения за CSV-файлом, который ещё записывается (длительная регистрация).
+При каждом опросе (QTimer) разбираются только байты, дописанные в файл после предыдущего чтения (до последней
+полной строки); отсчёты сигнала добавляются в буфер с запасом ёмкости, а время хранится равномерной осью
+(TimeBase: начало, шаг, количество) без массива отсчётов времени. Линия графика продлевается без повторного
+разбора файла, а пределы оси X сдвигаются к последним отсчётам.
+
+Список классов и функций:
+-------------------------
+- CsvTail(file_name, format_ver)
+    Инкрементное чтение растущего CSV-файла: только новые полные строки, накопление отсчётов.
+- TailFollower(plot_data, tail, line, x_zoom=1000, interval_ms=TAIL_POLL_INTERVAL_MS)
+    Периодический опрос файла и продление линии графика с прокруткой к последним отсчётам.
+- follow_csv_file(main_window)
+    Открывает диалог выбора CSV-файла и включает для него режим слежения.
+- stop_following(main_window)
+    Останавливает слежение за всеми файлами.
+'''
+
+import io
+
+import numpy as np
+
+from PyQt6.QtCore import QObject, QTimer
+
+from load_and_prepare_data import (
+    _read_header_format1,
+    _iter_csv_blocks,
+    _make_time_base,
+    select_csv_file,
+    add_signal_line,
+    is_compressed,
+    print_c,
+)
+
+# Интервал опроса файла, мс
+TAIL_POLL_INTERVAL_MS = 500
+# Максимальный объём новых данных, разбираемых за один опрос, байт (остальное — при следующих опросах)
+TAIL_READ_BYTES = 1 << 24
+# Начальная ёмкость буферов отсчётов
+TAIL_INITIAL_CAPACITY = 1 << 16
+
+
+class CsvTail:
+    '''
+    Инкрементное чтение CSV-файла, в конец которого дописываются строки.
+    Запоминается смещение конца последней разобранной строки; read_new() разбирает только полные строки,
+    дописанные после него. Неполная последняя строка (запись ещё не завершена) разбирается при следующем чтении.
+    Атрибуты:
+        file_name (str): Путь к CSV-файлу.
+        format_ver (int): Версия формата файла (см. load_data).
+        pos (int): Смещение в байтах, до которого файл уже разобран.
+        meta (dict): Метаинформация файла.
+        n (int): Количество накопленных отсчётов.
+    Особенности:
+        - Отсчёты сигнала хранятся в буфере, ёмкость которого удваивается при заполнении; signal — представление
+          заполненной части без копирования.
+        - Время не накапливается: хранятся первые два отсчёта и последний отсчёт времени, по которым строится
+          равномерная ось time_base (с учётом "Increment" и "Start").
+        - Если файл стал короче разобранной части (перезаписан), чтение начинается заново.
+    '''
+
+    def __init__(self, file_name, format_ver):
+        if is_compressed(file_name):
+            raise ValueError(f'Слежение недоступно для сжатого файла: {file_name}')
+        self.file_name = file_name
+        self.format_ver = format_ver
+        self.reset()
+
+    def reset(self):
+        '''Сбрасывает состояние: следующее чтение начнётся с начала файла.'''
+        self.pos = 0
+        self.meta = {}
+        self.k_t = 1.0
+        self.shift = 0.0
+        self.t_first = []
+        self.t_last = None
+        self.n = 0
+        self._s = np.empty(TAIL_INITIAL_CAPACITY)
+
+    @property
+    def signal(self):
+        '''Отсчёты сигнала накопленных строк (представление буфера).'''
+        return self._s[:self.n]
+
+    @property
+    def time_base(self):
+        '''Равномерная временная ось накопленных отсчётов (TimeBase).'''
+        return _make_time_base(self.format_ver, dict(self.meta), self.k_t, self.t_first, self.t_last, self.n)
+
+    def _append(self, s):
+        m = len(s)
+        if self.n + m > len(self._s):
+            self._s = np.resize(self._s, max(2 * len(self._s), self.n + m))
+        self._s[self.n:self.n + m] = s
+        self.n += m
+
+    def read_new(self, max_bytes=TAIL_READ_BYTES):
+        '''
+        Разбирает полные строки, дописанные в файл после предыдущего чтения (не более max_bytes байт за вызов).
+        Аргументы:
+            max_bytes (int): Максимальный объём разбираемых данных, байт.
+        Возвращает:
+            int: Количество новых отсчётов (0 — новых полных строк нет); -1 — файл перезаписан, накопленные
+            отсчёты сброшены.
+        '''
+        with open(self.file_name, 'rb') as f:
+            size = f.seek(0, io.SEEK_END)
+            if size < self.pos:
+                self.reset()
+                return -1
+            f.seek(self.pos)
+            if self.pos == 0 and self.format_ver == 1:
+                # Заголовок формата 1 (две строки) разбирается, только когда он записан полностью
+                header = f.readline() + f.readline()
+                if not header.endswith(b'\n') or header.count(b'\n') < 2:
+                    return 0
+                self.meta, self.k_t = _read_header_format1(io.StringIO(header.decode('utf-8')))
+                self.shift = float(self.meta.get('Start', 0.0) or 0.0)
+                self.pos = f.tell()
+            data = f.read(min(size - self.pos, max_bytes))
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        self.pos += end
+        n_before = self.n
+        for t_block, s_block in _iter_csv_blocks(io.BytesIO(data[:end]), self.format_ver, self.meta):
+            if len(t_block) == 0:
+                continue
+            if len(self.t_first) < 2:
+                self.t_first.extend(t_block[:2 - len(self.t_first)])
+            self.t_last = t_block[-1]
+            self._append(s_block)
+        return self.n - n_before
+
+
+class TailFollower(QObject):
+    '''
+    Следит за растущим CSV-файлом: по таймеру читает новые строки (CsvTail.read_new) и продлевает линию графика.
+    Аргументы:
+        plot_data (PlotData): График.
+        tail (CsvTail): Инкрементное чтение файла.
+        line (Line2D): Линия графика, которая продлевается.
+        x_zoom (float): Масштаб оси X (1000 — время в мс).
+        interval_ms (int): Интервал опроса файла, мс.
+    Атрибуты:
+        scroll (bool): Сдвигать пределы оси X к последним отсчётам (ширина видимого интервала сохраняется).
+    Особенности:
+        - Отсчёты оси X (время в масштабе оси) вычисляются по равномерной оси CsvTail.time_base и дописываются
+          в буфер только для новых отсчётов; весь буфер пересчитывается, только если изменился шаг оси.
+        - Линии передаются представления буферов, но matplotlib копирует данные линии (set_data),
+          поэтому каждое обновление линии — копирование O(N) без повторного разбора файла.
+        - Пределы оси Y только расширяются по минимуму и максимуму новых отсчётов (без перебора всех линий).
+        - Слежение останавливается, если линия удалена с графика.
+    '''
+
+    def __init__(self, plot_data, tail, line, x_zoom=1000, interval_ms=TAIL_POLL_INTERVAL_MS):
+        super().__init__(plot_data)
+        self.plot_data = plot_data
+        self.tail = tail
+        self.line = line
+        self.x_zoom = x_zoom
+        self.scroll = True
+        self._x = np.empty(0)
+        self._x_base = None  # Ось (в масштабе оси X), по которой вычислен буфер _x
+        self._n_shown = 0
+        self._show()
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        '''Запускает опрос файла.'''
+        self.timer.start()
+
+    def stop(self):
+        '''Останавливает опрос файла.'''
+        self.timer.stop()
+
+    @property
+    def active(self):
+        return self.timer.isActive()
+
+    def _show(self):
+        '''
+        Дополняет буфер отсчётов оси X отсчётами, прочитанными после предыдущего обновления,
+        и передаёт линии данные.
+        '''
+        n = self.tail.n
+        x_base = self.tail.time_base * self.x_zoom
+        if self._x_base is None or (x_base.t0, x_base.dt) != (self._x_base.t0, self._x_base.dt):
+            self._n_shown = 0  # Шаг оси уточнён (формат без "Increment") — буфер пересчитывается целиком
+        if n > len(self._x):
+            self._x = np.resize(self._x, max(2 * len(self._x), n))
+        self._x[self._n_shown:n] = x_base[self._n_shown:n]
+        self._x_base = x_base
+        self._n_shown = n
+        self.line.set_data(self._x[:n], self.tail.signal)
+        self.line._osc_viewer_time_base = x_base if n > 1 else None
+
+    def poll(self):
+        '''
+        Читает новые строки файла и продлевает линию графика.
+        Возвращает:
+            int: Количество новых отсчётов (см. CsvTail.read_new).
+        '''
+        if self.line not in self.plot_data.ax.lines:
+            self.stop()
+            return 0
+        m = self.tail.read_new()
+        if m == 0:
+            return 0
+        if m < 0:
+            print_c(f'Файл перезаписан, чтение начато заново: {self.tail.file_name}', color='orange')
+            self._n_shown = 0
+            self._show()
+            self.plot_data.canvas.draw_idle()
+            return m
+        n_old = self._n_shown
+        self._show()
+        ax = self.plot_data.ax
+        # Расширяем пределы оси Y по новым отсчётам
+        y_new = self.tail.signal[n_old:]
+        y_lo, y_hi = ax.get_ylim()
+        lo, hi = float(np.min(y_new)), float(np.max(y_new))
+        if lo < y_lo or hi > y_hi:
+            margin = 0.05 * (max(hi, y_hi) - min(lo, y_lo))
+            ax.set_ylim(lo - margin if lo < y_lo else y_lo, hi + margin if hi > y_hi else y_hi)
+        # Сдвигаем видимый интервал так, чтобы последний отсчёт был у правого края (ширина интервала сохраняется)
+        if self.scroll:
+            x_lo, x_hi = ax.get_xlim()
+            x = self._x[:self._n_shown]
+            x_start = max(x[0], x[-1] - (x_hi - x_lo))
+            ax.set_xlim(x_start, x_start + (x_hi - x_lo))
+        self.plot_data.canvas.draw_idle()
+        return m
+
+
+def follow_csv_file(main_window, interval_ms=TAIL_POLL_INTERVAL_MS):
+    '''
+    Открывает диалог выбора CSV-файла (select_csv_file), читает уже записанную часть файла, добавляет её на график
+    и включает слежение за файлом (TailFollower): новые строки добавляются на график по мере записи.
+    Аргументы:
+        main_window: Главное окно приложения.
+        interval_ms (int): Интервал опроса файла, мс.
+    Возвращает:
+        TailFollower | None: Объект слежения или None, если файл не выбран или не может быть прочитан.
+    '''
+    file_name = select_csv_file(main_window)
+    if not file_name:
+        return None
+    try:
+        tail = CsvTail(file_name, main_window.format_ver)
+        while tail.read_new() > 0:
+            pass
+    except (OSError, ValueError) as e:
+        print_c(f'Ошибка: {e}', color='red')
+        return None
+    add_signal_line(main_window, file_name, tail.time_base, tail.signal, label_suffix='(слежение)')
+    plot_data = main_window.plot_data_signal
+    follower = TailFollower(plot_data, tail, plot_data.get_all_lines()[-1], interval_ms=interval_ms)
+    if not hasattr(main_window, '_osc_viewer_followers'):
+        main_window._osc_viewer_followers = []
+    main_window._osc_viewer_followers.append(follower)
+    follower.start()
+    print_c(f'Слежение за файлом: {file_name} (отсчётов: {tail.n}, опрос каждые {interval_ms} мс)', color='green')
+    return follower
+
+
+def stop_following(main_window):
+    '''
+    Останавливает слежение за всеми файлами главного окна.
+    Аргументы:
+        main_window: Главное окно приложения.
+    Возвращает:
+        int: Количество остановленных слежений.
+    '''
+    followers = getattr(main_window, '_osc_viewer_followers', [])
+    n_active = sum(follower.active for follower in followers)
+    for follower in followers:
+        follower.stop()
+    followers.clear()
+    print_c(f'Слежение остановлено: {n_active}')
+    return n_active
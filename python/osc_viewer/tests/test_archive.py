@@ -0,0 +1,129 @@
+'''
+test_archive.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля archive (архив записей .oscz со сжатыми фрагментами).
+Тесты проверяют запись и чтение архива (float64 и коды АЦП), чтение диапазона с прореживанием,
+статистику и огибающую по сводкам фрагментов, а также переключение графика между огибающей и отсчётами.
+'''
+
+import os
+import sys
+import zipfile
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from archive import write_archive, ArchiveReader, ArchiveView
+from load_and_prepare_data import stream_statistics
+from quantized import quantize
+from time_base import TimeBase
+from PlotData import PlotData
+
+N = 10000
+META = {"Record Length": str(N), "Sample Interval": "1.0e-06", "Vertical Scale": "5.000000e-01"}
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Фикстура: сигнал float64 и архив с фрагментами по 512 отсчётов
+@pytest.fixture
+def signal_archive(tmp_path):
+    t = TimeBase(-5e-3, 1e-6, N)
+    s = np.sin(2 * np.pi * 1000 * t[:]) + 0.01 * np.arange(N) / N
+    file_name = str(tmp_path / "rec.oscz")
+    write_archive(file_name, t, s, META, chunk_size=512)
+    return file_name, t, s
+
+# Тест: запись и чтение архива, временная ось и метаинформация восстанавливаются из заголовка
+def test_archive_roundtrip(signal_archive):
+    file_name, t, s = signal_archive
+    with ArchiveReader(file_name) as reader:
+        assert len(reader) == N and reader.n_chunks == -(-N // 512)
+        tb = reader.time_base
+        assert (tb.t0, tb.dt, len(tb)) == (t.t0, t.dt, len(t))
+        assert np.array_equal(reader.read(), s)
+        meta_df = reader.meta_df
+        assert meta_df.loc[meta_df["Key"] == "Sample Interval", "Value"].iloc[0] == "1.0e-06"
+    with zipfile.ZipFile(file_name) as zf:
+        assert all(info.compress_type == zipfile.ZIP_DEFLATED for info in zf.infolist())
+
+# Тест: чтение участка, в том числе через границы фрагментов и с прореживанием
+@pytest.mark.parametrize("start, stop, step", [(0, 1, 1), (500, 1500, 1), (511, 513, 1), (100, N, 7), (N - 3, None, 1)])
+def test_archive_read_range(signal_archive, start, stop, step):
+    file_name, _, s = signal_archive
+    with ArchiveReader(file_name) as reader:
+        assert np.array_equal(reader.read(start, stop, step), s[start:stop:step])
+
+# Тест: статистика по сводкам фрагментов совпадает с потоковой статистикой отсчётов
+@pytest.mark.parametrize("start, stop", [(0, None), (1000, 3000), (700, 900)])
+def test_archive_statistics(signal_archive, start, stop):
+    file_name, _, s = signal_archive
+    with ArchiveReader(file_name) as reader:
+        stats = reader.statistics(start, stop)
+    expected = stream_statistics([s[start:stop]])
+    assert stats["n"] == expected["n"]
+    for key in ("min", "max", "mean", "rms"):
+        assert np.isclose(stats[key], expected[key])
+
+# Тест: огибающая ограничена max_points и охватывает весь размах сигнала
+def test_archive_overview(signal_archive):
+    file_name, _, s = signal_archive
+    with ArchiveReader(file_name) as reader:
+        x, y = reader.overview(max_points=8)
+    assert len(x) == len(y) <= 8
+    assert np.all(np.diff(x) >= 0)
+    assert y.min() == s.min() and y.max() == s.max()
+
+# Тест: сигнал в кодах АЦП хранится в архиве кодами int8 и переводится в вольты при чтении
+def test_archive_quantized(tmp_path):
+    q = quantize(0.02 * (np.arange(N) % 200 - 100), META)
+    t = TimeBase(0.0, 1e-6, N)
+    file_name = str(tmp_path / "q.oscz")
+    size = write_archive(file_name, t, q, META, chunk_size=1000)
+    assert size == os.path.getsize(file_name) < q.nbytes
+    with ArchiveReader(file_name) as reader:
+        assert reader.quantization == [q.scale, q.offset]
+        assert np.allclose(reader.read(990, 1010), q.to_volts()[990:1010])
+        assert np.isclose(reader.statistics()["max"], q.max())
+
+# Тест: при увеличении масштаба на линию выводятся отсчёты видимого участка, при уменьшении — огибающая
+def test_archive_view(qapp, signal_archive):
+    file_name, t, s = signal_archive
+    window = QWidget()
+    plot_data = PlotData(window)
+    reader = ArchiveReader(file_name)
+    x, y = reader.overview()
+    plot_data.plot_line(x, y, x_zoom=1000)
+    line = plot_data.get_all_lines()[-1]
+    view = ArchiveView(plot_data, reader, line, detail_points=2000)
+    plot_data.ax.set_xlim(t[0] * 1000, t[-1] * 1000)
+    view.refresh()
+    assert len(line.get_xdata()) == len(x)
+    # Участок 1 мс (1000 отсчётов) — выводятся сами отсчёты
+    plot_data.ax.set_xlim(0.0, 1.0)
+    i0 = 5000 - 1
+    assert np.array_equal(line.get_ydata()[:3], s[i0:i0 + 3])
+    assert len(line.get_ydata()) <= 1003
+    plot_data.ax.set_xlim(t[0] * 1000, t[-1] * 1000)
+    assert len(line.get_xdata()) == len(x)
+    view.disconnect()
+    reader.close()
+    window.close()
@@ -0,0 +1,150 @@
+'''
+test_background_loader.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.3
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля background_loader, реализующего фоновую загрузку CSV-файлов.
+Тесты проверяют предварительный просмотр и результат загрузки, отмену, загрузку из кэша,
+загрузку диапазона с записью кэша всего файла и добавление линии на график главного окна
+после завершения фоновой загрузки.
+'''
+
+import os
+import sys
+import gzip
+import numpy as np
+import pytest
+from PyQt6.QtCore import QEventLoop, QTimer
+from PyQt6.QtWidgets import QApplication
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from background_loader import CsvLoadWorker, estimate_row_count, start_background_load
+from load_and_prepare_data import read_capture
+from data_cache import load_cache
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Фикстура: CSV-файл формата 1 из 100 отсчётов
+@pytest.fixture
+def csv_file(tmp_path):
+    file_name = tmp_path / "capture.csv"
+    rows = "".join(f"{i},{i % 7}\n" for i in range(100))
+    file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,-1.0,0.01,\n" + rows, encoding="utf-8")
+    return str(file_name)
+
+# Запускает исполнителя в текущем потоке и собирает его сигналы
+def run_worker(worker):
+    events = {"preview": [], "loaded": [], "canceled": [], "failed": [], "progress": []}
+    worker.preview.connect(lambda t, s: events["preview"].append((t, s)))
+    worker.loaded.connect(lambda t, s, meta: events["loaded"].append((t, s, meta)))
+    worker.canceled.connect(lambda: events["canceled"].append(True))
+    worker.failed.connect(lambda msg: events["failed"].append(msg))
+    worker.progress.connect(events["progress"].append)
+    worker.run()
+    return events
+
+# Тест: оценка количества строк по размеру файла
+def test_estimate_row_count(csv_file):
+    assert 90 <= estimate_row_count(csv_file) <= 110
+
+# Тест: оценка количества строк сжатого файла учитывает степень сжатия
+def test_estimate_row_count_compressed(tmp_path):
+    file_name = str(tmp_path / "capture.csv.gz")
+    with gzip.open(file_name, "wt", encoding="utf-8") as f:
+        f.write("".join(f"{i},{np.sin(i / 50):.6f}\n" for i in range(100_000)))
+    assert 50_000 <= estimate_row_count(file_name, sample_bytes=1 << 14) <= 200_000
+    assert estimate_row_count(file_name, sample_bytes=1 << 24) == 100_000
+
+# Тест: предварительные просмотры прорежены, итог совпадает с полным чтением файла
+def test_worker_preview_and_result(qapp, csv_file):
+    worker = CsvLoadWorker(csv_file, 1, block_size=16, preview_points=10, preview_interval=0.0)
+    events = run_worker(worker)
+    assert not events["failed"] and not events["canceled"]
+    assert len(events["preview"]) == 7
+    t_prev, s_prev = events["preview"][0]
+    assert len(s_prev) < 16 and np.isclose(t_prev.t0, -1.0)
+    t, s, meta = events["loaded"][0]
+    t_ref, s_ref, _ = read_capture(csv_file, 1)
+    assert np.array_equal(s, s_ref)
+    assert np.allclose(t, t_ref)
+    assert meta["fs"] == pytest.approx(100.0)
+    assert events["progress"][-1] == 100
+    # Повторная загрузка — из кэша, без предварительного просмотра
+    events = run_worker(CsvLoadWorker(csv_file, 1, block_size=16, preview_interval=0.0))
+    assert not events["preview"]
+    assert isinstance(events["loaded"][0][1], np.memmap)
+
+# Тест: загрузка диапазона без кэша сохраняет кэш всего файла и возвращает только диапазон
+def test_worker_range_writes_cache(qapp, csv_file):
+    events = run_worker(CsvLoadWorker(csv_file, 1, inx_start=10, inx_stop=50, downsampling_factor=4, block_size=16,
+                                      preview_interval=0.0))
+    assert not events["preview"] and not events["failed"]
+    t, s, meta = events["loaded"][0]
+    t_ref, s_ref, _ = read_capture(csv_file, 1)
+    assert np.array_equal(s, s_ref[10:50:4]) and np.allclose(t, t_ref[10:50:4])
+    assert len(load_cache(csv_file, 1)[1]) == 100
+    t2, s2, _ = run_worker(CsvLoadWorker(csv_file, 1, inx_start=10, inx_stop=50, downsampling_factor=4))["loaded"][0]
+    assert isinstance(s2, np.memmap) and np.array_equal(s2, s)
+
+# Тест: большой несжатый файл разбирается параллельно (read_capture_parallel), без предварительного просмотра
+def test_worker_parallel_large_file(qapp, csv_file, monkeypatch):
+    import background_loader
+    import load_and_prepare_data
+    monkeypatch.setattr(background_loader, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(load_and_prepare_data, "PARALLEL_MIN_BYTES", 0)
+    calls = []
+    def spy(file_name, format_ver, max_workers=None):
+        calls.append(max_workers)
+        return load_and_prepare_data.read_capture_parallel(file_name, format_ver, max_workers)
+    monkeypatch.setattr(background_loader, "read_capture_parallel", spy)
+    events = run_worker(CsvLoadWorker(csv_file, 1, max_workers=2, preview_interval=0.0))
+    assert calls == [2] and not events["preview"] and not events["failed"]
+    t, s, meta = events["loaded"][0]
+    t_ref, s_ref, _ = read_capture(csv_file, 1)
+    assert np.array_equal(s, s_ref) and np.allclose(t, t_ref)
+    assert meta["fs"] == pytest.approx(100.0)
+
+# Тест: отмена загрузки
+def test_worker_cancel(qapp, csv_file):
+    worker = CsvLoadWorker(csv_file, 1, block_size=16)
+    worker.cancel()
+    events = run_worker(worker)
+    assert events["canceled"] and not events["loaded"]
+
+# Тест: ошибка загрузки передаётся сигналом failed
+def test_worker_failed(qapp, tmp_path):
+    events = run_worker(CsvLoadWorker(str(tmp_path / "missing.csv"), 1))
+    assert events["failed"] and not events["loaded"]
+
+# Тест: фоновая загрузка добавляет линию на график главного окна
+def test_start_background_load(qapp, csv_file):
+    from main import MainWindow
+    window = MainWindow()
+    controller = start_background_load(window, csv_file, 1, show_progress=False, block_size=16)
+    loop = QEventLoop()
+    controller.thread.finished.connect(loop.quit)
+    QTimer.singleShot(5000, loop.quit)
+    if controller.thread.isRunning():
+        loop.exec()
+    qapp.processEvents()
+    lines = window.plot_data_signal.get_all_lines()
+    assert len(lines) == 1
+    assert len(lines[0].get_ydata()) == 100
+    assert np.isclose(lines[0].get_xdata()[1] - lines[0].get_xdata()[0], 10.0)
+    assert "График построен" in window.status_text.toPlainText()
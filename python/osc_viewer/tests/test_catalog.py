@@ -0,0 +1,118 @@
+'''
+test_catalog.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля catalog (каталог записей в базе SQLite)
+и функции read_header_meta модуля load_and_prepare_data.
+Тесты проверяют чтение метаинформации без разбора отсчётов, инкрементное сканирование папки,
+поиск записей по условиям, командную строку и окно поиска.
+'''
+
+import os
+import sys
+import gzip
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication, QMainWindow
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from load_and_prepare_data import read_header_meta, read_capture, detect_format
+from catalog import scan_folder, query_catalog, main, CatalogDialog, default_catalog_path
+
+TEK_CONTENT = (
+    "Record Length,4,,-1.0e-06,0.1\n"
+    "Sample Interval,2.0e-07,,-0.8e-06,0.2\n"
+    "Source,CH1,,-0.6e-06,0.3\n"
+    "Model Number,TDS2002B,,-0.4e-06,0.4\n"
+)
+RIGOL_CONTENT = "X,CH2,Start,Increment,\n" "Sequence,Volt,-1.0,0.001,\n" + "".join(f"{i},{i % 3}\n" for i in range(10))
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Фикстура: папка с записями обоих форматов во вложенных папках
+@pytest.fixture
+def library(tmp_path):
+    (tmp_path / "6кГц").mkdir()
+    (tmp_path / "6кГц" / "F0000CH1.CSV").write_text(TEK_CONTENT, encoding="utf-8")
+    (tmp_path / "rigol.csv").write_text(RIGOL_CONTENT, encoding="utf-8")
+    with gzip.open(tmp_path / "rigol_old.csv.gz", "wt", encoding="utf-8") as f:
+        f.write(RIGOL_CONTENT)
+    return tmp_path
+
+# Тест: метаинформация без разбора отсчётов совпадает с результатом полного чтения файла
+@pytest.mark.parametrize("name", ["6кГц/F0000CH1.CSV", "rigol.csv", "rigol_old.csv.gz"])
+def test_read_header_meta(library, name):
+    file_name = str(library / name)
+    info = read_header_meta(file_name)
+    assert info["format_ver"] == detect_format(file_name)
+    t, s, meta = read_capture(file_name, info["format_ver"])
+    assert info["n_samples"] == len(s)
+    assert np.isclose(info["fs"], t.fs) and np.isclose(info["t0"], t.t0)
+    assert np.isclose(info["duration"], len(s) * t.dt)
+
+# Тест: модель и источник записи формата 0
+def test_read_header_meta_format0(library):
+    info = read_header_meta(str(library / "6кГц" / "F0000CH1.CSV"))
+    assert info["format_ver"] == 0
+    assert (info["model"], info["source"], info["n_samples"]) == ("TDS2002B", "CH1", 4)
+
+# Тест: повторное сканирование перечитывает только изменённые файлы и удаляет записи отсутствующих
+def test_scan_folder_incremental(library):
+    db_path = default_catalog_path(str(library))
+    assert scan_folder(db_path, str(library))["added"] == 3
+    assert scan_folder(db_path, str(library))["unchanged"] == 3
+    with open(library / "rigol.csv", "a", encoding="utf-8") as f:
+        f.write("10,1\n")
+    os.remove(library / "rigol_old.csv.gz")
+    counts = scan_folder(db_path, str(library))
+    assert (counts["updated"], counts["unchanged"], counts["removed"]) == (1, 1, 1)
+    rows = query_catalog(db_path, source="CH2")
+    assert [row["n_samples"] for row in rows] == [11]
+
+# Тест: поиск записей по модели, частоте дискретизации и количеству отсчётов
+def test_query_catalog(library):
+    db_path = default_catalog_path(str(library))
+    scan_folder(db_path, str(library))
+    assert len(query_catalog(db_path)) == 3
+    rows = query_catalog(db_path, model="tds2002b")
+    assert [os.path.basename(row["path"]) for row in rows] == ["F0000CH1.CSV"]
+    assert rows[0]["meta"]["Sample Interval"] == "2.0e-07"
+    assert len(query_catalog(db_path, fs=5e6, n_samples=4)) == 1
+    assert len(query_catalog(db_path, fs=1000.0, max_duration=0.02)) == 2
+    assert query_catalog(db_path, fs=1e6) == []
+
+# Тест командной строки: сканирование и поиск по периоду дискретизации
+def test_main_cli(library, capsys):
+    assert main(["scan", str(library)]) == 0
+    assert "добавлено 3" in capsys.readouterr().out
+    assert main(["query", str(library), "--sample-interval", "2e-7"]) == 0
+    out = capsys.readouterr().out
+    assert "F0000CH1.CSV" in out and "Найдено записей: 1" in out
+
+# Тест окна поиска: таблица заполняется по условиям отбора
+def test_catalog_dialog(qapp, library):
+    scan_folder(default_catalog_path(str(library)), str(library))
+    window = QMainWindow()
+    dialog = CatalogDialog(window, str(library))
+    assert dialog.table.rowCount() == 3
+    dialog.model_edit.setText("TDS2002B")
+    dialog.refresh()
+    assert dialog.table.rowCount() == 1
+    assert dialog.table.item(0, 0).text() == os.path.join("6кГц", "F0000CH1.CSV")
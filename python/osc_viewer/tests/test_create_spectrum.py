@@ -2,8 +2,8 @@
 test_create_spectrum.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.5
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -19,6 +19,10 @@ test_create_spectrum.py
 - Используются заглушки (Dummy-классы) для имитации поведения компонентов интерфейса и данных, чтобы изолировать тестируемую логику от внешних зависимостей.
 - Модульные тесты покрывают:
     * Корректность вычисления спектра (fft_signal)
+    * Совпадение пакетного вычисления спектров (batch_spectra) с вычислением по одному сигналу
+    * Пакетное вычисление спектра сигнала длиннее nfft без усечения (как в prepare_data)
+    * Чтение ранее построенного спектра из дискового кэша (каталог кэша в тестах — временный)
+    * Построение спектра методом Уэлча вместо спектра одного БПФ
     * Успешное построение спектра для валидных данных
     * Обработку ошибок при отсутствии выбранной линии или при повторном построении спектра
     * Переключение режимов отображения спектра (дБ/Вольты)
@@ -29,6 +33,7 @@ test_create_spectrum.py
 '''
 
 import numpy as np
+import pytest
 from unittest.mock import MagicMock
 import sys
 import types
@@ -66,6 +71,14 @@ sys.modules["load_and_prepare_data"] = types.ModuleType("load_and_prepare_data")
 sys.modules["load_and_prepare_data"].prepare_data = lambda t, s: (t, s, None)
 
 
+@pytest.fixture(autouse=True)
+def spectrum_cache_dir(tmp_path, monkeypatch):
+    '''Кэш спектров во временном каталоге: тесты не используют и не заполняют кэш приложения.'''
+    import spectrum_cache
+    monkeypatch.setattr(spectrum_cache, "SPECTRUM_CACHE_DIR", str(tmp_path / "spectrum_cache"))
+    return tmp_path / "spectrum_cache"
+
+
 class DummyLine:
     '''
     Заглушка для линии графика.
@@ -209,7 +222,9 @@ def test_fft_signal_basic():
     assert nsamp == 1000
     assert np.isclose(fs, 999.0, atol=1)
     assert np.isclose(df, fs / nsamp)
-    assert freq_vec.shape == (1000,)
+    # Односторонний спектр: частоты 0...fs/2
+    assert freq_vec.shape == (501,) and fft_s.shape == (501,)
+    assert freq_vec[0] == 0 and np.isclose(freq_vec[-1], fs / 2)
 
 
 def test_create_spectrume_success():
@@ -344,3 +359,128 @@ def test_add_spectrume_volts_mode(monkeypatch):
     )
     # Проверяем, что сообщение о построении графика отображено
     assert "График построен" in main_window.messages[-1]
+
+
+def test_batch_spectra_matches_single():
+    '''
+    Пакетное БПФ совпадает с вычислением спектра каждого сигнала отдельно; сигналы с разной частотой
+    дискретизации попадают в разные группы (свой вектор частот).
+    '''
+    from preprocess import Decimate, Detrend, Pipeline, PadTruncate
+    from spectrum_engine import rfft_spectrum
+    from time_base import TimeBase
+    rng = np.random.default_rng(0)
+    nfft = 4096
+    signals = [
+        (TimeBase(0.0, 1e-6, 16000), rng.standard_normal(16000) + 1.0),
+        (TimeBase(0.0, 2e-6, 7000), rng.standard_normal(7000)),
+        (TimeBase(0.0, 1e-6, 12345), np.sin(np.arange(12345) * 0.1)),
+    ]
+    results = create_spectrume.batch_spectra(signals, downsampling_factor=4, nfft=nfft)
+    assert len(results) == 3
+    # Спектры одной частоты дискретизации — строки одного массива с общим вектором частот
+    assert results[0][0] is results[2][0] and results[0][1].base is results[2][1].base
+    pipeline = Pipeline(Decimate(4), Detrend('constant'), PadTruncate(nfft))
+    for (t, s), (freq, spectrum) in zip(signals, results):
+        t_new, s_new = pipeline(t, s)
+        freq_ref, spectrum_ref, _ = rfft_spectrum(s_new, t_new.fs, nfft=nfft)
+        assert np.allclose(freq, freq_ref)
+        assert np.allclose(spectrum, spectrum_ref, atol=1e-12)
+
+
+def test_batch_spectra_longer_than_nfft():
+    '''
+    Сигнал длиннее nfft не усекается (как в prepare_data): длина БПФ равна длине сигнала, и он попадает
+    в отдельную группу; сигнал короче nfft той же частоты дискретизации дополняется до nfft.
+    '''
+    from spectrum_engine import rfft_spectrum
+    from time_base import TimeBase
+    rng = np.random.default_rng(1)
+    nfft = 1024
+    long_signal = rng.standard_normal(5000)
+    short_signal = rng.standard_normal(700)
+    results = create_spectrume.batch_spectra(
+        [(TimeBase(0.0, 1e-6, 5000), long_signal), (TimeBase(0.0, 1e-6, 700), short_signal)],
+        downsampling_factor=1, nfft=nfft,
+    )
+    (freq, spectrum), (freq_short, spectrum_short) = results
+    assert len(freq) == len(spectrum) == 5000 // 2 + 1
+    freq_ref, spectrum_ref, _ = rfft_spectrum(long_signal - long_signal.mean(), 1e6, nfft=5000)
+    assert np.allclose(freq, freq_ref)
+    assert np.allclose(spectrum, spectrum_ref, atol=1e-12)
+    assert len(freq_short) == nfft // 2 + 1
+    _, short_ref, _ = rfft_spectrum(short_signal - short_signal.mean(), 1e6, nfft=nfft)
+    assert np.allclose(spectrum_short, short_ref, atol=1e-12)
+
+
+def test_add_spectra_all_lines():
+    '''
+    Спектры всех линий строятся одним вызовом: линии с построенным спектром пропускаются,
+    параметры осей устанавливаются и вкладка переключается один раз.
+    '''
+    main_window = DummyMainWindow()
+    x = np.linspace(0, 1000, 1000)
+    lines = [DummyLine(x, np.sin(2 * np.pi * k * 1e-3 * x)) for k in (1, 2)]
+    lines.append(DummyLine(x, np.ones_like(x), has_spectrum=True))
+    main_window.plot_data_signal = MagicMock()
+    main_window.plot_data_signal.get_all_lines.return_value = lines
+    main_window.plot_data_signal.get_line_params.side_effect = (
+        lambda line: {"color": "r", "linestyle": "-", "label": f"line{lines.index(line)}"})
+    assert create_spectrume.add_spectra(main_window) == 2
+    plot_calls = main_window.spectrum_data.plot_calls
+    assert [kwargs["label"] for _, _, kwargs in plot_calls] == ["line0", "line1"]
+    assert all(kwargs["add_mode"] for _, _, kwargs in plot_calls)
+    assert main_window.spectrum_data.set_axes_params_called
+    assert main_window.tabs.setCurrentWidget_called
+    assert "Построено спектров: 2" in main_window.messages[-1]
+
+
+def test_add_spectrume_uses_cache(monkeypatch, spectrum_cache_dir):
+    '''
+    Повторное построение спектра той же линии читает его из кэша без вычисления;
+    в другом режиме отображения (дБ) спектр вычисляется заново.
+    '''
+    x = np.linspace(0, 1000, 1000)
+    line = DummyLine(x, np.sin(2 * np.pi * 1e-3 * x))
+    params = {"color": "g", "linestyle": ":", "label": "testline"}
+    main_window = DummyMainWindow()
+    create_spectrume.add_spectrume(main_window, line, params)
+    assert len(list(spectrum_cache_dir.iterdir())) == 1
+    _, first, _ = main_window.spectrum_data.plot_calls[-1]
+
+    calls = []
+    original = create_spectrume.create_spectrume
+    monkeypatch.setattr(create_spectrume, "create_spectrume", lambda *a: calls.append(a) or original(*a))
+    main_window = DummyMainWindow()
+    create_spectrume.add_spectrume(main_window, line, params)
+    assert not calls
+    _, cached, _ = main_window.spectrum_data.plot_calls[-1]
+    assert cached.dtype == np.float32 and np.allclose(cached, first, rtol=1e-6, atol=1e-12)
+
+    main_window._spectrum_db_mode = True
+    create_spectrume.add_spectrume(main_window, line, params)
+    assert len(calls) == 1
+    assert len(list(spectrum_cache_dir.iterdir())) == 2
+
+
+def test_add_spectrume_welch(spectrum_cache_dir):
+    '''
+    Спектр Уэлча: длина спектра определяется длиной сегмента, пик гармоники — половина её амплитуды,
+    подпись линии помечается «(Уэлч)», спектр сохраняется в кэш отдельно от спектра одного БПФ.
+    '''
+    main_window = DummyMainWindow()
+    x = np.arange(200000) * 1e-4  # мс, fs = 10 МГц, после децимации 1 МГц
+    line = DummyLine(x, 2 * np.sin(2 * np.pi * 125 * x))  # 125 кГц — на отсчёте сетки частот сегмента
+    welch = {"segment_length": 1024, "overlap": 0.5, "window": "hann"}
+    create_spectrume.add_spectrume(main_window, line, {"color": "g", "linestyle": ":", "label": "l"}, welch=welch)
+    freq, spectrum, kwargs = main_window.spectrum_data.plot_calls[-1]
+    assert len(spectrum) == 513 and kwargs["label"] == "l (Уэлч)"
+    assert np.isclose(freq[np.argmax(spectrum)], 0.125)
+    assert np.isclose(spectrum.max(), 1.0, rtol=0.05)
+    assert len(list(spectrum_cache_dir.iterdir())) == 1
+    # Сигнал короче сегмента — сообщение, спектр не строится
+    main_window = DummyMainWindow()
+    create_spectrume.add_spectrume(main_window, DummyLine(x[:5000], x[:5000]), {"color": "g", "linestyle": ":", "label": "l"},
+                                   welch=welch)
+    assert not main_window.spectrum_data.plot_calls
+    assert "короче" in main_window.messages[-1]
@@ -0,0 +1,95 @@
+'''
+test_data_cache.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.3
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля data_cache, реализующего бинарный кэш отсчётов рядом с CSV-файлом,
+а также для функции load_data_cached модуля load_and_prepare_data.
+Тесты проверяют запись и чтение кэша, отображение массивов в память и сброс кэша при изменении исходного файла.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from data_cache import cache_paths, load_cache, save_cache, load_row_index, save_row_index
+from load_and_prepare_data import load_data_cached
+from time_base import TimeBase
+
+# Фикстура для создания временного CSV-файла формата 1
+@pytest.fixture
+def csv_file(tmp_path):
+    file_name = tmp_path / "capture.csv"
+    file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,1.0,0.5,\n" "0,10,\n" "1,20,\n" "2,30,\n", encoding="utf-8")
+    return str(file_name)
+
+# Тест: кэш отсутствует — возвращается None
+def test_load_cache_missing(csv_file):
+    assert load_cache(csv_file, 1) is None
+
+# Тест: записанный кэш читается как отображённый в память сигнал и временная ось (t0, dt)
+def test_save_and_load_cache(csv_file):
+    t = TimeBase(1.0, 0.5, 3)
+    s = np.array([10.0, 20.0, 30.0])
+    assert save_cache(csv_file, 1, t, s, {"Start": "1.0", "fs": 2.0})
+    t2, s2, meta = load_cache(csv_file, 1)
+    assert isinstance(s2, np.memmap)
+    assert (t2.t0, t2.dt, len(t2)) == (1.0, 0.5, 3)
+    assert np.array_equal(s2, s)
+    assert meta == {"Start": "1.0", "fs": 2.0}
+    # Кэш другой версии формата не используется
+    assert load_cache(csv_file, 0) is None
+
+# Тест: при изменении исходного файла кэш считается устаревшим
+def test_cache_invalidated_on_change(csv_file):
+    save_cache(csv_file, 1, TimeBase(0.0, 1.0, 3), np.zeros(3), {})
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write("3,40,\n")
+    assert load_cache(csv_file, 1) is None
+
+# Тест: load_data_cached создаёт кэш при первом открытии и использует его при повторном
+def test_load_data_cached(csv_file):
+    t, s, meta_df = load_data_cached(csv_file, 1)
+    assert all(os.path.exists(p) for p in cache_paths(csv_file))
+    t2, s2, meta_df2 = load_data_cached(csv_file, 1)
+    assert isinstance(s2, np.memmap)
+    assert np.allclose(t2, [1.0, 1.5, 2.0])
+    assert np.array_equal(s2, s)
+    assert meta_df2.equals(meta_df)
+
+# Тест: индекс смещений строк сохраняется и читается, пока исходный файл не изменён
+def test_save_and_load_row_index(csv_file):
+    assert load_row_index(csv_file, 1) is None
+    assert save_row_index(csv_file, 1, np.array([44, 60]), 3, {"Start": "1.0"})
+    offsets, n_rows, meta = load_row_index(csv_file, 1)
+    assert np.array_equal(offsets, [44, 60])
+    assert n_rows == 3
+    assert meta == {"Start": "1.0"}
+    with open(csv_file, "a", encoding="utf-8") as f:
+        f.write("3,40,\n")
+    assert load_row_index(csv_file, 1) is None
+
+# Тест: открытие с диапазоном без кэша сохраняет кэш всего файла; из кэша диапазон — срез отображённого массива
+def test_load_data_cached_range(csv_file):
+    t, s, meta_df = load_data_cached(csv_file, 1, 1, None, 1)
+    assert all(os.path.exists(p) for p in cache_paths(csv_file))
+    assert np.allclose(s, [20.0, 30.0])
+    assert np.allclose(t, [1.5, 2.0])
+    assert len(load_cache(csv_file, 1)[1]) == 3
+    t, s, meta_df = load_data_cached(csv_file, 1, 1, None, 1)
+    assert isinstance(s, np.memmap)
+    assert np.allclose(s, [20.0, 30.0])
+    assert np.allclose(t, [1.5, 2.0])
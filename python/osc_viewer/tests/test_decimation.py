@@ -0,0 +1,73 @@
+'''
+test_decimation.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля decimation (децимация с фильтром защиты от наложения спектров).
+Тесты проверяют подавление составляющих, которые попали бы в полосу анализа, сохранение полезного сигнала
+и его привязки ко времени, совпадение потоковой и однократной децимации и prepare_data.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+from scipy.signal import resample_poly
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from decimation import design_decimation_filter, Decimator, decimate, decimate_blocks
+from load_and_prepare_data import prepare_data
+
+FS = 1e6
+
+# Тест: составляющая выше новой частоты Найквиста подавляется, составляющая в полосе сохраняется без сдвига
+@pytest.mark.parametrize("factor", [2, 10, 37])
+def test_decimate_anti_alias(factor):
+    t = np.arange(100_000) / FS
+    f_pass = 0.5 * FS / factor * 0.5  # Половина новой частоты Найквиста
+    f_alias = FS / factor - f_pass     # После прореживания среза попала бы на f_pass
+    tone = np.sin(2 * np.pi * f_pass * t)
+    y = decimate(tone + np.sin(2 * np.pi * f_alias * t), factor)
+    assert len(y) == -(-len(t) // factor)
+    inner = slice(50, -50)
+    assert np.abs(y - tone[::factor])[inner].max() < 1e-3  # -60 дБ и лучше
+    # Срез без фильтра переносит f_alias в полосу анализа
+    assert np.abs(tone[::factor] - (tone + np.sin(2 * np.pi * f_alias * t))[::factor])[inner].max() > 0.5
+
+# Тест: потоковая децимация блоками произвольной длины совпадает с однократной и с scipy.signal.resample_poly
+def test_decimate_streaming_matches():
+    x = np.random.default_rng(0).standard_normal(20_011) + 2.0
+    factor = 10
+    y = decimate(x, factor)
+    blocks = (x[i:i + 333] for i in range(0, len(x), 333))
+    assert np.allclose(np.concatenate(list(decimate_blocks(blocks, factor))), y, atol=1e-12)
+    h = design_decimation_filter(factor)
+    assert len(h) % 2 == 1 and np.isclose(h.sum(), 1.0)
+    assert np.allclose(resample_poly(x, 1, factor, window=h, padtype='edge'), y, atol=1e-12)
+    # Постоянная составляющая на краях не искажается
+    assert np.allclose(decimate(np.full(1000, 3.0), factor), 3.0)
+    # Короткий сигнал: один выходной отсчёт
+    decimator = Decimator(factor)
+    assert len(decimator.process(np.ones(5))) == 0
+    assert np.allclose(decimator.flush(), [1.0]) and decimator.n_out == 1
+    assert np.array_equal(decimate(x, 1), x)
+
+# Тест: prepare_data децимирует сигнал с фильтром, ось прореживается тем же шагом
+def test_prepare_data_decimation():
+    t = np.arange(50_000) / FS
+    s = np.sin(2 * np.pi * 10e3 * t) + np.sin(2 * np.pi * 95e3 * t)  # 95 кГц > 50 кГц (новая частота Найквиста)
+    t2, s2, _ = prepare_data(t, s, downsampling_factor=10)
+    assert np.isclose(t2.dt, 10 / FS)
+    expected = np.sin(2 * np.pi * 10e3 * t[::10])
+    assert np.abs(s2[100:4900] - (expected - expected.mean())[100:4900]).max() < 1e-3
@@ -0,0 +1,124 @@
+'''
+test_live_stream.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля live_stream (живой поток отсчётов по TCP).
+Тесты проверяют кольцевой буфер, приём кадров от генератора тестового сигнала
+и отображение в режиме прокрутки без выделения массивов при обновлении.
+'''
+
+import os
+import sys
+import threading
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from live_stream import RingBuffer, StreamWorker, RollView, listen_socket, serve_test_signal, write_frame
+from PlotData import PlotData
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Тест: запись с переходом через конец буфера и чтение последних отсчётов в хронологическом порядке
+def test_ring_buffer():
+    ring = RingBuffer(8)
+    out = np.empty(5, dtype=np.float32)
+    assert ring.read_latest(out) == 0 and np.isnan(out).all()
+    ring.write(np.arange(3, dtype=np.float32))
+    ring.read_latest(out)
+    assert np.isnan(out[:2]).all() and np.array_equal(out[2:], [0, 1, 2])
+    ring.write(np.arange(3, 10, dtype=np.float32))
+    assert ring.read_latest(out) == 10
+    assert np.array_equal(out, [5, 6, 7, 8, 9])
+    # Кадр длиннее буфера: сохраняются только последние capacity отсчётов
+    ring.write(np.arange(100, dtype=np.float32))
+    full = np.empty(8, dtype=np.float32)
+    assert ring.read_latest(full) == 110
+    assert np.array_equal(full, np.arange(92, 100))
+
+# Тест: кадры генератора принимаются в кольцевой буфер и переводятся в вольты
+def test_stream_worker_receives_frames():
+    server = listen_socket('127.0.0.1', 0)
+    port = server.getsockname()[1]
+    result = {}
+    thread = threading.Thread(
+        target=lambda: result.setdefault('sent', serve_test_signal(
+            server, fs=1e5, frame_samples=1000, freq=1e3, noise=0.0, duration=0.025, realtime=False)))
+    thread.start()
+    ring = RingBuffer(4096)
+    worker = StreamWorker('127.0.0.1', port, ring)
+    rates, errors = [], []
+    worker.rate_changed.connect(rates.append)
+    worker.failed.connect(errors.append)
+    worker.run()
+    thread.join(5)
+    server.close()
+    assert not errors and rates == [1e5]
+    assert result['sent'] == 2500 and ring.total == 2500 and worker.n_frames == 3
+    out = np.empty(100, dtype=np.float32)
+    ring.read_latest(out)
+    t = np.arange(2400, 2500) / 1e5
+    assert np.allclose(out, np.sin(2 * np.pi * 1e3 * t), atol=1e-3)
+
+# Тест: кадр кодов int16, который помещается в буфер байтов после большого кадра float32, но не в буфер вольт
+def test_stream_worker_grows_volts_buffer():
+    server = listen_socket('127.0.0.1', 0)
+    port = server.getsockname()[1]
+    n, m = 300_000, 500_000  # 4n байт > FRAME_BUFFER_BYTES, 2m байт <= 4n, m > n
+    def serve():
+        conn, _ = server.accept()
+        with conn:
+            write_frame(conn, np.ones(n, dtype=np.float32), 1e6, scale=0.5)
+            write_frame(conn, np.full(m, 4, dtype=np.int16), 1e6, scale=0.25)
+    thread = threading.Thread(target=serve)
+    thread.start()
+    ring = RingBuffer(1 << 20)
+    worker = StreamWorker('127.0.0.1', port, ring)
+    errors = []
+    worker.failed.connect(errors.append)
+    worker.run()
+    thread.join(5)
+    server.close()
+    assert not errors and worker.n_frames == 2 and ring.total == n + m
+    out = np.empty(m, dtype=np.float32)
+    ring.read_latest(out)
+    assert np.all(out == 1.0)
+
+# Тест: огибающая режима прокрутки строится в заранее выделенных массивах
+def test_roll_view(qapp):
+    ring = RingBuffer(1 << 16)
+    window = QWidget()
+    plot_data = PlotData(window)
+    view = RollView(plot_data, ring, fs=1e6, window_s=0.01, display_points=1000)
+    y, x = view._y, view._x
+    assert len(y) == 1000 and np.isclose(x[-1], 0.0) and np.isclose(x[0], -10.0, atol=0.01)
+    ring.write(np.tile(np.array([-1.0, 2.0], dtype=np.float32), 10_000))
+    assert view.refresh()
+    assert not view.refresh()  # Новых отсчётов нет — перерисовки нет
+    assert view._y is y and view._x is x
+    assert np.array_equal(y[0::2], np.full(500, -1.0)) and np.array_equal(y[1::2], np.full(500, 2.0))
+    assert np.array_equal(view.line.get_ydata(), y)
+    lo, hi = plot_data.ax.get_ylim()
+    assert lo < -1.0 and hi > 2.0
+    view.line.remove()
+    ring.write(np.zeros(10, dtype=np.float32))
+    assert not view.refresh() and not view.timer.isActive()
+    window.close()
@@ -2,8 +2,8 @@
 test_load_and_prepare_data.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.12
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -16,6 +16,9 @@ test_load_and_prepare_data.py
 
 import os
 import sys
+import gzip
+import bz2
+import lzma
 import tempfile
 import numpy as np
 import pandas as pd
@@ -26,7 +29,29 @@ osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if osc_viewer_dir not in sys.path:
     sys.path.insert(0, osc_viewer_dir)
 
-from load_and_prepare_data import load_data, prepare_data, print_c
+from load_and_prepare_data import (
+    load_data,
+    prepare_data,
+    print_c,
+    read_csv_arrays,
+    iter_data_blocks,
+    stream_statistics,
+    build_row_index,
+    read_csv_range,
+    read_capture,
+    find_csv_files,
+    load_files_parallel,
+    detect_channels,
+    read_channels,
+    open_capture,
+    read_display_params,
+    read_capture_parallel,
+    read_sparse_preview,
+)
+import load_and_prepare_data
+from time_base import TimeBase
+from quantized import QuantizedSignal
+from data_cache import load_cache
 
 # Фикстура для создания временного CSV-файла формата 0
 @pytest.fixture
@@ -65,8 +90,8 @@ def csv_file_format1():
 def test_load_data_format0(csv_file_format0):
     t, s, meta_df = load_data(csv_file_format0, 0)
     # Проверяем типы возвращаемых данных
-    assert isinstance(t, list)
-    assert isinstance(s, list)
+    assert isinstance(t, TimeBase)
+    assert isinstance(s, np.ndarray)
     assert isinstance(meta_df, pd.DataFrame)
     # Проверяем корректность метаданных
     assert meta_df[meta_df["Key"] == "Key1"]["Value"].values[0] == "Value1"
@@ -78,15 +103,255 @@ def test_load_data_format0(csv_file_format0):
 def test_load_data_format1(csv_file_format1):
     t, s, meta_df = load_data(csv_file_format1, 1)
     # t должен быть [0*0.5+1.0, 1*0.5+1.0, 2*0.5+1.0] = [1.0, 1.5, 2.0]
-    assert isinstance(t, list)
-    assert isinstance(s, list)
+    assert isinstance(t, TimeBase)
+    assert isinstance(s, np.ndarray)
     assert isinstance(meta_df, pd.DataFrame)
+    assert (t.t0, t.dt) == (1.0, 0.5)
     assert np.allclose(t, [1.0, 1.5, 2.0])
     assert np.allclose(s, [10.0, 20.0, 30.0])
     # Проверяем метаданные
     assert float(meta_df[meta_df["Key"] == "Increment"]["Value"].values[0]) == 0.5
     assert float(meta_df[meta_df["Key"] == "Start"]["Value"].values[0]) == 1.0
 
+# Тест блочного чтения в массивы numpy (формат 0, несколько блоков)
+def test_read_csv_arrays_format0_blocks(csv_file_format0):
+    t, s, meta = read_csv_arrays(csv_file_format0, 0, block_rows=2)
+    # Проверяем, что возвращаются массивы numpy, а метаинформация собрана из всех блоков
+    assert isinstance(t, np.ndarray)
+    assert isinstance(s, np.ndarray)
+    assert meta == {"Key1": "Value1", "Key2": "Value2"}
+    assert np.allclose(t, [0.0, 1.0, 2.0])
+    assert np.allclose(s, [1.0, 2.0, 3.0])
+
+# Тест блочного чтения формата 1: пустые поля пропускаются, время умножается на Increment
+def test_read_csv_arrays_format1_skips_empty():
+    content = "X,CH1,Increment,\n" "Sequence,Volt,0.5,\n" "0,10,\n" "1, ,\n" "2,30,\n" "\n"
+    with tempfile.NamedTemporaryFile(
+        "w+", suffix=".csv", delete=False, encoding="utf-8"
+    ) as f:
+        f.write(content)
+    try:
+        t, s, meta = read_csv_arrays(f.name, 1, block_rows=1)
+    finally:
+        os.remove(f.name)
+    assert np.allclose(t, [0.0, 1.0])
+    assert np.allclose(s, [10.0, 30.0])
+    assert meta["Increment"] == "0.5"
+
+# Тест потокового чтения блоками фиксированного размера
+def test_iter_data_blocks_format1(csv_file_format1):
+    blocks = list(iter_data_blocks(csv_file_format1, 1, block_size=2))
+    # Блоки фиксированного размера, последний — короче
+    assert [len(s) for _, s, _ in blocks] == [2, 1]
+    t = np.concatenate([b[0] for b in blocks])
+    s = np.concatenate([b[1] for b in blocks])
+    # Время учитывает Increment и Start, как в load_data
+    assert np.allclose(t, [1.0, 1.5, 2.0])
+    assert np.allclose(s, [10.0, 20.0, 30.0])
+    assert blocks[-1][2]["fs"] == 2.0
+
+# Тест: файл только с заголовком (или пустой) читается как сигнал нулевой длины
+def test_read_header_only(tmp_path):
+    file_name = tmp_path / "header_only.csv"
+    file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,0.0,0.5,\n", encoding="utf-8")
+    t, s, meta = read_csv_arrays(str(file_name), 1)
+    assert len(t) == 0 and len(s) == 0 and meta["Increment"] == "0.5"
+    assert list(iter_data_blocks(str(file_name), 1)) == []
+    t, s, meta = read_capture_parallel(str(file_name), 1, max_workers=2, chunk_bytes=8)
+    assert len(t) == 0 and len(s) == 0 and meta["fs"] == 0.0
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+    t, s, meta = read_capture(str(empty), 0)
+    assert len(t) == 0 and len(s) == 0
+
+# Тест потоковой статистики по блокам
+def test_stream_statistics(csv_file_format0):
+    stats = stream_statistics(iter_data_blocks(csv_file_format0, 0, block_size=1))
+    s = np.array([1.0, 2.0, 3.0])
+    assert stats["n"] == 3
+    assert stats["min"] == 1.0 and stats["max"] == 3.0
+    assert np.isclose(stats["mean"], s.mean())
+    assert np.isclose(stats["rms"], np.sqrt(np.mean(s**2)))
+    assert np.isclose(stats["std"], s.std())
+
+# Тест индекса смещений строк: строки метаинформации формата 0 не считаются строками данных
+def test_build_row_index_format0(csv_file_format0):
+    offsets, n_rows, meta = build_row_index(csv_file_format0, 0, step=2)
+    assert n_rows == 3
+    assert meta == {"Key1": "Value1", "Key2": "Value2"}
+    with open(csv_file_format0, "rb") as f:
+        content = f.read()
+    # Смещения строк данных с номерами 0 и 2
+    assert [content[o:o + 7] for o in offsets] == [b",,,0.0,", b",,,2.0,"]
+
+# Тест чтения диапазона строк с прореживанием: результат совпадает со срезом полного массива
+@pytest.mark.parametrize("inx_start, inx_stop, factor", [(0, None, 1), (1, 9, 2), (3, 4, 1), (2, None, 3), (20, None, 1)])
+def test_read_csv_range_matches_slice(tmp_path, monkeypatch, inx_start, inx_stop, factor):
+    # Маленький шаг индекса, чтобы чтение начиналось не с первой строки
+    monkeypatch.setattr(load_and_prepare_data, "ROW_INDEX_STEP", 2)
+    file_name = tmp_path / "capture.csv"
+    rows = "".join(f"{i},{i * 10}\n" for i in range(11))
+    file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,1.0,0.5,\n" + rows, encoding="utf-8")
+    t, s, meta = read_capture(str(file_name), 1)
+    t2, s2, meta2 = read_csv_range(str(file_name), 1, inx_start, inx_stop, factor)
+    assert np.allclose(t2, t[inx_start:inx_stop:factor])
+    assert np.array_equal(s2, s[inx_start:inx_stop:factor])
+
+# Тест формата 0: строки метаинформации с отсчётами входят в сигнал, шаг берётся из "Sample Interval"
+def test_read_capture_format0_sample_interval(tmp_path):
+    file_name = tmp_path / "tek.csv"
+    file_name.write_text(
+        "Record Length,4,Points,-1.0e-06,0.1\n"
+        "Sample Interval,2.0e-07,s,-0.8e-06,0.2\n"
+        ",,,-0.6e-06,0.3\n"
+        ",,,-0.4e-06,0.4\n",
+        encoding="utf-8",
+    )
+    t, s, meta = read_capture(str(file_name), 0)
+    assert np.allclose(s, [0.1, 0.2, 0.3, 0.4])
+    assert np.isclose(t.t0, -1.0e-06) and t.dt == 2.0e-07
+    assert meta["fs"] == 1 / 2.0e-07
+    offsets, n_rows, _ = build_row_index(str(file_name), 0)
+    assert n_rows == 4 and offsets[0] == 0
+
+# Тест потокового чтения сжатых файлов: результат совпадает с чтением несжатого файла
+@pytest.mark.parametrize("suffix, opener", [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)])
+def test_read_compressed_capture(tmp_path, suffix, opener):
+    content = "X,CH1,Start,Increment,\n" "Sequence,Volt,1.0,0.5,\n" + "".join(f"{i},{i * 10}\n" for i in range(11))
+    plain = tmp_path / "capture.csv"
+    plain.write_text(content, encoding="utf-8")
+    packed = str(plain) + suffix
+    with opener(packed, "wt", encoding="utf-8") as f:
+        f.write(content)
+    with open_capture(packed) as f:
+        assert f.readline() == "X,CH1,Start,Increment,\n"
+    t, s, meta = read_capture(str(plain), 1)
+    t2, s2, meta2 = read_capture(packed, 1)
+    assert (t2.t0, t2.dt, len(t2)) == (t.t0, t.dt, len(t))
+    assert np.array_equal(s2, s) and meta2 == meta
+    # Диапазон сжатого файла читается потоково, без индекса смещений строк
+    t3, s3, _ = read_csv_range(packed, 1, 1, 9, 2)
+    assert np.allclose(t3, t[1:9:2]) and np.array_equal(s3, s[1:9:2])
+    t4, s4, _ = read_csv_range(packed, 1, 2, None, 3)
+    assert np.allclose(t4, t[2::3]) and np.array_equal(s4, s[2::3])
+    with pytest.raises(ValueError):
+        build_row_index(packed, 1)
+    _, S, names, _ = read_channels(packed, 1)
+    assert names == ["CH1"] and np.array_equal(S[0], s)
+
+# Тест: параметры отображения сжатого файла читаются из JSON-файла с именем несжатого файла
+def test_read_display_params_compressed(tmp_path):
+    (tmp_path / "capture.json").write_text(
+        '{"format_ver": 0, "inx_start": 5, "inx_stop": 50, "downsampling_factor": 2}', encoding="utf-8"
+    )
+    assert read_display_params(str(tmp_path / "capture.csv.gz")) == (0, 5, 50, 2)
+
+# Тест параллельного разбора одного файла: фрагменты собираются в тот же сигнал, что и при чтении в одном процессе
+@pytest.mark.parametrize("format_ver", [0, 1])
+def test_read_capture_parallel(tmp_path, monkeypatch, format_ver):
+    monkeypatch.setattr(load_and_prepare_data, "PARALLEL_MIN_BYTES", 0)
+    file_name = tmp_path / "capture.csv"
+    if format_ver == 0:
+        content = "Record Length,300,,0.0,0.5\n" "Sample Interval,1.0e-03,,1.0e-03,0.25\n" + "".join(
+            f",,,{i * 1e-3:.6f},{np.sin(i):.4f}\n" for i in range(2, 300))
+    else:
+        content = "X,CH1,Start,Increment,\n" "Sequence,Volt,-1.0,0.01,\n" + "".join(f"{i},{i % 13}\n" for i in range(300))
+    file_name.write_text(content, encoding="utf-8")
+    t, s, meta = read_capture(str(file_name), format_ver)
+    t2, s2, meta2 = read_capture_parallel(str(file_name), format_ver, max_workers=2, chunk_bytes=512)
+    assert s2.flags.c_contiguous and np.array_equal(s2, s)
+    assert (t2.t0, t2.dt, len(t2)) == (t.t0, t.dt, len(t))
+    assert meta2 == meta
+
+# Тест предварительного просмотра: выбранные по байтовым смещениям строки и их номера совпадают с полным чтением
+@pytest.mark.parametrize("format_ver", [0, 1])
+def test_read_sparse_preview(tmp_path, format_ver):
+    file_name = tmp_path / "capture.csv"
+    if format_ver == 0:
+        content = "Record Length,3000,,0.0,0.5\n" "Sample Interval,1.0e-03,,1.0e-03,0.25\n" + "".join(
+            f",,,{i * 1e-3:.6f},{np.sin(i):.4f}\n" for i in range(2, 3000))
+    else:
+        content = "X,CH1,Start,Increment,\n" "Sequence,Volt,-1.0,0.01,\n" + "".join(f"{i},{i % 13}\n" for i in range(3000))
+    file_name.write_text(content, encoding="utf-8")
+    idx, t, s, info = read_sparse_preview(str(file_name), format_ver, n_rows=50)
+    assert 45 <= len(idx) <= 50 and idx[0] == 0 and np.all(np.diff(idx) > 0)
+    assert idx[-1] > 2900 and info["n_samples"] == 3000
+    t_full, s_full, _ = read_capture(str(file_name), format_ver)
+    assert np.array_equal(s, s_full[idx])
+    assert np.allclose(t, t_full.to_array()[idx])
+
+# Тест поиска CSV-файлов во вложенных папках (папки частотной развёртки)
+def test_find_csv_files(tmp_path):
+    for sub in ("6кГц", "9кГц"):
+        (tmp_path / sub).mkdir()
+        (tmp_path / sub / "F0000CH1.CSV").write_text("", encoding="utf-8")
+        (tmp_path / sub / "F0000TEK.SET").write_text("", encoding="utf-8")
+    files = find_csv_files(str(tmp_path))
+    assert [os.path.relpath(f, tmp_path) for f in files] == [
+        os.path.join("6кГц", "F0000CH1.CSV"), os.path.join("9кГц", "F0000CH1.CSV")
+    ]
+
+# Тест параллельной загрузки: результаты всех файлов, ошибка одного файла не прерывает загрузку остальных
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_load_files_parallel(tmp_path, max_workers):
+    jobs = []
+    for k in range(3):
+        file_name = tmp_path / f"capture{k}.csv"
+        file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,0.0,0.5,\n" f"0,{k}\n" f"1,{k + 1}\n", encoding="utf-8")
+        jobs.append((str(file_name), 1, 0, None, 1))
+    jobs.append((str(tmp_path / "missing.csv"), 1, 0, None, 1))
+    results = {f: (r, e) for f, r, e in load_files_parallel(jobs, max_workers=max_workers)}
+    assert len(results) == 4
+    assert isinstance(results[jobs[-1][0]][1], OSError)
+    for k, job in enumerate(jobs[:3]):
+        (t, s, meta_df, log), error = results[job[0]]
+        assert error is None
+        assert np.allclose(s, [k, k + 1]) and t.dt == 0.5
+        assert "Сигнал загружен" in log
+
+# Тест: при параллельной загрузке отсчёты по умолчанию в вольтах, как при открытии одного файла; коды АЦП — по запросу
+def test_load_files_parallel_quantized(tmp_path):
+    file_name = tmp_path / "capture.csv"
+    file_name.write_text("X,CH1,Start,Increment,\n" "Sequence,Volt,0.0,0.5,\n" "0,1\n" "1,2\n" "2,3\n", encoding="utf-8")
+    job = (str(file_name), 1, 0, None, 1)
+    (_, (t, s, _, _), error), = load_files_parallel([job], max_workers=1)
+    assert error is None and type(s) is np.ndarray and s.dtype == np.float64
+    assert not isinstance(load_cache(str(file_name), 1)[1], QuantizedSignal)  # Кэш записан в вольтах
+    (_, (t, s, _, _), error), = load_files_parallel([job], max_workers=1, quantized=True)
+    assert error is None and isinstance(s, QuantizedSignal)
+    assert np.allclose(np.asarray(s), [1.0, 2.0, 3.0])
+
+# Тест многоканального чтения формата 1: общая временная ось и массив "канал x отсчёт"
+def test_read_channels_format1(tmp_path):
+    file_name = tmp_path / "capture.csv"
+    file_name.write_text("X,CH1,CH2,Start,Increment,\n" "Sequence,Volt,Volt,-1.0,0.5,\n" "0,1,10,\n" "1,2,20,\n" "2,3,30,\n", encoding="utf-8")
+    t, S, names, meta = read_channels(str(file_name), 1, block_rows=2)
+    assert names == ["CH1", "CH2"]
+    assert S.shape == (2, 3) and S.flags["C_CONTIGUOUS"]
+    assert np.array_equal(S, [[1, 2, 3], [10, 20, 30]])
+    assert (t.t0, t.dt) == (-1.0, 0.5) and meta["fs"] == 2.0
+
+# Тест многоканального чтения формата 0: по 6 столбцов на канал, имена каналов из строки "Source"
+def test_read_channels_format0(tmp_path):
+    file_name = tmp_path / "tek.csv"
+    file_name.write_text(
+        "Record Length,3,Points,-1.0e-06,0.1,,Record Length,3,Points,-1.0e-06,1.1,\n"
+        "Source,CH1,,-0.8e-06,0.2,,Source,CH3,,-0.8e-06,1.2,\n"
+        ",,,-0.6e-06,0.3,,,,,-0.6e-06,1.3,\n",
+        encoding="utf-8",
+    )
+    t, S, names, meta = read_channels(str(file_name), 0)
+    assert names == ["CH1", "CH3"]
+    assert np.allclose(S, [[0.1, 0.2, 0.3], [1.1, 1.2, 1.3]])
+    assert meta["Source"] == "CH1" and np.isclose(t.dt, 0.2e-06)
+    # Первый канал совпадает с одноканальным чтением
+    assert np.array_equal(S[0], read_capture(str(file_name), 0)[1])
+
+# Тест определения каналов одноканального файла
+def test_detect_channels_single(csv_file_format0, csv_file_format1):
+    assert detect_channels(csv_file_format0, 0) == ["CH1"]
+    assert detect_channels(csv_file_format1, 1) == ["CH1"]
+
 # Тест downsampling в prepare_data
 def test_prepare_data_downsampling():
     t = np.linspace(0, 1, 100)  # Временная ось
@@ -94,6 +359,9 @@ def test_prepare_data_downsampling():
     t2, s2, oversampling_factor = prepare_data(t, s, downsampling_factor=10)
     # Проверяем длины массивов после downsampling
     assert len(t2) == len(s2)
+    # Временная ось продолжается с шагом, увеличенным в downsampling_factor раз
+    assert isinstance(t2, TimeBase)
+    assert np.isclose(t2.dt, 10 * (t[1] - t[0]))
     assert len(t2) >= len(t) // 10
     # Проверяем, что среднее значение сигнала близко к 0 (для синуса)
     assert np.isclose(np.mean(s2[: len(s2) - (len(t2) - len(s) // 10)]), 0, atol=1e-10)
@@ -108,6 +376,17 @@ def test_prepare_data_no_downsampling():
     # Проверяем, что среднее значение сигнала равно 0 (после обработки)
     assert np.allclose(np.mean(s2[:100]), 0)
 
+# Тест prepare_data: сигнал длиннее 2^20 отсчётов не усекается (только дополнение нулями коротких сигналов)
+def test_prepare_data_longer_than_pad_length():
+    n = 2**20 + 5000
+    t = TimeBase(0.0, 1e-6, n)
+    s = np.random.default_rng(0).standard_normal(n)
+    t2, s2, _ = prepare_data(t, s, downsampling_factor=1)
+    assert len(s2) == len(t2) == n
+    assert np.allclose(s2, s - np.mean(s))
+    t2, s2, _ = prepare_data(t[:1000], s[:1000], downsampling_factor=1)
+    assert len(s2) == 2**20 and not np.any(s2[1000:])
+
 # Тест функции цветного вывода print_c
 def test_print_c(capsys):
     print_c("test", color="red")
@@ -2,8 +2,8 @@
 test_main.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.3
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -87,6 +87,46 @@ def test_mainwindow_redirect_stdout_to_textedit(qapp):
         print("Redirected output")
     # Проверяем, что вывод появился в статусном QTextEdit
     assert "Redirected output" in window.status_text.toPlainText()
+
+def test_mainwindow_spectrogram_tab(qapp):
+    '''
+    Проверяет, что вкладка "Спектрограмма" следует за вкладкой "Спектр" и содержит график спектрограммы.
+    '''
+    window = MainWindow()
+    labels = [window.tabs.tabText(i) for i in range(window.tabs.count())]
+    assert labels.index("Спектрограмма") == labels.index("Спектр") + 1
+    assert window.tabs.widget(labels.index("Спектрограмма")) is window.spectrogram_widget
+    assert window.spectrogram_data.ax is not None and window._spectrogram_view is None
+
+def test_mainwindow_close_event_stops_streams(qapp, monkeypatch):
+    '''
+    Проверяет, что при закрытии окна останавливаются живые потоки (иначе работающий QThread уничтожается).
+    '''
+    from unittest.mock import MagicMock
+    window = MainWindow()
+    streams = [MagicMock(), MagicMock()]
+    window._osc_viewer_streams = list(streams)
+    monkeypatch.setattr(QMainWindow, "closeEvent", lambda self, event: None)
+    window.closeEvent(object())
+    for stream in streams:
+        stream.stop.assert_called_once_with()
+
+def test_mainwindow_open_csv_folder(qapp, monkeypatch, tmp_path):
+    '''
+    Проверяет импорт папки: каждый CSV-файл вложенных папок добавляется на график отдельной линией.
+    '''
+    import load_and_prepare_data
+    for sub in ("6кГц", "9кГц"):
+        (tmp_path / sub).mkdir()
+        (tmp_path / sub / "F0000CH1.CSV").write_text(
+            "X,CH1,Start,Increment,\n" "Sequence,Volt,0.0,0.5,\n" "0,1\n" "1,2\n", encoding="utf-8"
+        )
+    monkeypatch.setattr(load_and_prepare_data.QFileDialog, "getExistingDirectory", lambda *args: str(tmp_path))
+    monkeypatch.setattr(load_and_prepare_data, "_save_last_dir", lambda folder: None)
+    window = MainWindow()
+    window.open_csv_folder_with_redirect()
+    assert len(window.plot_data_signal.get_all_lines()) == 2
+    assert "Загружено файлов: 2 из 2" in window.status_text.toPlainText()
     def test_mainwindow_close_event(qapp, monkeypatch):
         '''
         Проверяет, что при закрытии окна вызывается родительский closeEvent.
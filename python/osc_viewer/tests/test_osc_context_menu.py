@@ -2,8 +2,8 @@
 test_py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.3
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -11,7 +11,7 @@ test_py
 Краткое описание:
 -----------------
 Модуль содержит набор unit-тестов для функций модуля osc_context_menu, реализующих работу контекстного меню графика в приложении.
-Тесты проверяют корректность обработки различных действий меню, таких как сохранение изображения, очистка графика, построение спектра и обрезка данных по оси X.
+Тесты проверяют корректность обработки различных действий меню, таких как сохранение изображения, очистка графика, построение спектра (одной линии, всех линий и спектра Уэлча), построение спектрограммы и обрезка данных по оси X.
 '''
 
 import os
@@ -27,6 +27,9 @@ if osc_viewer_dir not in sys.path:
 from osc_context_menu import (
     show_plot_context_menu,
     create_spectrum,
+    create_spectra_all,
+    create_spectrum_welch,
+    create_spectrogram,
     clip_data_x_axis,
     save_to_png,
 )
@@ -54,6 +57,9 @@ def test_show_plot_context_menu_save_image(main_window):
             MagicMock(),
             MagicMock(),
             MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         # Эмулируем выбор первого действия (сохранение)
         menu_instance.exec.return_value = action1
@@ -76,6 +82,9 @@ def test_show_plot_context_menu_clear_plot(main_window):
             action2,
             MagicMock(),
             MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         # Эмулируем выбор второго действия (очистка)
         menu_instance.exec.return_value = action2
@@ -98,6 +107,9 @@ def test_show_plot_context_menu_create_spectrum(main_window):
             MagicMock(),
             action3,
             MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         # Эмулируем выбор третьего действия (спектр)
         menu_instance.exec.return_value = action3
@@ -120,6 +132,9 @@ def test_show_plot_context_menu_clip_data_x_axis(main_window):
             MagicMock(),
             MagicMock(),
             action4,
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
         ]
         # Эмулируем выбор четвертого действия (обрезка)
         menu_instance.exec.return_value = action4
@@ -129,6 +144,65 @@ def test_show_plot_context_menu_clip_data_x_axis(main_window):
         # Проверяем, что был выведен правильный текст
         mock_print.assert_called_with("Обрезать данные по оси х\n")
 
+# Тест: Проверка обработки действия "Построить спектры всех линий"
+def test_show_plot_context_menu_create_spectra_all(main_window):
+    with patch("osc_context_menu.QMenu") as MockMenu, patch(
+        "osc_context_menu.create_spectra_all"
+    ) as mock_spectra, patch("osc_context_menu.print_c") as mock_print:
+        menu_instance = MockMenu.return_value
+        action5 = MagicMock()
+        # Эмулируем добавление действий в меню
+        menu_instance.addAction.side_effect = [
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            MagicMock(),
+            action5,
+            MagicMock(),
+            MagicMock(),
+        ]
+        # Эмулируем выбор пятого действия (спектры всех линий)
+        menu_instance.exec.return_value = action5
+        show_plot_context_menu(main_window, MagicMock())
+        mock_spectra.assert_called_once_with(main_window)
+        mock_print.assert_called_with("Построить спектры всех линий\n")
+
+# Тест: Построение спектров всех линий: режим отображения устанавливается, при отсутствии линий — сообщение
+def test_create_spectra_all(main_window):
+    if hasattr(main_window, "_spectrum_db_mode"):
+        delattr(main_window, "_spectrum_db_mode")
+    with patch("osc_context_menu.add_spectra", return_value=0) as mock_add, patch(
+        "osc_context_menu.print_c"
+    ) as mock_print:
+        create_spectra_all(main_window)
+        mock_add.assert_called_once_with(main_window)
+        assert main_window._spectrum_db_mode is False
+        mock_print.assert_called_with("Нет линий для спектра\n")
+
+# Тест: спектр Уэлча строится по активной линии с параметрами из диалога; отмена диалога — без построения
+def test_create_spectrum_welch(main_window):
+    main_window.plot_data_signal.get_active_line_params.return_value = {"dummy": 1}
+    main_window.plot_data_signal.get_active_line.return_value = "line"
+    welch = {"segment_length": 1024, "overlap": 0.5, "window": "hann"}
+    with patch("osc_context_menu.add_spectrume") as mock_add, patch(
+        "osc_context_menu.ask_welch_params", side_effect=[welch, None]
+    ), patch("osc_context_menu.print_c"):
+        create_spectrum_welch(main_window)
+        mock_add.assert_called_once_with(main_window, "line", {"dummy": 1}, welch=welch)
+        create_spectrum_welch(main_window)
+        mock_add.assert_called_once()
+
+# Тест: спектрограмма строится по активной линии для видимой области; без активной линии — сообщение
+def test_create_spectrogram(main_window):
+    main_window.plot_data_signal.get_active_line.return_value = "line"
+    with patch("osc_context_menu.show_spectrogram") as mock_show, patch("osc_context_menu.print_c") as mock_print:
+        create_spectrogram(main_window)
+        mock_show.assert_called_once_with(main_window, "line", (0.0, 10.0))
+        main_window.plot_data_signal.get_active_line.return_value = None
+        create_spectrogram(main_window)
+        mock_show.assert_called_once()
+        mock_print.assert_called_with("Нет активной линии для спектрограммы\n")
+
 # Тест: Проверка построения спектра при отсутствии активной линии (нет параметров)
 def test_create_spectrum_no_active_line_params(main_window):
     main_window.plot_data_signal.get_active_line_params.return_value = None
@@ -0,0 +1,120 @@
+'''
+test_pcm_data.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля pcm_data (чтение записей WAV и PCM без заголовка отображением в память).
+Тесты проверяют разбор заголовка WAV, параметры из JSON-файла, отсутствие копирования отсчётов при открытии
+и загрузку файлов WAV/PCM функциями модуля load_and_prepare_data.
+'''
+
+import os
+import sys
+import json
+import wave
+import struct
+import numpy as np
+import pytest
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from pcm_data import read_wav_header, read_pcm, read_pcm_channels, is_pcm_file
+from quantized import QuantizedSignal
+from data_cache import cache_paths
+from load_and_prepare_data import load_data_cached, load_channels, read_header_meta, read_display_params
+
+# Стереозапись: канал 1 — пилообразный сигнал, канал 2 — он же с обратным знаком
+N = 1000
+CODES = np.stack([np.arange(N) * 30 - 15000, 15000 - np.arange(N) * 30], axis=1).astype('<i2')
+
+@pytest.fixture
+def wav_file(tmp_path):
+    file_name = str(tmp_path / "rec.wav")
+    with wave.open(file_name, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(48000)
+        w.writeframes(CODES.tobytes())
+    return file_name
+
+# Массив является представлением отображённого в память файла (без копирования)
+def _is_mapped(a):
+    while isinstance(a, np.ndarray):
+        if isinstance(a, np.memmap):
+            return True
+        a = a.base
+    return False
+
+# Тест: заголовок WAV-файла — тип отсчёта, количество каналов, частота и положение отсчётов
+def test_read_wav_header(wav_file):
+    header = read_wav_header(wav_file)
+    assert header["dtype"] == np.dtype("<i2") and header["channels"] == 2
+    assert header["sample_rate"] == 48000 and header["header_bytes"] == 44 and header["n_frames"] == N
+
+# Тест: отсчёты канала — представление отображённого в память файла, перевод в вольты по требованию
+def test_read_pcm_wav_zero_copy(wav_file):
+    t, s, meta = read_pcm(wav_file, channel=1)
+    assert isinstance(s, QuantizedSignal) and _is_mapped(s.codes)
+    assert not s.codes.flags.owndata and not s.codes.flags.writeable
+    assert len(t) == len(s) == N and t.fs == 48000
+    assert np.allclose(np.asarray(s), CODES[:, 1] / 32768)
+    assert meta["Source"] == "CH2" and meta["fs"] == 48000
+
+# Тест: сырой PCM без заголовка — параметры и перевод в вольты из JSON-файла
+def test_read_pcm_raw_sidecar(tmp_path):
+    file_name = str(tmp_path / "rec.raw")
+    with open(file_name, "wb") as f:
+        f.write(b"HDR!" + CODES.tobytes())
+    with open(tmp_path / "rec.json", "w", encoding="utf-8") as f:
+        json.dump({"sample_rate": 1e6, "channels": 2, "channel": 0, "header_bytes": 4, "scale": 0.001, "offset": 0.5,
+                   "t0": -1e-4, "inx_start": 10}, f)
+    t, s, meta = read_pcm(file_name)
+    assert np.allclose(s, CODES[:, 0] * 0.001 + 0.5)
+    assert (t.t0, t.dt) == (-1e-4, 1e-6)
+    # Параметры отображения в том же JSON-файле дополняются значениями по умолчанию
+    assert read_display_params(file_name) == (1, 10, None, 1)
+    # Без частоты дискретизации сырой PCM не открывается
+    os.remove(tmp_path / "rec.json")
+    with pytest.raises(ValueError):
+        read_pcm(file_name)
+
+# Тест: WAV-файл с отсчётами float32 — сам отображённый в память массив, без перевода
+def test_read_pcm_float_wav(tmp_path):
+    data = np.linspace(-1, 1, 101, dtype="<f4")
+    file_name = str(tmp_path / "float.wav")
+    fmt = struct.pack("<HHIIHH", 3, 1, 1000, 4000, 4, 32)
+    with open(file_name, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + data.nbytes) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        f.write(b"data" + struct.pack("<I", data.nbytes) + data.tobytes())
+    t, s, _ = read_pcm(file_name)
+    assert _is_mapped(s) and s.dtype == np.float32
+    assert np.array_equal(s, data) and t.fs == 1000
+
+# Тест: загрузка диапазона с прореживанием — срез без копирования, кэш не создаётся
+def test_load_data_cached_pcm(wav_file):
+    assert is_pcm_file(wav_file)
+    t, s, meta_df = load_data_cached(wav_file, 1, 100, 200, 5)
+    assert len(t) == len(s) == 20 and np.isclose(t.dt, 5 / 48000)
+    assert _is_mapped(s.codes)
+    assert np.allclose(s, CODES[100:200:5, 0] / 32768)
+    assert not any(os.path.exists(p) for p in cache_paths(wav_file))
+
+# Тест: все каналы и метаинформация для каталога без чтения отсчётов
+def test_load_channels_and_header_meta_pcm(wav_file):
+    t, S, names, _ = load_channels(wav_file, 1)
+    assert names == ["CH1", "CH2"] and len(S) == 2
+    assert np.allclose(S[1], CODES[:, 1] / 32768)
+    info = read_header_meta(wav_file)
+    assert (info["n_samples"], info["fs"], info["source"]) == (N, 48000, "CH1, CH2")
+    assert np.isclose(info["duration"], N / 48000)
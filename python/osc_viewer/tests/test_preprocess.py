@@ -0,0 +1,78 @@
+'''
+test_preprocess.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля preprocess (конвейер предобработки сигнала).
+Тесты проверяют этапы конвейера, длину результата и временную ось, запись в переданный буфер
+без изменения исходного сигнала и сигнал, хранимый кодами АЦП.
+'''
+
+import os
+import sys
+import tracemalloc
+import numpy as np
+import pytest
+from scipy.signal import detrend, get_window
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from preprocess import Pipeline, Decimate, Detrend, Window, PadTruncate
+from decimation import decimate
+from quantized import quantize
+from time_base import TimeBase
+
+# Тест: этапы удаления тренда, окна и дополнения нулями совпадают с вычислением «вручную»
+def test_pipeline_stages():
+    rng = np.random.default_rng(0)
+    s = 0.01 * np.arange(1000) + 2.0 + rng.standard_normal(1000)
+    s_orig = s.copy()
+    pipeline = Pipeline(Detrend('linear'), Window('hann'), PadTruncate(4096))
+    t, y = pipeline(TimeBase(-1.0, 1e-3, 1000), s)
+    assert np.array_equal(s, s_orig)  # Исходный сигнал не изменяется
+    w = get_window('hann', 1000)
+    expected = detrend(s, type='linear') * w / w.mean()
+    assert len(y) == 4096 and np.allclose(y[:1000], expected) and not y[1000:].any()
+    assert (t.t0, t.dt, len(t)) == (-1.0, 1e-3, 4096)
+    # Усечение до изменяющих этапов — срез исходного сигнала, буфер только под результат
+    pipeline = Pipeline(PadTruncate(100), Detrend())
+    assert pipeline.buffer_length(1000) == 100
+    assert np.allclose(pipeline.run(s), s[:100] - s[:100].mean())
+    with pytest.raises(ValueError):
+        Detrend('quadratic')
+
+# Тест: децимация пишет сразу в переданный буфер, конвейер не выделяет массивов длины сигнала
+def test_pipeline_decimate_into_buffer():
+    s = np.random.default_rng(1).standard_normal(1 << 18) + 1.0
+    pipeline = Pipeline(Decimate(8), Detrend(), PadTruncate(1 << 16))
+    assert pipeline.output_length(len(s)) == 1 << 16 and pipeline.buffer_length(len(s)) == 1 << 16
+    out = np.empty(pipeline.buffer_length(len(s)))
+    pipeline.run(s[:1000], out)  # Окна и фильтр рассчитываются при первом вызове
+    tracemalloc.start()
+    y = pipeline.run(s, out)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert np.shares_memory(y, out)
+    assert peak < s.nbytes // 2
+    d = decimate(s, 8)
+    assert np.allclose(y[:len(d)], d - d.mean()) and not y[len(d):].any()
+    t = pipeline.time_base(np.arange(len(s)) * 1e-6)
+    assert np.isclose(t.dt, 8e-6) and len(t) == 1 << 16
+
+# Тест: сигнал, хранимый кодами АЦП, переводится в вольты сразу в буфер конвейера
+def test_pipeline_quantized():
+    s = np.round(np.sin(np.linspace(0, 20, 5000)) * 100) * 0.01 + 0.5
+    q = quantize(s, step=0.01)
+    y = Pipeline(Detrend(), PadTruncate(8192)).run(q)
+    assert np.allclose(y[:5000], s - s.mean()) and not y[5000:].any()
+    assert np.allclose(Pipeline(Decimate(5)).run(q), decimate(s, 5))
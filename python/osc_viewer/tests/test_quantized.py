@@ -0,0 +1,89 @@
+'''
+test_quantized.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля quantized, реализующего хранение отсчётов сигнала кодами АЦП (int8/int16).
+Тесты проверяют перевод в коды без потери точности, выбор шага квантования, срезы и поблочный перевод в вольты,
+а также загрузку файла с квантованным хранением отсчётов.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from quantized import QuantizedSignal, quantize, quantization_step
+from load_and_prepare_data import load_data, load_data_cached
+
+# Тест: шаг квантования по вертикальной шкале осциллографа (25 кодов на деление)
+def test_quantization_step():
+    assert quantization_step({"Vertical Scale": "5.000000e-01"}) == 0.02
+    assert quantization_step({}) is None
+    assert quantization_step(None) is None
+
+# Тест: отсчёты с шагом 0.02 В переводятся в коды int8 без потери точности
+def test_quantize_int8_lossless():
+    codes = np.array([-3, 0, 1, 2, -1, 127, -128])
+    s = np.array([float(f"{c * 0.02:.5f}") for c in codes])
+    q = quantize(s, {"Vertical Scale": "0.5"})
+    assert q.codes.dtype == np.int8 and q.nbytes == len(s)
+    assert np.array_equal(q.codes, codes)
+    assert np.allclose(np.asarray(q), s, rtol=0, atol=1e-12)
+
+# Тест: без метаинформации шаг и смещение оцениваются по данным, широкий диапазон кодов хранится в int16
+def test_quantize_estimated_step_int16():
+    s = 0.0003 + 0.001 * np.arange(-1000, 1000)
+    q = quantize(s)
+    assert q.codes.dtype == np.int16
+    assert q.scale == 0.001 and np.isclose(q.offset, 0.0003)
+    assert np.allclose(q.to_volts(), s)
+
+# Тест: сигнал не на сетке уровней не квантуется
+def test_quantize_not_on_grid():
+    assert quantize(np.array([0.0, 0.1, 0.25, 0.3333])) is None
+    assert quantize(np.arange(100000) * 1.0) is None  # Коды не помещаются в int16
+
+# Тест: индексация, срезы, поблочный перевод в вольты, минимум и максимум
+def test_quantized_signal_access():
+    q = QuantizedSignal(np.arange(-5, 5, dtype=np.int8), 0.5, 1.0)
+    assert len(q) == 10
+    assert q[0] == -1.5 and q[-1] == 3.0
+    half = q[::2]
+    assert isinstance(half, QuantizedSignal) and np.allclose(half, [-1.5, -0.5, 0.5, 1.5, 2.5])
+    blocks = list(q.iter_blocks(block_size=4, dtype=np.float32))
+    assert [len(b) for b in blocks] == [4, 4, 2] and blocks[0].dtype == np.float32
+    assert np.allclose(np.concatenate(blocks), q.to_volts())
+    assert (q.min(), q.max()) == (-1.5, 3.0)
+    assert (np.min(q), np.max(q)) == (-1.5, 3.0)
+
+# Тест: загрузка файла с хранением отсчётов кодами АЦП, кэш также записывается кодами
+def test_load_data_quantized(tmp_path):
+    file_name = tmp_path / "tek.csv"
+    file_name.write_text(
+        "Record Length,4,,0.0,0.02\n"
+        "Sample Interval,1.0e-03,,0.001,-0.04\n"
+        "Vertical Scale,5.000000e-01,,0.002,0.00\n"
+        ",,,0.003,0.06\n",
+        encoding="utf-8",
+    )
+    t, s, _ = load_data(str(file_name), 0, quantized=True)
+    assert isinstance(s, QuantizedSignal) and np.array_equal(s.codes, [1, -2, 0, 3])
+    load_data_cached(str(file_name), 0, quantized=True)
+    t2, s2, _ = load_data_cached(str(file_name), 0, quantized=True)
+    assert isinstance(s2, QuantizedSignal) and isinstance(s2.codes, np.memmap) and s2.codes.dtype == np.int8
+    # Без квантования вызывающий получает массив значений
+    t3, s3, _ = load_data_cached(str(file_name), 0)
+    assert isinstance(s3, np.ndarray) and np.allclose(s3, [0.02, -0.04, 0.0, 0.06])
@@ -0,0 +1,101 @@
+'''
+test_quick_preview.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля quick_preview (предварительный просмотр большого CSV-файла).
+Тесты проверяют выбор участка на графике, границы участка (в том числе за пределами 2^31 отсчётов),
+параметры загрузки, передаваемые главному окну, и отмену загрузки.
+'''
+
+import os
+import sys
+import pytest
+from PyQt6.QtWidgets import QApplication, QMainWindow, QDialog
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+import quick_preview
+from quick_preview import RegionSelectDialog, needs_preview, select_region
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Фикстура: файл формата 1 из 5000 отсчётов с шагом 1 мс, начиная с -1 с
+@pytest.fixture
+def big_csv(tmp_path):
+    file_name = tmp_path / "capture.csv"
+    file_name.write_text(
+        "X,CH1,Start,Increment,\n" "Sequence,Volt,-1.0,0.001,\n" + "".join(f"{i},{i % 7}\n" for i in range(5000)),
+        encoding="utf-8",
+    )
+    return str(file_name)
+
+# Фикстура: главное окно с параметрами отображения по умолчанию (как после select_csv_file)
+@pytest.fixture
+def window(qapp):
+    window = QMainWindow()
+    window.format_ver, window.inx_start, window.inx_stop, window.downsampling_factor = 1, 0, None, 1
+    yield window
+    window.close()
+
+# Тест: выделение интервала времени на графике задаёт номера отсчётов участка
+def test_region_select_dialog(window, big_csv):
+    dialog = RegionSelectDialog(window, big_csv, 1, downsampling_factor=4)
+    assert dialog.n_samples == 5000 and dialog.region() == (0, None, 4)
+    dialog.on_select(0.0, 1000.0)  # 0...1 с (на графике — мс)
+    assert dialog.region() == (1000, 2001, 4)
+    assert "Будет загружено отсчётов: 251" in dialog.summary_label.text()
+    dialog.select_whole()
+    assert dialog.region() == (0, None, 4)
+
+# Тест: конец участка не раньше начала; номера отсчётов записи длиннее 2^31 строк задаются без переполнения
+def test_region_bounds(window, big_csv, monkeypatch):
+    dialog = RegionSelectDialog(window, big_csv, 1)
+    dialog.stop_spin.setValue(100)
+    dialog.start_spin.setValue(300)
+    assert dialog.region() == (300, 300, 1)
+    dialog.stop_spin.setValue(200)
+    assert dialog.region() == (300, 300, 1)
+    n = 3 * 2**31 + 5
+    preview = quick_preview.read_sparse_preview(big_csv, 1)
+    monkeypatch.setattr(quick_preview, "read_sparse_preview", lambda *args: preview[:3] + ({**preview[3], "n_samples": n},))
+    dialog = RegionSelectDialog(window, big_csv, 1, inx_start=2**32, inx_stop=n - 1)
+    assert dialog.region() == (2**32, n - 1, 1)
+    assert f"Будет загружено отсчётов: {n - 1 - 2**32} из {n}" in dialog.summary_label.text()
+
+# Тест: маленький файл загружается без предварительного просмотра, большой — с выбором участка
+def test_select_region(window, big_csv, monkeypatch):
+    assert not needs_preview(big_csv)
+    assert select_region(window, big_csv)
+    monkeypatch.setattr(quick_preview, "PREVIEW_MIN_BYTES", 0)
+    assert needs_preview(big_csv) and not needs_preview(big_csv + ".gz")
+
+    def accept(dialog):
+        dialog.on_select(-500.0, 500.0)
+        dialog.ds_spin.setValue(10)
+        return QDialog.DialogCode.Accepted
+    monkeypatch.setattr(RegionSelectDialog, "exec", accept)
+    assert select_region(window, big_csv)
+    assert (window.inx_start, window.inx_stop, window.downsampling_factor) == (500, 1501, 10)
+
+# Тест: при отмене в окне просмотра файл не загружается, параметры окна не меняются
+def test_select_region_canceled(window, big_csv, monkeypatch):
+    monkeypatch.setattr(quick_preview, "PREVIEW_MIN_BYTES", 0)
+    monkeypatch.setattr(RegionSelectDialog, "exec", lambda dialog: QDialog.DialogCode.Rejected)
+    assert not select_region(window, big_csv)
+    assert (window.inx_start, window.inx_stop, window.downsampling_factor) == (0, None, 1)
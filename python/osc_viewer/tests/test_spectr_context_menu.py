@@ -2,8 +2,8 @@
 test_spectr_context_menu.py
 
 Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
-Дата:         2025-09-26
-Версия:       1.0.0
+Дата:         2026-10-17
+Версия:       1.0.1
 
 Лицензия:     MIT License
 Контакты:     https://github.com/MSergeyS/ppf.git
@@ -156,6 +156,24 @@ def test_toggle_db_switches_mode_and_updates_lines(mock_qmenu, main_window_with_
     for line in main_window.spectrum_data.get_all_lines():
         assert line.set_ydata_calls  # Проверяем, что set_ydata был вызван хотя бы раз
 
+# --- Тест: многократное переключение В/дБ возвращает исходные значения без накопления погрешности ---
+@patch("spectr_context_menu.QMenu")
+def test_toggle_db_round_trip_is_exact(mock_qmenu):
+    lines = [DummyLine([0.001, 2.5, 3.0]), DummyLine([2, 4, 6])]
+    main_window = DummyMainWindow(lines)
+    original = [line.get_ydata().copy() for line in lines]
+    menu = MagicMock()
+    mock_qmenu.return_value = menu
+    actions = [MagicMock() for _ in range(5)]
+    menu.exec.return_value = actions[0]
+    for _ in range(20):
+        # Каждое открытие меню добавляет те же пять действий; выбирается переключение масштаба
+        menu.addAction.side_effect = list(actions)
+        show_spectr_context_menu(main_window, pos=MagicMock())
+    assert main_window._spectrum_db_mode is False
+    for line, ydata in zip(lines, original):
+        assert np.array_equal(line.get_ydata(), ydata)
+
 # --- Тест нормализации: максимальное значение каждой линии после действия должно быть 1 ---
 @pytest.mark.usefixtures("main_window_with_lines")
 @patch("spectr_context_menu.QMenu")
@@ -0,0 +1,127 @@
+'''
+test_spectrogram.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля spectrogram, реализующего спектрограмму (STFT) с прореженной сеткой
+и постепенным построением изображения. Тесты проверяют сетку длинной записи, нормировку амплитуды, слежение за
+частотой ЛЧМ-сигнала, объединение бинов, пропуск пачек отменённых вычислений и построение спектрограммы в главном окне.
+'''
+
+import os
+import sys
+import time
+import numpy as np
+import pytest
+from scipy.signal import chirp
+from PyQt6.QtWidgets import QApplication
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from spectrogram import SpectrogramGrid, SpectrogramWorker, spectrogram, show_spectrogram
+from time_base import TimeBase
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Ожидает завершения вычислений спектрограммы, обрабатывая события (пачки столбцов)
+def wait_view(qapp, view, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while view._running and time.monotonic() < deadline:
+        qapp.processEvents()
+    qapp.processEvents()
+    assert not view._running
+
+# Тест: сетка длинной записи прорежена до max_columns столбцов, короткая — нет; участок короче сегмента — ошибка
+def test_grid_decimation():
+    grid = SpectrogramGrid(1_000_000, 50e6, segment_length=512, overlap=0.5, max_columns=1024)
+    assert grid.decimated and grid.n_columns <= 1024
+    assert (grid.n_columns - 1) * grid.hop + 512 <= 1_000_000
+    grid = SpectrogramGrid(10_000, 50e6, segment_length=512, overlap=0.5, max_columns=1024)
+    assert not grid.decimated and grid.hop == 256 and grid.n_columns == (10_000 - 512) // 256 + 1
+    with pytest.raises(ValueError):
+        SpectrogramGrid(100, 50e6, segment_length=512)
+
+# Тест: гармоника амплитуды A даёт A/2 (-6 дБ для A = 1), пачки совпадают с вычислением целиком
+def test_tone_amplitude_and_chunks():
+    fs = 1e6
+    x = np.sin(2 * np.pi * 125e3 * np.arange(20_000) / fs)  # 125 кГц — точно на бине для сегмента 512
+    times, freq, db = spectrogram(x, fs, segment_length=512)
+    assert db.shape == (257, len(times))
+    assert np.allclose(freq[np.argmax(db, axis=0)], 125e3)
+    assert np.allclose(db.max(axis=0), 20 * np.log10(0.5), atol=0.01)
+    grid = SpectrogramGrid(len(x), fs, segment_length=512)
+    chunks = np.concatenate([block for _, block in grid.chunks(x, chunk_columns=7)], axis=1)
+    assert np.array_equal(chunks, db)
+
+# Тест: частота ЛЧМ-сигнала отслеживается по времени; при объединении бинов пик гармоники сохраняется
+def test_chirp_tracking_and_row_grouping():
+    fs = 50e6
+    t = np.arange(1_000_000) / fs
+    x = chirp(t, 1e6, t[-1], 10e6)
+    times, freq, db = spectrogram(x, fs, segment_length=2048, max_rows=256)
+    assert len(freq) <= 256
+    f_ref = 1e6 + 9e6 * times / t[-1]
+    df = fs / 2048 * 4  # Ширина строки (4 объединённых бина)
+    assert np.all(np.abs(freq[np.argmax(db, axis=0)] - f_ref) <= 2 * df)
+    assert np.all(db.max(axis=0) > 20 * np.log10(0.5) - 3)
+
+# Тест: исполнитель передаёт все столбцы пачками с номером вычисления; отмена до запуска — без пачек
+def test_worker_chunks_and_cancel(qapp):
+    x = np.random.default_rng(0).standard_normal(5000)
+    grid = SpectrogramGrid(len(x), 1e3, segment_length=128)
+    worker = SpectrogramWorker(grid, x, chunk_columns=10, generation=3)
+    chunks, canceled = [], []
+    worker.chunk.connect(lambda generation, c0, block: chunks.append((generation, c0, block.shape[1])))
+    worker.canceled.connect(lambda: canceled.append(True))
+    worker.run()
+    assert [c0 for _, c0, _ in chunks] == list(range(0, grid.n_columns, 10))
+    assert sum(n for _, _, n in chunks) == grid.n_columns and {g for g, _, _ in chunks} == {3}
+    worker = SpectrogramWorker(grid, x)
+    worker.cancel()
+    worker.chunk.connect(lambda *args: chunks.append(args))
+    worker.canceled.connect(lambda: canceled.append(True))
+    n_chunks = len(chunks)
+    worker.run()
+    assert canceled and len(chunks) == n_chunks
+
+# Тест: спектрограмма видимого участка строится на вкладке главного окна, при увеличении масштаба уточняется
+def test_show_spectrogram_main_window(qapp):
+    from main import MainWindow
+    window = MainWindow()
+    fs = 1e6
+    x = np.sin(2 * np.pi * 125e3 * np.arange(200_000) / fs)
+    window.plot_data_signal.plot_line(TimeBase(0.0, 1 / fs, len(x)), x, x_zoom=1000, label="tone")
+    view = show_spectrogram(window, x_range=(0.0, 200.0), params={"max_columns": 100})
+    assert window.tabs.currentWidget() is window.spectrogram_widget
+    wait_view(qapp, view)
+    assert view.grid.decimated and view.grid.n_columns <= 100
+    assert not np.isnan(view._data).any()
+    # Пачка отменённого вычисления не попадает в изображение
+    view.on_chunk(view._generation - 1, 0, np.zeros((view.grid.n_rows, 1), dtype=np.float32))
+    assert not np.all(view._data[:, 0] == 0)
+    # Увеличение масштаба: видимый участок пересчитывается по подробной сетке
+    window.spectrogram_data.ax.set_xlim(10.0, 12.0)
+    assert view.refine()
+    wait_view(qapp, view)
+    assert not view.grid.decimated
+    assert view.image.get_extent()[0] >= 9.0 and view.image.get_extent()[1] <= 13.0
+    assert not view.refine()
+    # Участок короче одного сегмента — сообщение, спектрограмма не строится
+    assert show_spectrogram(window, x_range=(0.0, 0.01)) is None
+    assert "Спектрограмма не построена" in window.status_text.toPlainText()
+    window.close()
@@ -0,0 +1,71 @@
+'''
+test_spectrum_cache.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля spectrum_cache, реализующего дисковый кэш спектров.
+Тесты проверяют ключ кэша (зависимость от отсчётов, шага оси и параметров), запись и чтение спектра в float32
+и удаление записей, которые дольше всего не использовались, при превышении размера кэша.
+'''
+
+import os
+import sys
+import numpy as np
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from spectrum_cache import spectrum_key, load_spectrum, save_spectrum, prune_cache
+from quantized import QuantizedSignal
+from time_base import TimeBase
+
+# Тест: ключ зависит от отсчётов, шага временной оси и параметров, но не от начала оси и способа хранения массива
+def test_spectrum_key():
+    s = np.arange(10.0)
+    t = TimeBase(0.0, 1e-6, 10)
+    key = spectrum_key(s, t, downsampling_factor=10, db_mode=False)
+    assert key == spectrum_key(s.copy(), TimeBase(5.0, 1e-6, 10), db_mode=False, downsampling_factor=10)
+    assert key == spectrum_key(np.arange(20.0)[::2] / 2, t, downsampling_factor=10, db_mode=False)
+    assert key != spectrum_key(s, t, downsampling_factor=10, db_mode=True)
+    assert key != spectrum_key(s, t, downsampling_factor=5, db_mode=False)
+    assert key != spectrum_key(s, TimeBase(0.0, 2e-6, 10), downsampling_factor=10, db_mode=False)
+    s2 = s.copy()
+    s2[-1] += 1e-9
+    assert key != spectrum_key(s2, t, downsampling_factor=10, db_mode=False)
+    # Коды АЦП хэшируются вместе с шагом и смещением
+    codes = np.arange(10, dtype=np.int16)
+    assert spectrum_key(QuantizedSignal(codes, 0.5, 0.0), t) != spectrum_key(QuantizedSignal(codes, 0.25, 0.0), t)
+
+# Тест: спектр сохраняется в float32 и читается с восстановленной осью частот
+def test_save_and_load_spectrum(tmp_path):
+    freq = np.fft.rfftfreq(1024, d=1e-6)
+    amplitude = np.abs(np.fft.rfft(np.random.default_rng(0).standard_normal(1024))) / 1024
+    assert load_spectrum('missing', str(tmp_path)) is None
+    assert save_spectrum('abc', freq, amplitude, str(tmp_path))
+    freq2, amplitude2 = load_spectrum('abc', str(tmp_path))
+    assert amplitude2.dtype == np.float32
+    assert np.allclose(amplitude2, amplitude, rtol=1e-6)
+    assert np.allclose(freq2, freq)
+    assert os.path.getsize(tmp_path / 'abc.npz') < amplitude.nbytes
+
+# Тест: при превышении размера кэша удаляются записи, которые дольше всего не использовались
+def test_prune_cache_lru(tmp_path):
+    freq = np.arange(1000.0)
+    for i, key in enumerate(('a', 'b', 'c')):
+        save_spectrum(key, freq, np.zeros(1000), str(tmp_path))
+        os.utime(tmp_path / f'{key}.npz', ns=(i * 10**9, i * 10**9))
+    # Чтение записи 'a' делает её самой недавно использованной
+    assert load_spectrum('a', str(tmp_path)) is not None
+    entry_size = os.path.getsize(tmp_path / 'a.npz')
+    assert prune_cache(str(tmp_path), max_bytes=2 * entry_size) == 1
+    assert load_spectrum('b', str(tmp_path)) is None
+    assert load_spectrum('a', str(tmp_path)) is not None and load_spectrum('c', str(tmp_path)) is not None
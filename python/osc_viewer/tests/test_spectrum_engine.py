@@ -0,0 +1,69 @@
+'''
+test_spectrum_engine.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля spectrum_engine (односторонний спектр действительного сигнала).
+Тесты проверяют совпадение с половиной полного комплексного спектра, выбор быстрой длины БПФ
+по разрешению и вычисление в одинарной точности.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from spectrum_engine import fft_length, rfft_spectrum
+
+FS = 1e6
+
+# Тест: односторонний спектр совпадает с неотрицательной половиной полного комплексного спектра
+def test_rfft_matches_full_fft():
+    s = np.random.default_rng(0).standard_normal(1000)
+    freq, spectrum, n = rfft_spectrum(s, FS)
+    full = np.fft.fft(s) / n
+    assert n == 1000 and len(spectrum) == 501 and len(freq) == 501
+    assert np.allclose(spectrum, full[:501])
+    assert np.allclose(freq, np.fft.fftfreq(n, 1 / FS)[:501] % FS)
+    # Спектры нескольких сигналов — по последней оси
+    _, spectra, _ = rfft_spectrum(np.vstack([s, 2 * s]), FS)
+    assert spectra.shape == (2, 501) and np.allclose(spectra[1], 2 * spectrum)
+    with pytest.raises(ValueError):
+        rfft_spectrum(s, FS, precision='half')
+
+# Тест: длина БПФ не меньше fs/resolution и округляется до быстрой длины
+def test_fft_length():
+    assert fft_length(1000) == 1000
+    assert fft_length(1009) == 1024  # 1009 — простое число
+    n = fft_length(1000, FS, resolution=7.0)
+    assert n >= FS / 7.0 and FS / n <= 7.0
+    m = n
+    for p in (2, 3, 5):
+        while m % p == 0:
+            m //= p
+    assert m == 1  # Быстрая длина — произведение степеней 2, 3 и 5
+    assert fft_length(10, nfft=2**20) == 2**20
+    with pytest.raises(ValueError):
+        fft_length(1000, resolution=1.0)
+
+# Тест: в одинарной точности спектр complex64, частоты остаются float64
+def test_single_precision():
+    t = np.arange(4096) / FS
+    s = np.sin(2 * np.pi * 123_456.0 * t)
+    freq, spectrum, n = rfft_spectrum(s, FS, resolution=FS / 8192, precision='single')
+    assert spectrum.dtype == np.complex64 and freq.dtype == np.float64
+    assert n == 8192 and np.isclose(freq[-1], FS / 2)
+    _, ref, _ = rfft_spectrum(s, FS, nfft=8192)
+    assert np.allclose(spectrum, ref, atol=1e-5)
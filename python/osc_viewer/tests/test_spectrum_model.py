@@ -0,0 +1,79 @@
+'''
+test_spectrum_model.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля spectrum_model, реализующего модель спектра с кэшированными
+представлениями (В, дБ, нормированные).
+Тесты проверяют кэширование представлений, нормировку, восстановление модели по значениям линии
+и отсутствие накопления погрешности при многократном переключении представлений линии.
+'''
+
+import os
+import sys
+import numpy as np
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from spectrum_model import SpectrumModel, show_spectrum_view
+
+
+class DummyLine:
+    '''Заглушка для линии спектра.'''
+    def __init__(self, ydata):
+        self._ydata = np.array(ydata)
+
+    def get_xdata(self):
+        return np.arange(len(self._ydata), dtype=float)
+
+    def get_ydata(self):
+        return self._ydata
+
+    def set_ydata(self, ydata):
+        self._ydata = ydata
+
+
+# Тест: представления вычисляются один раз, доступны только для чтения и нормированы
+def test_views_cached_and_normalized():
+    spectrum = np.array([1 + 1j, 2.0, 0.5j, 4.0])
+    model = SpectrumModel(np.arange(4.0), spectrum)
+    assert model.view() is model.view() and model.view(db=True) is model.db
+    assert not model.magnitude.flags.writeable
+    assert np.allclose(model.magnitude, np.abs(spectrum))
+    assert np.allclose(model.db, 20 * np.log10(np.abs(spectrum) + 1e-12))
+    assert model.peak == 4.0
+    assert np.isclose(np.max(model.view(normalized=True)), 1.0)
+    assert np.isclose(np.max(model.view(db=True, normalized=True)), 0.0)
+    assert model.limits(db=True) == (float(np.min(model.db)), float(np.max(model.db)))
+
+# Тест: модель восстанавливается по значениям линии в дБ с масштабным коэффициентом
+def test_from_view():
+    magnitude = np.array([0.1, 1.0, 3.0])
+    model = SpectrumModel.from_view(None, 20 * np.log10(magnitude / 3.0), db=True, scale=1 / 3.0)
+    assert np.allclose(model.magnitude, magnitude)
+    cached = SpectrumModel.from_view(None, magnitude.astype(np.float32))
+    assert cached.magnitude.dtype == np.float32
+
+# Тест: многократное переключение В/дБ и нормализации возвращает ровно исходные значения
+def test_toggle_without_drift():
+    ydata = np.random.default_rng(0).random(1000) + 1e-3
+    line = DummyLine(ydata)
+    for _ in range(50):
+        show_spectrum_view(line, True, False)
+        show_spectrum_view(line, True, True, current_db=True)
+        show_spectrum_view(line, False, False, current_db=True)
+    assert np.array_equal(line.get_ydata(), ydata)
+    # Представления подставляются из модели без пересчёта
+    view = line.get_ydata()
+    show_spectrum_view(line, False, False)
+    assert line.get_ydata() is view
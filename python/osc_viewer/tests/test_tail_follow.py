@@ -0,0 +1,101 @@
+'''
+test_tail_follow.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.1
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля tail_follow (слежение за записываемым CSV-файлом).
+Тесты проверяют разбор только дописанных полных строк, перезапись файла, продление линии графика
+и сдвиг видимого интервала к последним отсчётам.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+from PyQt6.QtWidgets import QApplication, QWidget
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from tail_follow import CsvTail, TailFollower
+from load_and_prepare_data import read_capture
+from PlotData import PlotData
+
+HEADER = "X,CH1,Start,Increment,\nSequence,Volt,-1.0,0.001,\n"
+
+def _rows(a, b):
+    return "".join(f"{i},{i % 5}\n" for i in range(a, b))
+
+@pytest.fixture(scope="module")
+def qapp():
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    yield app
+
+# Тест: разбираются только дописанные полные строки, неполная строка ждёт следующего чтения
+def test_csv_tail_incremental(tmp_path):
+    file_name = tmp_path / "live.csv"
+    file_name.write_text(HEADER[:10], encoding="utf-8")
+    tail = CsvTail(str(file_name), 1)
+    assert tail.read_new() == 0  # Заголовок ещё не записан полностью
+    with open(file_name, "a", encoding="utf-8") as f:
+        f.write(HEADER[10:] + _rows(0, 100) + "100,")
+    assert tail.read_new() == 100
+    pos = tail.pos
+    assert tail.read_new() == 0 and tail.pos == pos
+    with open(file_name, "a", encoding="utf-8") as f:
+        f.write("0\n" + _rows(101, 250))
+    assert tail.read_new(max_bytes=200) > 0 and tail.n < 250
+    while tail.read_new() > 0:
+        pass
+    # Результат совпадает с чтением всего файла
+    t, s, _ = read_capture(str(file_name), 1)
+    assert tail.n == 250 and np.array_equal(tail.signal, s)
+    assert not hasattr(tail, "_t")  # Время хранится равномерной осью, без массива отсчётов
+    tb = tail.time_base
+    assert np.allclose(tb.to_array(), t.to_array())
+    assert (tb.t0, len(tb)) == (t.t0, len(t)) and np.isclose(tb.dt, t.dt)
+
+# Тест: файл, ставший короче прочитанной части, читается заново
+def test_csv_tail_truncated(tmp_path):
+    file_name = tmp_path / "live.csv"
+    file_name.write_text(HEADER + _rows(0, 50), encoding="utf-8")
+    tail = CsvTail(str(file_name), 1)
+    assert tail.read_new() == 50
+    file_name.write_text(HEADER + _rows(0, 3), encoding="utf-8")
+    assert tail.read_new() == -1 and tail.n == 0
+    assert tail.read_new() == 3
+
+# Тест: линия продлевается новыми строками, видимый интервал сдвигается к последним отсчётам
+def test_tail_follower(qapp, tmp_path):
+    file_name = tmp_path / "live.csv"
+    file_name.write_text(HEADER + _rows(0, 100), encoding="utf-8")
+    tail = CsvTail(str(file_name), 1)
+    tail.read_new()
+    window = QWidget()
+    plot_data = PlotData(window)
+    plot_data.plot_line(tail.time_base, tail.signal, x_zoom=1000)
+    line = plot_data.get_all_lines()[-1]
+    follower = TailFollower(plot_data, tail, line)
+    plot_data.ax.set_xlim(-1000.0, -960.0)  # Видимый интервал 40 мс
+    assert follower.poll() == 0
+    with open(file_name, "a", encoding="utf-8") as f:
+        f.write(_rows(100, 300) + "300,9\n")
+    assert follower.poll() == 201
+    assert len(line.get_xdata()) == 301 and np.isclose(line.get_xdata()[-1], -700.0)
+    assert np.allclose(plot_data.ax.get_xlim(), (-740.0, -700.0))
+    assert plot_data.ax.get_ylim()[1] >= 9
+    # Удалённая с графика линия больше не продлевается
+    line.remove()
+    assert follower.poll() == 0 and not follower.active
+    window.close()
@@ -0,0 +1,68 @@
+'''
+test_time_base.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-16
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля time_base, реализующего равномерную временную ось (t0, dt, n).
+Тесты проверяют индексацию, срезы, масштабирование, преобразование в массив и вычисление диапазона индексов.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from time_base import TimeBase, as_time_base
+
+# Тест: индексация и преобразование в массив совпадают с явным массивом времени
+def test_indexing_and_array():
+    t = TimeBase(1.0, 0.5, 5)
+    assert len(t) == 5
+    assert t[0] == 1.0 and t[-1] == 3.0
+    assert np.allclose(np.asarray(t), [1.0, 1.5, 2.0, 2.5, 3.0])
+    assert t.fs == 2.0
+    with pytest.raises(IndexError):
+        t[5]
+
+# Тест: срез оси совпадает со срезом массива
+@pytest.mark.parametrize("key", [slice(1, 4), slice(None, None, 2), slice(3, None), slice(None, None, -1), slice(10, 20)])
+def test_slice(key):
+    t = TimeBase(-2.0, 0.25, 9)
+    assert np.allclose(np.asarray(t[key]), np.asarray(t)[key])
+    assert len(t[key]) == len(np.asarray(t)[key])
+
+# Тест: масштабирование и сдвиг оси без массива
+def test_scale_and_shift():
+    t = TimeBase(0.001, 1e-6, 4)
+    assert np.allclose(np.asarray(t * 1000), np.asarray(t) * 1000)
+    assert np.allclose(np.asarray(t / 1000), np.asarray(t) / 1000)
+    assert np.allclose(np.asarray(t + 1.0), np.asarray(t) + 1.0)
+    assert np.allclose(np.asarray(t - 1.0), np.asarray(t) - 1.0)
+
+# Тест: диапазон индексов совпадает с маской по массиву
+@pytest.mark.parametrize("x_min, x_max", [(0.0, 1.0), (0.3, 0.7), (-5.0, 0.25), (0.95, 5.0), (2.0, 3.0)])
+def test_index_range(x_min, x_max):
+    t = TimeBase(0.0, 0.1, 11)
+    x = np.asarray(t)
+    i0, i1 = t.index_range(x_min, x_max)
+    assert np.array_equal(x[i0:i1], x[(x >= x_min) & (x <= x_max)])
+
+# Тест: построение оси по массиву
+def test_as_time_base():
+    t = as_time_base(np.linspace(0, 1, 11))
+    assert (t.t0, len(t)) == (0.0, 11)
+    assert np.isclose(t.dt, 0.1)
+    assert as_time_base(t) is t
+    assert len(as_time_base([])) == 0
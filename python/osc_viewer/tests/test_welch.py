@@ -0,0 +1,66 @@
+'''
+test_welch.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль содержит набор unit-тестов для модуля welch, реализующего спектр методом Уэлча с ограниченным
+расходом памяти. Тесты проверяют совпадение с scipy.signal.welch, независимость результата от разбиения
+сигнала на блоки и нормировку амплитуды гармоники.
+'''
+
+import os
+import sys
+import numpy as np
+import pytest
+from scipy.signal import welch as scipy_welch
+
+# Получаем абсолютный путь к директории osc_viewer (на уровень выше текущего файла).
+osc_viewer_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if osc_viewer_dir not in sys.path:
+    sys.path.insert(0, osc_viewer_dir)
+
+from welch import WelchAccumulator, welch_blocks, welch_spectrum
+from quantized import QuantizedSignal
+
+# Тест: спектр совпадает с scipy.signal.welch (scaling='spectrum', без удвоения односторонних отсчётов)
+@pytest.mark.parametrize("segment_length, overlap, window", [(1024, 0.5, "hann"), (1000, 0.25, "blackman"), (512, 0.0, "boxcar")])
+def test_matches_scipy_welch(segment_length, overlap, window):
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(50003) + 2 * np.sin(0.3 * np.arange(50003)) + 0.7
+    freq, amplitude, n_segments = welch_spectrum(x, 1e3, segment_length, overlap, window, block_size=333)
+    freq_ref, power = scipy_welch(x, 1e3, window=window, nperseg=segment_length,
+                                  noverlap=int(round(overlap * segment_length)), scaling="spectrum")
+    power[1:(segment_length + 1) // 2] /= 2  # scipy удваивает мощность всех отсчётов, кроме 0 и fs/2
+    assert np.allclose(freq, freq_ref)
+    assert np.allclose(amplitude ** 2, power, rtol=1e-9)
+    assert n_segments == (len(x) - segment_length) // (segment_length - int(round(overlap * segment_length))) + 1
+
+# Тест: результат не зависит от разбиения на блоки; коды АЦП обрабатываются поблочно
+def test_blocks_independent():
+    rng = np.random.default_rng(2)
+    codes = rng.integers(-2000, 2000, 30000).astype(np.int16)
+    x = codes * 0.01 + 0.5
+    ref = welch_spectrum(x, 1.0, 256, 0.75, "hamming")
+    for block in (1, 100, 255, 256, 257, 30000):
+        blocks = (x[i:i + block] for i in range(0, len(x), block))
+        freq, amplitude, n = welch_blocks(blocks, 1.0, 256, 0.75, "hamming")
+        assert n == ref[2] and np.allclose(amplitude, ref[1])
+    _, amplitude, _ = welch_spectrum(QuantizedSignal(codes, 0.01, 0.5), 1.0, 256, 0.75, "hamming", block_size=1000)
+    assert np.allclose(amplitude, ref[1])
+
+# Тест: гармоника амплитуды A даёт пик A/2 (как спектр одного БПФ); короткий сигнал — ошибка
+def test_amplitude_and_short_signal():
+    t = np.arange(1 << 15)
+    _, amplitude, _ = welch_spectrum(3 * np.sin(2 * np.pi * 0.125 * t), 1.0, 1024, 0.5, "hann")
+    assert np.isclose(amplitude.max(), 1.5)
+    acc = WelchAccumulator(1.0, 1024)
+    acc.process(np.zeros(1000))
+    with pytest.raises(ValueError):
+        acc.result()
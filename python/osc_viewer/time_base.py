@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+'''
+time_base.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-16
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует равномерную временную ось сигнала, которая хранит только начальный момент t0, шаг dt и количество отсчётов n.
+Отсчёты времени t[i] = t0 + i*dt вычисляются по требованию, поэтому сигнал хранится как (t0, dt, samples)
+без массива времени той же длины, что и сам сигнал. Срезы, масштабирование и сдвиг оси выполняются за O(1).
+
+Список классов и функций:
+-------------------------
+- TimeBase(t0, dt, n)
+    Равномерная временная ось с ленивым вычислением отсчётов времени.
+- as_time_base(t)
+    Возвращает TimeBase для TimeBase, списка или массива отсчётов времени.
+'''
+
+import math
+import operator
+
+import numpy as np
+
+
+class TimeBase:
+    '''
+    Равномерная временная ось: t[i] = t0 + i*dt, i = 0..n-1.
+    Атрибуты:
+        t0 (float): Время первого отсчёта.
+        dt (float): Шаг по времени (период дискретизации).
+        n (int): Количество отсчётов.
+    Особенности:
+        - Поддерживает len(), индексацию (t[i], t[-1]) и срезы (t[a:b:k] — новая TimeBase без копирования).
+        - Умножение/деление на число и сложение/вычитание числа возвращают новую TimeBase (масштаб и сдвиг оси).
+        - np.asarray(t) и to_array() формируют массив отсчётов времени (одно выделение памяти).
+    '''
+
+    __slots__ = ('t0', 'dt', 'n')
+
+    def __init__(self, t0, dt, n):
+        self.t0 = float(t0)
+        self.dt = float(dt)
+        self.n = int(n)
+
+    @classmethod
+    def from_array(cls, t):
+        '''
+        Создаёт TimeBase по массиву отсчётов времени (шаг — средний по всему массиву).
+        Аргументы:
+            t (array-like): Отсчёты времени.
+        Возвращает:
+            TimeBase: Равномерная ось с тем же началом, концом и количеством отсчётов.
+        '''
+        t = np.asarray(t, dtype=np.float64)
+        n = len(t)
+        if n == 0:
+            return cls(0.0, 0.0, 0)
+        dt = (t[-1] - t[0]) / (n - 1) if n > 1 else 0.0
+        return cls(t[0], dt, n)
+
+    @property
+    def fs(self):
+        '''Частота дискретизации (0.0, если шаг не определён).'''
+        return 1.0 / self.dt if self.dt else 0.0
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.n)
+            return TimeBase(self.t0 + start * self.dt, self.dt * step, len(range(start, stop, step)))
+        i = operator.index(key)
+        if i < 0:
+            i += self.n
+        if not 0 <= i < self.n:
+            raise IndexError('TimeBase index out of range')
+        return self.t0 + i * self.dt
+
+    def __iter__(self):
+        return iter(self.to_array())
+
+    def to_array(self):
+        '''
+        Формирует массив отсчётов времени.
+        Возвращает:
+            np.ndarray: Массив t0 + i*dt длиной n.
+        '''
+        t = np.arange(self.n, dtype=np.float64)
+        t *= self.dt
+        t += self.t0
+        return t
+
+    def __array__(self, dtype=None, copy=None):
+        t = self.to_array()
+        return t if dtype is None else t.astype(dtype, copy=False)
+
+    def __mul__(self, k):
+        return TimeBase(self.t0 * k, self.dt * k, self.n)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, k):
+        return TimeBase(self.t0 / k, self.dt / k, self.n)
+
+    def __add__(self, x):
+        return TimeBase(self.t0 + x, self.dt, self.n)
+
+    __radd__ = __add__
+
+    def __sub__(self, x):
+        return TimeBase(self.t0 - x, self.dt, self.n)
+
+    def index_range(self, x_min, x_max):
+        '''
+        Возвращает диапазон индексов отсчётов, попадающих в интервал [x_min, x_max].
+        Аргументы:
+            x_min (float): Левая граница интервала.
+            x_max (float): Правая граница интервала.
+        Возвращает:
+            tuple: (i0, i1) — срез [i0:i1] содержит отсчёты внутри интервала.
+        '''
+        if self.n == 0 or self.dt <= 0:
+            inside = self.n > 0 and x_min <= self.t0 <= x_max
+            return (0, self.n) if inside else (0, 0)
+        # Оценка границ по t0 и dt с уточнением по фактическим значениям t0 + i*dt (как в to_array),
+        # чтобы результат совпадал с маской (t >= x_min) & (t <= x_max)
+        def value(i):
+            return self.t0 + i * self.dt
+        i0 = min(max(0, math.ceil((x_min - self.t0) / self.dt)), self.n)
+        while i0 > 0 and value(i0 - 1) >= x_min:
+            i0 -= 1
+        while i0 < self.n and value(i0) < x_min:
+            i0 += 1
+        i1 = min(max(0, math.floor((x_max - self.t0) / self.dt) + 1), self.n)
+        while i1 < self.n and value(i1) <= x_max:
+            i1 += 1
+        while i1 > 0 and value(i1 - 1) > x_max:
+            i1 -= 1
+        return i0, max(i0, i1)
+
+    def __repr__(self):
+        return f'TimeBase(t0={self.t0!r}, dt={self.dt!r}, n={self.n})'
+
+
+def as_time_base(t):
+    '''
+    Возвращает равномерную временную ось для переданных отсчётов времени.
+    Аргументы:
+        t (TimeBase | list | np.ndarray): Отсчёты времени.
+    Возвращает:
+        TimeBase: Та же ось, если передана TimeBase, иначе ось, построенная по массиву (TimeBase.from_array).
+    '''
+    if isinstance(t, TimeBase):
+        return t
+    return TimeBase.from_array(t)
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+'''
+welch.py
+
+Автор:        Мосолов С.С. (mosolov.s.s@yandex.ru)
+Дата:         2026-10-17
+Версия:       1.0.0
+
+Лицензия:     MIT License
+Контакты:     https://github.com/MSergeyS/ppf.git
+
+Краткое описание:
+-----------------
+Модуль реализует спектр методом Уэлча (усреднённая периодограмма) с ограниченным расходом памяти.
+Сигнал делится на сегменты длиной segment_length с перекрытием overlap; из каждого сегмента удаляется
+постоянная составляющая, сегмент умножается на окно, и квадраты модулей его БПФ усредняются.
+Сегменты обрабатываются потоково: сигнал подаётся блоками произвольной длины (из массива линии,
+из отображённого в память файла или из потокового загрузчика iter_data_blocks), между блоками хранится только
+незавершённый сегмент, а БПФ выполняется пачками по WELCH_BATCH_SEGMENTS сегментов. Поэтому память
+пропорциональна длине сегмента и не зависит от длины записи.
+Результат — амплитудный спектр в вольтах в той же нормировке, что и спектр одного БПФ (create_spectrume):
+sqrt(среднее |БПФ(x*w)|^2) / sum(w), т.е. гармоника амплитуды A даёт пик A/2 при любом окне.
+
+Список классов и функций:
+-------------------------
+- WelchAccumulator(fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW, precision='double')
+    Потоковое усреднение периодограмм: process(block) для очередного блока, result() — (freq, amplitude).
+- welch_spectrum(s, fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW, ...)
+    Спектр Уэлча массива (или QuantizedSignal), который подаётся блоками.
+- welch_blocks(blocks, fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW, ...)
+    Спектр Уэлча потока блоков отсчётов (например, из iter_data_blocks).
+'''
+
+import numpy as np
+import scipy.fft
+from scipy.signal import get_window
+
+from spectrum_engine import PRECISIONS, SPECTRUM_WORKERS
+
+# Длина сегмента по умолчанию, отсчётов
+WELCH_SEGMENT_LENGTH = 1 << 14
+# Перекрытие соседних сегментов по умолчанию (доля длины сегмента)
+WELCH_OVERLAP = 0.5
+# Окно по умолчанию (имя scipy.signal.get_window)
+WELCH_WINDOW = 'hann'
+# Количество сегментов, преобразуемых одним вызовом БПФ
+WELCH_BATCH_SEGMENTS = 16
+# Окна, предлагаемые в интерфейсе
+WELCH_WINDOWS = ('hann', 'hamming', 'blackman', 'blackmanharris', 'flattop', 'boxcar')
+
+
+class WelchAccumulator:
+    '''
+    Потоковое вычисление спектра методом Уэлча.
+    Аргументы:
+        fs (float): Частота дискретизации, Гц.
+        segment_length (int): Длина сегмента (и БПФ), отсчётов.
+        overlap (float): Перекрытие соседних сегментов, доля длины сегмента (0 <= overlap < 1).
+        window (str | tuple): Окно (имя scipy.signal.get_window).
+        precision (str): 'double' или 'single' (см. spectrum_engine.rfft_spectrum).
+    Атрибуты:
+        n_segments (int): Количество усреднённых сегментов.
+    Особенности:
+        - Между блоками хранится только начало следующего сегмента (меньше segment_length отсчётов).
+        - Сегменты блока берутся представлениями (sliding_window_view) без копирования; копируется
+          только пачка из WELCH_BATCH_SEGMENTS сегментов перед БПФ.
+    '''
+
+    def __init__(self, fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW,
+                 precision='double'):
+        if precision not in PRECISIONS:
+            raise ValueError(f'Неизвестная точность вычисления спектра: {precision}')
+        self.segment_length = int(segment_length)
+        if self.segment_length < 2:
+            raise ValueError(f'Длина сегмента должна быть не меньше 2: {segment_length}')
+        if not 0 <= overlap < 1:
+            raise ValueError(f'Перекрытие сегментов должно быть в диапазоне [0, 1): {overlap}')
+        self.fs = fs
+        self.step = max(1, self.segment_length - int(round(overlap * self.segment_length)))
+        self._real_dtype = PRECISIONS[precision][0]
+        self._window = get_window(window, self.segment_length, fftbins=True).astype(self._real_dtype)
+        self._power = np.zeros(self.segment_length // 2 + 1)
+        self._buf = np.empty(0, dtype=self._real_dtype)
+        self.n_segments = 0
+
+    def _accumulate(self, segments):
+        '''Добавляет к сумме периодограмм сегменты (двумерное представление «сегмент x отсчёт»).'''
+        for i in range(0, len(segments), WELCH_BATCH_SEGMENTS):
+            batch = np.array(segments[i:i + WELCH_BATCH_SEGMENTS], dtype=self._real_dtype)
+            batch -= batch.mean(axis=1, keepdims=True)  # Удаление постоянной составляющей сегмента
+            batch *= self._window
+            spectrum = scipy.fft.rfft(batch, axis=-1, workers=SPECTRUM_WORKERS)
+            self._power += (spectrum.real ** 2 + spectrum.imag ** 2).sum(axis=0)
+            self.n_segments += len(batch)
+
+    def process(self, block):
+        '''
+        Обрабатывает очередной блок отсчётов: усредняет все сегменты, которые в нём завершились.
+        Аргументы:
+            block (array-like): Отсчёты сигнала.
+        '''
+        block = np.asarray(block)
+        if len(block) == 0:
+            return
+        if len(self._buf):
+            # Сегменты, начинающиеся в сохранённом начале, — по короткому объединённому массиву
+            head = np.concatenate((self._buf, block[:self.segment_length]))
+            n_head = max(0, (len(head) - self.segment_length) // self.step + 1)
+            n_head = min(n_head, -(-len(self._buf) // self.step))
+            if n_head:
+                self._accumulate(np.lib.stride_tricks.sliding_window_view(head, self.segment_length)[::self.step][:n_head])
+            start = n_head * self.step - len(self._buf)  # Начало следующего сегмента относительно блока
+            if start < 0:
+                # Сегмент, начинающийся в сохранённых отсчётах, ещё не завершён
+                self._buf = head[n_head * self.step:].copy() if len(head) < len(self._buf) + len(block) \
+                    else np.concatenate((self._buf[n_head * self.step:], block))
+                return
+            block = block[start:]
+        n = (len(block) - self.segment_length) // self.step + 1 if len(block) >= self.segment_length else 0
+        if n:
+            self._accumulate(np.lib.stride_tricks.sliding_window_view(block, self.segment_length)[::self.step][:n])
+        self._buf = np.array(block[n * self.step:], dtype=self._real_dtype)  # Копия: блок может быть изменён
+
+    def result(self):
+        '''
+        Возвращает усреднённый спектр.
+        Возвращает:
+            tuple:
+                freq (np.ndarray): Частоты 0...fs/2, Гц (segment_length//2 + 1 отсчётов).
+                amplitude (np.ndarray): Амплитудный спектр, В (нормировка как у спектра одного БПФ).
+        Исключения:
+            ValueError: Если сигнал короче одного сегмента.
+        '''
+        if self.n_segments == 0:
+            raise ValueError(f'Сигнал короче одного сегмента ({self.segment_length} отсчётов)')
+        amplitude = np.sqrt(self._power / self.n_segments) / np.sum(self._window, dtype=np.float64)
+        freq = scipy.fft.rfftfreq(self.segment_length, d=1/self.fs)
+        return freq, amplitude
+
+
+def welch_blocks(blocks, fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW,
+                 precision='double'):
+    '''
+    Спектр Уэлча потока блоков отсчётов.
+    Аргументы:
+        blocks (iterable): Блоки отсчётов сигнала, например (s for _, s, _ in iter_data_blocks(file_name, ver)).
+        fs (float): Частота дискретизации, Гц.
+        segment_length, overlap, window, precision: См. WelchAccumulator.
+    Возвращает:
+        tuple: (freq, amplitude, n_segments).
+    '''
+    acc = WelchAccumulator(fs, segment_length, overlap, window, precision)
+    for block in blocks:
+        acc.process(block)
+    freq, amplitude = acc.result()
+    return freq, amplitude, acc.n_segments
+
+
+def welch_spectrum(s, fs, segment_length=WELCH_SEGMENT_LENGTH, overlap=WELCH_OVERLAP, window=WELCH_WINDOW,
+                   precision='double', block_size=None):
+    '''
+    Спектр Уэлча сигнала в памяти (в том числе отображённого в память или хранимого кодами АЦП).
+    Сигнал подаётся блоками по block_size отсчётов, поэтому промежуточные массивы не зависят от длины сигнала.
+    Аргументы:
+        s (array-like | QuantizedSignal): Сигнал.
+        fs (float): Частота дискретизации, Гц.
+        segment_length, overlap, window, precision: См. WelchAccumulator.
+        block_size (int | None): Размер блока (None — WELCH_BATCH_SEGMENTS сегментов).
+    Возвращает:
+        tuple: (freq, amplitude, n_segments).
+    '''
+    block_size = int(block_size or WELCH_BATCH_SEGMENTS * int(segment_length))
+    return welch_blocks(
+        (s[i:i + block_size] for i in range(0, len(s), block_size)),
+        fs, segment_length, overlap, window, precision,
+    )